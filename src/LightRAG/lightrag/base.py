@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+import asyncio
 from enum import Enum
 import os
 from dotenv import load_dotenv
@@ -109,6 +110,12 @@ class QueryParam:
     If proivded, this will be use instead of the default vaulue from prompt template.
     """
 
+    enable_trace: bool = False
+    """If True, collects a per-stage timing trace of the query, including storage round trips and token counts."""
+
+    trace: Any | None = None
+    """Timing trace of the last query run with enable_trace (a QueryTrace), set by aquery."""
+
 
 @dataclass
 class StorageNameSpace(ABC):
@@ -167,6 +174,34 @@ class BaseVectorStorage(StorageNameSpace, ABC):
     ) -> list[dict[str, Any]]:
         """Query the vector storage and retrieve top_k results."""
 
+    async def query_batch(
+        self,
+        queries: list[str],
+        top_k: int,
+        ids: list[str] | None = None,
+        embeddings: Any | None = None,
+    ) -> list[list[dict[str, Any]]]:
+        """Query the vector storage with several queries at once.
+
+        Args:
+            queries: Query texts
+            top_k: Number of results to retrieve per query
+            ids: Optional list of ids to filter the results
+            embeddings: Optional precomputed embeddings of `queries` (one row per query)
+
+        Returns:
+            One result list per query, in the same order and format as `query`.
+
+        The default implementation runs `query` concurrently and ignores
+        `embeddings`. In-memory storages override it to embed all queries in one
+        call and score them with a single matrix product.
+        """
+        return list(
+            await asyncio.gather(
+                *[self.query(query, top_k=top_k, ids=ids) for query in queries]
+            )
+        )
+
     @abstractmethod
     async def upsert(self, data: dict[str, dict[str, Any]]) -> None:
         """Insert or update vectors in the storage.
@@ -638,6 +673,18 @@ class DocProcessingStatus:
     """Additional metadata"""
 
 
+@dataclass
+class DocStatusPage:
+    """One page of a document status listing"""
+
+    documents: list[tuple[str, DocProcessingStatus]]
+    """(document id, status) pairs of the page, in sort order"""
+    next_cursor: str | None
+    """Cursor of the next page, None on the last page"""
+    total: int
+    """Number of documents matching the filters, across all pages"""
+
+
 @dataclass
 class DocStatusStorage(BaseKVStorage, ABC):
     """Base class for document status storage"""
@@ -652,6 +699,53 @@ class DocStatusStorage(BaseKVStorage, ABC):
     ) -> dict[str, DocProcessingStatus]:
         """Get all documents with a specific status"""
 
+    async def get_docs_paginated(
+        self,
+        status: DocStatus | None = None,
+        file_path_filter: str | None = None,
+        sort_field: str = "updated_at",
+        sort_direction: Literal["asc", "desc"] = "desc",
+        page_size: int = 50,
+        cursor: str | None = None,
+    ) -> DocStatusPage:
+        """Get one page of documents, filtered and sorted
+
+        Backends override this with a query served by their status, updated_at
+        and file_path indexes; this fallback loads the matching documents.
+
+        Args:
+            status: Only list documents with this status
+            file_path_filter: Case-insensitive substring the file path must contain
+            sort_field: "updated_at", "created_at", "file_path" or "id"
+            sort_direction: "asc" or "desc"
+            page_size: Maximum number of documents in the page
+            cursor: next_cursor of the previous page, None for the first page
+
+        Raises:
+            ValueError: On an invalid sort, page size or cursor
+        """
+        from .doc_status_index import paginate_records, validate_page_request
+
+        validate_page_request(sort_field, sort_direction, page_size)
+        statuses = [status] if status is not None else list(DocStatus)
+        docs: dict[str, DocProcessingStatus] = {}
+        for s in statuses:
+            docs.update(await self.get_docs_by_status(s))
+
+        ids, next_cursor, total = paginate_records(
+            ((doc_id, doc.__dict__) for doc_id, doc in docs.items()),
+            file_path_filter,
+            sort_field,
+            sort_direction,
+            page_size,
+            cursor,
+        )
+        return DocStatusPage(
+            documents=[(doc_id, docs[doc_id]) for doc_id in ids],
+            next_cursor=next_cursor,
+            total=total,
+        )
+
     async def drop_cache_by_modes(self, modes: list[str] | None = None) -> bool:
         """Drop cache is not supported for Doc Status storage"""
         return False
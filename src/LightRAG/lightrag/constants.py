@@ -20,3 +20,8 @@ GRAPH_FIELD_SEP = "<SEP>"
 DEFAULT_LOG_MAX_BYTES = 10485760  # Default 10MB
 DEFAULT_LOG_BACKUP_COUNT = 5  # Default 5 backups
 DEFAULT_LOG_FILENAME = "lightrag.log"  # Default log filename
+
+# HTTP connection pool defaults for LLM, embedding and rerank bindings
+DEFAULT_HTTP_MAX_CONNECTIONS = 100
+DEFAULT_HTTP_MAX_KEEPALIVE_CONNECTIONS = 20
+DEFAULT_HTTP_KEEPALIVE_EXPIRY = 30  # seconds
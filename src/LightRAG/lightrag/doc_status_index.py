@@ -0,0 +1,301 @@
+"""
+Secondary indexes and cursor pagination for document status listings
+
+Pages are addressed with keyset cursors: an opaque token holding the sort value
+and id of the last document of the previous page. Fetching the next page seeks
+past that key instead of skipping an offset, so deep pages cost the same as the
+first one and documents inserted meanwhile do not shift the pages.
+"""
+
+from __future__ import annotations
+
+import base64
+import heapq
+import json
+from bisect import bisect_left, bisect_right, insort
+from typing import Any, Iterable, Iterator
+
+from .base import DocProcessingStatus, DocStatus
+
+DOC_STATUS_SORT_FIELDS = ("updated_at", "created_at", "file_path", "id")
+"""Fields document status listings can be sorted by"""
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 1000
+
+
+def encode_cursor(sort_value: Any, doc_id: str) -> str:
+    """Encode the key of the last document of a page as an opaque cursor"""
+    raw = json.dumps([sort_value, doc_id], ensure_ascii=False, default=str)
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> tuple[Any, str]:
+    """Decode a cursor into (sort value, document id)
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        sort_value, doc_id = json.loads(
+            base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+        )
+    except (ValueError, TypeError, UnicodeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+    return sort_value, str(doc_id)
+
+
+def validate_page_request(sort_field: str, sort_direction: str, page_size: int) -> None:
+    """Check the sort and page size of a listing request
+
+    Raises:
+        ValueError: If a parameter is out of range
+    """
+    if sort_field not in DOC_STATUS_SORT_FIELDS:
+        raise ValueError(
+            f"Invalid sort field: {sort_field}, expected one of {DOC_STATUS_SORT_FIELDS}"
+        )
+    if sort_direction not in ("asc", "desc"):
+        raise ValueError(f"Invalid sort direction: {sort_direction}")
+    if not 1 <= page_size <= MAX_PAGE_SIZE:
+        raise ValueError(f"page_size must be between 1 and {MAX_PAGE_SIZE}")
+
+
+def status_value(status: Any) -> str:
+    """Plain string value of a stored status
+
+    str() of a DocStatus is "DocStatus.PENDING". Members are not matched by
+    class, the server imports DocStatus through another module path.
+    """
+    return str(getattr(status, "value", status))
+
+
+def sort_value(doc_id: str, data: dict[str, Any], sort_field: str) -> str:
+    """Value a document is sorted by, missing values sorting first"""
+    if sort_field == "id":
+        return doc_id
+    value = data.get(sort_field)
+    return "" if value is None else str(value)
+
+
+def to_doc_processing_status(data: dict[str, Any]) -> DocProcessingStatus:
+    """Build a DocProcessingStatus from a stored record, filling legacy gaps"""
+    # Make a copy of the data to avoid modifying the original
+    data = dict(data)
+    # If content is missing, use content_summary as content
+    if "content" not in data and "content_summary" in data:
+        data["content"] = data["content_summary"]
+    # If file_path is not in data, use document id as file path
+    if "file_path" not in data:
+        data["file_path"] = "no-file-path"
+    return DocProcessingStatus(**data)
+
+
+def paginate_records(
+    records: Iterable[tuple[str, dict[str, Any]]],
+    file_path_filter: str | None,
+    sort_field: str,
+    sort_direction: str,
+    page_size: int,
+    cursor: str | None,
+) -> tuple[list[str], str | None, int]:
+    """Page through records held in memory, without an index
+
+    Returns:
+        (document ids of the page, next cursor or None, total matching documents)
+    """
+    needle = file_path_filter.lower() if file_path_filter else None
+    keyed = [
+        (sort_value(doc_id, data, sort_field), doc_id)
+        for doc_id, data in records
+        if needle is None or needle in str(data.get("file_path") or "").lower()
+    ]
+    descending = sort_direction == "desc"
+    keyed.sort(reverse=descending)
+    total = len(keyed)
+
+    start = 0
+    if cursor:
+        value, doc_id = decode_cursor(cursor)
+        key = (str(value), doc_id)
+        # Entries are unique (sort value, id) pairs, so the cursor key is skipped
+        if descending:
+            start = _count_greater_or_equal(keyed, key)
+        else:
+            start = bisect_right(keyed, key)
+
+    page = keyed[start : start + page_size + 1]
+    next_cursor = None
+    if len(page) > page_size:
+        next_cursor = encode_cursor(*page[page_size - 1])
+    return [doc_id for _, doc_id in page[:page_size]], next_cursor, total
+
+
+def _count_greater_or_equal(descending: list[tuple[str, str]], key) -> int:
+    lo, hi = 0, len(descending)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if descending[mid] >= key:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+
+class DocStatusIndex:
+    """In-memory secondary indexes over document status records
+
+    For each status and sort field, document keys are kept in a sorted list, so a
+    page is a bisection plus a slice, and listings across statuses merge the
+    per-status lists. Document ids are also grouped by file path.
+    """
+
+    def __init__(self):
+        # (status, sort field) -> sorted [(sort value, doc id)]
+        self._sorted: dict[tuple[str, str], list[tuple[str, str]]] = {}
+        # doc id -> (status, {sort field: sort value})
+        self._entries: dict[str, tuple[str, dict[str, str]]] = {}
+        # file path -> doc ids
+        self._by_file_path: dict[str, set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        self._sorted.clear()
+        self._entries.clear()
+        self._by_file_path.clear()
+
+    def rebuild(self, records: Iterable[tuple[str, dict[str, Any]]]) -> None:
+        """Replace the index content with the given records"""
+        self.clear()
+        for doc_id, data in records:
+            status = status_value(data.get("status"))
+            values = {
+                field: sort_value(doc_id, data, field)
+                for field in DOC_STATUS_SORT_FIELDS
+            }
+            self._entries[doc_id] = (status, values)
+            self._by_file_path.setdefault(values["file_path"], set()).add(doc_id)
+            for field, value in values.items():
+                self._sorted.setdefault((status, field), []).append((value, doc_id))
+        for entries in self._sorted.values():
+            entries.sort()
+
+    def add(self, doc_id: str, data: dict[str, Any]) -> None:
+        """Index a document, replacing its previous entry"""
+        self.remove(doc_id)
+        status = status_value(data.get("status"))
+        values = {
+            field: sort_value(doc_id, data, field) for field in DOC_STATUS_SORT_FIELDS
+        }
+        self._entries[doc_id] = (status, values)
+        self._by_file_path.setdefault(values["file_path"], set()).add(doc_id)
+        for field, value in values.items():
+            insort(self._sorted.setdefault((status, field), []), (value, doc_id))
+
+    def remove(self, doc_id: str) -> None:
+        """Drop a document from the index, if present"""
+        entry = self._entries.pop(doc_id, None)
+        if entry is None:
+            return
+        status, values = entry
+        ids = self._by_file_path.get(values["file_path"])
+        if ids is not None:
+            ids.discard(doc_id)
+            if not ids:
+                del self._by_file_path[values["file_path"]]
+        for field, value in values.items():
+            entries = self._sorted[(status, field)]
+            pos = bisect_left(entries, (value, doc_id))
+            if pos < len(entries) and entries[pos] == (value, doc_id):
+                del entries[pos]
+
+    def status_counts(self) -> dict[str, int]:
+        """Number of indexed documents per status"""
+        counts = {status.value: 0 for status in DocStatus}
+        for (status, field), entries in self._sorted.items():
+            if field == "id":
+                counts[status] = counts.get(status, 0) + len(entries)
+        return counts
+
+    def ids_by_file_path(self, file_path: str) -> set[str]:
+        """Ids of the documents with exactly this file path"""
+        return set(self._by_file_path.get(file_path, ()))
+
+    def page(
+        self,
+        status: str | None,
+        file_path_filter: str | None,
+        sort_field: str,
+        sort_direction: str,
+        page_size: int,
+        cursor: str | None,
+    ) -> tuple[list[str], str | None, int]:
+        """One page of document ids
+
+        Args:
+            status: Status to list, None lists all statuses
+            file_path_filter: Case-insensitive substring the file path must contain
+            sort_field: One of DOC_STATUS_SORT_FIELDS
+            sort_direction: "asc" or "desc"
+            page_size: Maximum number of ids returned
+            cursor: Cursor returned with the previous page
+
+        Returns:
+            (document ids of the page, next cursor or None, total matching documents)
+        """
+        descending = sort_direction == "desc"
+        key = None
+        if cursor:
+            value, doc_id = decode_cursor(cursor)
+            key = (str(value), doc_id)
+        statuses = (
+            [status]
+            if status is not None
+            else [s for (s, field) in self._sorted if field == sort_field]
+        )
+
+        streams = [
+            self._iter_after(self._sorted.get((s, sort_field), []), key, descending)
+            for s in statuses
+        ]
+        matches = heapq.merge(*streams, reverse=descending)
+
+        needle = file_path_filter.lower() if file_path_filter else None
+        page: list[tuple[str, str]] = []
+        for value, doc_id in matches:
+            if needle and needle not in self._entries[doc_id][1]["file_path"].lower():
+                continue
+            page.append((value, doc_id))
+            if len(page) > page_size:
+                break
+
+        next_cursor = None
+        if len(page) > page_size:
+            next_cursor = encode_cursor(*page[page_size - 1])
+        total = self._total(status, needle)
+        return [doc_id for _, doc_id in page[:page_size]], next_cursor, total
+
+    def _total(self, status: str | None, needle: str | None) -> int:
+        if needle is None:
+            counts = self.status_counts()
+            return counts.get(status, 0) if status is not None else sum(counts.values())
+        total = 0
+        for file_path, ids in self._by_file_path.items():
+            if needle in file_path.lower():
+                if status is None:
+                    total += len(ids)
+                else:
+                    total += sum(1 for i in ids if self._entries[i][0] == status)
+        return total
+
+    @staticmethod
+    def _iter_after(
+        entries: list[tuple[str, str]], key, descending: bool
+    ) -> Iterator[tuple[str, str]]:
+        if descending:
+            end = bisect_left(entries, key) if key is not None else len(entries)
+            return (entries[i] for i in range(end - 1, -1, -1))
+        start = bisect_right(entries, key) if key is not None else 0
+        return (entries[i] for i in range(start, len(entries)))
@@ -0,0 +1,176 @@
+"""
+Process-wide keep-alive HTTP connection pools for LLM, embedding and rerank bindings.
+
+Bindings used to build a fresh client (and therefore a fresh TCP+TLS connection)
+for every request. This module keeps one client per (binding, endpoint, credentials)
+and per event loop, so connections are reused across calls. Each LightRAG instance
+registers as a user of the pools of its event loop in `initialize_storages` and
+releases them in `finalize_storages`; the clients of a loop are closed when its
+last user is finalized.
+
+Pool sizes are configurable through environment variables:
+    HTTP_MAX_CONNECTIONS            total connections per client
+    HTTP_MAX_KEEPALIVE_CONNECTIONS  idle connections kept alive per client
+    HTTP_KEEPALIVE_EXPIRY           seconds an idle connection is kept alive
+    HTTP_ENABLE_HTTP2               negotiate HTTP/2 when the `h2` package is installed
+"""
+
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import inspect
+import weakref
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from .constants import (
+    DEFAULT_HTTP_KEEPALIVE_EXPIRY,
+    DEFAULT_HTTP_MAX_CONNECTIONS,
+    DEFAULT_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+)
+from .utils import get_env_value, logger
+
+# (binding, key, loop id) -> (client, close function, loop reference)
+_http_clients: Dict[
+    Tuple[str, Hashable, int],
+    Tuple[Any, Optional[Callable[[], Any]], Callable[[], Any]],
+] = {}
+# loop id -> number of LightRAG instances using the clients of that loop
+_http_client_users: Dict[int, int] = {}
+
+def get_http_pool_config() -> Dict[str, Any]:
+    """Return the connection pool settings read from the environment."""
+    return {
+        "max_connections": get_env_value(
+            "HTTP_MAX_CONNECTIONS", DEFAULT_HTTP_MAX_CONNECTIONS, int
+        ),
+        "max_keepalive_connections": get_env_value(
+            "HTTP_MAX_KEEPALIVE_CONNECTIONS",
+            DEFAULT_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            int,
+        ),
+        "keepalive_expiry": get_env_value(
+            "HTTP_KEEPALIVE_EXPIRY", DEFAULT_HTTP_KEEPALIVE_EXPIRY, float
+        ),
+        "http2": get_env_value("HTTP_ENABLE_HTTP2", True, bool)
+        and importlib.util.find_spec("h2") is not None,
+    }
+
+
+def get_httpx_client_kwargs() -> Dict[str, Any]:
+    """Keyword arguments for `httpx.AsyncClient` configuring pooling and HTTP/2."""
+    import httpx
+
+    config = get_http_pool_config()
+    return {
+        "limits": httpx.Limits(
+            max_connections=config["max_connections"],
+            max_keepalive_connections=config["max_keepalive_connections"],
+            keepalive_expiry=config["keepalive_expiry"],
+        ),
+        "http2": config["http2"],
+    }
+
+
+def _current_loop() -> Optional[asyncio.AbstractEventLoop]:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+def _current_loop_id() -> int:
+    loop = _current_loop()
+    return id(loop) if loop is not None else 0
+
+
+def _loop_ref(loop: Optional[asyncio.AbstractEventLoop]) -> Callable[[], Any]:
+    if loop is None:
+        return lambda: None
+    return weakref.ref(loop)
+
+def get_pooled_http_client(
+    binding: str,
+    key: Hashable,
+    factory: Callable[[], Any],
+    close: Optional[Callable[[Any], Awaitable[None]]] = None,
+) -> Any:
+    """Return the shared client for `binding`/`key`, creating it on first use.
+
+    Clients are bound to the running event loop, so a separate client is kept
+    for each loop (e.g. scripts calling `asyncio.run` more than once).
+
+    Args:
+        binding: Binding name, e.g. "openai", "ollama" or "rerank".
+        key: Hashable identifying the endpoint and credentials.
+        factory: Builds a new client.
+        close: Coroutine function closing the client. Defaults to the client's
+            `aclose()` or `close()` method.
+    """
+    loop = _current_loop()
+    cache_key = (binding, key, _current_loop_id())
+    entry = _http_clients.get(cache_key)
+    # The id of a garbage collected loop can be reused by a new one
+    if entry is not None and entry[2]() is loop:
+        return entry[0]
+
+    client = factory()
+    if close is None:
+        closer = getattr(client, "aclose", None) or getattr(client, "close", None)
+    else:
+
+        def closer():
+            return close(client)
+
+    _http_clients[cache_key] = (client, closer, _loop_ref(loop))
+    logger.debug(f"Created pooled HTTP client for {binding}")
+    return client
+
+
+def acquire_http_clients() -> None:
+    """Register a user of the pooled clients of the running event loop."""
+    loop_id = _current_loop_id()
+    _http_client_users[loop_id] = _http_client_users.get(loop_id, 0) + 1
+
+
+async def release_http_clients() -> None:
+    """Unregister a user, closing the loop's clients when it was the last one."""
+    loop_id = _current_loop_id()
+    users = _http_client_users.get(loop_id, 0) - 1
+    if users > 0:
+        _http_client_users[loop_id] = users
+        return
+    _http_client_users.pop(loop_id, None)
+    await close_http_clients()
+
+
+async def close_http_clients() -> None:
+    """Close the pooled clients of the running event loop.
+
+    Clients of other live loops are kept. Clients of loops that are closed or
+    gone cannot be awaited any more and are dropped. New clients are created
+    lazily on next use.
+    """
+    current_loop = _current_loop()
+    current_loop_id = _current_loop_id()
+    entries = []
+    for cache_key, entry in list(_http_clients.items()):
+        loop = entry[2]()
+        if cache_key[2] == current_loop_id and loop is current_loop:
+            entries.append((cache_key[0], entry[1]))
+        elif loop is not None and not loop.is_closed():
+            continue
+        del _http_clients[cache_key]
+
+    for binding, closer in entries:
+        if closer is None:
+            continue
+        try:
+            result = closer()
+            if inspect.isawaitable(result):
+                await result
+        except Exception as e:
+            logger.warning(f"Failed to close pooled HTTP client for {binding}: {e}")
+
+    if entries:
+        logger.debug(f"Closed {len(entries)} pooled HTTP client(s)")
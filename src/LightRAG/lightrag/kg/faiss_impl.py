@@ -10,9 +10,11 @@ from lightrag.utils import logger, compute_mdhash_id
 from lightrag.base import BaseVectorStorage
 
 from .shared_storage import (
+    get_changes_since,
     get_storage_lock,
-    get_update_flag,
-    set_all_update_flags,
+    publish_changes,
+    register_change_reader,
+    unregister_change_reader,
 )
 
 # You must manually install faiss-cpu or faiss-gpu before using FAISS vector db
@@ -65,29 +67,64 @@ class FaissVectorDBStorage(BaseVectorStorage):
         # Maps <int faiss_id> → metadata (including your original ID).
         self._id_to_meta = {}
 
+        self._storage_lock = None
+        # Generation of the namespace this copy is at, and the changes made here
+        # since the last save, published to the other workers on save
+        self._generation = 0
+        self._pending_changes = []
+
         self._load_faiss_index()
 
     async def initialize(self):
         """Initialize storage data"""
-        # Get the update flag for cross-process update notification
-        self.storage_updated = await get_update_flag(self.namespace)
+        # Follow the changes saved by other processes
+        self._generation = await register_change_reader(self.namespace)
         # Get the storage lock for use in other methods
         self._storage_lock = get_storage_lock()
 
+    async def finalize(self):
+        """Stop following the changes saved by other processes"""
+        if self._storage_lock is not None:
+            await unregister_change_reader(self.namespace)
+            self._storage_lock = None
+
+    async def _sync_changes(self):
+        """Apply the changes saved by other processes since our generation
+
+        Must be called while holding the storage lock.
+        """
+        generation, changes = await get_changes_since(self.namespace, self._generation)
+        if generation == self._generation:
+            return
+        if changes is None:
+            logger.info(
+                f"Process {os.getpid()} FAISS reloading {self.namespace} due to update by another process"
+            )
+            self._index = faiss.IndexFlatIP(self._dim)
+            self._id_to_meta = {}
+            self._load_faiss_index()
+            # The file does not hold our unsaved changes, which are still published
+            self._apply_changes(self._pending_changes)
+        else:
+            logger.debug(
+                f"Process {os.getpid()} FAISS applying {len(changes)} changes to {self.namespace}"
+            )
+            self._apply_changes(changes)
+        self._generation = generation
+
+    def _apply_changes(self, changes: list) -> None:
+        """Replay journaled operations on the index"""
+        for op, payload in changes:
+            if op == "upsert":
+                self._upsert_vectors([dict(meta) for meta in payload])
+            elif op == "delete":
+                self._delete_custom_ids(payload)
+
     async def _get_index(self):
-        """Check if the shtorage should be reloaded"""
+        """Bring the storage up to date with other processes"""
         # Acquire lock to prevent concurrent read and write
         async with self._storage_lock:
-            # Check if storage was updated by another process
-            if self.storage_updated.value:
-                logger.info(
-                    f"Process {os.getpid()} FAISS reloading {self.namespace} due to update by another process"
-                )
-                # Reload data
-                self._index = faiss.IndexFlatIP(self._dim)
-                self._id_to_meta = {}
-                self._load_faiss_index()
-                self.storage_updated.value = False
+            await self._sync_changes()
             return self._index
 
     async def upsert(self, data: dict[str, dict[str, Any]]) -> None:
@@ -144,30 +181,14 @@ class FaissVectorDBStorage(BaseVectorStorage):
         embeddings = embeddings.astype(np.float32)
         faiss.normalize_L2(embeddings)
 
-        # Upsert logic:
-        # 1. Identify which vectors to remove if they exist
-        # 2. Remove them
-        # 3. Add the new vectors
-        existing_ids_to_remove = []
-        for meta, emb in zip(list_data, embeddings):
-            faiss_internal_id = self._find_faiss_id_by_custom_id(meta["__id__"])
-            if faiss_internal_id is not None:
-                existing_ids_to_remove.append(faiss_internal_id)
-
-        if existing_ids_to_remove:
-            await self._remove_faiss_ids(existing_ids_to_remove)
-
-        # Step 2: Add new vectors
-        index = await self._get_index()
-        start_idx = index.ntotal
-        index.add(embeddings)
-
-        # Step 3: Store metadata + vector for each new ID
+        # Store the raw vector so we can rebuild if something is removed
         for i, meta in enumerate(list_data):
-            fid = start_idx + i
-            # Store the raw vector so we can rebuild if something is removed
             meta["__vector__"] = embeddings[i].tolist()
-            self._id_to_meta.update({fid: meta})
+
+        async with self._storage_lock:
+            await self._sync_changes()
+            self._upsert_vectors(list_data)
+            self._pending_changes.append(("upsert", list_data))
 
         logger.debug(f"Upserted {len(list_data)} vectors into Faiss index.")
         return [m["__id__"] for m in list_data]
@@ -191,11 +212,45 @@ class FaissVectorDBStorage(BaseVectorStorage):
 
         # Perform the similarity search
         index = await self._get_index()
-        distances, indices = index.search(embedding, top_k)
+        distances, indices = index.search(embedding, self._search_k(index, top_k, ids))
+        return self._collect_results(distances[0], indices[0], top_k, ids)
+
+    async def query_batch(
+        self,
+        queries: list[str],
+        top_k: int,
+        ids: list[str] | None = None,
+        embeddings: np.ndarray | None = None,
+    ) -> list[list[dict[str, Any]]]:
+        """
+        Search several textual queries with one batched index search.
+        """
+        if not queries:
+            return []
+        if embeddings is None:
+            embeddings = await self.embedding_func(queries, _priority=5)
+        # embeddings is shape (n, dim)
+        embeddings = np.array(embeddings, dtype=np.float32)
+        faiss.normalize_L2(embeddings)
+
+        index = await self._get_index()
+        distances, indices = index.search(
+            embeddings, self._search_k(index, top_k, ids)
+        )
+        return [
+            self._collect_results(row_distances, row_indices, top_k, ids)
+            for row_distances, row_indices in zip(distances, indices)
+        ]
 
-        distances = distances[0]
-        indices = indices[0]
+    @staticmethod
+    def _search_k(index, top_k: int, ids: list[str] | None) -> int:
+        # With an ids filter, rank every vector so the filter applies before top_k
+        return max(top_k, index.ntotal) if ids else top_k
 
+    def _collect_results(
+        self, distances, indices, top_k: int, ids: list[str] | None
+    ) -> list[dict[str, Any]]:
+        id_set = set(ids) if ids else None
         results = []
         for dist, idx in zip(distances, indices):
             if idx == -1:
@@ -207,6 +262,8 @@ class FaissVectorDBStorage(BaseVectorStorage):
                 continue
 
             meta = self._id_to_meta.get(idx, {})
+            if id_set is not None and meta.get("__id__") not in id_set:
+                continue
             results.append(
                 {
                     **meta,
@@ -215,7 +272,8 @@ class FaissVectorDBStorage(BaseVectorStorage):
                     "created_at": meta.get("__created_at__"),
                 }
             )
-
+            if len(results) >= top_k:
+                break
         return results
 
     @property
@@ -233,17 +291,12 @@ class FaissVectorDBStorage(BaseVectorStorage):
            KG-storage-log should be used to avoid data corruption
         """
         logger.debug(f"Deleting {len(ids)} vectors from {self.namespace}")
-        to_remove = []
-        for cid in ids:
-            fid = self._find_faiss_id_by_custom_id(cid)
-            if fid is not None:
-                to_remove.append(fid)
-
-        if to_remove:
-            await self._remove_faiss_ids(to_remove)
-        logger.debug(
-            f"Successfully deleted {len(to_remove)} vectors from {self.namespace}"
-        )
+        async with self._storage_lock:
+            await self._sync_changes()
+            removed = self._delete_custom_ids(ids)
+            if removed:
+                self._pending_changes.append(("delete", list(ids)))
+        logger.debug(f"Successfully deleted {removed} vectors from {self.namespace}")
 
     async def delete_entity(self, entity_name: str) -> None:
         """
@@ -264,14 +317,16 @@ class FaissVectorDBStorage(BaseVectorStorage):
            KG-storage-log should be used to avoid data corruption
         """
         logger.debug(f"Searching relations for entity {entity_name}")
-        relations = []
-        for fid, meta in self._id_to_meta.items():
-            if meta.get("src_id") == entity_name or meta.get("tgt_id") == entity_name:
-                relations.append(fid)
+        await self._get_index()
+        relations = [
+            meta["__id__"]
+            for meta in self._id_to_meta.values()
+            if meta.get("src_id") == entity_name or meta.get("tgt_id") == entity_name
+        ]
 
         logger.debug(f"Found {len(relations)} relations for {entity_name}")
         if relations:
-            await self._remove_faiss_ids(relations)
+            await self.delete(relations)
             logger.debug(f"Deleted {len(relations)} relations for {entity_name}")
 
     # --------------------------------------------------------------------------------
@@ -287,13 +342,44 @@ class FaissVectorDBStorage(BaseVectorStorage):
                 return fid
         return None
 
-    async def _remove_faiss_ids(self, fid_list):
+    def _upsert_vectors(self, list_data: list[dict[str, Any]]):
+        """
+        Add vectors whose metadata holds the normalized "__vector__",
+        replacing the vectors already stored under the same custom IDs.
+        Must be called while holding the storage lock.
+        """
+        self._delete_custom_ids([meta["__id__"] for meta in list_data])
+        start_idx = self._index.ntotal
+        self._index.add(
+            np.array([meta["__vector__"] for meta in list_data], dtype=np.float32)
+        )
+        for i, meta in enumerate(list_data):
+            self._id_to_meta[start_idx + i] = meta
+
+    def _delete_custom_ids(self, custom_ids: list[str]) -> int:
+        """
+        Remove the vectors of the given custom IDs, return how many were removed.
+        Must be called while holding the storage lock.
+        """
+        custom_ids = set(custom_ids)
+        fid_list = [
+            fid
+            for fid, meta in self._id_to_meta.items()
+            if meta.get("__id__") in custom_ids
+        ]
+        if fid_list:
+            self._remove_faiss_ids(fid_list)
+        return len(fid_list)
+
+    def _remove_faiss_ids(self, fid_list):
         """
         Remove a list of internal Faiss IDs from the index.
         Because IndexFlatIP doesn't support 'removals',
         we rebuild the index excluding those vectors.
+        Must be called while holding the storage lock.
         """
-        keep_fids = [fid for fid in self._id_to_meta if fid not in fid_list]
+        fid_set = set(fid_list)
+        keep_fids = [fid for fid in self._id_to_meta if fid not in fid_set]
 
         # Rebuild the index
         vectors_to_keep = []
@@ -303,14 +389,13 @@ class FaissVectorDBStorage(BaseVectorStorage):
             vectors_to_keep.append(vec_meta["__vector__"])  # stored as list
             new_id_to_meta[new_fid] = vec_meta
 
-        async with self._storage_lock:
-            # Re-init index
-            self._index = faiss.IndexFlatIP(self._dim)
-            if vectors_to_keep:
-                arr = np.array(vectors_to_keep, dtype=np.float32)
-                self._index.add(arr)
+        # Re-init index
+        self._index = faiss.IndexFlatIP(self._dim)
+        if vectors_to_keep:
+            arr = np.array(vectors_to_keep, dtype=np.float32)
+            self._index.add(arr)
 
-            self._id_to_meta = new_id_to_meta
+        self._id_to_meta = new_id_to_meta
 
     def _save_faiss_index(self):
         """
@@ -360,28 +445,20 @@ class FaissVectorDBStorage(BaseVectorStorage):
             self._id_to_meta = {}
 
     async def index_done_callback(self) -> None:
-        async with self._storage_lock:
-            # Check if storage was updated by another process
-            if self.storage_updated.value:
-                # Storage was updated by another process, reload data instead of saving
-                logger.warning(
-                    f"Storage for FAISS {self.namespace} was updated by another process, reloading..."
-                )
-                self._index = faiss.IndexFlatIP(self._dim)
-                self._id_to_meta = {}
-                self._load_faiss_index()
-                self.storage_updated.value = False
-                return False  # Return error
-
         # Acquire lock and perform persistence
         async with self._storage_lock:
             try:
+                # Changes saved by other processes are applied before ours
+                await self._sync_changes()
+                if not self._pending_changes:
+                    return True
                 # Save data to disk
                 self._save_faiss_index()
-                # Notify other processes that data has been updated
-                await set_all_update_flags(self.namespace)
-                # Reset own update flag to avoid self-reloading
-                self.storage_updated.value = False
+                # Publish our changes so that other processes apply them
+                self._generation = await publish_changes(
+                    self.namespace, self._pending_changes
+                )
+                self._pending_changes = []
             except Exception as e:
                 logger.error(f"Error saving FAISS index for {self.namespace}: {e}")
                 return False  # Return error
@@ -472,9 +549,9 @@ class FaissVectorDBStorage(BaseVectorStorage):
                 self._id_to_meta = {}
                 self._load_faiss_index()
 
-                # Notify other processes
-                await set_all_update_flags(self.namespace)
-                self.storage_updated.value = False
+                # Other processes reload the (now empty) storage
+                self._generation = await publish_changes(self.namespace, None)
+                self._pending_changes = []
 
                 logger.info(f"Process {os.getpid()} drop FAISS index {self.namespace}")
             return {"status": "success", "message": "data dropped"}
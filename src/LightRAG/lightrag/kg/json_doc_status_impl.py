@@ -1,12 +1,18 @@
 from dataclasses import dataclass
 import os
-from typing import Any, Union, final
+from typing import Any, Literal, Union, final
 
 from lightrag.base import (
     DocProcessingStatus,
     DocStatus,
+    DocStatusPage,
     DocStatusStorage,
 )
+from ..doc_status_index import (
+    DocStatusIndex,
+    to_doc_processing_status,
+    validate_page_request,
+)
 from lightrag.utils import (
     load_json,
     logger,
@@ -14,6 +20,8 @@ from lightrag.utils import (
 )
 from .shared_storage import (
     get_namespace_data,
+    get_shared_counter,
+    increment_shared_counter,
     get_storage_lock,
     get_data_init_lock,
     get_update_flag,
@@ -45,6 +53,11 @@ class JsonDocStatusStorage(DocStatusStorage):
         self._data = None
         self._storage_lock = None
         self.storage_updated = None
+        # Secondary indexes are process-local; the shared version counter tells a
+        # process that another one changed the records and its index must be rebuilt
+        self._index = DocStatusIndex()
+        self._index_version = None
+        self._version_counter = f"{self.namespace}_index_version"
 
     async def initialize(self):
         """Initialize storage data"""
@@ -73,16 +86,38 @@ class JsonDocStatusStorage(DocStatusStorage):
             for id in ids:
                 data = self._data.get(id, None)
                 if data:
-                    result.append(data)
+                    # Copy, tagged with the ID since missing documents are skipped
+                    result.append({**data, "_id": id})
         return result
 
+    async def _sync_index(self) -> None:
+        """Rebuild the secondary indexes if the records changed elsewhere
+
+        Must be called while holding the storage lock.
+        """
+        version = await get_shared_counter(self._version_counter)
+        if self._index_version != version:
+            self._index.rebuild(self._data.items())
+            self._index_version = version
+
+    async def _bump_index_version(self) -> bool:
+        """Record a change of the records, return whether the local index is current
+
+        Must be called while holding the storage lock, before the change is
+        applied to the local index.
+        """
+        version = await get_shared_counter(self._version_counter)
+        in_sync = self._index_version == version
+        version = await increment_shared_counter(self._version_counter)
+        if in_sync:
+            self._index_version = version
+        return in_sync
+
     async def get_status_counts(self) -> dict[str, int]:
         """Get counts of documents in each status"""
-        counts = {status.value: 0 for status in DocStatus}
         async with self._storage_lock:
-            for doc in self._data.values():
-                counts[doc["status"]] += 1
-        return counts
+            await self._sync_index()
+            return self._index.status_counts()
 
     async def get_docs_by_status(
         self, status: DocStatus
@@ -93,20 +128,43 @@ class JsonDocStatusStorage(DocStatusStorage):
             for k, v in self._data.items():
                 if v["status"] == status.value:
                     try:
-                        # Make a copy of the data to avoid modifying the original
-                        data = v.copy()
-                        # If content is missing, use content_summary as content
-                        if "content" not in data and "content_summary" in data:
-                            data["content"] = data["content_summary"]
-                        # If file_path is not in data, use document id as file path
-                        if "file_path" not in data:
-                            data["file_path"] = "no-file-path"
-                        result[k] = DocProcessingStatus(**data)
-                    except KeyError as e:
+                        result[k] = to_doc_processing_status(v)
+                    except (KeyError, TypeError) as e:
                         logger.error(f"Missing required field for document {k}: {e}")
                         continue
         return result
 
+    async def get_docs_paginated(
+        self,
+        status: DocStatus | None = None,
+        file_path_filter: str | None = None,
+        sort_field: str = "updated_at",
+        sort_direction: Literal["asc", "desc"] = "desc",
+        page_size: int = 50,
+        cursor: str | None = None,
+    ) -> DocStatusPage:
+        """Get one page of documents, served by the in-memory secondary indexes"""
+        validate_page_request(sort_field, sort_direction, page_size)
+        documents = []
+        async with self._storage_lock:
+            await self._sync_index()
+            ids, next_cursor, total = self._index.page(
+                status.value if status is not None else None,
+                file_path_filter,
+                sort_field,
+                sort_direction,
+                page_size,
+                cursor,
+            )
+            for doc_id in ids:
+                try:
+                    documents.append(
+                        (doc_id, to_doc_processing_status(self._data[doc_id]))
+                    )
+                except (KeyError, TypeError) as e:
+                    logger.error(f"Missing required field for document {doc_id}: {e}")
+        return DocStatusPage(documents=documents, next_cursor=next_cursor, total=total)
+
     async def index_done_callback(self) -> None:
         async with self._storage_lock:
             if self.storage_updated.value:
@@ -134,6 +192,9 @@ class JsonDocStatusStorage(DocStatusStorage):
                 if "chunks_list" not in doc_data:
                     doc_data["chunks_list"] = []
             self._data.update(data)
+            if await self._bump_index_version():
+                for doc_id, doc_data in data.items():
+                    self._index.add(doc_id, doc_data)
             await set_all_update_flags(self.namespace)
 
         await self.index_done_callback()
@@ -156,13 +217,14 @@ class JsonDocStatusStorage(DocStatusStorage):
             None
         """
         async with self._storage_lock:
-            any_deleted = False
-            for doc_id in doc_ids:
-                result = self._data.pop(doc_id, None)
-                if result is not None:
-                    any_deleted = True
-
-            if any_deleted:
+            deleted = [
+                doc_id for doc_id in doc_ids if self._data.pop(doc_id, None) is not None
+            ]
+
+            if deleted:
+                if await self._bump_index_version():
+                    for doc_id in deleted:
+                        self._index.remove(doc_id)
                 await set_all_update_flags(self.namespace)
 
     async def drop(self) -> dict[str, str]:
@@ -181,6 +243,8 @@ class JsonDocStatusStorage(DocStatusStorage):
         try:
             async with self._storage_lock:
                 self._data.clear()
+                if await self._bump_index_version():
+                    self._index.clear()
                 await set_all_update_flags(self.namespace)
 
             await self.index_done_callback()
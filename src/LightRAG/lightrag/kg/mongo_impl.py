@@ -4,8 +4,9 @@ from dataclasses import dataclass, field
 import numpy as np
 import configparser
 import asyncio
+import re
 
-from typing import Any, Union, final
+from typing import Any, Literal, Union, final
 
 from ..base import (
     BaseGraphStorage,
@@ -13,8 +14,10 @@ from ..base import (
     BaseVectorStorage,
     DocProcessingStatus,
     DocStatus,
+    DocStatusPage,
     DocStatusStorage,
 )
+from ..doc_status_index import decode_cursor, encode_cursor, validate_page_request
 from ..utils import logger, compute_mdhash_id
 from ..types import KnowledgeGraph, KnowledgeGraphNode, KnowledgeGraphEdge
 from ..constants import GRAPH_FIELD_SEP
@@ -321,8 +324,25 @@ class MongoDocStatusStorage(DocStatusStorage):
         if self.db is None:
             self.db = await ClientManager.get_client()
             self._data = await get_or_create_collection(self.db, self._collection_name)
+            await self.create_secondary_indexes_if_not_exists()
             logger.debug(f"Use MongoDB as DocStatus {self._collection_name}")
 
+    async def create_secondary_indexes_if_not_exists(self):
+        """Create the indexes serving status counts and paginated listings"""
+        try:
+            await self._data.create_index(
+                [("status", 1), ("updated_at", -1), ("_id", -1)],
+                name="status_updated_at",
+            )
+            for sort_field in ("updated_at", "created_at", "file_path"):
+                await self._data.create_index(
+                    [(sort_field, -1), ("_id", -1)], name=sort_field
+                )
+        except PyMongoError as e:
+            logger.warning(
+                f"Failed to create doc status indexes for {self._collection_name}: {e}"
+            )
+
     async def finalize(self):
         if self.db is not None:
             await ClientManager.release_client(self.db)
@@ -372,20 +392,71 @@ class MongoDocStatusStorage(DocStatusStorage):
         """Get all documents with a specific status"""
         cursor = self._data.find({"status": status.value})
         result = await cursor.to_list()
-        return {
-            doc["_id"]: DocProcessingStatus(
-                content=doc["content"],
-                content_summary=doc.get("content_summary"),
-                content_length=doc["content_length"],
-                status=doc["status"],
-                created_at=doc.get("created_at"),
-                updated_at=doc.get("updated_at"),
-                chunks_count=doc.get("chunks_count", -1),
-                file_path=doc.get("file_path", doc["_id"]),
-                chunks_list=doc.get("chunks_list", []),
-            )
-            for doc in result
-        }
+        return {doc["_id"]: self._to_doc_status(doc) for doc in result}
+
+    async def get_docs_paginated(
+        self,
+        status: DocStatus | None = None,
+        file_path_filter: str | None = None,
+        sort_field: str = "updated_at",
+        sort_direction: Literal["asc", "desc"] = "desc",
+        page_size: int = 50,
+        cursor: str | None = None,
+    ) -> DocStatusPage:
+        """Get one page of documents with a keyset query on the sort index"""
+        validate_page_request(sort_field, sort_direction, page_size)
+        query: dict[str, Any] = {}
+        if status is not None:
+            query["status"] = status.value
+        if file_path_filter:
+            query["file_path"] = {
+                "$regex": re.escape(file_path_filter),
+                "$options": "i",
+            }
+        total = await self._data.count_documents(query)
+
+        sort_key = "_id" if sort_field == "id" else sort_field
+        order = -1 if sort_direction == "desc" else 1
+        if cursor:
+            sort_value, doc_id = decode_cursor(cursor)
+            op = "$lt" if order == -1 else "$gt"
+            if sort_key == "_id":
+                query["_id"] = {op: doc_id}
+            else:
+                query["$or"] = [
+                    {sort_key: {op: sort_value}},
+                    {sort_key: sort_value, "_id": {op: doc_id}},
+                ]
+
+        docs = (
+            await self._data.find(query)
+            .sort([(sort_key, order), ("_id", order)])
+            .limit(page_size + 1)
+            .to_list()
+        )
+        next_cursor = None
+        if len(docs) > page_size:
+            last = docs[page_size - 1]
+            next_cursor = encode_cursor(last.get(sort_key), last["_id"])
+        return DocStatusPage(
+            documents=[(doc["_id"], self._to_doc_status(doc)) for doc in docs[:page_size]],
+            next_cursor=next_cursor,
+            total=total,
+        )
+
+    @staticmethod
+    def _to_doc_status(doc: dict[str, Any]) -> DocProcessingStatus:
+        return DocProcessingStatus(
+            content=doc["content"],
+            content_summary=doc.get("content_summary"),
+            content_length=doc["content_length"],
+            status=doc["status"],
+            created_at=doc.get("created_at"),
+            updated_at=doc.get("updated_at"),
+            chunks_count=doc.get("chunks_count", -1),
+            file_path=doc.get("file_path", doc["_id"]),
+            chunks_list=doc.get("chunks_list", []),
+        )
 
     async def index_done_callback(self) -> None:
         # Mongo handles persistence automatically
@@ -17,9 +17,11 @@ if not pm.is_installed("nano-vectordb"):
 
 from nano_vectordb import NanoVectorDB
 from .shared_storage import (
+    get_changes_since,
     get_storage_lock,
-    get_update_flag,
-    set_all_update_flags,
+    publish_changes,
+    register_change_reader,
+    unregister_change_reader,
 )
 
 
@@ -30,7 +32,10 @@ class NanoVectorDBStorage(BaseVectorStorage):
         # Initialize basic attributes
         self._client = None
         self._storage_lock = None
-        self.storage_updated = None
+        # Generation of the namespace this copy is at, and the changes made here
+        # since the last save, published to the other workers on save
+        self._generation = 0
+        self._pending_changes = []
 
         # Use global config value if specified, otherwise use default
         kwargs = self.global_config.get("vector_db_storage_cls_kwargs", {})
@@ -63,28 +68,56 @@ class NanoVectorDBStorage(BaseVectorStorage):
 
     async def initialize(self):
         """Initialize storage data"""
-        # Get the update flag for cross-process update notification
-        self.storage_updated = await get_update_flag(self.namespace)
+        # Follow the changes saved by other processes
+        self._generation = await register_change_reader(self.namespace)
         # Get the storage lock for use in other methods
         self._storage_lock = get_storage_lock(enable_logging=False)
 
+    async def finalize(self):
+        """Stop following the changes saved by other processes"""
+        if self._storage_lock is not None:
+            await unregister_change_reader(self.namespace)
+            self._storage_lock = None
+
+    async def _sync_changes(self):
+        """Apply the changes saved by other processes since our generation
+
+        Must be called while holding the storage lock.
+        """
+        generation, changes = await get_changes_since(self.namespace, self._generation)
+        if generation == self._generation:
+            return
+        if changes is None:
+            logger.info(
+                f"Process {os.getpid()} reloading {self.namespace} due to update by another process"
+            )
+            self._client = NanoVectorDB(
+                self.embedding_func.embedding_dim,
+                storage_file=self._client_file_name,
+            )
+            # The file does not hold our unsaved changes, which are still published
+            self._apply_changes(self._pending_changes)
+        else:
+            logger.debug(
+                f"Process {os.getpid()} applying {len(changes)} changes to {self.namespace}"
+            )
+            self._apply_changes(changes)
+        self._generation = generation
+
+    def _apply_changes(self, changes: list) -> None:
+        """Replay journaled operations on the client"""
+        for op, payload in changes:
+            if op == "upsert":
+                # NanoVectorDB.upsert consumes the dicts it is given
+                self._client.upsert(datas=[dict(d) for d in payload])
+            elif op == "delete":
+                self._client.delete(payload)
+
     async def _get_client(self):
-        """Check if the storage should be reloaded"""
+        """Bring the storage up to date with other processes"""
         # Acquire lock to prevent concurrent read and write
         async with self._storage_lock:
-            # Check if data needs to be reloaded
-            if self.storage_updated.value:
-                logger.info(
-                    f"Process {os.getpid()} reloading {self.namespace} due to update by another process"
-                )
-                # Reload data
-                self._client = NanoVectorDB(
-                    self.embedding_func.embedding_dim,
-                    storage_file=self._client_file_name,
-                )
-                # Reset update flag
-                self.storage_updated.value = False
-
+            await self._sync_changes()
             return self._client
 
     async def upsert(self, data: dict[str, dict[str, Any]]) -> None:
@@ -123,6 +156,7 @@ class NanoVectorDBStorage(BaseVectorStorage):
             for i, d in enumerate(list_data):
                 d["__vector__"] = embeddings[i]
             client = await self._get_client()
+            self._pending_changes.append(("upsert", [dict(d) for d in list_data]))
             results = client.upsert(datas=list_data)
             return results
         else:
@@ -141,12 +175,93 @@ class NanoVectorDBStorage(BaseVectorStorage):
         embedding = embedding[0]
 
         client = await self._get_client()
+        if ids and not client.get(list(ids)):
+            return []
         results = client.query(
             query=embedding,
             top_k=top_k,
             better_than_threshold=self.cosine_better_than_threshold,
+            filter_lambda=self._ids_filter(ids),
         )
-        results = [
+        return self._format_results(results)
+
+    async def query_batch(
+        self,
+        queries: list[str],
+        top_k: int,
+        ids: list[str] | None = None,
+        embeddings: np.ndarray | None = None,
+    ) -> list[list[dict[str, Any]]]:
+        if not queries:
+            return []
+        if embeddings is None:
+            # One embedding call for the whole batch
+            embeddings = await self.embedding_func(queries, _priority=5)
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+
+        client = await self._get_client()
+        if ids and not client.get(list(ids)):
+            return [[] for _ in queries]
+        storage = getattr(client, "_NanoVectorDB__storage", None) or {}
+        matrix = storage.get("matrix")
+        storage_data = storage.get("data", [])
+
+        if (
+            client.metric != "cosine"
+            or matrix is None
+            or not len(storage_data)
+            or len(matrix) != len(storage_data)
+        ):
+            # Same per-query path as query()
+            return [
+                self._format_results(
+                    client.query(
+                        query=embedding,
+                        top_k=top_k,
+                        better_than_threshold=self.cosine_better_than_threshold,
+                        filter_lambda=self._ids_filter(ids),
+                    )
+                )
+                for embedding in embeddings
+            ]
+
+        if ids:
+            id_set = set(ids)
+            candidates = np.array(
+                [i for i, dp in enumerate(storage_data) if dp["__id__"] in id_set],
+                dtype=np.int64,
+            )
+            matrix = matrix[candidates]
+        else:
+            candidates = np.arange(len(storage_data))
+
+        # Score every query against every vector with a single matrix product
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        norms[norms == 0] = 1
+        scores = (embeddings / norms) @ matrix.T
+        batch_results = []
+        for row in scores:
+            top_indices = np.argsort(row)[-top_k:][::-1]
+            results = []
+            for i in top_indices:
+                if row[i] < self.cosine_better_than_threshold:
+                    break
+                results.append(
+                    {**storage_data[candidates[i]], "__metrics__": float(row[i])}
+                )
+            batch_results.append(self._format_results(results))
+        return batch_results
+
+    @staticmethod
+    def _ids_filter(ids: list[str] | None):
+        if not ids:
+            return None
+        id_set = set(ids)
+        return lambda dp: dp["__id__"] in id_set
+
+    @staticmethod
+    def _format_results(results: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        return [
             {
                 **dp,
                 "id": dp["__id__"],
@@ -155,7 +270,6 @@ class NanoVectorDBStorage(BaseVectorStorage):
             }
             for dp in results
         ]
-        return results
 
     @property
     async def client_storage(self):
@@ -176,6 +290,7 @@ class NanoVectorDBStorage(BaseVectorStorage):
         try:
             client = await self._get_client()
             client.delete(ids)
+            self._pending_changes.append(("delete", list(ids)))
             logger.debug(
                 f"Successfully deleted {len(ids)} vectors from {self.namespace}"
             )
@@ -200,6 +315,7 @@ class NanoVectorDBStorage(BaseVectorStorage):
             client = await self._get_client()
             if client.get([entity_id]):
                 client.delete([entity_id])
+                self._pending_changes.append(("delete", [entity_id]))
                 logger.debug(f"Successfully deleted entity {entity_name}")
             else:
                 logger.debug(f"Entity {entity_name} not found in storage")
@@ -228,6 +344,7 @@ class NanoVectorDBStorage(BaseVectorStorage):
             if ids_to_delete:
                 client = await self._get_client()
                 client.delete(ids_to_delete)
+                self._pending_changes.append(("delete", ids_to_delete))
                 logger.debug(
                     f"Deleted {len(ids_to_delete)} relations for {entity_name}"
                 )
@@ -238,37 +355,25 @@ class NanoVectorDBStorage(BaseVectorStorage):
 
     async def index_done_callback(self) -> bool:
         """Save data to disk"""
-        async with self._storage_lock:
-            # Check if storage was updated by another process
-            if self.storage_updated.value:
-                # Storage was updated by another process, reload data instead of saving
-                logger.warning(
-                    f"Storage for {self.namespace} was updated by another process, reloading..."
-                )
-                self._client = NanoVectorDB(
-                    self.embedding_func.embedding_dim,
-                    storage_file=self._client_file_name,
-                )
-                # Reset update flag
-                self.storage_updated.value = False
-                return False  # Return error
-
         # Acquire lock and perform persistence
         async with self._storage_lock:
             try:
+                # Changes saved by other processes are applied before ours
+                await self._sync_changes()
+                if not self._pending_changes:
+                    return True
                 # Save data to disk
                 self._client.save()
-                # Notify other processes that data has been updated
-                await set_all_update_flags(self.namespace)
-                # Reset own update flag to avoid self-reloading
-                self.storage_updated.value = False
+                # Publish our changes so that other processes apply them
+                self._generation = await publish_changes(
+                    self.namespace, self._pending_changes
+                )
+                self._pending_changes = []
                 return True  # Return success
             except Exception as e:
                 logger.error(f"Error saving data for {self.namespace}: {e}")
                 return False  # Return error
 
-        return True  # Return success
-
     async def get_by_id(self, id: str) -> dict[str, Any] | None:
         """Get vector data by its ID
 
@@ -339,10 +444,9 @@ class NanoVectorDBStorage(BaseVectorStorage):
                     storage_file=self._client_file_name,
                 )
 
-                # Notify other processes that data has been updated
-                await set_all_update_flags(self.namespace)
-                # Reset own update flag to avoid self-reloading
-                self.storage_updated.value = False
+                # Other processes reload the (now empty) storage
+                self._generation = await publish_changes(self.namespace, None)
+                self._pending_changes = []
 
                 logger.info(
                     f"Process {os.getpid()} drop {self.namespace}(file:{self._client_file_name})"
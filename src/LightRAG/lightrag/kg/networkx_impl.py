@@ -14,9 +14,11 @@ if not pm.is_installed("networkx"):
 
 import networkx as nx
 from .shared_storage import (
+    get_changes_since,
     get_storage_lock,
-    get_update_flag,
-    set_all_update_flags,
+    publish_changes,
+    register_change_reader,
+    unregister_change_reader,
 )
 
 from dotenv import load_dotenv
@@ -58,8 +60,11 @@ class NetworkXStorage(BaseGraphStorage):
                 working_dir, f"graph_{self.namespace}.graphml"
             )
         self._storage_lock = None
-        self.storage_updated = None
         self._graph = None
+        # Generation of the namespace this copy is at, and the changes made here
+        # since the last save, published to the other workers on save
+        self._generation = 0
+        self._pending_changes = []
 
         # Load initial graph
         preloaded_graph = NetworkXStorage.load_nx_graph(self._graphml_xml_file)
@@ -73,27 +78,61 @@ class NetworkXStorage(BaseGraphStorage):
 
     async def initialize(self):
         """Initialize storage data"""
-        # Get the update flag for cross-process update notification
-        self.storage_updated = await get_update_flag(self.namespace)
+        # Follow the changes saved by other processes
+        self._generation = await register_change_reader(self.namespace)
         # Get the storage lock for use in other methods
         self._storage_lock = get_storage_lock()
 
+    async def finalize(self):
+        """Stop following the changes saved by other processes"""
+        if self._storage_lock is not None:
+            await unregister_change_reader(self.namespace)
+            self._storage_lock = None
+
+    @staticmethod
+    def apply_changes(graph: nx.Graph, changes: list) -> None:
+        """Replay journaled graph operations"""
+        for op, payload in changes:
+            if op == "upsert_node":
+                node_id, node_data = payload
+                graph.add_node(node_id, **node_data)
+            elif op == "upsert_edge":
+                source, target, edge_data = payload
+                graph.add_edge(source, target, **edge_data)
+            elif op == "remove_nodes":
+                graph.remove_nodes_from(payload)
+            elif op == "remove_edges":
+                graph.remove_edges_from(payload)
+
+    async def _sync_changes(self):
+        """Apply the changes saved by other processes since our generation
+
+        Must be called while holding the storage lock.
+        """
+        generation, changes = await get_changes_since(self.namespace, self._generation)
+        if generation == self._generation:
+            return
+        if changes is None:
+            logger.info(
+                f"Process {os.getpid()} reloading graph {self.namespace} due to update by another process"
+            )
+            self._graph = (
+                NetworkXStorage.load_nx_graph(self._graphml_xml_file) or nx.Graph()
+            )
+            # The file does not hold our unsaved changes, which are still published
+            NetworkXStorage.apply_changes(self._graph, self._pending_changes)
+        else:
+            logger.debug(
+                f"Process {os.getpid()} applying {len(changes)} changes to graph {self.namespace}"
+            )
+            NetworkXStorage.apply_changes(self._graph, changes)
+        self._generation = generation
+
     async def _get_graph(self):
-        """Check if the storage should be reloaded"""
+        """Bring the storage up to date with other processes"""
         # Acquire lock to prevent concurrent read and write
         async with self._storage_lock:
-            # Check if data needs to be reloaded
-            if self.storage_updated.value:
-                logger.info(
-                    f"Process {os.getpid()} reloading graph {self.namespace} due to update by another process"
-                )
-                # Reload data
-                self._graph = (
-                    NetworkXStorage.load_nx_graph(self._graphml_xml_file) or nx.Graph()
-                )
-                # Reset update flag
-                self.storage_updated.value = False
-
+            await self._sync_changes()
             return self._graph
 
     async def has_node(self, node_id: str) -> bool:
@@ -139,6 +178,7 @@ class NetworkXStorage(BaseGraphStorage):
         """
         graph = await self._get_graph()
         graph.add_node(node_id, **node_data)
+        self._pending_changes.append(("upsert_node", (node_id, dict(node_data))))
 
     async def upsert_edge(
         self, source_node_id: str, target_node_id: str, edge_data: dict[str, str]
@@ -151,6 +191,9 @@ class NetworkXStorage(BaseGraphStorage):
         """
         graph = await self._get_graph()
         graph.add_edge(source_node_id, target_node_id, **edge_data)
+        self._pending_changes.append(
+            ("upsert_edge", (source_node_id, target_node_id, dict(edge_data)))
+        )
 
     async def delete_node(self, node_id: str) -> None:
         """
@@ -162,6 +205,7 @@ class NetworkXStorage(BaseGraphStorage):
         graph = await self._get_graph()
         if graph.has_node(node_id):
             graph.remove_node(node_id)
+            self._pending_changes.append(("remove_nodes", [node_id]))
             logger.debug(f"Node {node_id} deleted from the graph.")
         else:
             logger.warning(f"Node {node_id} not found in the graph for deletion.")
@@ -181,6 +225,7 @@ class NetworkXStorage(BaseGraphStorage):
         for node in nodes:
             if graph.has_node(node):
                 graph.remove_node(node)
+        self._pending_changes.append(("remove_nodes", list(nodes)))
 
     async def remove_edges(self, edges: list[tuple[str, str]]):
         """Delete multiple edges
@@ -197,6 +242,7 @@ class NetworkXStorage(BaseGraphStorage):
         for source, target in edges:
             if graph.has_edge(source, target):
                 graph.remove_edge(source, target)
+        self._pending_changes.append(("remove_edges", list(edges)))
 
     async def get_all_labels(self) -> list[str]:
         """
@@ -401,29 +447,20 @@ class NetworkXStorage(BaseGraphStorage):
 
     async def index_done_callback(self) -> bool:
         """Save data to disk"""
-        async with self._storage_lock:
-            # Check if storage was updated by another process
-            if self.storage_updated.value:
-                # Storage was updated by another process, reload data instead of saving
-                logger.info(
-                    f"Graph for {self.namespace} was updated by another process, reloading..."
-                )
-                self._graph = (
-                    NetworkXStorage.load_nx_graph(self._graphml_xml_file) or nx.Graph()
-                )
-                # Reset update flag
-                self.storage_updated.value = False
-                return False  # Return error
-
         # Acquire lock and perform persistence
         async with self._storage_lock:
             try:
+                # Changes saved by other processes are applied before ours
+                await self._sync_changes()
+                if not self._pending_changes:
+                    return True
                 # Save data to disk
                 NetworkXStorage.write_nx_graph(self._graph, self._graphml_xml_file)
-                # Notify other processes that data has been updated
-                await set_all_update_flags(self.namespace)
-                # Reset own update flag to avoid self-reloading
-                self.storage_updated.value = False
+                # Publish our changes so that other processes apply them
+                self._generation = await publish_changes(
+                    self.namespace, self._pending_changes
+                )
+                self._pending_changes = []
                 return True  # Return success
             except Exception as e:
                 logger.error(f"Error saving graph for {self.namespace}: {e}")
@@ -451,10 +488,9 @@ class NetworkXStorage(BaseGraphStorage):
                 if os.path.exists(self._graphml_xml_file):
                     os.remove(self._graphml_xml_file)
                 self._graph = nx.Graph()
-                # Notify other processes that data has been updated
-                await set_all_update_flags(self.namespace)
-                # Reset own update flag to avoid self-reloading
-                self.storage_updated.value = False
+                # Other processes reload the (now empty) storage
+                self._generation = await publish_changes(self.namespace, None)
+                self._pending_changes = []
                 logger.info(
                     f"Process {os.getpid()} drop graph {self.namespace} (file:{self._graphml_xml_file})"
                 )
@@ -5,7 +5,7 @@ import re
 import datetime
 from datetime import timezone
 from dataclasses import dataclass, field
-from typing import Any, Union, final
+from typing import Any, Literal, Union, final
 import numpy as np
 import configparser
 
@@ -24,8 +24,10 @@ from ..base import (
     BaseVectorStorage,
     DocProcessingStatus,
     DocStatus,
+    DocStatusPage,
     DocStatusStorage,
 )
+from ..doc_status_index import decode_cursor, encode_cursor, validate_page_request
 from ..namespace import NameSpace, is_namespace
 from ..utils import logger
 from ..constants import GRAPH_FIELD_SEP
@@ -697,6 +699,34 @@ class PostgreSQLDB:
         except Exception as e:
             logger.error(f"PostgreSQL, Failed to migrate field lengths: {e}")
 
+        # Create the indexes serving paginated document status listings
+        try:
+            await self._create_doc_status_indexes()
+        except Exception as e:
+            logger.error(f"PostgreSQL, Failed to create doc status indexes: {e}")
+
+    async def _create_doc_status_indexes(self):
+        """Index doc status by status, timestamps and file path for listings"""
+        indexes = {
+            "idx_lightrag_doc_status_workspace_status_updated_at": "(workspace, status, updated_at, id)",
+            "idx_lightrag_doc_status_workspace_updated_at": "(workspace, updated_at, id)",
+            "idx_lightrag_doc_status_workspace_created_at": "(workspace, created_at, id)",
+            "idx_lightrag_doc_status_workspace_file_path": "(workspace, file_path, id)",
+        }
+        for index_name, columns in indexes.items():
+            check_index_sql = f"""
+            SELECT 1 FROM pg_indexes
+            WHERE indexname = '{index_name}'
+            AND tablename = 'lightrag_doc_status'
+            """
+            if not await self.query(check_index_sql):
+                logger.info(
+                    f"PostgreSQL, Creating index {index_name} on table LIGHTRAG_DOC_STATUS"
+                )
+                await self.execute(
+                    f"CREATE INDEX {index_name} ON LIGHTRAG_DOC_STATUS{columns}"
+                )
+
     async def query(
         self,
         sql: str,
@@ -1603,6 +1633,7 @@ class PGDocStatusStorage(DocStatusStorage):
 
             processed_results.append(
                 {
+                    "_id": row["id"],
                     "content": row["content"],
                     "content_length": row["content_length"],
                     "content_summary": row["content_summary"],
@@ -1639,31 +1670,90 @@ class PGDocStatusStorage(DocStatusStorage):
 
         docs_by_status = {}
         for element in result:
-            # Parse chunks_list JSON string back to list
-            chunks_list = element.get("chunks_list", [])
-            if isinstance(chunks_list, str):
-                try:
-                    chunks_list = json.loads(chunks_list)
-                except json.JSONDecodeError:
-                    chunks_list = []
+            docs_by_status[element["id"]] = self._row_to_doc_status(element)
 
-            # Convert datetime objects to ISO format strings with timezone info
-            created_at = self._format_datetime_with_timezone(element["created_at"])
-            updated_at = self._format_datetime_with_timezone(element["updated_at"])
-
-            docs_by_status[element["id"]] = DocProcessingStatus(
-                content=element["content"],
-                content_summary=element["content_summary"],
-                content_length=element["content_length"],
-                status=element["status"],
-                created_at=created_at,
-                updated_at=updated_at,
-                chunks_count=element["chunks_count"],
-                file_path=element["file_path"],
-                chunks_list=chunks_list,
+        return docs_by_status
+
+    async def get_docs_paginated(
+        self,
+        status: DocStatus | None = None,
+        file_path_filter: str | None = None,
+        sort_field: str = "updated_at",
+        sort_direction: Literal["asc", "desc"] = "desc",
+        page_size: int = 50,
+        cursor: str | None = None,
+    ) -> DocStatusPage:
+        """Get one page of documents with a keyset query on the sort index"""
+        validate_page_request(sort_field, sort_direction, page_size)
+        params: dict[str, Any] = {"workspace": self.db.workspace}
+        conditions = ["workspace=$1"]
+        if status is not None:
+            params["status"] = status.value
+            conditions.append(f"status=${len(params)}")
+        if file_path_filter:
+            escaped = re.sub(r"([\\%_])", r"\\\1", file_path_filter)
+            params["file_path"] = f"%{escaped}%"
+            conditions.append(f"file_path ILIKE ${len(params)}")
+
+        count_sql = f"SELECT COUNT(1) AS count FROM LIGHTRAG_DOC_STATUS WHERE {' AND '.join(conditions)}"
+        count_result = await self.db.query(count_sql, dict(params))
+        total = count_result["count"] if count_result else 0
+
+        # sort_field is validated, so it is safe to use as a column name
+        if cursor:
+            sort_value, doc_id = decode_cursor(cursor)
+            if sort_field in ("updated_at", "created_at") and sort_value is not None:
+                sort_value = datetime.datetime.fromisoformat(sort_value)
+            params["cursor_value"] = sort_value
+            params["cursor_id"] = doc_id
+            op = "<" if sort_direction == "desc" else ">"
+            conditions.append(
+                f"({sort_field}, id) {op} (${len(params) - 1}, ${len(params)})"
             )
+        direction = sort_direction.upper()
+        params["limit"] = page_size + 1
+        sql = f"""SELECT * FROM LIGHTRAG_DOC_STATUS
+                  WHERE {' AND '.join(conditions)}
+                  ORDER BY {sort_field} {direction}, id {direction}
+                  LIMIT ${len(params)}"""
+        rows = await self.db.query(sql, params, True) or []
+
+        next_cursor = None
+        if len(rows) > page_size:
+            last = rows[page_size - 1][sort_field]
+            if isinstance(last, datetime.datetime):
+                last = last.isoformat()
+            next_cursor = encode_cursor(last, rows[page_size - 1]["id"])
+        return DocStatusPage(
+            documents=[(row["id"], self._row_to_doc_status(row)) for row in rows[:page_size]],
+            next_cursor=next_cursor,
+            total=total,
+        )
 
-        return docs_by_status
+    def _row_to_doc_status(self, element: dict[str, Any]) -> DocProcessingStatus:
+        # Parse chunks_list JSON string back to list
+        chunks_list = element.get("chunks_list", [])
+        if isinstance(chunks_list, str):
+            try:
+                chunks_list = json.loads(chunks_list)
+            except json.JSONDecodeError:
+                chunks_list = []
+
+        # Convert datetime objects to ISO format strings with timezone info
+        created_at = self._format_datetime_with_timezone(element["created_at"])
+        updated_at = self._format_datetime_with_timezone(element["updated_at"])
+
+        return DocProcessingStatus(
+            content=element["content"],
+            content_summary=element["content_summary"],
+            content_length=element["content_length"],
+            status=element["status"],
+            created_at=created_at,
+            updated_at=updated_at,
+            chunks_count=element["chunks_count"],
+            file_path=element["file_path"],
+            chunks_list=chunks_list,
+        )
 
     async def index_done_callback(self) -> None:
         # PG handles persistence automatically
@@ -1,5 +1,5 @@
 import os
-from typing import Any, final, Union
+from typing import Any, Literal, final, Union
 from dataclasses import dataclass
 import pipmaster as pm
 import configparser
@@ -18,8 +18,18 @@ from lightrag.base import (
     BaseKVStorage,
     DocStatusStorage,
     DocStatus,
+    DocStatusPage,
     DocProcessingStatus,
 )
+from ..doc_status_index import (
+    DOC_STATUS_SORT_FIELDS,
+    decode_cursor,
+    encode_cursor,
+    sort_value,
+    status_value,
+    to_doc_processing_status,
+    validate_page_request,
+)
 import json
 
 
@@ -608,6 +618,8 @@ class RedisDocStatusStorage(DocStatusStorage):
                 logger.info(
                     f"Connected to Redis for doc status namespace {self.namespace}"
                 )
+                if not await redis.exists(self._index_ready_key):
+                    await self._build_secondary_indexes(redis)
                 self._initialized = True
         except Exception as e:
             logger.error(f"Failed to connect to Redis for doc status: {e}")
@@ -615,6 +627,57 @@ class RedisDocStatusStorage(DocStatusStorage):
             await self.close()
             raise
 
+    # Secondary indexes: one sorted set per status and sort field, all scores 0,
+    # members "<sort value>\x00<doc id>" so lexicographic ranges follow the sort.
+    # Index keys are outside the "{namespace}:*" pattern of the document keys.
+
+    @property
+    def _index_prefix(self) -> str:
+        return f"{self.namespace}_idx"
+
+    @property
+    def _index_ready_key(self) -> str:
+        return f"{self._index_prefix}:ready"
+
+    def _index_key(self, status: str, sort_field: str) -> str:
+        return f"{self._index_prefix}:{status}:{sort_field}"
+
+    def _index_entries(self, doc_id: str, data: dict[str, Any]):
+        """(index key, member) pairs of a document"""
+        status = status_value(data.get("status"))
+        for sort_field in DOC_STATUS_SORT_FIELDS:
+            member = f"{sort_value(doc_id, data, sort_field)}\x00{doc_id}"
+            yield self._index_key(status, sort_field), member
+
+    async def _build_secondary_indexes(self, redis) -> None:
+        """Index the documents stored before the indexes existed"""
+        indexed = 0
+        cursor = 0
+        while True:
+            cursor, keys = await redis.scan(
+                cursor, match=f"{self.namespace}:*", count=1000
+            )
+            if keys:
+                values = await redis.mget(keys)
+                pipe = redis.pipeline()
+                for key, value in zip(keys, values):
+                    if not value:
+                        continue
+                    try:
+                        doc_data = json.loads(value)
+                    except json.JSONDecodeError:
+                        continue
+                    for index_key, member in self._index_entries(
+                        key.split(":", 1)[1], doc_data
+                    ):
+                        pipe.zadd(index_key, {member: 0})
+                    indexed += 1
+                await pipe.execute()
+            if cursor == 0:
+                break
+        await redis.set(self._index_ready_key, 1)
+        logger.info(f"Built doc status indexes for {indexed} documents in {self.namespace}")
+
     @asynccontextmanager
     async def _get_redis_connection(self):
         """Safe context manager for Redis operations."""
@@ -684,13 +747,16 @@ class RedisDocStatusStorage(DocStatusStorage):
                     pipe.get(f"{self.namespace}:{id}")
                 results = await pipe.execute()
 
-                for result_data in results:
+                for id, result_data in zip(ids, results):
                     if result_data:
                         try:
-                            result.append(json.loads(result_data))
+                            data = json.loads(result_data)
                         except json.JSONDecodeError as e:
                             logger.error(f"JSON decode error in get_by_ids: {e}")
                             continue
+                        # Tagged with the ID since missing documents are skipped
+                        data["_id"] = id
+                        result.append(data)
             except Exception as e:
                 logger.error(f"Error in get_by_ids: {e}")
         return result
@@ -700,32 +766,11 @@ class RedisDocStatusStorage(DocStatusStorage):
         counts = {status.value: 0 for status in DocStatus}
         async with self._get_redis_connection() as redis:
             try:
-                # Use SCAN to iterate through all keys in the namespace
-                cursor = 0
-                while True:
-                    cursor, keys = await redis.scan(
-                        cursor, match=f"{self.namespace}:*", count=1000
-                    )
-                    if keys:
-                        # Get all values in batch
-                        pipe = redis.pipeline()
-                        for key in keys:
-                            pipe.get(key)
-                        values = await pipe.execute()
-
-                        # Count statuses
-                        for value in values:
-                            if value:
-                                try:
-                                    doc_data = json.loads(value)
-                                    status = doc_data.get("status")
-                                    if status in counts:
-                                        counts[status] += 1
-                                except json.JSONDecodeError:
-                                    continue
-
-                    if cursor == 0:
-                        break
+                pipe = redis.pipeline()
+                for status in counts:
+                    pipe.zcard(self._index_key(status, "id"))
+                for status, count in zip(list(counts), await pipe.execute()):
+                    counts[status] = count
             except Exception as e:
                 logger.error(f"Error getting status counts: {e}")
 
@@ -786,6 +831,68 @@ class RedisDocStatusStorage(DocStatusStorage):
 
         return result
 
+    async def get_docs_paginated(
+        self,
+        status: DocStatus | None = None,
+        file_path_filter: str | None = None,
+        sort_field: str = "updated_at",
+        sort_direction: Literal["asc", "desc"] = "desc",
+        page_size: int = 50,
+        cursor: str | None = None,
+    ) -> DocStatusPage:
+        """Get one page of documents with lexicographic ranges on the indexes
+
+        Substring filters on the file path cannot use a sorted set and fall back
+        to loading the matching documents.
+        """
+        validate_page_request(sort_field, sort_direction, page_size)
+        if file_path_filter:
+            return await super().get_docs_paginated(
+                status, file_path_filter, sort_field, sort_direction, page_size, cursor
+            )
+
+        descending = sort_direction == "desc"
+        statuses = [status.value] if status is not None else [s.value for s in DocStatus]
+        if cursor:
+            value, doc_id = decode_cursor(cursor)
+            bound = f"({value}\x00{doc_id}"
+        else:
+            bound = "+" if descending else "-"
+
+        async with self._get_redis_connection() as redis:
+            pipe = redis.pipeline()
+            for s in statuses:
+                key = self._index_key(s, sort_field)
+                if descending:
+                    pipe.zrevrangebylex(key, bound, "-", start=0, num=page_size + 1)
+                else:
+                    pipe.zrangebylex(key, bound, "+", start=0, num=page_size + 1)
+                pipe.zcard(self._index_key(s, "id"))
+            results = await pipe.execute()
+
+            # Each status range is sorted, so the page is the head of their union
+            members = sorted(
+                (m for ranged in results[0::2] for m in ranged), reverse=descending
+            )[: page_size + 1]
+            total = sum(results[1::2])
+
+            page = [m.split("\x00", 1) for m in members[:page_size]]
+            values = await redis.mget([f"{self.namespace}:{i}" for _, i in page])
+
+        documents = []
+        for (_, doc_id), value in zip(page, values):
+            if not value:
+                continue
+            try:
+                documents.append((doc_id, to_doc_processing_status(json.loads(value))))
+            except (json.JSONDecodeError, KeyError, TypeError) as e:
+                logger.error(f"Error processing document {doc_id}: {e}")
+
+        next_cursor = None
+        if len(members) > page_size:
+            next_cursor = encode_cursor(*page[-1])
+        return DocStatusPage(documents=documents, next_cursor=next_cursor, total=total)
+
     async def index_done_callback(self) -> None:
         """Redis handles persistence automatically"""
         pass
@@ -803,9 +910,17 @@ class RedisDocStatusStorage(DocStatusStorage):
                     if "chunks_list" not in doc_data:
                         doc_data["chunks_list"] = []
 
+                # Previous versions give the index members to replace
+                previous = await redis.mget([f"{self.namespace}:{k}" for k in data])
+
                 pipe = redis.pipeline()
-                for k, v in data.items():
+                for (k, v), old in zip(data.items(), previous):
                     pipe.set(f"{self.namespace}:{k}", json.dumps(v))
+                    if old:
+                        for index_key, member in self._index_entries(k, json.loads(old)):
+                            pipe.zrem(index_key, member)
+                    for index_key, member in self._index_entries(k, v):
+                        pipe.zadd(index_key, {member: 0})
                 await pipe.execute()
             except json.JSONEncodeError as e:
                 logger.error(f"JSON encode error during upsert: {e}")
@@ -826,12 +941,20 @@ class RedisDocStatusStorage(DocStatusStorage):
             return
 
         async with self._get_redis_connection() as redis:
+            previous = await redis.mget([f"{self.namespace}:{i}" for i in doc_ids])
+
             pipe = redis.pipeline()
             for doc_id in doc_ids:
                 pipe.delete(f"{self.namespace}:{doc_id}")
+            for doc_id, old in zip(doc_ids, previous):
+                if old:
+                    for index_key, member in self._index_entries(
+                        doc_id, json.loads(old)
+                    ):
+                        pipe.zrem(index_key, member)
 
             results = await pipe.execute()
-            deleted_count = sum(results)
+            deleted_count = sum(results[: len(doc_ids)])
             logger.info(
                 f"Deleted {deleted_count} of {len(doc_ids)} doc status entries from {self.namespace}"
             )
@@ -858,6 +981,18 @@ class RedisDocStatusStorage(DocStatusStorage):
                     if cursor == 0:
                         break
 
+                # Drop the secondary indexes along with the documents
+                cursor = 0
+                while True:
+                    cursor, keys = await redis.scan(
+                        cursor, match=f"{self._index_prefix}:*", count=1000
+                    )
+                    if keys:
+                        await redis.delete(*keys)
+                    if cursor == 0:
+                        break
+                await redis.set(self._index_ready_key, 1)
+
                 logger.info(
                     f"Dropped {deleted_count} doc status keys from {self.namespace}"
                 )
@@ -2,12 +2,23 @@ import os
 import sys
 import asyncio
 import multiprocessing as mp
+import pickle
 from multiprocessing.synchronize import Lock as ProcessLock
+from multiprocessing.synchronize import RLock as ProcessRLock
 from multiprocessing import Manager
 import time
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, List, Optional, Union, TypeVar, Generic
 
+from .shm_primitives import (
+    SharedCounterTable,
+    SharedFlagTable,
+    SharedStatusBlock,
+    SharedStatusDict,
+    StripedProcessLocks,
+)
+
 
 # Define a direct print function for critical logs that must be visible in all processes
 def direct_log(message, enable_output: bool = False, level: str = "DEBUG"):
@@ -51,6 +62,28 @@ _is_multiprocess = None
 _workers = None
 _manager = None
 
+# Multi-process backend: "shared_memory" keeps the locks, update flags, counters
+# and hot pipeline status fields in memory mapped by all forked workers, "manager"
+# keeps all shared state in the multiprocessing.Manager server process
+SHARED_STORAGE_BACKEND = os.getenv("SHARED_STORAGE_BACKEND", "shared_memory")
+# Number of process locks keyed locks are hashed onto (shared_memory backend)
+KEYED_LOCK_STRIPES = int(os.getenv("KEYED_LOCK_STRIPES", 1024))
+# Capacity of the update flag table: namespaces x workers (shared_memory backend)
+SHARED_FLAG_SLOTS = int(os.getenv("SHARED_FLAG_SLOTS", 4096))
+SHARED_COUNTER_SLOTS = 1024
+# Change sets journaled per namespace, instances further behind reload from file
+CHANGE_JOURNAL_MAX_ENTRIES = int(os.getenv("CHANGE_JOURNAL_MAX_ENTRIES", 32))
+# Total size of the pickled change sets journaled per namespace
+CHANGE_JOURNAL_MAX_BYTES = int(os.getenv("CHANGE_JOURNAL_MAX_BYTES", 32 * 1024 * 1024))
+
+_backend: Optional[str] = None
+_lock_stripes: Optional[StripedProcessLocks] = None
+_flag_table: Optional[SharedFlagTable] = None
+_counter_table: Optional[SharedCounterTable] = None
+_status_block: Optional[SharedStatusBlock] = None
+# Per-process views of namespaces whose fields partly live in shared memory
+_shared_views: Dict[str, SharedStatusDict] = {}
+
 # Global singleton data for multi-process keyed locks
 _lock_registry: Optional[Dict[str, mp.synchronize.Lock]] = None
 _lock_registry_count: Optional[Dict[str, int]] = None
@@ -89,6 +122,127 @@ _async_locks: Optional[Dict[str, asyncio.Lock]] = None
 DEBUG_LOCKS = False
 _debug_n_locks_acquired: int = 0
 
+# Wait and hold time metrics of the locks, collected per process
+LOCK_METRICS_ENABLED = os.getenv("LOCK_METRICS", "true").lower() in ("true", "1", "yes")
+# Acquisitions waiting at least this many seconds are logged, 0 disables the log
+SLOW_LOCK_ACQUIRE_SECONDS = float(os.getenv("SLOW_LOCK_ACQUIRE_SECONDS", 1.0))
+# Number of hot keys reported, and keys tracked before the coldest are dropped
+LOCK_METRICS_TOP_KEYS = int(os.getenv("LOCK_METRICS_TOP_KEYS", 10))
+LOCK_METRICS_MAX_KEYS = 5000
+# Upper bounds (seconds) of the histogram buckets, the last bucket is unbounded
+LOCK_HISTOGRAM_BOUNDS = (0.001, 0.01, 0.1, 1.0, 10.0, 60.0)
+
+
+class LockHistogram:
+    """Fixed-bucket histogram of durations in seconds"""
+
+    __slots__ = ("buckets", "count", "total", "max")
+
+    def __init__(self):
+        self.buckets = [0] * (len(LOCK_HISTOGRAM_BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        index = 0
+        bounds = LOCK_HISTOGRAM_BOUNDS
+        while index < len(bounds) and seconds > bounds[index]:
+            index += 1
+        self.buckets[index] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def snapshot(self) -> Dict[str, Any]:
+        labels = [f"le_{bound:g}s" for bound in LOCK_HISTOGRAM_BOUNDS] + ["inf"]
+        return {
+            "count": self.count,
+            "total_seconds": round(self.total, 6),
+            "avg_seconds": round(self.total / self.count, 6) if self.count else 0.0,
+            "max_seconds": round(self.max, 6),
+            "buckets": dict(zip(labels, self.buckets)),
+        }
+
+
+class LockMetrics:
+    """Wait and hold time histograms per lock, plus per-key totals for keyed locks
+
+    Named locks are tracked under their name, keyed locks under "keyed:<namespace>",
+    the namespace being the prefix of their keys. Metrics are process-local.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        # series -> {"wait": LockHistogram, "hold": LockHistogram}
+        self._series: Dict[str, Dict[str, LockHistogram]] = {}
+        # "namespace:key" -> [acquisitions, total wait, max wait, total hold]
+        self._keys: Dict[str, List[float]] = {}
+        self.slow_acquisitions = 0
+        self.since = time.time()
+
+    def record(self, series: str, key: Optional[str], wait: float, hold: float) -> None:
+        histograms = self._series.get(series)
+        if histograms is None:
+            histograms = {"wait": LockHistogram(), "hold": LockHistogram()}
+            self._series[series] = histograms
+        histograms["wait"].record(wait)
+        histograms["hold"].record(hold)
+
+        if key is None:
+            return
+        stats = self._keys.get(key)
+        if stats is None:
+            if len(self._keys) >= LOCK_METRICS_MAX_KEYS:
+                self._drop_cold_keys()
+            stats = [0, 0.0, 0.0, 0.0]
+            self._keys[key] = stats
+        stats[0] += 1
+        stats[1] += wait
+        if wait > stats[2]:
+            stats[2] = wait
+        stats[3] += hold
+
+    def _drop_cold_keys(self) -> None:
+        # Keep the half of the keys with the most wait time
+        ranked = sorted(self._keys.items(), key=lambda item: item[1][1], reverse=True)
+        self._keys = dict(ranked[: LOCK_METRICS_MAX_KEYS // 2])
+
+    def hot_keys(self, top_n: int) -> List[Dict[str, Any]]:
+        """Keys with the most total wait time, then the most acquisitions"""
+        ranked = sorted(
+            self._keys.items(), key=lambda item: (item[1][1], item[1][0]), reverse=True
+        )
+        return [
+            {
+                "key": key,
+                "acquisitions": int(count),
+                "total_wait_seconds": round(total_wait, 6),
+                "max_wait_seconds": round(max_wait, 6),
+                "total_hold_seconds": round(total_hold, 6),
+            }
+            for key, (count, total_wait, max_wait, total_hold) in ranked[:top_n]
+        ]
+
+    def snapshot(self, top_n: int) -> Dict[str, Any]:
+        return {
+            "enabled": LOCK_METRICS_ENABLED,
+            "since": self.since,
+            "slow_acquire_threshold_seconds": SLOW_LOCK_ACQUIRE_SECONDS,
+            "slow_acquisitions": self.slow_acquisitions,
+            "locks": {
+                series: {kind: hist.snapshot() for kind, hist in histograms.items()}
+                for series, histograms in sorted(self._series.items())
+            },
+            "hot_keys": self.hot_keys(top_n),
+        }
+
+
+_lock_metrics = LockMetrics()
+
 
 def inc_debug_n_locks_acquired():
     global _debug_n_locks_acquired
@@ -112,6 +266,60 @@ def get_debug_n_locks_acquired():
     return _debug_n_locks_acquired
 
 
+# Threads blocking on process locks held by other processes
+LOCK_WAIT_THREADS = 32
+# Longest polling interval of a contended re-entrant keyed lock stripe
+STRIPE_POLL_MAX_SECONDS = 0.002
+
+_lock_wait_executor: Optional[ThreadPoolExecutor] = None
+_lock_wait_executor_pid: Optional[int] = None
+
+
+def _get_lock_wait_executor() -> ThreadPoolExecutor:
+    """Thread pool of the current process, created after the fork"""
+    global _lock_wait_executor, _lock_wait_executor_pid
+    if _lock_wait_executor is None or _lock_wait_executor_pid != os.getpid():
+        _lock_wait_executor = ThreadPoolExecutor(
+            max_workers=LOCK_WAIT_THREADS, thread_name_prefix="lock-wait"
+        )
+        _lock_wait_executor_pid = os.getpid()
+    return _lock_wait_executor
+
+
+async def _acquire_process_lock(lock) -> None:
+    """Acquire a process lock without blocking the event loop
+
+    A contended lock is acquired by a blocking call in a thread, so the waiter is
+    woken by the release itself, in the order the lock implementation grants it,
+    instead of polling. Re-entrant keyed lock stripes are owned by the acquiring
+    thread, which must be the event loop thread; they are polled with an interval
+    of at most STRIPE_POLL_MAX_SECONDS.
+    """
+    if lock.acquire(False):
+        return
+
+    if isinstance(lock, ProcessRLock):
+        delay = 0.0001
+        while not lock.acquire(False):
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, STRIPE_POLL_MAX_SECONDS)
+        return
+
+    acquisition = asyncio.get_running_loop().run_in_executor(
+        _get_lock_wait_executor(), lock.acquire
+    )
+    try:
+        await asyncio.shield(acquisition)
+    except asyncio.CancelledError:
+        # The thread still gets the lock; release it as soon as it does
+        def _release_unused(future) -> None:
+            if not future.cancelled() and future.exception() is None:
+                lock.release()
+
+        acquisition.add_done_callback(_release_unused)
+        raise
+
+
 class UnifiedLock(Generic[T]):
     """Provide a unified lock interface type for asyncio.Lock and multiprocessing.Lock"""
 
@@ -122,6 +330,8 @@ class UnifiedLock(Generic[T]):
         name: str = "unnamed",
         enable_logging: bool = True,
         async_lock: Optional[asyncio.Lock] = None,
+        metrics_series: Optional[str] = None,
+        metrics_key: Optional[str] = None,
     ):
         self._lock = lock
         self._is_async = is_async
@@ -129,8 +339,36 @@ class UnifiedLock(Generic[T]):
         self._name = name  # for debug only
         self._enable_logging = enable_logging  # for debug only
         self._async_lock = async_lock  # auxiliary lock for coroutine synchronization
+        self._metrics_series = metrics_series or name
+        self._metrics_key = metrics_key
+        # Set by the holder only, the lock being exclusive
+        self._wait_seconds = 0.0
+        self._acquired_at = None
+
+    def _record_acquired(self, wait_started: float) -> None:
+        self._acquired_at = time.perf_counter()
+        self._wait_seconds = self._acquired_at - wait_started
+        threshold = SLOW_LOCK_ACQUIRE_SECONDS
+        if threshold and self._wait_seconds >= threshold:
+            _lock_metrics.slow_acquisitions += 1
+            direct_log(
+                f"== Lock == Process {self._pid}: Slow acquire of '{self._name}', waited {self._wait_seconds:.3f}s",
+                level="WARNING",
+            )
+
+    def _record_released(self) -> None:
+        if self._acquired_at is None:
+            return
+        _lock_metrics.record(
+            self._metrics_series,
+            self._metrics_key and self._name,
+            self._wait_seconds,
+            time.perf_counter() - self._acquired_at,
+        )
+        self._acquired_at = None
 
     async def __aenter__(self) -> "UnifiedLock[T]":
+        wait_started = time.perf_counter()
         try:
             # If in multiprocess mode and async lock exists, acquire it first
             if not self._is_async and self._async_lock is not None:
@@ -144,7 +382,10 @@ class UnifiedLock(Generic[T]):
             if self._is_async:
                 await self._lock.acquire()
             else:
-                self._lock.acquire()
+                await _acquire_process_lock(self._lock)
+
+            if LOCK_METRICS_ENABLED:
+                self._record_acquired(wait_started)
 
             direct_log(
                 f"== Lock == Process {self._pid}: Lock '{self._name}' acquired (async={self._is_async})",
@@ -176,6 +417,7 @@ class UnifiedLock(Generic[T]):
             else:
                 self._lock.release()
             main_lock_released = True
+            self._record_released()
 
             direct_log(
                 f"== Lock == Process {self._pid}: Lock '{self._name}' released (async={self._is_async})",
@@ -407,6 +649,9 @@ def _get_or_create_shared_raw_mp_lock(
     """Return the *singleton* manager.Lock() proxy for keyed lock, creating if needed."""
     if not _is_multiprocess:
         return None
+    if _lock_stripes is not None:
+        # Fixed stripes are shared by all workers: no registry, nothing to clean up
+        return _lock_stripes.lock_for(_get_combined_key(factory_name, key))
 
     with _registry_guard:
         combined_key = _get_combined_key(factory_name, key)
@@ -432,7 +677,7 @@ def _get_or_create_shared_raw_mp_lock(
 
 def _release_shared_raw_mp_lock(factory_name: str, key: str):
     """Release the *singleton* manager.Lock() proxy for *key*."""
-    if not _is_multiprocess:
+    if not _is_multiprocess or _lock_stripes is not None:
         return
 
     global _earliest_mp_cleanup_time, _last_mp_cleanup_time
@@ -598,10 +843,12 @@ class KeyedUnifiedLock:
         if is_multiprocess:
             return UnifiedLock(
                 lock=raw_lock,
-                is_async=False,  # manager.Lock is synchronous
+                is_async=False,  # process locks are synchronous
                 name=combined_key,
                 enable_logging=enable_logging,
                 async_lock=async_lock,  # prevents event‑loop blocking
+                metrics_series=f"keyed:{namespace}",
+                metrics_key=key,
             )
         else:
             return UnifiedLock(
@@ -610,6 +857,8 @@ class KeyedUnifiedLock:
                 name=combined_key,
                 enable_logging=enable_logging,
                 async_lock=None,  # No need for async lock in single process mode
+                metrics_series=f"keyed:{namespace}",
+                metrics_key=key,
             )
 
     def _release_lock_for_key(self, namespace: str, key: str):
@@ -752,7 +1001,9 @@ class KeyedUnifiedLock:
 
         try:
             # Count multiprocess locks
-            if _is_multiprocess and _lock_registry_count is not None:
+            if _is_multiprocess and _lock_stripes is not None:
+                status["total_mp_locks"] = _lock_stripes.stripes
+            elif _is_multiprocess and _lock_registry_count is not None:
                 if _registry_guard is not None:
                     with _registry_guard:
                         status["total_mp_locks"] = len(_lock_registry_count)
@@ -920,34 +1171,69 @@ def cleanup_keyed_lock() -> Dict[str, Any]:
     return _storage_keyed_lock.cleanup_expired_locks()
 
 
-def get_keyed_lock_status() -> Dict[str, Any]:
+def get_keyed_lock_status(
+    top_n: Optional[int] = None, include_metrics: bool = True
+) -> Dict[str, Any]:
     """
     Get current status of keyed locks without performing cleanup.
 
     This function provides a read-only view of the current lock counts
-    for both multiprocess and async locks, including pending cleanup counts.
+    for both multiprocess and async locks, including pending cleanup counts,
+    and the lock metrics of the current process.
+
+    Args:
+        top_n: Number of hot keys reported, defaults to LOCK_METRICS_TOP_KEYS
+        include_metrics: Whether to collect the lock metrics
 
     Returns:
-        Same as get_lock_status in KeyedUnifiedLock
+        Same as get_lock_status in KeyedUnifiedLock, plus "metrics" (see
+        get_lock_metrics) if include_metrics
     """
     global _storage_keyed_lock
 
     # Check if shared storage is initialized
     if not _initialized or _storage_keyed_lock is None:
-        return {
-            "process_id": os.getpid(),
+        status = {
             "total_mp_locks": 0,
             "pending_mp_cleanup": 0,
             "total_async_locks": 0,
             "pending_async_cleanup": 0,
         }
-
-    status = _storage_keyed_lock.get_lock_status()
+    else:
+        status = _storage_keyed_lock.get_lock_status()
     status["process_id"] = os.getpid()
+    if include_metrics:
+        status["metrics"] = get_lock_metrics(top_n)
     return status
 
 
-def initialize_share_data(workers: int = 1):
+def get_lock_metrics(top_n: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Get the lock metrics of the current process.
+
+    Returns:
+        {
+            "enabled": True,
+            "since": 1700000000.0,  # start of the collection (epoch seconds)
+            "slow_acquire_threshold_seconds": 1.0,
+            "slow_acquisitions": 3,
+            "locks": {
+                "graph_db_lock": {"wait": {...}, "hold": {...}},
+                "keyed:GraphDB": {"wait": {...}, "hold": {...}},
+            },
+            "hot_keys": [{"key": "GraphDB:Rice", "acquisitions": 12, ...}],
+        }
+        Each histogram holds count, total/avg/max seconds and bucket counts.
+    """
+    return _lock_metrics.snapshot(LOCK_METRICS_TOP_KEYS if top_n is None else top_n)
+
+
+def reset_lock_metrics() -> None:
+    """Clear the lock metrics of the current process"""
+    _lock_metrics.reset()
+
+
+def initialize_share_data(workers: int = 1, backend: Optional[str] = None):
     """
     Initialize shared storage data for single or multi-process mode.
 
@@ -961,9 +1247,15 @@ def initialize_share_data(workers: int = 1):
     based on the number of workers. If workers=1, it uses thread locks and local dictionaries.
     If workers>1, it uses process locks and shared dictionaries managed by multiprocessing.Manager.
 
+    With the "shared_memory" backend (the default where workers are forked), the named
+    locks and striped keyed locks are plain process locks, and update flags, counters
+    and the scalar pipeline status fields live in shared memory, so the hot paths make
+    no round trip to the Manager server. The Manager still holds the namespace dicts.
+
     Args:
         workers (int): Number of worker processes. If 1, single-process mode is used.
                       If > 1, multi-process mode with shared memory is used.
+        backend (str): "shared_memory" or "manager", defaults to SHARED_STORAGE_BACKEND
     """
     global \
         _manager, \
@@ -985,7 +1277,12 @@ def initialize_share_data(workers: int = 1):
         _async_locks, \
         _storage_keyed_lock, \
         _earliest_mp_cleanup_time, \
-        _last_mp_cleanup_time
+        _last_mp_cleanup_time, \
+        _backend, \
+        _lock_stripes, \
+        _flag_table, \
+        _counter_table, \
+        _status_block
 
     # Check if already initialized
     if _initialized:
@@ -998,16 +1295,38 @@ def initialize_share_data(workers: int = 1):
 
     if workers > 1:
         _is_multiprocess = True
+        _backend = backend or SHARED_STORAGE_BACKEND
+        if _backend not in ("shared_memory", "manager"):
+            raise ValueError(f"Unknown shared storage backend: {_backend}")
+        if _backend == "shared_memory" and not hasattr(os, "fork"):
+            # Shared memory and process locks are inherited by forked workers only
+            direct_log(
+                f"Process {os.getpid()} shared_memory backend needs fork, using manager",
+                level="WARNING",
+            )
+            _backend = "manager"
+
         _manager = Manager()
-        _lock_registry = _manager.dict()
-        _lock_registry_count = _manager.dict()
-        _lock_cleanup_data = _manager.dict()
-        _registry_guard = _manager.RLock()
-        _internal_lock = _manager.Lock()
-        _storage_lock = _manager.Lock()
-        _pipeline_status_lock = _manager.Lock()
-        _graph_db_lock = _manager.Lock()
-        _data_init_lock = _manager.Lock()
+        if _backend == "shared_memory":
+            _internal_lock = mp.Lock()
+            _storage_lock = mp.Lock()
+            _pipeline_status_lock = mp.Lock()
+            _graph_db_lock = mp.Lock()
+            _data_init_lock = mp.Lock()
+            _lock_stripes = StripedProcessLocks(KEYED_LOCK_STRIPES)
+            _flag_table = SharedFlagTable(SHARED_FLAG_SLOTS)
+            _counter_table = SharedCounterTable(SHARED_COUNTER_SLOTS)
+            _status_block = SharedStatusBlock()
+        else:
+            _lock_registry = _manager.dict()
+            _lock_registry_count = _manager.dict()
+            _lock_cleanup_data = _manager.dict()
+            _registry_guard = _manager.RLock()
+            _internal_lock = _manager.Lock()
+            _storage_lock = _manager.Lock()
+            _pipeline_status_lock = _manager.Lock()
+            _graph_db_lock = _manager.Lock()
+            _data_init_lock = _manager.Lock()
         _shared_dicts = _manager.dict()
         _init_flags = _manager.dict()
         _update_flags = _manager.dict()
@@ -1024,7 +1343,7 @@ def initialize_share_data(workers: int = 1):
         }
 
         direct_log(
-            f"Process {os.getpid()} Shared-Data created for Multiple Process (workers={workers})"
+            f"Process {os.getpid()} Shared-Data created for Multiple Process (workers={workers}, backend={_backend})"
         )
     else:
         _is_multiprocess = False
@@ -1099,7 +1418,9 @@ async def get_update_flag(namespace: str):
                 f"Process {os.getpid()} initialized updated flags for namespace: [{namespace}]"
             )
 
-        if _is_multiprocess and _manager is not None:
+        if _flag_table is not None:
+            new_update_flag = _flag_table.allocate(namespace)
+        elif _is_multiprocess and _manager is not None:
             new_update_flag = _manager.Value("b", False)
         else:
             # Create a simple mutable object to store boolean value for compatibility with mutiprocess
@@ -1109,7 +1430,9 @@ async def get_update_flag(namespace: str):
 
             new_update_flag = MutableBoolean(False)
 
-        _update_flags[namespace].append(new_update_flag)
+        if _flag_table is None:
+            # Flags in the shared table are listed by the table itself
+            _update_flags[namespace].append(new_update_flag)
         return new_update_flag
 
 
@@ -1119,6 +1442,11 @@ async def set_all_update_flags(namespace: str):
     if _update_flags is None:
         raise ValueError("Try to create namespace before Shared-Data is initialized")
 
+    if _flag_table is not None:
+        # Single byte writes in shared memory, no lock needed
+        _flag_table.set_all(namespace, True)
+        return
+
     async with get_internal_lock():
         if namespace not in _update_flags:
             raise ValueError(f"Namespace {namespace} not found in update flags")
@@ -1133,6 +1461,10 @@ async def clear_all_update_flags(namespace: str):
     if _update_flags is None:
         raise ValueError("Try to create namespace before Shared-Data is initialized")
 
+    if _flag_table is not None:
+        _flag_table.set_all(namespace, False)
+        return
+
     async with get_internal_lock():
         if namespace not in _update_flags:
             raise ValueError(f"Namespace {namespace} not found in update flags")
@@ -1154,6 +1486,9 @@ async def get_all_update_flags_status() -> Dict[str, list]:
     result = {}
     async with get_internal_lock():
         for namespace, flags in _update_flags.items():
+            if _flag_table is not None:
+                result[namespace] = _flag_table.values(namespace)
+                continue
             worker_statuses = []
             for flag in flags:
                 if _is_multiprocess:
@@ -1205,9 +1540,135 @@ async def get_namespace_data(namespace: str) -> Dict[str, Any]:
             else:
                 _shared_dicts[namespace] = {}
 
+    if _status_block is not None and namespace == "pipeline_status":
+        view = _shared_views.get(namespace)
+        if view is None:
+            view = SharedStatusDict(_shared_dicts[namespace], _status_block)
+            _shared_views[namespace] = view
+        return view
     return _shared_dicts[namespace]
 
 
+async def get_shared_counter(name: str) -> int:
+    """Return the value of a named counter shared by all workers (0 if never set)"""
+    if _counter_table is not None:
+        return _counter_table.get(name)
+    counters = await get_namespace_data("shared_counters")
+    return counters.get(name, 0)
+
+
+async def increment_shared_counter(name: str, delta: int = 1) -> int:
+    """Atomically add to a named counter shared by all workers, return the new value"""
+    if _counter_table is not None:
+        return _counter_table.add(name, delta)
+    counters = await get_namespace_data("shared_counters")
+    async with get_internal_lock():
+        value = counters.get(name, 0) + delta
+        counters[name] = value
+    return value
+
+
+async def get_storage_generation() -> int:
+    """Return the storage generation, bumped whenever indexed data changes"""
+    return await get_shared_counter("storage_generation")
+
+
+async def bump_storage_generation() -> int:
+    """Advance the storage generation so that all workers drop derived query caches"""
+    return await increment_shared_counter("storage_generation")
+
+
+async def register_change_reader(namespace: str) -> int:
+    """Register a storage instance that keeps its own copy of a namespace
+
+    Instances holding a private copy of the data (in-memory graph or vector index)
+    follow the changes of the other instances through the namespace's change journal.
+
+    Returns:
+        The current generation of the namespace, the instance's starting point
+    """
+    await increment_shared_counter(f"{namespace}_readers")
+    return await get_namespace_generation(namespace)
+
+
+async def unregister_change_reader(namespace: str) -> None:
+    """Unregister a storage instance registered with register_change_reader"""
+    if not _initialized:
+        return
+    await increment_shared_counter(f"{namespace}_readers", -1)
+
+
+async def get_namespace_generation(namespace: str) -> int:
+    """Return the generation of a namespace, advanced by every published change set"""
+    return await get_shared_counter(f"{namespace}_generation")
+
+
+async def publish_changes(namespace: str, changes: Optional[List[Any]]) -> int:
+    """Advance the generation of a namespace and journal the changes leading to it
+
+    Must be called while holding the storage lock, which also serializes the readers
+    of the journal.
+
+    Args:
+        namespace: Namespace whose persisted data changed
+        changes: Operations applied since the previous generation, or None if they
+            cannot be replayed (e.g. after a drop), so that other instances reload
+
+    Returns:
+        The new generation
+    """
+    journal = await get_namespace_data(f"{namespace}_journal")
+    journal_sizes = await get_namespace_data(f"{namespace}_journal_sizes")
+    readers = await get_shared_counter(f"{namespace}_readers")
+    generation = await increment_shared_counter(f"{namespace}_generation")
+    # A single instance has nobody to replay its changes. Change sets are stored
+    # pickled, so their size is known and the manager process copies plain bytes
+    if changes is not None and readers > 1:
+        data = pickle.dumps(changes, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(data) <= CHANGE_JOURNAL_MAX_BYTES:
+            journal[generation] = data
+            journal_sizes[generation] = len(data)
+
+    # Drop the oldest change sets beyond the entry and size limits
+    entries = sorted(dict(journal_sizes).items())
+    total_size = sum(size for _, size in entries)
+    for old_generation, size in entries:
+        if (
+            old_generation > generation - CHANGE_JOURNAL_MAX_ENTRIES
+            and total_size <= CHANGE_JOURNAL_MAX_BYTES
+        ):
+            break
+        journal.pop(old_generation, None)
+        journal_sizes.pop(old_generation, None)
+        total_size -= size
+    return generation
+
+
+async def get_changes_since(
+    namespace: str, generation: int
+) -> tuple[int, Optional[List[Any]]]:
+    """Return the changes of a namespace published after a generation
+
+    Must be called while holding the storage lock.
+
+    Returns:
+        (current generation, changes in publication order), the changes being None
+        when the journal no longer covers all generations since `generation` and the
+        caller must reload its data
+    """
+    current = await get_namespace_generation(namespace)
+    if current == generation:
+        return current, []
+    journal = await get_namespace_data(f"{namespace}_journal")
+    changes = []
+    for next_generation in range(generation + 1, current + 1):
+        entry = journal.get(next_generation)
+        if entry is None:
+            return current, None
+        changes.extend(pickle.loads(entry))
+    return current, changes
+
+
 def finalize_share_data():
     """
     Release shared resources and clean up.
@@ -1230,7 +1691,16 @@ def finalize_share_data():
         _init_flags, \
         _initialized, \
         _update_flags, \
-        _async_locks
+        _async_locks, \
+        _backend, \
+        _lock_stripes, \
+        _flag_table, \
+        _counter_table, \
+        _status_block, \
+        _lock_registry, \
+        _lock_registry_count, \
+        _lock_cleanup_data, \
+        _registry_guard
 
     # Check if already initialized
     if not _initialized:
@@ -1275,6 +1745,12 @@ def finalize_share_data():
                     pass  # Ignore any errors during update flags cleanup
                 _update_flags.clear()
 
+            # Unmap the shared memory blocks, the creating process also unlinks them
+            _shared_views.clear()
+            for block in (_flag_table, _counter_table, _status_block):
+                if block is not None:
+                    block.close()
+
             # Shut down the Manager - this will automatically clean up all shared resources
             _manager.shutdown()
             direct_log(f"Process {os.getpid()} Manager shutdown complete")
@@ -1296,5 +1772,14 @@ def finalize_share_data():
     _data_init_lock = None
     _update_flags = None
     _async_locks = None
+    _backend = None
+    _lock_stripes = None
+    _flag_table = None
+    _counter_table = None
+    _status_block = None
+    _lock_registry = None
+    _lock_registry_count = None
+    _lock_cleanup_data = None
+    _registry_guard = None
 
     direct_log(f"Process {os.getpid()} storage data finalization complete")
@@ -0,0 +1,334 @@
+"""
+Shared-memory primitives for multi-process shared storage.
+
+These structures are allocated once in the Gunicorn master before the workers are
+forked, so every worker maps the same memory and reads or writes them without the
+IPC round trip to a multiprocessing.Manager server that manager proxies need.
+Names (namespaces, counter names) are identified by a 64-bit hash, so lookups need
+no shared registry.
+"""
+
+import hashlib
+import multiprocessing as mp
+import os
+import struct
+import zlib
+from collections.abc import MutableMapping
+from multiprocessing import shared_memory
+from typing import Any, Dict, Iterator, Optional
+
+
+def name_hash(name: str) -> int:
+    """Stable signed 64-bit hash of a name, identical in every process"""
+    digest = hashlib.blake2b(name.encode("utf-8"), digest_size=8).digest()
+    # 0 marks an unused slot
+    return struct.unpack("<q", digest)[0] or 1
+
+
+def process_alive(pid: int) -> bool:
+    """Whether a process with this pid still exists"""
+    if pid <= 0:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # Exists, owned by another user
+        return True
+    return True
+
+
+class _SharedBlock:
+    """A shared memory block of int64 cells, unlinked by the creating process"""
+
+    def __init__(self, cells: int):
+        self._shm = shared_memory.SharedMemory(create=True, size=cells * 8)
+        self._owner_pid = os.getpid()
+        self.cells = self._shm.buf.cast("q")
+        for i in range(cells):
+            self.cells[i] = 0
+
+    def close(self) -> None:
+        try:
+            self.cells.release()
+            self._shm.close()
+            if os.getpid() == self._owner_pid:
+                self._shm.unlink()
+        except (BufferError, FileNotFoundError):
+            pass
+
+
+class SharedFlagTable:
+    """Boolean flags tagged with the hash of their namespace and their owner's pid
+
+    Layout: [allocated count][hash x slots][value x slots][owner pid x slots]
+
+    Slots of processes that exited (e.g. restarted Gunicorn workers) are reused by
+    later allocations, so the table only has to hold the flags of live workers.
+    """
+
+    def __init__(self, slots: int):
+        self.slots = slots
+        self._block = _SharedBlock(1 + 3 * slots)
+        self._cells = self._block.cells
+        self._lock = mp.Lock()
+
+    def _owner(self, index: int) -> int:
+        return self._cells[1 + 2 * self.slots + index]
+
+    def allocate(self, namespace: str) -> "SharedFlag":
+        """Reserve a new flag for a namespace, initially False"""
+        pid = os.getpid()
+        with self._lock:
+            count = self._cells[0]
+            index = next(
+                (
+                    i
+                    for i in range(count)
+                    if self._owner(i) != pid and not process_alive(self._owner(i))
+                ),
+                None,
+            )
+            if index is None:
+                if count >= self.slots:
+                    raise RuntimeError(
+                        f"Shared flag table is full ({self.slots} slots), raise SHARED_FLAG_SLOTS"
+                    )
+                index = count
+                self._cells[0] = count + 1
+            self._cells[1 + index] = name_hash(namespace)
+            self._cells[1 + self.slots + index] = 0
+            self._cells[1 + 2 * self.slots + index] = pid
+        return SharedFlag(self, index)
+
+    def set_all(self, namespace: str, value: bool) -> None:
+        """Set every flag of a namespace"""
+        h = name_hash(namespace)
+        flag = 1 if value else 0
+        for index in range(self._cells[0]):
+            if self._cells[1 + index] == h:
+                self._cells[1 + self.slots + index] = flag
+
+    def values(self, namespace: str) -> list[bool]:
+        """Flags of a namespace held by live processes"""
+        h = name_hash(namespace)
+        return [
+            bool(self._cells[1 + self.slots + index])
+            for index in range(self._cells[0])
+            if self._cells[1 + index] == h and process_alive(self._owner(index))
+        ]
+
+    def get(self, index: int) -> bool:
+        return bool(self._cells[1 + self.slots + index])
+
+    def set(self, index: int, value: bool) -> None:
+        self._cells[1 + self.slots + index] = 1 if value else 0
+
+    def close(self) -> None:
+        self._block.close()
+
+
+class SharedFlag:
+    """One flag of a SharedFlagTable, with the `.value` interface of Manager.Value"""
+
+    __slots__ = ("_table", "_index")
+
+    def __init__(self, table: SharedFlagTable, index: int):
+        self._table = table
+        self._index = index
+
+    @property
+    def value(self) -> bool:
+        return self._table.get(self._index)
+
+    @value.setter
+    def value(self, value: bool) -> None:
+        self._table.set(self._index, value)
+
+
+class SharedCounterTable:
+    """Named int64 counters
+
+    Layout: [hash x slots][value x slots]. Counters are found by linear probing
+    on the hash of their name and created on first use. Aligned 8-byte cells are
+    read without locking; increments take a process lock.
+    """
+
+    def __init__(self, slots: int):
+        self.slots = slots
+        self._block = _SharedBlock(2 * slots)
+        self._cells = self._block.cells
+        self._lock = mp.Lock()
+
+    def _find(self, name: str, create: bool) -> Optional[int]:
+        h = name_hash(name)
+        start = h % self.slots
+        for probe in range(self.slots):
+            index = (start + probe) % self.slots
+            current = self._cells[index]
+            if current == h:
+                return index
+            if current == 0:
+                if not create:
+                    return None
+                self._cells[index] = h
+                return index
+        if create:
+            raise RuntimeError(f"Shared counter table is full ({self.slots} slots)")
+        return None
+
+    def get(self, name: str) -> int:
+        index = self._find(name, create=False)
+        return 0 if index is None else self._cells[self.slots + index]
+
+    def add(self, name: str, delta: int = 1) -> int:
+        """Atomically add to a counter, returning the new value"""
+        with self._lock:
+            index = self._find(name, create=True)
+            value = self._cells[self.slots + index] + delta
+            self._cells[self.slots + index] = value
+        return value
+
+    def set(self, name: str, value: int) -> None:
+        with self._lock:
+            index = self._find(name, create=True)
+            self._cells[self.slots + index] = value
+
+    def close(self) -> None:
+        self._block.close()
+
+
+class StripedProcessLocks:
+    """A fixed pool of process locks that keys are hashed onto
+
+    Stripes are re-entrant, so two keys of one process that share a stripe do
+    not deadlock; exclusion between coroutines of a process comes from the
+    per-key asyncio locks that are always taken first.
+    """
+
+    def __init__(self, stripes: int):
+        self.stripes = stripes
+        self._locks = [mp.RLock() for _ in range(stripes)]
+
+    def lock_for(self, combined_key: str):
+        return self._locks[zlib.crc32(combined_key.encode("utf-8")) % self.stripes]
+
+
+# Pipeline status fields kept in shared memory: polled on every request and
+# written on every batch, unlike the messages and job details
+STATUS_FIELDS: Dict[str, type] = {
+    "busy": bool,
+    "request_pending": bool,
+    "autoscanned": bool,
+    "watching": bool,
+    "docs": int,
+    "batchs": int,
+    "cur_batch": int,
+}
+
+
+class SharedStatusBlock:
+    """Shared memory cells for STATUS_FIELDS: [present, value] per field"""
+
+    def __init__(self):
+        self.fields = {name: i for i, name in enumerate(STATUS_FIELDS)}
+        self._block = _SharedBlock(2 * len(self.fields))
+        self.cells = self._block.cells
+
+    def close(self) -> None:
+        self._block.close()
+
+
+class SharedStatusDict(MutableMapping):
+    """Status dictionary whose hot scalar fields live in shared memory
+
+    Fields of STATUS_FIELDS holding a value of their type are stored in the
+    shared block; everything else is kept in the backing (Manager) dict.
+    """
+
+    def __init__(self, backing: Any, block: SharedStatusBlock):
+        self._backing = backing
+        self._block = block
+
+    def _slot(self, key: str) -> Optional[int]:
+        index = self._block.fields.get(key)
+        return None if index is None else 2 * index
+
+    def _fits(self, key: str, value: Any) -> bool:
+        field_type = STATUS_FIELDS[key]
+        if field_type is bool:
+            return isinstance(value, bool)
+        return isinstance(value, int) and not isinstance(value, bool)
+
+    def __getitem__(self, key: str) -> Any:
+        slot = self._slot(key)
+        if slot is not None and self._block.cells[slot]:
+            value = self._block.cells[slot + 1]
+            return bool(value) if STATUS_FIELDS[key] is bool else value
+        return self._backing[key]
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        slot = self._slot(key)
+        if slot is not None and self._fits(key, value):
+            self._block.cells[slot + 1] = int(value)
+            self._block.cells[slot] = 1
+            if key in self._backing:
+                del self._backing[key]
+            return
+        if slot is not None:
+            self._block.cells[slot] = 0
+        self._backing[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        slot = self._slot(key)
+        if slot is not None and self._block.cells[slot]:
+            self._block.cells[slot] = 0
+            return
+        del self._backing[key]
+
+    def _shared_keys(self) -> list[str]:
+        return [
+            name
+            for name, index in self._block.fields.items()
+            if self._block.cells[2 * index]
+        ]
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self._shared_keys()
+        yield from list(self._backing.keys())
+
+    def __len__(self) -> int:
+        return len(self._shared_keys()) + len(self._backing)
+
+    def __contains__(self, key: object) -> bool:
+        slot = self._slot(key) if isinstance(key, str) else None
+        if slot is not None and self._block.cells[slot]:
+            return True
+        return key in self._backing
+
+    def get(self, key: str, default: Any = None) -> Any:
+        slot = self._slot(key)
+        if slot is not None and self._block.cells[slot]:
+            return self[key]
+        return self._backing.get(key, default)
+
+    def update(self, other=(), **kwargs) -> None:
+        # One round trip to the backing dict for the non-shared fields
+        items = dict(other, **kwargs)
+        backing_items = {}
+        for key, value in items.items():
+            slot = self._slot(key)
+            if slot is not None and self._fits(key, value):
+                self[key] = value
+            else:
+                if slot is not None:
+                    self._block.cells[slot] = 0
+                backing_items[key] = value
+        if backing_items:
+            self._backing.update(backing_items)
+
+    def clear(self) -> None:
+        for index in self._block.fields.values():
+            self._block.cells[2 * index] = 0
+        self._backing.clear()
@@ -6,7 +6,7 @@ import os
 import time
 import traceback
 import warnings
-from dataclasses import asdict, dataclass, field
+from dataclasses import asdict, dataclass, field, replace
 from datetime import datetime, timezone
 from functools import partial
 from typing import (
@@ -31,6 +31,7 @@ from .base import (
     DeletionResult,
     DocProcessingStatus,
     DocStatus,
+    DocStatusPage,
     DocStatusStorage,
     QueryParam,
     StorageNameSpace,
@@ -46,7 +47,9 @@ from .kg import (
     STORAGES,
     verify_storage_implementation,
 )
+from .http_pool import acquire_http_clients, release_http_clients
 from .kg.shared_storage import (
+    bump_storage_generation,
     get_graph_db_lock,
     get_namespace_data,
     get_pipeline_status_lock,
@@ -56,14 +59,23 @@ from .operate import (
     _rebuild_knowledge_from_chunks,
     chunking_by_token_size,
     extract_entities,
+    extract_keywords_batch,
     kg_query,
     merge_nodes_and_edges,
     naive_query,
+    query_batch,
     query_with_keywords,
 )
+from .query_trace import (
+    QueryTrace,
+    activate_query_trace,
+    deactivate_query_trace,
+    trace_stage,
+)
 from .types import KnowledgeGraph
 from .utils import (
     EmbeddingFunc,
+    QueryContextCache,
     TiktokenTokenizer,
     Tokenizer,
     always_get_an_event_loop,
@@ -250,6 +262,20 @@ class LightRAG:
     rerank_model_func: Callable[..., object] | None = field(default=None)
     """Function for reranking retrieved documents. All rerank configurations (model name, API keys, top_k, etc.) should be included in this function. Optional."""
 
+    # Query keyword extraction
+    # ---
+
+    keyword_extraction_func: Callable[..., object] | None = field(default=None)
+    """Optional local keyword extractor used instead of the LLM for queries.
+    An async function `(query: str, param: QueryParam) -> (hl_keywords, ll_keywords)`,
+    e.g. a statistical extractor or a small local model.
+    """
+
+    keyword_extraction_batch_size: int = field(
+        default=get_env_value("KEYWORD_EXTRACTION_BATCH_SIZE", 16, int)
+    )
+    """Maximum number of queries whose keywords are extracted in a single LLM call."""
+
     # Storage
     # ---
 
@@ -262,6 +288,16 @@ class LightRAG:
     enable_llm_cache_for_entity_extract: bool = field(default=True)
     """If True, enables caching for entity extraction steps to reduce LLM costs."""
 
+    enable_query_context_cache: bool = field(
+        default=get_env_value("ENABLE_QUERY_CONTEXT_CACHE", True, bool)
+    )
+    """If True, reuses retrieval contexts of repeated queries until indexed data changes."""
+
+    query_context_cache_size: int = field(
+        default=get_env_value("QUERY_CONTEXT_CACHE_SIZE", 256, int)
+    )
+    """Maximum number of retrieval contexts kept in the per-process query context cache."""
+
     # Extensions
     # ---
 
@@ -457,6 +493,12 @@ class LightRAG:
             )
         )
 
+        self.query_context_cache: QueryContextCache | None = (
+            QueryContextCache(max_size=self.query_context_cache_size)
+            if self.enable_query_context_cache
+            else None
+        )
+
         # Init Rerank
         if self.enable_rerank and self.rerank_model_func:
             logger.info("Rerank model initialized for improved retrieval quality")
@@ -513,6 +555,8 @@ class LightRAG:
 
             await asyncio.gather(*tasks)
 
+            acquire_http_clients()
+
             self._storages_status = StoragesStatus.INITIALIZED
             logger.debug("Initialized Storages")
 
@@ -536,6 +580,10 @@ class LightRAG:
 
             await asyncio.gather(*tasks)
 
+            # Release keep-alive connections held by the LLM/embedding/rerank
+            # bindings, once no other instance on this event loop uses them
+            await release_http_clients()
+
             self._storages_status = StoragesStatus.FINALIZED
             logger.debug("Finalized Storages")
 
@@ -1281,6 +1329,9 @@ class LightRAG:
         ]
         await asyncio.gather(*tasks)
 
+        # Cached query contexts were built from the previous data
+        await bump_storage_generation()
+
         log_message = "In memory DB persist to disk"
         logger.info(log_message)
 
@@ -1513,46 +1564,153 @@ class LightRAG:
         global_config = asdict(self)
         # Save original query for vector search
         param.original_query = query
+        trace = QueryTrace(detailed=param.enable_trace)
+        trace_token = activate_query_trace(trace)
 
-        if param.mode in ["local", "global", "hybrid", "mix"]:
-            response = await kg_query(
-                query.strip(),
-                self.chunk_entity_relation_graph,
-                self.entities_vdb,
-                self.relationships_vdb,
-                self.text_chunks,
-                param,
-                global_config,
-                hashing_kv=self.llm_response_cache,
-                system_prompt=system_prompt,
-                chunks_vdb=self.chunks_vdb,
-            )
-        elif param.mode == "naive":
-            response = await naive_query(
-                query.strip(),
-                self.chunks_vdb,
-                param,
-                global_config,
-                hashing_kv=self.llm_response_cache,
-                system_prompt=system_prompt,
-            )
-        elif param.mode == "bypass":
-            # Bypass mode: directly use LLM without knowledge retrieval
-            use_llm_func = param.model_func or global_config["llm_model_func"]
-            # Apply higher priority (8) to entity/relation summary tasks
-            use_llm_func = partial(use_llm_func, _priority=8)
-
-            param.stream = True if param.stream is None else param.stream
-            response = await use_llm_func(
-                query.strip(),
-                system_prompt=system_prompt,
-                history_messages=param.conversation_history,
-                stream=param.stream,
-            )
+        try:
+            if param.mode in ["local", "global", "hybrid", "mix"]:
+                response = await kg_query(
+                    query.strip(),
+                    trace.wrap_storage(self.chunk_entity_relation_graph, "graph"),
+                    trace.wrap_storage(self.entities_vdb, "entities_vdb"),
+                    trace.wrap_storage(self.relationships_vdb, "relationships_vdb"),
+                    trace.wrap_storage(self.text_chunks, "text_chunks"),
+                    param,
+                    global_config,
+                    hashing_kv=self.llm_response_cache,
+                    system_prompt=system_prompt,
+                    chunks_vdb=trace.wrap_storage(self.chunks_vdb, "chunks_vdb"),
+                    context_cache=self.query_context_cache,
+                )
+            elif param.mode == "naive":
+                response = await naive_query(
+                    query.strip(),
+                    trace.wrap_storage(self.chunks_vdb, "chunks_vdb"),
+                    param,
+                    global_config,
+                    hashing_kv=self.llm_response_cache,
+                    system_prompt=system_prompt,
+                    context_cache=self.query_context_cache,
+                )
+            elif param.mode == "bypass":
+                # Bypass mode: directly use LLM without knowledge retrieval
+                use_llm_func = param.model_func or global_config["llm_model_func"]
+                # Apply higher priority (8) to entity/relation summary tasks
+                use_llm_func = partial(use_llm_func, _priority=8)
+
+                param.stream = True if param.stream is None else param.stream
+                with trace_stage("generation"):
+                    response = await use_llm_func(
+                        query.strip(),
+                        system_prompt=system_prompt,
+                        history_messages=param.conversation_history,
+                        stream=param.stream,
+                    )
+            else:
+                raise ValueError(f"Unknown mode {param.mode}")
+        finally:
+            deactivate_query_trace(trace_token)
+        await self._query_done()
+
+        if hasattr(response, "__aiter__"):
+            # Generation ends once the stream has been consumed
+            response = trace.wrap_stream(response)
         else:
+            trace.finish()
+        if param.enable_trace:
+            param.trace = trace
+        return response
+
+    async def aextract_keywords_batch(
+        self, queries: list[str], param: QueryParam = QueryParam()
+    ) -> list[tuple[list[str], list[str]]]:
+        """
+        Extract query keywords for several queries, batching the LLM calls.
+
+        Args:
+            queries (list[str]): The queries to extract keywords from.
+            param (QueryParam): Query parameters shared by the queries (mode, history, model_func).
+
+        Returns:
+            list: One (high_level_keywords, low_level_keywords) tuple per query.
+        """
+        keywords = await extract_keywords_batch(
+            [query.strip() for query in queries],
+            param,
+            asdict(self),
+            hashing_kv=self.llm_response_cache,
+        )
+        await self._query_done()
+        return keywords
+
+    def query_batch(
+        self,
+        queries: list[str],
+        param: QueryParam = QueryParam(),
+        system_prompt: str | None = None,
+    ) -> list[str | Iterator[str]]:
+        """Sync version of aquery_batch."""
+        loop = always_get_an_event_loop()
+
+        return loop.run_until_complete(
+            self.aquery_batch(queries, param, system_prompt)
+        )  # type: ignore
+
+    async def aquery_batch(
+        self,
+        queries: list[str],
+        param: QueryParam = QueryParam(),
+        system_prompt: str | None = None,
+    ) -> list[str | AsyncIterator[str]]:
+        """
+        Answer several queries at once, sharing retrieval work across the batch.
+
+        Vector search texts of all queries are embedded together and searched in
+        batch, graph and chunk lookups are deduplicated across queries, and the
+        answers are generated concurrently.
+
+        Args:
+            queries (list[str]): The queries to be executed.
+            param (QueryParam): Configuration parameters applied to every query.
+            system_prompt (Optional[str]): Custom system prompt, see aquery.
+
+        Returns:
+            list: One response per query, in input order.
+        """
+        if param.mode == "bypass":
+            return list(
+                await asyncio.gather(
+                    *[
+                        self.aquery(query, replace(param), system_prompt)
+                        for query in queries
+                    ]
+                )
+            )
+        if param.mode not in ["local", "global", "hybrid", "mix", "naive"]:
             raise ValueError(f"Unknown mode {param.mode}")
+
+        query_params = []
+        for query in queries:
+            query_param = replace(param)
+            # Save original query for vector search
+            query_param.original_query = query
+            query_params.append(query_param)
+
+        responses = await query_batch(
+            [query.strip() for query in queries],
+            query_params,
+            self.chunk_entity_relation_graph,
+            self.entities_vdb,
+            self.relationships_vdb,
+            self.text_chunks,
+            self.chunks_vdb,
+            asdict(self),
+            hashing_kv=self.llm_response_cache,
+            system_prompt=system_prompt,
+            context_cache=self.query_context_cache,
+        )
         await self._query_done()
-        return response
+        return responses
 
     # TODO: Deprecated, use user_prompt in QueryParam instead
     def query_with_separate_keyword_extraction(
@@ -1673,6 +1831,31 @@ class LightRAG:
         """
         return await self.doc_status.get_docs_by_status(status)
 
+    async def get_docs_paginated(
+        self,
+        status: DocStatus | None = None,
+        file_path_filter: str | None = None,
+        sort_field: str = "updated_at",
+        sort_direction: Literal["asc", "desc"] = "desc",
+        page_size: int = 50,
+        cursor: str | None = None,
+    ) -> DocStatusPage:
+        """Get one page of documents, filtered and sorted
+
+        Pass the next_cursor of a page to get the following one.
+
+        Raises:
+            ValueError: On an invalid sort, page size or cursor
+        """
+        return await self.doc_status.get_docs_paginated(
+            status=status,
+            file_path_filter=file_path_filter,
+            sort_field=sort_field,
+            sort_direction=sort_direction,
+            page_size=page_size,
+            cursor=cursor,
+        )
+
     async def aget_docs_by_ids(
         self, ids: str | list[str]
     ) -> dict[str, DocProcessingStatus]:
@@ -1755,300 +1938,347 @@ class LightRAG:
                 - `status_code` (int): HTTP status code (e.g., 200, 404, 500).
                 - `file_path` (str | None): The file path of the deleted document, if available.
         """
+        results = await self.adelete_by_doc_ids([doc_id])
+        return results[0]
+
+    async def adelete_by_doc_ids(self, doc_ids: list[str]) -> list[DeletionResult]:
+        """Delete several documents and all their related data at once.
+
+        Unlike calling `adelete_by_doc_id` for each document, the affected entities and
+        relationships are analyzed once for the union of the documents' chunks, the
+        partially affected ones are rebuilt once, and the storages are flushed once.
+        The documents are deleted together: if a step fails, every document found is
+        reported as failed.
+
+        Args:
+            doc_ids (list[str]): The unique identifiers of the documents to be deleted.
+
+        Returns:
+            list[DeletionResult]: The outcome for each document, in the order of `doc_ids`
+                (see `adelete_by_doc_id`).
+        """
         deletion_operations_started = False
         original_exception = None
+        results: dict[str, DeletionResult] = {}
+        # Documents found in doc status: doc_id -> file_path
+        found_docs: dict[str, str | None] = {}
+        chunkless_doc_ids: set[str] = set()
+        unique_doc_ids = list(dict.fromkeys(doc_ids))
+        target = (
+            f"document {unique_doc_ids[0]}"
+            if len(unique_doc_ids) == 1
+            else f"{len(unique_doc_ids)} documents"
+        )
 
         # Get pipeline status shared data and lock for status updates
         pipeline_status = await get_namespace_data("pipeline_status")
         pipeline_status_lock = get_pipeline_status_lock()
 
         async with pipeline_status_lock:
-            log_message = f"Starting deletion process for document {doc_id}"
+            log_message = f"Starting deletion process for {target}"
             logger.info(log_message)
             pipeline_status["latest_message"] = log_message
             pipeline_status["history_messages"].append(log_message)
 
         try:
-            # 1. Get the document status and related data
-            doc_status_data = await self.doc_status.get_by_id(doc_id)
-            file_path = doc_status_data.get("file_path") if doc_status_data else None
-            if not doc_status_data:
-                logger.warning(f"Document {doc_id} not found")
-                return DeletionResult(
-                    status="not_found",
+            # 1. Get the document statuses and related data in one read; missing
+            # documents are skipped, the others carry their ID in "_id"
+            doc_statuses = {
+                doc["_id"]: doc
+                for doc in await self.doc_status.get_by_ids(unique_doc_ids)
+                if doc
+            }
+
+            # 2. Collect the chunk IDs of all documents
+            chunk_ids = set()
+            for doc_id in unique_doc_ids:
+                doc_status_data = doc_statuses.get(doc_id)
+                if not doc_status_data:
+                    logger.warning(f"Document {doc_id} not found")
+                    results[doc_id] = DeletionResult(
+                        status="not_found",
+                        doc_id=doc_id,
+                        message=f"Document {doc_id} not found.",
+                        status_code=404,
+                        file_path="",
+                    )
+                    continue
+
+                found_docs[doc_id] = doc_status_data.get("file_path")
+                doc_chunk_ids = doc_status_data.get("chunks_list", [])
+                if not doc_chunk_ids:
+                    logger.warning(f"No chunks found for document {doc_id}")
+                    chunkless_doc_ids.add(doc_id)
+                chunk_ids.update(doc_chunk_ids)
+
+            if not found_docs:
+                return [results[doc_id] for doc_id in doc_ids]
+
+            # Mark that deletion operations have started
+            deletion_operations_started = True
+
+            # 3. Delete the chunks, then delete or rebuild the affected graph elements
+            if chunk_ids:
+                log_message = await self._delete_chunks_and_rebuild(
+                    chunk_ids, pipeline_status, pipeline_status_lock
+                )
+
+            # 4. Delete original documents and statuses
+            try:
+                await self.full_docs.delete(list(found_docs))
+                await self.doc_status.delete(list(found_docs))
+            except Exception as e:
+                logger.error(f"Failed to delete document and status: {e}")
+                raise Exception(f"Failed to delete document and status: {e}") from e
+
+            for doc_id, file_path in found_docs.items():
+                if doc_id in chunkless_doc_ids:
+                    message = f"Document {doc_id} is deleted without associated chunks."
+                    logger.info(message)
+                else:
+                    message = log_message
+                results[doc_id] = DeletionResult(
+                    status="success",
                     doc_id=doc_id,
-                    message=f"Document {doc_id} not found.",
-                    status_code=404,
-                    file_path="",
+                    message=message,
+                    status_code=200,
+                    file_path=file_path,
                 )
 
-            # 2. Get chunk IDs from document status
-            chunk_ids = set(doc_status_data.get("chunks_list", []))
+        except Exception as e:
+            original_exception = e
+            logger.error(f"Error while deleting {target}: {e}")
+            logger.error(traceback.format_exc())
+            for doc_id in unique_doc_ids:
+                if doc_id in results and doc_id not in found_docs:
+                    continue  # not found
+                results[doc_id] = DeletionResult(
+                    status="fail",
+                    doc_id=doc_id,
+                    message=f"Error while deleting document {doc_id}: {e}",
+                    status_code=500,
+                    file_path=found_docs.get(doc_id),
+                )
 
-            if not chunk_ids:
-                logger.warning(f"No chunks found for document {doc_id}")
-                # Mark that deletion operations have started
-                deletion_operations_started = True
+        finally:
+            # ALWAYS ensure persistence if any deletion operations were started
+            if deletion_operations_started:
                 try:
-                    # Still need to delete the doc status and full doc
-                    await self.full_docs.delete([doc_id])
-                    await self.doc_status.delete([doc_id])
-                    logger.info(f"Deleted document {doc_id} with no associated chunks")
-                except Exception as e:
-                    logger.error(
-                        f"Failed to delete document {doc_id} with no chunks: {e}"
+                    await self._insert_done()
+                except Exception as persistence_error:
+                    persistence_error_msg = f"Failed to persist data after deletion attempt for {target}: {persistence_error}"
+                    logger.error(persistence_error_msg)
+                    logger.error(traceback.format_exc())
+
+                    # If there was no original exception, this persistence error becomes the main error
+                    # Otherwise the original error results are kept
+                    if original_exception is None:
+                        for doc_id, file_path in found_docs.items():
+                            results[doc_id] = DeletionResult(
+                                status="fail",
+                                doc_id=doc_id,
+                                message=f"Deletion completed but failed to persist changes: {persistence_error}",
+                                status_code=500,
+                                file_path=file_path,
+                            )
+            else:
+                logger.debug(
+                    f"No deletion operations were started for {target}, skipping persistence"
+                )
+
+        return [results[doc_id] for doc_id in doc_ids]
+
+    async def _delete_chunks_and_rebuild(
+        self,
+        chunk_ids: set[str],
+        pipeline_status: dict,
+        pipeline_status_lock,
+    ) -> str:
+        """Delete chunks and the graph elements only they support, rebuild the others.
+
+        Entities and relationships whose sources are all among `chunk_ids` are deleted;
+        those keeping other sources are rebuilt from their remaining chunks.
+
+        Returns:
+            str: The last status message
+        """
+        # 1. Analyze entities and relationships that will be affected
+        entities_to_delete = set()
+        entities_to_rebuild = {}  # entity_name -> remaining_chunk_ids
+        relationships_to_delete = set()
+        relationships_to_rebuild = {}  # (src, tgt) -> remaining_chunk_ids
+
+        # Use graph database lock to ensure atomic merges and updates
+        graph_db_lock = get_graph_db_lock(enable_logging=False)
+        async with graph_db_lock:
+            try:
+                # Get all affected nodes and edges in batch
+                # logger.info(
+                #     f"Analyzing affected entities and relationships for {len(chunk_ids)} chunks"
+                # )
+                affected_nodes = (
+                    await self.chunk_entity_relation_graph.get_nodes_by_chunk_ids(
+                        list(chunk_ids)
                     )
-                    raise Exception(f"Failed to delete document entry: {e}") from e
+                )
+
+                affected_edges = (
+                    await self.chunk_entity_relation_graph.get_edges_by_chunk_ids(
+                        list(chunk_ids)
+                    )
+                )
+
+            except Exception as e:
+                logger.error(f"Failed to analyze affected graph elements: {e}")
+                raise Exception(f"Failed to analyze graph dependencies: {e}") from e
+
+            try:
+                # Process entities
+                for node_data in affected_nodes:
+                    node_label = node_data.get("entity_id")
+                    if node_label and "source_id" in node_data:
+                        sources = set(node_data["source_id"].split(GRAPH_FIELD_SEP))
+                        remaining_sources = sources - chunk_ids
+
+                        if not remaining_sources:
+                            entities_to_delete.add(node_label)
+                        elif remaining_sources != sources:
+                            entities_to_rebuild[node_label] = remaining_sources
 
                 async with pipeline_status_lock:
                     log_message = (
-                        f"Document {doc_id} is deleted without associated chunks."
+                        f"Found {len(entities_to_rebuild)} affected entities"
                     )
                     logger.info(log_message)
                     pipeline_status["latest_message"] = log_message
                     pipeline_status["history_messages"].append(log_message)
 
-                return DeletionResult(
-                    status="success",
-                    doc_id=doc_id,
-                    message=log_message,
-                    status_code=200,
-                    file_path=file_path,
-                )
+                # Process relationships
+                for edge_data in affected_edges:
+                    src = edge_data.get("source")
+                    tgt = edge_data.get("target")
 
-            # Mark that deletion operations have started
-            deletion_operations_started = True
+                    if src and tgt and "source_id" in edge_data:
+                        edge_tuple = tuple(sorted((src, tgt)))
+                        if (
+                            edge_tuple in relationships_to_delete
+                            or edge_tuple in relationships_to_rebuild
+                        ):
+                            continue
 
-            # 4. Analyze entities and relationships that will be affected
-            entities_to_delete = set()
-            entities_to_rebuild = {}  # entity_name -> remaining_chunk_ids
-            relationships_to_delete = set()
-            relationships_to_rebuild = {}  # (src, tgt) -> remaining_chunk_ids
+                        sources = set(edge_data["source_id"].split(GRAPH_FIELD_SEP))
+                        remaining_sources = sources - chunk_ids
 
-            # Use graph database lock to ensure atomic merges and updates
-            graph_db_lock = get_graph_db_lock(enable_logging=False)
-            async with graph_db_lock:
-                try:
-                    # Get all affected nodes and edges in batch
-                    # logger.info(
-                    #     f"Analyzing affected entities and relationships for {len(chunk_ids)} chunks"
-                    # )
-                    affected_nodes = (
-                        await self.chunk_entity_relation_graph.get_nodes_by_chunk_ids(
-                            list(chunk_ids)
-                        )
-                    )
+                        if not remaining_sources:
+                            relationships_to_delete.add(edge_tuple)
+                        elif remaining_sources != sources:
+                            relationships_to_rebuild[edge_tuple] = remaining_sources
 
-                    affected_edges = (
-                        await self.chunk_entity_relation_graph.get_edges_by_chunk_ids(
-                            list(chunk_ids)
-                        )
+                async with pipeline_status_lock:
+                    log_message = (
+                        f"Found {len(relationships_to_rebuild)} affected relations"
                     )
+                    logger.info(log_message)
+                    pipeline_status["latest_message"] = log_message
+                    pipeline_status["history_messages"].append(log_message)
 
-                except Exception as e:
-                    logger.error(f"Failed to analyze affected graph elements: {e}")
-                    raise Exception(f"Failed to analyze graph dependencies: {e}") from e
+            except Exception as e:
+                logger.error(f"Failed to process graph analysis results: {e}")
+                raise Exception(f"Failed to process graph dependencies: {e}") from e
 
+            # 2. Delete chunks from storage
+            if chunk_ids:
                 try:
-                    # Process entities
-                    for node_data in affected_nodes:
-                        node_label = node_data.get("entity_id")
-                        if node_label and "source_id" in node_data:
-                            sources = set(node_data["source_id"].split(GRAPH_FIELD_SEP))
-                            remaining_sources = sources - chunk_ids
-
-                            if not remaining_sources:
-                                entities_to_delete.add(node_label)
-                            elif remaining_sources != sources:
-                                entities_to_rebuild[node_label] = remaining_sources
+                    await self.chunks_vdb.delete(chunk_ids)
+                    await self.text_chunks.delete(chunk_ids)
 
                     async with pipeline_status_lock:
-                        log_message = (
-                            f"Found {len(entities_to_rebuild)} affected entities"
-                        )
+                        log_message = f"Successfully deleted {len(chunk_ids)} chunks from storage"
                         logger.info(log_message)
                         pipeline_status["latest_message"] = log_message
                         pipeline_status["history_messages"].append(log_message)
 
-                    # Process relationships
-                    for edge_data in affected_edges:
-                        src = edge_data.get("source")
-                        tgt = edge_data.get("target")
-
-                        if src and tgt and "source_id" in edge_data:
-                            edge_tuple = tuple(sorted((src, tgt)))
-                            if (
-                                edge_tuple in relationships_to_delete
-                                or edge_tuple in relationships_to_rebuild
-                            ):
-                                continue
-
-                            sources = set(edge_data["source_id"].split(GRAPH_FIELD_SEP))
-                            remaining_sources = sources - chunk_ids
+                except Exception as e:
+                    logger.error(f"Failed to delete chunks: {e}")
+                    raise Exception(f"Failed to delete document chunks: {e}") from e
 
-                            if not remaining_sources:
-                                relationships_to_delete.add(edge_tuple)
-                            elif remaining_sources != sources:
-                                relationships_to_rebuild[edge_tuple] = remaining_sources
+            # 3. Delete entities that have no remaining sources
+            if entities_to_delete:
+                try:
+                    # Delete from vector database
+                    entity_vdb_ids = [
+                        compute_mdhash_id(entity, prefix="ent-")
+                        for entity in entities_to_delete
+                    ]
+                    await self.entities_vdb.delete(entity_vdb_ids)
+
+                    # Delete from graph
+                    await self.chunk_entity_relation_graph.remove_nodes(
+                        list(entities_to_delete)
+                    )
 
                     async with pipeline_status_lock:
-                        log_message = (
-                            f"Found {len(relationships_to_rebuild)} affected relations"
-                        )
+                        log_message = f"Successfully deleted {len(entities_to_delete)} entities"
                         logger.info(log_message)
                         pipeline_status["latest_message"] = log_message
                         pipeline_status["history_messages"].append(log_message)
 
                 except Exception as e:
-                    logger.error(f"Failed to process graph analysis results: {e}")
-                    raise Exception(f"Failed to process graph dependencies: {e}") from e
-
-                # 5. Delete chunks from storage
-                if chunk_ids:
-                    try:
-                        await self.chunks_vdb.delete(chunk_ids)
-                        await self.text_chunks.delete(chunk_ids)
-
-                        async with pipeline_status_lock:
-                            log_message = f"Successfully deleted {len(chunk_ids)} chunks from storage"
-                            logger.info(log_message)
-                            pipeline_status["latest_message"] = log_message
-                            pipeline_status["history_messages"].append(log_message)
-
-                    except Exception as e:
-                        logger.error(f"Failed to delete chunks: {e}")
-                        raise Exception(f"Failed to delete document chunks: {e}") from e
-
-                # 6. Delete entities that have no remaining sources
-                if entities_to_delete:
-                    try:
-                        # Delete from vector database
-                        entity_vdb_ids = [
-                            compute_mdhash_id(entity, prefix="ent-")
-                            for entity in entities_to_delete
-                        ]
-                        await self.entities_vdb.delete(entity_vdb_ids)
-
-                        # Delete from graph
-                        await self.chunk_entity_relation_graph.remove_nodes(
-                            list(entities_to_delete)
-                        )
+                    logger.error(f"Failed to delete entities: {e}")
+                    raise Exception(f"Failed to delete entities: {e}") from e
 
-                        async with pipeline_status_lock:
-                            log_message = f"Successfully deleted {len(entities_to_delete)} entities"
-                            logger.info(log_message)
-                            pipeline_status["latest_message"] = log_message
-                            pipeline_status["history_messages"].append(log_message)
-
-                    except Exception as e:
-                        logger.error(f"Failed to delete entities: {e}")
-                        raise Exception(f"Failed to delete entities: {e}") from e
-
-                # 7. Delete relationships that have no remaining sources
-                if relationships_to_delete:
-                    try:
-                        # Delete from vector database
-                        rel_ids_to_delete = []
-                        for src, tgt in relationships_to_delete:
-                            rel_ids_to_delete.extend(
-                                [
-                                    compute_mdhash_id(src + tgt, prefix="rel-"),
-                                    compute_mdhash_id(tgt + src, prefix="rel-"),
-                                ]
-                            )
-                        await self.relationships_vdb.delete(rel_ids_to_delete)
-
-                        # Delete from graph
-                        await self.chunk_entity_relation_graph.remove_edges(
-                            list(relationships_to_delete)
-                        )
-
-                        async with pipeline_status_lock:
-                            log_message = f"Successfully deleted {len(relationships_to_delete)} relations"
-                            logger.info(log_message)
-                            pipeline_status["latest_message"] = log_message
-                            pipeline_status["history_messages"].append(log_message)
-
-                    except Exception as e:
-                        logger.error(f"Failed to delete relationships: {e}")
-                        raise Exception(f"Failed to delete relationships: {e}") from e
-
-                # 8. Rebuild entities and relationships from remaining chunks
-                if entities_to_rebuild or relationships_to_rebuild:
-                    try:
-                        await _rebuild_knowledge_from_chunks(
-                            entities_to_rebuild=entities_to_rebuild,
-                            relationships_to_rebuild=relationships_to_rebuild,
-                            knowledge_graph_inst=self.chunk_entity_relation_graph,
-                            entities_vdb=self.entities_vdb,
-                            relationships_vdb=self.relationships_vdb,
-                            text_chunks_storage=self.text_chunks,
-                            llm_response_cache=self.llm_response_cache,
-                            global_config=asdict(self),
-                            pipeline_status=pipeline_status,
-                            pipeline_status_lock=pipeline_status_lock,
+            # 4. Delete relationships that have no remaining sources
+            if relationships_to_delete:
+                try:
+                    # Delete from vector database
+                    rel_ids_to_delete = []
+                    for src, tgt in relationships_to_delete:
+                        rel_ids_to_delete.extend(
+                            [
+                                compute_mdhash_id(src + tgt, prefix="rel-"),
+                                compute_mdhash_id(tgt + src, prefix="rel-"),
+                            ]
                         )
+                    await self.relationships_vdb.delete(rel_ids_to_delete)
 
-                    except Exception as e:
-                        logger.error(f"Failed to rebuild knowledge from chunks: {e}")
-                        raise Exception(
-                            f"Failed to rebuild knowledge graph: {e}"
-                        ) from e
-
-            # 9. Delete original document and status
-            try:
-                await self.full_docs.delete([doc_id])
-                await self.doc_status.delete([doc_id])
-            except Exception as e:
-                logger.error(f"Failed to delete document and status: {e}")
-                raise Exception(f"Failed to delete document and status: {e}") from e
+                    # Delete from graph
+                    await self.chunk_entity_relation_graph.remove_edges(
+                        list(relationships_to_delete)
+                    )
 
-            return DeletionResult(
-                status="success",
-                doc_id=doc_id,
-                message=log_message,
-                status_code=200,
-                file_path=file_path,
-            )
+                    async with pipeline_status_lock:
+                        log_message = f"Successfully deleted {len(relationships_to_delete)} relations"
+                        logger.info(log_message)
+                        pipeline_status["latest_message"] = log_message
+                        pipeline_status["history_messages"].append(log_message)
 
-        except Exception as e:
-            original_exception = e
-            error_message = f"Error while deleting document {doc_id}: {e}"
-            logger.error(error_message)
-            logger.error(traceback.format_exc())
-            return DeletionResult(
-                status="fail",
-                doc_id=doc_id,
-                message=error_message,
-                status_code=500,
-                file_path=file_path,
-            )
+                except Exception as e:
+                    logger.error(f"Failed to delete relationships: {e}")
+                    raise Exception(f"Failed to delete relationships: {e}") from e
 
-        finally:
-            # ALWAYS ensure persistence if any deletion operations were started
-            if deletion_operations_started:
+            # 5. Rebuild entities and relationships from remaining chunks
+            if entities_to_rebuild or relationships_to_rebuild:
                 try:
-                    await self._insert_done()
-                except Exception as persistence_error:
-                    persistence_error_msg = f"Failed to persist data after deletion attempt for {doc_id}: {persistence_error}"
-                    logger.error(persistence_error_msg)
-                    logger.error(traceback.format_exc())
+                    await _rebuild_knowledge_from_chunks(
+                        entities_to_rebuild=entities_to_rebuild,
+                        relationships_to_rebuild=relationships_to_rebuild,
+                        knowledge_graph_inst=self.chunk_entity_relation_graph,
+                        entities_vdb=self.entities_vdb,
+                        relationships_vdb=self.relationships_vdb,
+                        text_chunks_storage=self.text_chunks,
+                        llm_response_cache=self.llm_response_cache,
+                        global_config=asdict(self),
+                        pipeline_status=pipeline_status,
+                        pipeline_status_lock=pipeline_status_lock,
+                    )
 
-                    # If there was no original exception, this persistence error becomes the main error
-                    if original_exception is None:
-                        return DeletionResult(
-                            status="fail",
-                            doc_id=doc_id,
-                            message=f"Deletion completed but failed to persist changes: {persistence_error}",
-                            status_code=500,
-                            file_path=file_path,
-                        )
-                    # If there was an original exception, log the persistence error but don't override the original error
-                    # The original error result was already returned in the except block
-            else:
-                logger.debug(
-                    f"No deletion operations were started for document {doc_id}, skipping persistence"
-                )
+                except Exception as e:
+                    logger.error(f"Failed to rebuild knowledge from chunks: {e}")
+                    raise Exception(
+                        f"Failed to rebuild knowledge graph: {e}"
+                    ) from e
+
+        return log_message
 
     async def adelete_by_entity(self, entity_name: str) -> DeletionResult:
         """Asynchronously delete an entity and all its relationships.
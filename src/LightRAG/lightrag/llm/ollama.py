@@ -25,12 +25,32 @@ from lightrag.exceptions import (
     APITimeoutError,
 )
 from lightrag.api import __api_version__
+from ..http_pool import get_httpx_client_kwargs, get_pooled_http_client
 
 import numpy as np
 from typing import Union
 from lightrag.utils import logger
 
 
+def _get_ollama_client(host, timeout, api_key) -> ollama.AsyncClient:
+    """Return the shared Ollama client for host/timeout/api_key, keeping connections alive."""
+    headers = {
+        "Content-Type": "application/json",
+        "User-Agent": f"LightRAG/{__api_version__}",
+    }
+    if api_key:
+        headers["Authorization"] = f"Bearer {api_key}"
+
+    return get_pooled_http_client(
+        "ollama",
+        (host, timeout, api_key),
+        lambda: ollama.AsyncClient(
+            host=host, timeout=timeout, headers=headers, **get_httpx_client_kwargs()
+        ),
+        close=lambda client: client._client.aclose(),
+    )
+
+
 @retry(
     stop=stop_after_attempt(3),
     wait=wait_exponential(multiplier=1, min=4, max=10),
@@ -53,71 +73,38 @@ async def _ollama_model_if_cache(
     timeout = kwargs.pop("timeout", None) or 600  # Default timeout 600s
     kwargs.pop("hashing_kv", None)
     api_key = kwargs.pop("api_key", None)
-    headers = {
-        "Content-Type": "application/json",
-        "User-Agent": f"LightRAG/{__api_version__}",
-    }
-    if api_key:
-        headers["Authorization"] = f"Bearer {api_key}"
 
-    ollama_client = ollama.AsyncClient(host=host, timeout=timeout, headers=headers)
+    ollama_client = _get_ollama_client(host, timeout, api_key)
 
-    try:
-        messages = []
-        if system_prompt:
-            messages.append({"role": "system", "content": system_prompt})
-        messages.extend(history_messages)
-        messages.append({"role": "user", "content": prompt})
-
-        response = await ollama_client.chat(model=model, messages=messages, **kwargs)
-        if stream:
-            """cannot cache stream response and process reasoning"""
-
-            async def inner():
-                try:
-                    async for chunk in response:
-                        yield chunk["message"]["content"]
-                except Exception as e:
-                    logger.error(f"Error in stream response: {str(e)}")
-                    raise
-                finally:
-                    try:
-                        await ollama_client._client.aclose()
-                        logger.debug("Successfully closed Ollama client for streaming")
-                    except Exception as close_error:
-                        logger.warning(f"Failed to close Ollama client: {close_error}")
-
-            return inner()
-        else:
-            model_response = response["message"]["content"]
-
-            """
-            If the model also wraps its thoughts in a specific tag,
-            this information is not needed for the final
-            response and can simply be trimmed.
-            """
-
-            return model_response
-    except Exception as e:
-        try:
-            await ollama_client._client.aclose()
-            logger.debug("Successfully closed Ollama client after exception")
-        except Exception as close_error:
-            logger.warning(
-                f"Failed to close Ollama client after exception: {close_error}"
-            )
-        raise e
-    finally:
-        if not stream:
+    messages = []
+    if system_prompt:
+        messages.append({"role": "system", "content": system_prompt})
+    messages.extend(history_messages)
+    messages.append({"role": "user", "content": prompt})
+
+    response = await ollama_client.chat(model=model, messages=messages, **kwargs)
+    if stream:
+        """cannot cache stream response and process reasoning"""
+
+        async def inner():
             try:
-                await ollama_client._client.aclose()
-                logger.debug(
-                    "Successfully closed Ollama client for non-streaming response"
-                )
-            except Exception as close_error:
-                logger.warning(
-                    f"Failed to close Ollama client in finally block: {close_error}"
-                )
+                async for chunk in response:
+                    yield chunk["message"]["content"]
+            except Exception as e:
+                logger.error(f"Error in stream response: {str(e)}")
+                raise
+
+        return inner()
+    else:
+        model_response = response["message"]["content"]
+
+        """
+        If the model also wraps its thoughts in a specific tag,
+        this information is not needed for the final
+        response and can simply be trimmed.
+        """
+
+        return model_response
 
 
 async def ollama_model_complete(
@@ -138,34 +125,14 @@ async def ollama_model_complete(
 
 async def ollama_embed(texts: list[str], embed_model, **kwargs) -> np.ndarray:
     api_key = kwargs.pop("api_key", None)
-    headers = {
-        "Content-Type": "application/json",
-        "User-Agent": f"LightRAG/{__api_version__}",
-    }
-    if api_key:
-        headers["Authorization"] = f"Bearer {api_key}"
-
     host = kwargs.pop("host", None)
     timeout = kwargs.pop("timeout", None) or 300  # Default time out 300s
 
-    ollama_client = ollama.AsyncClient(host=host, timeout=timeout, headers=headers)
+    ollama_client = _get_ollama_client(host, timeout, api_key)
 
     try:
         data = await ollama_client.embed(model=embed_model, input=texts)
         return np.array(data["embeddings"])
     except Exception as e:
         logger.error(f"Error in ollama_embed: {str(e)}")
-        try:
-            await ollama_client._client.aclose()
-            logger.debug("Successfully closed Ollama client after exception in embed")
-        except Exception as close_error:
-            logger.warning(
-                f"Failed to close Ollama client after exception in embed: {close_error}"
-            )
         raise e
-    finally:
-        try:
-            await ollama_client._client.aclose()
-            logger.debug("Successfully closed Ollama client after embed")
-        except Exception as close_error:
-            logger.warning(f"Failed to close Ollama client after embed: {close_error}")
@@ -33,6 +33,7 @@ from lightrag.utils import (
 )
 from lightrag.types import GPTKeywordExtractionFormat
 from lightrag.api import __api_version__
+from ..http_pool import get_httpx_client_kwargs, get_pooled_http_client
 
 import numpy as np
 from typing import Any, Union
@@ -68,6 +69,8 @@ def create_openai_async_client(
     Returns:
         An AsyncOpenAI client instance.
     """
+    import httpx
+
     if not api_key:
         api_key = os.environ["OPENAI_API_KEY"]
 
@@ -93,9 +96,43 @@ def create_openai_async_client(
             "OPENAI_API_BASE", "https://api.openai.com/v1"
         )
 
+    # Keep-alive connection pool (HTTP/2 when available) unless the caller brings its own
+    if "http_client" not in merged_configs:
+        merged_configs["http_client"] = httpx.AsyncClient(
+            follow_redirects=True, **get_httpx_client_kwargs()
+        )
+
     return AsyncOpenAI(**merged_configs)
 
 
+def get_openai_async_client(
+    api_key: str | None = None,
+    base_url: str | None = None,
+    client_configs: dict[str, Any] = None,
+) -> AsyncOpenAI:
+    """Return a process-wide AsyncOpenAI client shared by calls with the same configuration.
+
+    The client is built with `create_openai_async_client` on first use and kept open
+    so that its connections are reused. It is closed by
+    `lightrag.http_pool.release_http_clients` when the last LightRAG instance on
+    the event loop is finalized.
+    """
+    if client_configs is None:
+        client_configs = {}
+    key = (
+        api_key or os.environ.get("OPENAI_API_KEY"),
+        base_url or os.environ.get("OPENAI_API_BASE"),
+        repr(sorted(client_configs.items())),
+    )
+    return get_pooled_http_client(
+        "openai",
+        key,
+        lambda: create_openai_async_client(
+            api_key=api_key, base_url=base_url, client_configs=client_configs
+        ),
+    )
+
+
 @retry(
     stop=stop_after_attempt(3),
     wait=wait_exponential(multiplier=1, min=4, max=10),
@@ -152,8 +189,8 @@ async def openai_complete_if_cache(
     # Extract client configuration options
     client_configs = kwargs.pop("openai_client_configs", {})
 
-    # Create the OpenAI client
-    openai_async_client = create_openai_async_client(
+    # Get the shared OpenAI client
+    openai_async_client = get_openai_async_client(
         api_key=api_key, base_url=base_url, client_configs=client_configs
     )
 
@@ -188,21 +225,17 @@ async def openai_complete_if_cache(
             )
     except APIConnectionError as e:
         logger.error(f"OpenAI API Connection Error: {e}")
-        await openai_async_client.close()  # Ensure client is closed
         raise
     except RateLimitError as e:
         logger.error(f"OpenAI API Rate Limit Error: {e}")
-        await openai_async_client.close()  # Ensure client is closed
         raise
     except APITimeoutError as e:
         logger.error(f"OpenAI API Timeout Error: {e}")
-        await openai_async_client.close()  # Ensure client is closed
         raise
     except Exception as e:
         logger.error(
             f"OpenAI API Call Failed,\nModel: {model},\nParams: {kwargs}, Got: {e}"
         )
-        await openai_async_client.close()  # Ensure client is closed
         raise
 
     if hasattr(response, "__aiter__"):
@@ -271,8 +304,6 @@ async def openai_complete_if_cache(
                         logger.warning(
                             f"Failed to close stream response: {close_error}"
                         )
-                # Ensure client is closed in case of exception
-                await openai_async_client.close()
                 raise
             finally:
                 # Ensure resources are released even if no exception occurs
@@ -289,58 +320,39 @@ async def openai_complete_if_cache(
                             f"Failed to close stream response in finally block: {close_error}"
                         )
 
-                # This prevents resource leaks since the caller doesn't handle closing
-                try:
-                    await openai_async_client.close()
-                    logger.debug(
-                        "Successfully closed OpenAI client for streaming response"
-                    )
-                except Exception as client_close_error:
-                    logger.warning(
-                        f"Failed to close OpenAI client in streaming finally block: {client_close_error}"
-                    )
-
         return inner()
 
     else:
-        try:
-            if (
-                not response
-                or not response.choices
-                or not hasattr(response.choices[0], "message")
-                or not hasattr(response.choices[0].message, "content")
-            ):
-                logger.error("Invalid response from OpenAI API")
-                await openai_async_client.close()  # Ensure client is closed
-                raise InvalidResponseError("Invalid response from OpenAI API")
-
-            content = response.choices[0].message.content
-
-            if not content or content.strip() == "":
-                logger.error("Received empty content from OpenAI API")
-                await openai_async_client.close()  # Ensure client is closed
-                raise InvalidResponseError("Received empty content from OpenAI API")
-
-            if r"\u" in content:
-                content = safe_unicode_decode(content.encode("utf-8"))
-
-            if token_tracker and hasattr(response, "usage"):
-                token_counts = {
-                    "prompt_tokens": getattr(response.usage, "prompt_tokens", 0),
-                    "completion_tokens": getattr(
-                        response.usage, "completion_tokens", 0
-                    ),
-                    "total_tokens": getattr(response.usage, "total_tokens", 0),
-                }
-                token_tracker.add_usage(token_counts)
-
-            logger.debug(f"Response content len: {len(content)}")
-            verbose_debug(f"Response: {response}")
-
-            return content
-        finally:
-            # Ensure client is closed in all cases for non-streaming responses
-            await openai_async_client.close()
+        if (
+            not response
+            or not response.choices
+            or not hasattr(response.choices[0], "message")
+            or not hasattr(response.choices[0].message, "content")
+        ):
+            logger.error("Invalid response from OpenAI API")
+            raise InvalidResponseError("Invalid response from OpenAI API")
+
+        content = response.choices[0].message.content
+
+        if not content or content.strip() == "":
+            logger.error("Received empty content from OpenAI API")
+            raise InvalidResponseError("Received empty content from OpenAI API")
+
+        if r"\u" in content:
+            content = safe_unicode_decode(content.encode("utf-8"))
+
+        if token_tracker and hasattr(response, "usage"):
+            token_counts = {
+                "prompt_tokens": getattr(response.usage, "prompt_tokens", 0),
+                "completion_tokens": getattr(response.usage, "completion_tokens", 0),
+                "total_tokens": getattr(response.usage, "total_tokens", 0),
+            }
+            token_tracker.add_usage(token_counts)
+
+        logger.debug(f"Response content len: {len(content)}")
+        verbose_debug(f"Response: {response}")
+
+        return content
 
 
 async def openai_complete(
@@ -466,13 +478,12 @@ async def openai_embed(
         RateLimitError: If the OpenAI API rate limit is exceeded.
         APITimeoutError: If the OpenAI API request times out.
     """
-    # Create the OpenAI client
-    openai_async_client = create_openai_async_client(
+    # Get the shared OpenAI client
+    openai_async_client = get_openai_async_client(
         api_key=api_key, base_url=base_url, client_configs=client_configs
     )
 
-    async with openai_async_client:
-        response = await openai_async_client.embeddings.create(
-            model=model, input=texts, encoding_format="float"
-        )
-        return np.array([dp.embedding for dp in response.data])
+    response = await openai_async_client.embeddings.create(
+        model=model, input=texts, encoding_format="float"
+    )
+    return np.array([dp.embedding for dp in response.data])
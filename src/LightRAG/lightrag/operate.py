@@ -27,6 +27,7 @@ from .utils import (
     use_llm_func_with_cache,
     update_chunk_cache_list,
     remove_think_tags,
+    QueryContextCache,
 )
 from .base import (
     BaseGraphStorage,
@@ -38,6 +39,7 @@ from .base import (
 from .prompt import PROMPTS
 from .constants import GRAPH_FIELD_SEP
 from .kg.shared_storage import get_storage_keyed_lock
+from .query_trace import get_query_trace, trace_stage
 import time
 from dotenv import load_dotenv
 
@@ -263,6 +265,52 @@ async def _handle_single_relationship_extraction(
     )
 
 
+class _VectorUpsertBatch:
+    """Vector records collected across concurrent rebuild tasks
+
+    Records are embedded and upserted once `batch_size` of them are pending, and by
+    a final `flush`, instead of one embedding call per entity or relationship.
+    After a batch is upserted, its stale ids that were not upserted again are
+    deleted. A batch that fails keeps its stale records and is collected in
+    `failed` rather than raised into the task that happened to fill it. Provides
+    the `delete`/`upsert` subset of BaseVectorStorage used by the rebuild functions.
+    """
+
+    def __init__(self, vdb: BaseVectorStorage, batch_size: int):
+        self._vdb = vdb
+        self._batch_size = max(1, batch_size)
+        self._records: dict[str, dict] = {}
+        self._stale_ids: set[str] = set()
+        # Records of the batches that could not be upserted
+        self.failed: dict[str, dict] = {}
+
+    async def delete(self, ids: list[str]) -> None:
+        self._stale_ids.update(ids)
+
+    async def upsert(self, data: dict[str, dict]) -> None:
+        self._records.update(data)
+        if len(self._records) >= self._batch_size:
+            await self.flush()
+
+    async def flush(self) -> None:
+        # Swap the pending records out before awaiting, other tasks keep adding
+        records, self._records = self._records, {}
+        stale_ids, self._stale_ids = self._stale_ids, set()
+        if records:
+            try:
+                await self._vdb.upsert(records)
+            except Exception as e:
+                logger.error(f"Failed to upsert {len(records)} vector records: {e}")
+                self.failed.update(records)
+                return
+        stale_ids -= records.keys()
+        if stale_ids:
+            try:
+                await self._vdb.delete(list(stale_ids))
+            except Exception as e:
+                logger.warning(f"Could not delete stale vector records: {e}")
+
+
 async def _rebuild_knowledge_from_chunks(
     entities_to_rebuild: dict[str, set[str]],
     relationships_to_rebuild: dict[tuple[str, str], set[str]],
@@ -280,6 +328,8 @@ async def _rebuild_knowledge_from_chunks(
     This method uses cached LLM extraction results instead of calling LLM again,
     following the same approach as the insert process. Now with parallel processing
     controlled by llm_model_max_async and using get_storage_keyed_lock for data consistency.
+    Chunks and cache entries are read in bulk, and the rebuilt vector records are
+    re-embedded in batches shared by all entities and relationships.
 
     Args:
         entities_to_rebuild: Dict mapping entity_name -> set of remaining chunk_ids
@@ -312,7 +362,8 @@ async def _rebuild_knowledge_from_chunks(
 
     # Get cached extraction results for these chunks using storage
     #    cached_results： chunk_id -> [list of extraction result from LLM cache sorted by created_at]
-    cached_results = await _get_cached_extraction_results(
+    #    chunk_file_paths: chunk_id -> file_path of the chunk
+    cached_results, chunk_file_paths = await _get_cached_extraction_results(
         llm_response_cache,
         all_referenced_chunk_ids,
         text_chunks_storage=text_chunks_storage,
@@ -340,9 +391,9 @@ async def _rebuild_knowledge_from_chunks(
             # process multiple LLM extraction results for a single chunk_id
             for extraction_result in extraction_results:
                 entities, relationships = await _parse_extraction_result(
-                    text_chunks_storage=text_chunks_storage,
                     extraction_result=extraction_result,
                     chunk_id=chunk_id,
+                    file_path=chunk_file_paths.get(chunk_id, "unknown_source"),
                 )
 
                 # Merge entities and relationships from this extraction result
@@ -377,6 +428,13 @@ async def _rebuild_knowledge_from_chunks(
     graph_max_async = global_config.get("llm_model_max_async", 4) * 2
     semaphore = asyncio.Semaphore(graph_max_async)
 
+    # Vector records are re-embedded in batches shared by all rebuild tasks
+    vdb_batch_size = global_config.get("embedding_batch_num", 10) * global_config.get(
+        "embedding_func_max_async", 8
+    )
+    entities_vdb_batch = _VectorUpsertBatch(entities_vdb, vdb_batch_size)
+    relationships_vdb_batch = _VectorUpsertBatch(relationships_vdb, vdb_batch_size)
+
     # Counters for tracking progress
     rebuilt_entities_count = 0
     rebuilt_relationships_count = 0
@@ -394,7 +452,7 @@ async def _rebuild_knowledge_from_chunks(
                 try:
                     await _rebuild_single_entity(
                         knowledge_graph_inst=knowledge_graph_inst,
-                        entities_vdb=entities_vdb,
+                        entities_vdb=entities_vdb_batch,
                         entity_name=entity_name,
                         chunk_ids=chunk_ids,
                         chunk_entities=chunk_entities,
@@ -430,7 +488,7 @@ async def _rebuild_knowledge_from_chunks(
                 try:
                     await _rebuild_single_relationship(
                         knowledge_graph_inst=knowledge_graph_inst,
-                        relationships_vdb=relationships_vdb,
+                        relationships_vdb=relationships_vdb_batch,
                         src=src,
                         tgt=tgt,
                         chunk_ids=chunk_ids,
@@ -478,6 +536,33 @@ async def _rebuild_knowledge_from_chunks(
     # Execute all tasks in parallel with semaphore control
     await asyncio.gather(*tasks)
 
+    # Embed and upsert the remaining vector records
+    await entities_vdb_batch.flush()
+    await relationships_vdb_batch.flush()
+
+    # The graph data of these was rebuilt, but their vector records were not
+    failed_vdb_entities = {
+        record["entity_name"] for record in entities_vdb_batch.failed.values()
+    }
+    failed_vdb_relationships = {
+        (record["src_id"], record["tgt_id"])
+        for record in relationships_vdb_batch.failed.values()
+    }
+    if failed_vdb_entities or failed_vdb_relationships:
+        rebuilt_entities_count -= len(failed_vdb_entities)
+        failed_entities_count += len(failed_vdb_entities)
+        rebuilt_relationships_count -= len(failed_vdb_relationships)
+        failed_relationships_count += len(failed_vdb_relationships)
+        status_message = f"Failed to update the vector records of {len(failed_vdb_entities)} entities and {len(failed_vdb_relationships)} relationships"
+        logger.warning(
+            f"{status_message}: entities {sorted(failed_vdb_entities)}, "
+            f"relationships {sorted(failed_vdb_relationships)}"
+        )
+        if pipeline_status is not None and pipeline_status_lock is not None:
+            async with pipeline_status_lock:
+                pipeline_status["latest_message"] = status_message
+                pipeline_status["history_messages"].append(status_message)
+
     # Final status report
     status_message = f"KG rebuild completed: {rebuilt_entities_count} entities and {rebuilt_relationships_count} relationships rebuilt successfully."
     if failed_entities_count > 0 or failed_relationships_count > 0:
@@ -494,27 +579,32 @@ async def _get_cached_extraction_results(
     llm_response_cache: BaseKVStorage,
     chunk_ids: set[str],
     text_chunks_storage: BaseKVStorage,
-) -> dict[str, list[str]]:
+) -> tuple[dict[str, list[str]], dict[str, str]]:
     """Get cached extraction results for specific chunk IDs
 
+    Chunks and cache entries are each read with a single get_by_ids call.
+
     Args:
         llm_response_cache: LLM response cache storage
         chunk_ids: Set of chunk IDs to get cached results for
-        text_chunks_data: Pre-loaded chunk data (optional, for performance)
-        text_chunks_storage: Text chunks storage (fallback if text_chunks_data is None)
+        text_chunks_storage: Text chunks storage
 
     Returns:
-        Dict mapping chunk_id -> list of extraction_result_text
+        Tuple of (dict mapping chunk_id -> list of extraction_result_text,
+        dict mapping chunk_id -> file_path of the chunk)
     """
     cached_results = {}
+    chunk_file_paths = {}
 
     # Collect all LLM cache IDs from chunks
     all_cache_ids = set()
 
     # Read from storage
-    chunk_data_list = await text_chunks_storage.get_by_ids(list(chunk_ids))
-    for chunk_id, chunk_data in zip(chunk_ids, chunk_data_list):
+    chunk_id_list = list(chunk_ids)
+    chunk_data_list = await text_chunks_storage.get_by_ids(chunk_id_list)
+    for chunk_id, chunk_data in zip(chunk_id_list, chunk_data_list):
         if chunk_data and isinstance(chunk_data, dict):
+            chunk_file_paths[chunk_id] = chunk_data.get("file_path", "unknown_source")
             llm_cache_list = chunk_data.get("llm_cache_list", [])
             if llm_cache_list:
                 all_cache_ids.update(llm_cache_list)
@@ -525,14 +615,15 @@ async def _get_cached_extraction_results(
 
     if not all_cache_ids:
         logger.warning(f"No LLM cache IDs found for {len(chunk_ids)} chunk IDs")
-        return cached_results
+        return cached_results, chunk_file_paths
 
     # Batch get LLM cache entries
-    cache_data_list = await llm_response_cache.get_by_ids(list(all_cache_ids))
+    cache_id_list = list(all_cache_ids)
+    cache_data_list = await llm_response_cache.get_by_ids(cache_id_list)
 
     # Process cache entries and group by chunk_id
     valid_entries = 0
-    for cache_id, cache_entry in zip(all_cache_ids, cache_data_list):
+    for cache_id, cache_entry in zip(cache_id_list, cache_data_list):
         if (
             cache_entry is not None
             and isinstance(cache_entry, dict)
@@ -561,30 +652,23 @@ async def _get_cached_extraction_results(
     logger.info(
         f"Found {valid_entries} valid cache entries, {len(cached_results)} chunks with results"
     )
-    return cached_results
+    return cached_results, chunk_file_paths
 
 
 async def _parse_extraction_result(
-    text_chunks_storage: BaseKVStorage, extraction_result: str, chunk_id: str
+    extraction_result: str, chunk_id: str, file_path: str = "unknown_source"
 ) -> tuple[dict, dict]:
     """Parse cached extraction result using the same logic as extract_entities
 
     Args:
-        text_chunks_storage: Text chunks storage to get chunk data
         extraction_result: The cached LLM extraction result
         chunk_id: The chunk ID for source tracking
+        file_path: The file path of the chunk
 
     Returns:
         Tuple of (entities_dict, relationships_dict)
     """
 
-    # Get chunk data for file_path from storage
-    chunk_data = await text_chunks_storage.get_by_id(chunk_id)
-    file_path = (
-        chunk_data.get("file_path", "unknown_source")
-        if chunk_data
-        else "unknown_source"
-    )
     context_base = dict(
         tuple_delimiter=PROMPTS["DEFAULT_TUPLE_DELIMITER"],
         record_delimiter=PROMPTS["DEFAULT_RECORD_DELIMITER"],
@@ -722,8 +806,10 @@ async def _rebuild_single_entity(
         file_paths = set()
 
         # Get edge data for all connected relationships
-        for src_id, tgt_id in edges:
-            edge_data = await knowledge_graph_inst.get_edge(src_id, tgt_id)
+        edges_data = await knowledge_graph_inst.get_edges_batch(
+            [{"src": src_id, "tgt": tgt_id} for src_id, tgt_id in edges]
+        )
+        for edge_data in edges_data.values():
             if edge_data:
                 if edge_data.get("description"):
                     relationship_descriptions.append(edge_data["description"])
@@ -1557,6 +1643,7 @@ async def kg_query(
     hashing_kv: BaseKVStorage | None = None,
     system_prompt: str | None = None,
     chunks_vdb: BaseVectorStorage = None,
+    context_cache: QueryContextCache | None = None,
 ) -> str | AsyncIterator[str]:
     if query_param.model_func:
         use_model_func = query_param.model_func
@@ -1570,12 +1657,16 @@ async def kg_query(
     cached_response, quantized, min_val, max_val = await handle_cache(
         hashing_kv, args_hash, query, query_param.mode, cache_type="query"
     )
+    trace = get_query_trace()
     if cached_response is not None:
+        if trace is not None:
+            trace.count("llm_cache_hit")
         return cached_response
 
-    hl_keywords, ll_keywords = await get_keywords_from_query(
-        query, query_param, global_config, hashing_kv
-    )
+    with trace_stage("keyword_extraction"):
+        hl_keywords, ll_keywords = await get_keywords_from_query(
+            query, query_param, global_config, hashing_kv
+        )
 
     logger.debug(f"High-level keywords: {hl_keywords}")
     logger.debug(f"Low-level  keywords: {ll_keywords}")
@@ -1600,18 +1691,36 @@ async def kg_query(
     ll_keywords_str = ", ".join(ll_keywords) if ll_keywords else ""
     hl_keywords_str = ", ".join(hl_keywords) if hl_keywords else ""
 
-    # Build context
-    context = await _build_query_context(
-        query,
-        ll_keywords_str,
-        hl_keywords_str,
-        knowledge_graph_inst,
-        entities_vdb,
-        relationships_vdb,
-        text_chunks_db,
-        query_param,
-        chunks_vdb,
-    )
+    # Build context, reusing a cached one while the storages are unchanged
+    context = None
+    context_cache_key = None
+    if context_cache is not None:
+        context_cache_key = await context_cache.make_key(
+            *_query_context_cache_args(
+                query, ll_keywords_str, hl_keywords_str, query_param, global_config
+            )
+        )
+        context = context_cache.get(context_cache_key)
+        if context is not None:
+            logger.info("Query context cache hit")
+            if trace is not None:
+                trace.count("context_cache_hit")
+
+    if context is None:
+        with trace_stage("context_build"):
+            context = await _build_query_context(
+                query,
+                ll_keywords_str,
+                hl_keywords_str,
+                knowledge_graph_inst,
+                entities_vdb,
+                relationships_vdb,
+                text_chunks_db,
+                query_param,
+                chunks_vdb,
+            )
+        if context_cache_key is not None:
+            context_cache.put(context_cache_key, context)
 
     if query_param.only_need_context:
         return context if context is not None else PROMPTS["fail_response"]
@@ -1645,12 +1754,15 @@ async def kg_query(
     tokenizer: Tokenizer = global_config["tokenizer"]
     len_of_prompts = len(tokenizer.encode(query + sys_prompt))
     logger.debug(f"[kg_query]Prompt Tokens: {len_of_prompts}")
-
-    response = await use_model_func(
-        query,
-        system_prompt=sys_prompt,
-        stream=query_param.stream,
-    )
+    if trace is not None:
+        trace.add_tokens("prompt", len_of_prompts)
+
+    with trace_stage("generation"):
+        response = await use_model_func(
+            query,
+            system_prompt=sys_prompt,
+            stream=query_param.stream,
+        )
     if isinstance(response, str) and len(response) > len(sys_prompt):
         response = (
             response.replace(sys_prompt, "")
@@ -1661,6 +1773,8 @@ async def kg_query(
             .replace("</system>", "")
             .strip()
         )
+    if trace is not None and trace.detailed and isinstance(response, str):
+        trace.add_tokens("completion", len(tokenizer.encode(response)))
 
     if hashing_kv.global_config.get("enable_llm_cache"):
         # Save to cache
@@ -1681,6 +1795,36 @@ async def kg_query(
     return response
 
 
+def _query_context_cache_args(
+    query: str,
+    ll_keywords: str,
+    hl_keywords: str,
+    query_param: QueryParam,
+    global_config: dict[str, str],
+) -> tuple:
+    """Retrieval inputs that determine the context built for a query.
+
+    The raw query only matters when it is searched directly (mix/naive modes) or
+    used for reranking; otherwise the keywords fully determine the context.
+    """
+    query_dependent = query_param.mode in ("mix", "naive") or global_config.get(
+        "enable_rerank", False
+    )
+    return (
+        query_param.mode,
+        query if query_dependent else "",
+        ll_keywords,
+        hl_keywords,
+        query_param.top_k,
+        query_param.chunk_top_k,
+        query_param.chunk_rerank_top_k,
+        sorted(query_param.ids) if query_param.ids else None,
+        query_param.max_token_for_text_unit,
+        query_param.max_token_for_global_context,
+        query_param.max_token_for_local_context,
+    )
+
+
 async def get_keywords_from_query(
     query: str,
     query_param: QueryParam,
@@ -1723,8 +1867,15 @@ async def extract_keywords_only(
     Extract high-level and low-level keywords from the given 'text' using the LLM.
     This method does NOT build the final RAG context or provide a final answer.
     It ONLY extracts keywords (hl_keywords, ll_keywords).
+
+    If `keyword_extraction_func` is configured, it is used instead of the LLM.
     """
 
+    # 0. A local keyword extractor skips the LLM round trip entirely
+    local_extractor = global_config.get("keyword_extraction_func")
+    if local_extractor is not None:
+        return await local_extractor(text, param)
+
     # 1. Handle cache if needed - add cache type for keywords
     args_hash = compute_args_hash(param.mode, text)
     cached_response, quantized, min_val, max_val = await handle_cache(
@@ -1742,16 +1893,7 @@ async def extract_keywords_only(
             )
 
     # 2. Build the examples
-    example_number = global_config["addon_params"].get("example_number", None)
-    if example_number and example_number < len(PROMPTS["keywords_extraction_examples"]):
-        examples = "\n".join(
-            PROMPTS["keywords_extraction_examples"][: int(example_number)]
-        )
-    else:
-        examples = "\n".join(PROMPTS["keywords_extraction_examples"])
-    language = global_config["addon_params"].get(
-        "language", PROMPTS["DEFAULT_LANGUAGE"]
-    )
+    examples, language = _keyword_extraction_examples(global_config)
 
     # 3. Process conversation history
     history_context = ""
@@ -1818,6 +1960,187 @@ async def extract_keywords_only(
     return hl_keywords, ll_keywords
 
 
+def _keyword_extraction_examples(global_config: dict[str, str]) -> tuple[str, str]:
+    """Return the keyword extraction examples and language from the configuration."""
+    example_number = global_config["addon_params"].get("example_number", None)
+    if example_number and example_number < len(PROMPTS["keywords_extraction_examples"]):
+        examples = "\n".join(
+            PROMPTS["keywords_extraction_examples"][: int(example_number)]
+        )
+    else:
+        examples = "\n".join(PROMPTS["keywords_extraction_examples"])
+    language = global_config["addon_params"].get(
+        "language", PROMPTS["DEFAULT_LANGUAGE"]
+    )
+    return examples, language
+
+
+async def extract_keywords_batch(
+    texts: list[str],
+    param: QueryParam,
+    global_config: dict[str, str],
+    hashing_kv: BaseKVStorage | None = None,
+) -> list[tuple[list[str], list[str]]]:
+    """
+    Extract high-level and low-level keywords for several queries sharing `param`.
+
+    Cached keywords are reused and the remaining distinct queries are sent to the
+    LLM in groups of `keyword_extraction_batch_size`, one call per group. Queries
+    missing from a batched answer fall back to `extract_keywords_only`. If
+    `keyword_extraction_func` is configured, it is used instead of the LLM.
+
+    Returns:
+        One (hl_keywords, ll_keywords) tuple per input text, in input order.
+    """
+    local_extractor = global_config.get("keyword_extraction_func")
+    if local_extractor is not None:
+        return list(
+            await asyncio.gather(*[local_extractor(text, param) for text in texts])
+        )
+
+    results: list[tuple[list[str], list[str]] | None] = [None] * len(texts)
+    pending: dict[str, list[int]] = defaultdict(list)
+    for i, text in enumerate(texts):
+        args_hash = compute_args_hash(param.mode, text)
+        cached_response, _, _, _ = await handle_cache(
+            hashing_kv, args_hash, text, param.mode, cache_type="keywords"
+        )
+        if cached_response is not None:
+            try:
+                keywords_data = json.loads(cached_response)
+                results[i] = (
+                    keywords_data["high_level_keywords"],
+                    keywords_data["low_level_keywords"],
+                )
+                continue
+            except (json.JSONDecodeError, KeyError):
+                logger.warning(
+                    "Invalid cache format for keywords, proceeding with extraction"
+                )
+        pending[text].append(i)
+
+    pending_texts = list(pending)
+    batch_size = max(1, global_config.get("keyword_extraction_batch_size") or 1)
+    batches = [
+        pending_texts[i : i + batch_size]
+        for i in range(0, len(pending_texts), batch_size)
+    ]
+    batch_keywords = await asyncio.gather(
+        *[
+            _extract_keywords_single_call(batch, param, global_config, hashing_kv)
+            for batch in batches
+        ]
+    )
+    for batch, keywords in zip(batches, batch_keywords):
+        for text, text_keywords in zip(batch, keywords):
+            for i in pending[text]:
+                results[i] = text_keywords
+
+    return results
+
+
+async def _extract_keywords_single_call(
+    texts: list[str],
+    param: QueryParam,
+    global_config: dict[str, str],
+    hashing_kv: BaseKVStorage | None = None,
+) -> list[tuple[list[str], list[str]]]:
+    """Extract keywords for `texts` with one LLM call, caching each query's result."""
+    if len(texts) == 1:
+        return [await extract_keywords_only(texts[0], param, global_config, hashing_kv)]
+
+    examples, language = _keyword_extraction_examples(global_config)
+
+    history_context = ""
+    if param.conversation_history:
+        history_context = get_conversation_turns(
+            param.conversation_history, param.history_turns
+        )
+
+    queries_str = "\n".join(f"{i + 1}. {text}" for i, text in enumerate(texts))
+    kw_prompt = PROMPTS["keywords_extraction_batch"].format(
+        queries=queries_str,
+        examples=examples,
+        language=language,
+        history=history_context,
+    )
+
+    tokenizer: Tokenizer = global_config["tokenizer"]
+    len_of_prompts = len(tokenizer.encode(kw_prompt))
+    logger.debug(
+        f"[kg_query]Batched keyword prompt for {len(texts)} queries, tokens: {len_of_prompts}"
+    )
+
+    if param.model_func:
+        use_model_func = param.model_func
+    else:
+        use_model_func = global_config["llm_model_func"]
+        # Apply higher priority (5) to query relation LLM function
+        use_model_func = partial(use_model_func, _priority=5)
+
+    # The batched answer is keyed by query number, so the single-query
+    # keyword_extraction response format must not be forced here
+    result = remove_think_tags(await use_model_func(kw_prompt))
+    batch_data = {}
+    match = re.search(r"\{.*\}", result, re.DOTALL)
+    if match:
+        try:
+            batch_data = json.loads(match.group(0))
+        except json.JSONDecodeError as e:
+            logger.error(f"JSON parsing error in batched keyword extraction: {e}")
+    else:
+        logger.error("No JSON-like structure found in the batched keywords respond.")
+
+    results: list[tuple[list[str], list[str]] | None] = []
+    for i, text in enumerate(texts):
+        keywords_data = (
+            batch_data.get(str(i + 1)) if isinstance(batch_data, dict) else None
+        )
+        if not isinstance(keywords_data, dict):
+            results.append(None)
+            continue
+        hl_keywords = keywords_data.get("high_level_keywords", [])
+        ll_keywords = keywords_data.get("low_level_keywords", [])
+        results.append((hl_keywords, ll_keywords))
+
+        if (
+            (hl_keywords or ll_keywords)
+            and hashing_kv is not None
+            and hashing_kv.global_config.get("enable_llm_cache")
+        ):
+            cache_data = {
+                "high_level_keywords": hl_keywords,
+                "low_level_keywords": ll_keywords,
+            }
+            await save_to_cache(
+                hashing_kv,
+                CacheData(
+                    args_hash=compute_args_hash(param.mode, text),
+                    content=json.dumps(cache_data),
+                    prompt=text,
+                    mode=param.mode,
+                    cache_type="keywords",
+                ),
+            )
+
+    # Queries the batched answer did not cover are extracted one by one
+    missing = [i for i, keywords in enumerate(results) if keywords is None]
+    if missing:
+        logger.warning(
+            f"Batched keyword extraction missed {len(missing)} of {len(texts)} queries, retrying individually"
+        )
+        fallback = await asyncio.gather(
+            *[
+                extract_keywords_only(texts[i], param, global_config, hashing_kv)
+                for i in missing
+            ]
+        )
+        for i, keywords in zip(missing, fallback):
+            results[i] = keywords
+
+    return results
+
+
 async def _get_vector_context(
     query: str,
     chunks_vdb: BaseVectorStorage,
@@ -1841,7 +2164,10 @@ async def _get_vector_context(
         # Use chunk_top_k if specified, otherwise fall back to top_k
         search_top_k = query_param.chunk_top_k or query_param.top_k
 
-        results = await chunks_vdb.query(query, top_k=search_top_k, ids=query_param.ids)
+        with trace_stage("vector_search"):
+            results = await chunks_vdb.query(
+                query, top_k=search_top_k, ids=query_param.ids
+            )
         if not results:
             return []
 
@@ -2011,9 +2337,10 @@ async def _get_node_data(
         f"Query nodes: {query}, top_k: {query_param.top_k}, cosine: {entities_vdb.cosine_better_than_threshold}"
     )
 
-    results = await entities_vdb.query(
-        query, top_k=query_param.top_k, ids=query_param.ids
-    )
+    with trace_stage("vector_search"):
+        results = await entities_vdb.query(
+            query, top_k=query_param.top_k, ids=query_param.ids
+        )
 
     if not len(results):
         return "", "", ""
@@ -2022,10 +2349,11 @@ async def _get_node_data(
     node_ids = [r["entity_name"] for r in results]
 
     # Call the batch node retrieval and degree functions concurrently.
-    nodes_dict, degrees_dict = await asyncio.gather(
-        knowledge_graph_inst.get_nodes_batch(node_ids),
-        knowledge_graph_inst.node_degrees_batch(node_ids),
-    )
+    with trace_stage("graph_reads"):
+        nodes_dict, degrees_dict = await asyncio.gather(
+            knowledge_graph_inst.get_nodes_batch(node_ids),
+            knowledge_graph_inst.node_degrees_batch(node_ids),
+        )
 
     # Now, if you need the node data and degree in order:
     node_datas = [nodes_dict.get(nid) for nid in node_ids]
@@ -2059,12 +2387,13 @@ async def _get_node_data(
 
     tokenizer: Tokenizer = text_chunks_db.global_config.get("tokenizer")
     len_node_datas = len(node_datas)
-    node_datas = truncate_list_by_token_size(
-        node_datas,
-        key=lambda x: x["description"] if x["description"] is not None else "",
-        max_token_size=query_param.max_token_for_local_context,
-        tokenizer=tokenizer,
-    )
+    with trace_stage("token_truncation"):
+        node_datas = truncate_list_by_token_size(
+            node_datas,
+            key=lambda x: x["description"] if x["description"] is not None else "",
+            max_token_size=query_param.max_token_for_local_context,
+            tokenizer=tokenizer,
+        )
     logger.debug(
         f"Truncate entities from {len_node_datas} to {len(node_datas)} (max tokens:{query_param.max_token_for_local_context})"
     )
@@ -2135,7 +2464,10 @@ async def _find_most_related_text_unit_from_entities(
     ]
 
     node_names = [dp["entity_name"] for dp in node_datas]
-    batch_edges_dict = await knowledge_graph_inst.get_nodes_edges_batch(node_names)
+    with trace_stage("graph_reads"):
+        batch_edges_dict = await knowledge_graph_inst.get_nodes_edges_batch(
+            node_names
+        )
     # Build the edges list in the same order as node_datas.
     edges = [batch_edges_dict.get(name, []) for name in node_names]
 
@@ -2148,9 +2480,10 @@ async def _find_most_related_text_unit_from_entities(
     all_one_hop_nodes = list(all_one_hop_nodes)
 
     # Batch retrieve one-hop node data using get_nodes_batch
-    all_one_hop_nodes_data_dict = await knowledge_graph_inst.get_nodes_batch(
-        all_one_hop_nodes
-    )
+    with trace_stage("graph_reads"):
+        all_one_hop_nodes_data_dict = await knowledge_graph_inst.get_nodes_batch(
+            all_one_hop_nodes
+        )
     all_one_hop_nodes_data = [
         all_one_hop_nodes_data_dict.get(e) for e in all_one_hop_nodes
     ]
@@ -2175,12 +2508,13 @@ async def _find_most_related_text_unit_from_entities(
     batch_size = 5
     results = []
 
-    for i in range(0, len(tasks), batch_size):
-        batch_tasks = tasks[i : i + batch_size]
-        batch_results = await asyncio.gather(
-            *[text_chunks_db.get_by_id(c_id) for c_id, _, _ in batch_tasks]
-        )
-        results.extend(batch_results)
+    with trace_stage("chunk_reads"):
+        for i in range(0, len(tasks), batch_size):
+            batch_tasks = tasks[i : i + batch_size]
+            batch_results = await asyncio.gather(
+                *[text_chunks_db.get_by_id(c_id) for c_id, _, _ in batch_tasks]
+            )
+            results.extend(batch_results)
 
     for (c_id, index, this_edges), data in zip(tasks, results):
         all_text_units_lookup[c_id] = {
@@ -2231,7 +2565,10 @@ async def _find_most_related_edges_from_entities(
     knowledge_graph_inst: BaseGraphStorage,
 ):
     node_names = [dp["entity_name"] for dp in node_datas]
-    batch_edges_dict = await knowledge_graph_inst.get_nodes_edges_batch(node_names)
+    with trace_stage("graph_reads"):
+        batch_edges_dict = await knowledge_graph_inst.get_nodes_edges_batch(
+            node_names
+        )
 
     all_edges = []
     seen = set()
@@ -2251,10 +2588,11 @@ async def _find_most_related_edges_from_entities(
     edge_pairs_tuples = list(all_edges)  # all_edges is already a list of tuples
 
     # Call the batched functions concurrently.
-    edge_data_dict, edge_degrees_dict = await asyncio.gather(
-        knowledge_graph_inst.get_edges_batch(edge_pairs_dicts),
-        knowledge_graph_inst.edge_degrees_batch(edge_pairs_tuples),
-    )
+    with trace_stage("graph_reads"):
+        edge_data_dict, edge_degrees_dict = await asyncio.gather(
+            knowledge_graph_inst.get_edges_batch(edge_pairs_dicts),
+            knowledge_graph_inst.edge_degrees_batch(edge_pairs_tuples),
+        )
 
     # Reconstruct edge_datas list in the same order as the deduplicated results.
     all_edges_data = []
@@ -2278,12 +2616,13 @@ async def _find_most_related_edges_from_entities(
     all_edges_data = sorted(
         all_edges_data, key=lambda x: (x["rank"], x["weight"]), reverse=True
     )
-    all_edges_data = truncate_list_by_token_size(
-        all_edges_data,
-        key=lambda x: x["description"] if x["description"] is not None else "",
-        max_token_size=query_param.max_token_for_global_context,
-        tokenizer=tokenizer,
-    )
+    with trace_stage("token_truncation"):
+        all_edges_data = truncate_list_by_token_size(
+            all_edges_data,
+            key=lambda x: x["description"] if x["description"] is not None else "",
+            max_token_size=query_param.max_token_for_global_context,
+            tokenizer=tokenizer,
+        )
 
     logger.debug(
         f"Truncate relations from {len(all_edges)} to {len(all_edges_data)} (max tokens:{query_param.max_token_for_global_context})"
@@ -2303,9 +2642,10 @@ async def _get_edge_data(
         f"Query edges: {keywords}, top_k: {query_param.top_k}, cosine: {relationships_vdb.cosine_better_than_threshold}"
     )
 
-    results = await relationships_vdb.query(
-        keywords, top_k=query_param.top_k, ids=query_param.ids
-    )
+    with trace_stage("vector_search"):
+        results = await relationships_vdb.query(
+            keywords, top_k=query_param.top_k, ids=query_param.ids
+        )
 
     if not len(results):
         return "", "", ""
@@ -2317,10 +2657,11 @@ async def _get_edge_data(
     edge_pairs_tuples = [(r["src_id"], r["tgt_id"]) for r in results]
 
     # Call the batched functions concurrently.
-    edge_data_dict, edge_degrees_dict = await asyncio.gather(
-        knowledge_graph_inst.get_edges_batch(edge_pairs_dicts),
-        knowledge_graph_inst.edge_degrees_batch(edge_pairs_tuples),
-    )
+    with trace_stage("graph_reads"):
+        edge_data_dict, edge_degrees_dict = await asyncio.gather(
+            knowledge_graph_inst.get_edges_batch(edge_pairs_dicts),
+            knowledge_graph_inst.edge_degrees_batch(edge_pairs_tuples),
+        )
 
     # Reconstruct edge_datas list in the same order as results.
     edge_datas = []
@@ -2348,12 +2689,13 @@ async def _get_edge_data(
     edge_datas = sorted(
         edge_datas, key=lambda x: (x["rank"], x["weight"]), reverse=True
     )
-    edge_datas = truncate_list_by_token_size(
-        edge_datas,
-        key=lambda x: x["description"] if x["description"] is not None else "",
-        max_token_size=query_param.max_token_for_global_context,
-        tokenizer=tokenizer,
-    )
+    with trace_stage("token_truncation"):
+        edge_datas = truncate_list_by_token_size(
+            edge_datas,
+            key=lambda x: x["description"] if x["description"] is not None else "",
+            max_token_size=query_param.max_token_for_global_context,
+            tokenizer=tokenizer,
+        )
     use_entities, use_text_units = await asyncio.gather(
         _find_most_related_entities_from_relationships(
             edge_datas,
@@ -2446,10 +2788,11 @@ async def _find_most_related_entities_from_relationships(
             seen.add(e["tgt_id"])
 
     # Batch approach: Retrieve nodes and their degrees concurrently with one query each.
-    nodes_dict, degrees_dict = await asyncio.gather(
-        knowledge_graph_inst.get_nodes_batch(entity_names),
-        knowledge_graph_inst.node_degrees_batch(entity_names),
-    )
+    with trace_stage("graph_reads"):
+        nodes_dict, degrees_dict = await asyncio.gather(
+            knowledge_graph_inst.get_nodes_batch(entity_names),
+            knowledge_graph_inst.node_degrees_batch(entity_names),
+        )
 
     # Rebuild the list in the same order as entity_names
     node_datas = []
@@ -2465,12 +2808,13 @@ async def _find_most_related_entities_from_relationships(
 
     tokenizer: Tokenizer = knowledge_graph_inst.global_config.get("tokenizer")
     len_node_datas = len(node_datas)
-    node_datas = truncate_list_by_token_size(
-        node_datas,
-        key=lambda x: x["description"] if x["description"] is not None else "",
-        max_token_size=query_param.max_token_for_local_context,
-        tokenizer=tokenizer,
-    )
+    with trace_stage("token_truncation"):
+        node_datas = truncate_list_by_token_size(
+            node_datas,
+            key=lambda x: x["description"] if x["description"] is not None else "",
+            max_token_size=query_param.max_token_for_local_context,
+            tokenizer=tokenizer,
+        )
     logger.debug(
         f"Truncate entities from {len_node_datas} to {len(node_datas)} (max tokens:{query_param.max_token_for_local_context})"
     )
@@ -2506,7 +2850,8 @@ async def _find_related_text_unit_from_relationships(
         for c_id in unit_list:
             tasks.append(fetch_chunk_data(c_id, index))
 
-    await asyncio.gather(*tasks)
+    with trace_stage("chunk_reads"):
+        await asyncio.gather(*tasks)
 
     if not all_text_units_lookup:
         logger.warning("No valid text chunks found")
@@ -2543,6 +2888,7 @@ async def naive_query(
     global_config: dict[str, str],
     hashing_kv: BaseKVStorage | None = None,
     system_prompt: str | None = None,
+    context_cache: QueryContextCache | None = None,
 ) -> str | AsyncIterator[str]:
     if query_param.model_func:
         use_model_func = query_param.model_func
@@ -2556,39 +2902,58 @@ async def naive_query(
     cached_response, quantized, min_val, max_val = await handle_cache(
         hashing_kv, args_hash, query, query_param.mode, cache_type="query"
     )
+    trace = get_query_trace()
     if cached_response is not None:
+        if trace is not None:
+            trace.count("llm_cache_hit")
         return cached_response
 
     tokenizer: Tokenizer = global_config["tokenizer"]
 
-    chunks = await _get_vector_context(query, chunks_vdb, query_param)
+    # Reuse the chunk context built for the same query while the storages are unchanged
+    text_units_str = None
+    context_cache_key = None
+    if context_cache is not None:
+        context_cache_key = await context_cache.make_key(
+            *_query_context_cache_args(query, "", "", query_param, global_config)
+        )
+        text_units_str = context_cache.get(context_cache_key)
+        if text_units_str is not None:
+            logger.info("Query context cache hit")
+            if trace is not None:
+                trace.count("context_cache_hit")
 
-    if chunks is None or len(chunks) == 0:
-        return PROMPTS["fail_response"]
+    if text_units_str is None:
+        chunks = await _get_vector_context(query, chunks_vdb, query_param)
 
-    # Process chunks using unified processing
-    processed_chunks = await process_chunks_unified(
-        query=query,
-        chunks=chunks,
-        query_param=query_param,
-        global_config=global_config,
-        source_type="vector",
-    )
-
-    logger.info(f"Final context: {len(processed_chunks)} chunks")
+        if chunks is None or len(chunks) == 0:
+            return PROMPTS["fail_response"]
 
-    # Build text_units_context from processed chunks
-    text_units_context = []
-    for i, chunk in enumerate(processed_chunks):
-        text_units_context.append(
-            {
-                "id": i + 1,
-                "content": chunk["content"],
-                "file_path": chunk.get("file_path", "unknown_source"),
-            }
+        # Process chunks using unified processing
+        processed_chunks = await process_chunks_unified(
+            query=query,
+            chunks=chunks,
+            query_param=query_param,
+            global_config=global_config,
+            source_type="vector",
         )
 
-    text_units_str = json.dumps(text_units_context, ensure_ascii=False)
+        logger.info(f"Final context: {len(processed_chunks)} chunks")
+
+        # Build text_units_context from processed chunks
+        text_units_context = []
+        for i, chunk in enumerate(processed_chunks):
+            text_units_context.append(
+                {
+                    "id": i + 1,
+                    "content": chunk["content"],
+                    "file_path": chunk.get("file_path", "unknown_source"),
+                }
+            )
+
+        text_units_str = json.dumps(text_units_context, ensure_ascii=False)
+        if context_cache_key is not None:
+            context_cache.put(context_cache_key, text_units_str)
     if query_param.only_need_context:
         return f"""
 ---Document Chunks---
@@ -2624,12 +2989,15 @@ async def naive_query(
 
     len_of_prompts = len(tokenizer.encode(query + sys_prompt))
     logger.debug(f"[naive_query]Prompt Tokens: {len_of_prompts}")
-
-    response = await use_model_func(
-        query,
-        system_prompt=sys_prompt,
-        stream=query_param.stream,
-    )
+    if trace is not None:
+        trace.add_tokens("prompt", len_of_prompts)
+
+    with trace_stage("generation"):
+        response = await use_model_func(
+            query,
+            system_prompt=sys_prompt,
+            stream=query_param.stream,
+        )
 
     if isinstance(response, str) and len(response) > len(sys_prompt):
         response = (
@@ -2642,6 +3010,8 @@ async def naive_query(
             .replace("</system>", "")
             .strip()
         )
+    if trace is not None and trace.detailed and isinstance(response, str):
+        trace.add_tokens("completion", len(tokenizer.encode(response)))
 
     if hashing_kv.global_config.get("enable_llm_cache"):
         # Save to cache
@@ -2863,6 +3233,269 @@ async def query_with_keywords(
         raise ValueError(f"Unknown mode {param.mode}")
 
 
+class _SharedLookup:
+    """Memoizes keyed storage lookups so a batch of queries fetches each key once."""
+
+    def __init__(self, fetch_many):
+        self._fetch_many = fetch_many
+        self._futures: dict[Any, asyncio.Future] = {}
+
+    async def get_many(self, keys: list) -> dict:
+        missing = [k for k in dict.fromkeys(keys) if k not in self._futures]
+        if missing:
+            loop = asyncio.get_running_loop()
+            futures = {k: loop.create_future() for k in missing}
+            self._futures.update(futures)
+            try:
+                fetched = await self._fetch_many(missing)
+            except Exception as e:
+                for k, future in futures.items():
+                    self._futures.pop(k, None)
+                    future.set_exception(e)
+                    future.exception()  # mark as retrieved for waiters-less futures
+                raise
+            for k, future in futures.items():
+                future.set_result(fetched.get(k))
+        return {k: await self._futures[k] for k in keys}
+
+
+class _BatchVectorStorage:
+    """Serves prefetched batch search results, falling back to the wrapped storage."""
+
+    def __init__(self, storage: BaseVectorStorage):
+        self._storage = storage
+        self._results: dict[tuple, list[dict]] = {}
+
+    def __getattr__(self, name):
+        return getattr(self._storage, name)
+
+    def add_results(self, query: str, top_k: int, ids, results: list[dict]) -> None:
+        self._results[(query, top_k, tuple(ids) if ids else None)] = results
+
+    async def query(self, query: str, top_k: int, ids: list[str] | None = None):
+        results = self._results.get((query, top_k, tuple(ids) if ids else None))
+        if results is None:
+            return await self._storage.query(query, top_k=top_k, ids=ids)
+        return list(results)
+
+
+class _BatchKVStorage:
+    """Deduplicates text chunk lookups across the queries of a batch."""
+
+    def __init__(self, storage: BaseKVStorage):
+        self._storage = storage
+        self._lookup = _SharedLookup(self._fetch_many)
+
+    def __getattr__(self, name):
+        return getattr(self._storage, name)
+
+    async def _fetch_many(self, ids: list[str]) -> dict:
+        return dict(zip(ids, await self._storage.get_by_ids(ids)))
+
+    async def get_by_id(self, id: str):
+        return (await self._lookup.get_many([id]))[id]
+
+    async def get_by_ids(self, ids: list[str]):
+        found = await self._lookup.get_many(ids)
+        return [found[id] for id in ids]
+
+
+class _BatchGraphStorage:
+    """Deduplicates node/edge lookups across the queries of a batch."""
+
+    def __init__(self, storage: BaseGraphStorage):
+        self._storage = storage
+        self._nodes = _SharedLookup(storage.get_nodes_batch)
+        self._node_degrees = _SharedLookup(storage.node_degrees_batch)
+        self._nodes_edges = _SharedLookup(storage.get_nodes_edges_batch)
+        self._edge_degrees = _SharedLookup(storage.edge_degrees_batch)
+        self._edges = _SharedLookup(
+            lambda pairs: storage.get_edges_batch(
+                [{"src": src, "tgt": tgt} for src, tgt in pairs]
+            )
+        )
+
+    def __getattr__(self, name):
+        return getattr(self._storage, name)
+
+    async def get_nodes_batch(self, node_ids: list[str]) -> dict:
+        return await self._nodes.get_many(node_ids)
+
+    async def node_degrees_batch(self, node_ids: list[str]) -> dict:
+        return await self._node_degrees.get_many(node_ids)
+
+    async def get_nodes_edges_batch(self, node_ids: list[str]) -> dict:
+        return await self._nodes_edges.get_many(node_ids)
+
+    async def edge_degrees_batch(self, edge_pairs: list[tuple[str, str]]) -> dict:
+        return await self._edge_degrees.get_many([tuple(p) for p in edge_pairs])
+
+    async def get_edges_batch(self, pairs: list[dict[str, str]]) -> dict:
+        return await self._edges.get_many([(p["src"], p["tgt"]) for p in pairs])
+
+
+def _effective_query_mode(
+    mode: str, hl_keywords: list[str], ll_keywords: list[str]
+) -> str:
+    """Mode kg_query ends up using once empty keyword lists are accounted for."""
+    if not ll_keywords and mode in ["local", "hybrid"]:
+        mode = "global"
+    if not hl_keywords and mode in ["global", "hybrid"]:
+        mode = "local"
+    return mode
+
+
+async def query_batch(
+    queries: list[str],
+    query_params: list[QueryParam],
+    knowledge_graph_inst: BaseGraphStorage,
+    entities_vdb: BaseVectorStorage,
+    relationships_vdb: BaseVectorStorage,
+    text_chunks_db: BaseKVStorage,
+    chunks_vdb: BaseVectorStorage,
+    global_config: dict[str, str],
+    hashing_kv: BaseKVStorage | None = None,
+    system_prompt: str | None = None,
+    context_cache: QueryContextCache | None = None,
+) -> list[str | AsyncIterator[str]]:
+    """
+    Answer several queries while sharing retrieval work across the batch.
+
+    1. Keywords of graph-mode queries are extracted with batched LLM calls.
+    2. All vector search texts are embedded together and searched with
+       `BaseVectorStorage.query_batch`.
+    3. Graph and text chunk lookups go through batch-scoped memoizing wrappers, so
+       nodes, edges and chunks shared by several queries are fetched once.
+    4. Each query then runs the regular kg_query/naive_query path concurrently;
+       LLM concurrency stays bounded by the LLM function's own limiter.
+
+    Returns one response per query, in input order.
+    """
+    kg_modes = ("local", "global", "hybrid", "mix")
+    responses: list[str | AsyncIterator[str] | None] = [None] * len(queries)
+
+    # 1. Keywords for graph-based modes, extracted in batched LLM calls
+    kg_indices = [i for i, p in enumerate(query_params) if p.mode in kg_modes]
+    predefined = [
+        i
+        for i in kg_indices
+        if query_params[i].hl_keywords or query_params[i].ll_keywords
+    ]
+    to_extract = [i for i in kg_indices if i not in predefined]
+    keywords = [
+        (query_params[i].hl_keywords, query_params[i].ll_keywords) for i in predefined
+    ]
+    if to_extract:
+        keywords += await extract_keywords_batch(
+            [queries[i] for i in to_extract],
+            query_params[to_extract[0]],
+            global_config,
+            hashing_kv,
+        )
+    for i, (hl_keywords, ll_keywords) in zip(predefined + to_extract, keywords):
+        if not hl_keywords and not ll_keywords:
+            logger.warning("low_level_keywords and high_level_keywords is empty")
+            responses[i] = PROMPTS["fail_response"]
+            continue
+        query_params[i].hl_keywords = hl_keywords
+        query_params[i].ll_keywords = ll_keywords
+
+    # 2. Collect vector searches: (wrapper, text, top_k, ids)
+    batch_entities_vdb = _BatchVectorStorage(entities_vdb)
+    batch_relationships_vdb = _BatchVectorStorage(relationships_vdb)
+    batch_chunks_vdb = _BatchVectorStorage(chunks_vdb) if chunks_vdb else None
+    searches: dict[tuple, list[str]] = defaultdict(list)
+    for i, (query, param) in enumerate(zip(queries, query_params)):
+        if responses[i] is not None:
+            continue
+        mode = param.mode
+        if mode in kg_modes:
+            mode = _effective_query_mode(mode, param.hl_keywords, param.ll_keywords)
+            if mode in ("local", "hybrid", "mix") and param.ll_keywords:
+                key = (batch_entities_vdb, param.top_k, tuple(param.ids or ()))
+                searches[key].append(", ".join(param.ll_keywords))
+            if mode in ("global", "hybrid", "mix") and param.hl_keywords:
+                key = (batch_relationships_vdb, param.top_k, tuple(param.ids or ()))
+                searches[key].append(", ".join(param.hl_keywords))
+        if mode in ("mix", "naive") and batch_chunks_vdb is not None:
+            search_top_k = param.chunk_top_k or param.top_k
+            key = (batch_chunks_vdb, search_top_k, tuple(param.ids or ()))
+            searches[key].append(query)
+
+    # 3. Embed every distinct search text once, then search each storage in batch
+    search_texts = list(
+        dict.fromkeys(text for texts in searches.values() for text in texts)
+    )
+    if search_texts:
+        embedding_func = entities_vdb.embedding_func
+        batch_size = global_config.get("embedding_batch_num") or len(search_texts)
+        text_batches = [
+            search_texts[i : i + batch_size]
+            for i in range(0, len(search_texts), batch_size)
+        ]
+        embedding_batches = await asyncio.gather(
+            *[embedding_func(texts, _priority=5) for texts in text_batches]
+        )
+        text_embeddings = {
+            text: embedding
+            for texts, embeddings in zip(text_batches, embedding_batches)
+            for text, embedding in zip(texts, embeddings)
+        }
+
+        async def run_search(key: tuple, texts: list[str]) -> None:
+            wrapper, top_k, ids = key
+            texts = list(dict.fromkeys(texts))
+            results = await wrapper._storage.query_batch(
+                texts,
+                top_k=top_k,
+                ids=list(ids) or None,
+                embeddings=[text_embeddings[t] for t in texts],
+            )
+            for text, text_results in zip(texts, results):
+                wrapper.add_results(text, top_k, list(ids) or None, text_results)
+
+        await asyncio.gather(
+            *[run_search(key, texts) for key, texts in searches.items()]
+        )
+        logger.info(
+            f"Batch query: {len(search_texts)} distinct vector searches for {len(queries)} queries"
+        )
+
+    # 4. Build contexts and generate answers concurrently
+    batch_graph = _BatchGraphStorage(knowledge_graph_inst)
+    batch_text_chunks = _BatchKVStorage(text_chunks_db)
+
+    async def answer(i: int) -> str | AsyncIterator[str]:
+        if responses[i] is not None:
+            return responses[i]
+        param = query_params[i]
+        if param.mode == "naive":
+            return await naive_query(
+                queries[i],
+                batch_chunks_vdb,
+                param,
+                global_config,
+                hashing_kv=hashing_kv,
+                system_prompt=system_prompt,
+                context_cache=context_cache,
+            )
+        return await kg_query(
+            queries[i],
+            batch_graph,
+            batch_entities_vdb,
+            batch_relationships_vdb,
+            batch_text_chunks,
+            param,
+            global_config,
+            hashing_kv=hashing_kv,
+            system_prompt=system_prompt,
+            chunks_vdb=batch_chunks_vdb,
+            context_cache=context_cache,
+        )
+
+    return list(await asyncio.gather(*[answer(i) for i in range(len(queries))]))
+
+
 async def apply_rerank_if_enabled(
     query: str,
     retrieved_docs: list[dict],
@@ -2957,12 +3590,13 @@ async def process_chunks_unified(
     # 2. Apply reranking if enabled and query is provided
     if global_config.get("enable_rerank", False) and query and unique_chunks:
         rerank_top_k = query_param.chunk_rerank_top_k or len(unique_chunks)
-        unique_chunks = await apply_rerank_if_enabled(
-            query=query,
-            retrieved_docs=unique_chunks,
-            global_config=global_config,
-            top_k=rerank_top_k,
-        )
+        with trace_stage("rerank"):
+            unique_chunks = await apply_rerank_if_enabled(
+                query=query,
+                retrieved_docs=unique_chunks,
+                global_config=global_config,
+                top_k=rerank_top_k,
+            )
         logger.debug(f"Rerank: {len(unique_chunks)} chunks (source: {source_type})")
 
     # 3. Apply chunk_top_k limiting if specified
@@ -2977,12 +3611,13 @@ async def process_chunks_unified(
     tokenizer = global_config.get("tokenizer")
     if tokenizer and unique_chunks:
         original_count = len(unique_chunks)
-        unique_chunks = truncate_list_by_token_size(
-            unique_chunks,
-            key=lambda x: x.get("content", ""),
-            max_token_size=query_param.max_token_for_text_unit,
-            tokenizer=tokenizer,
-        )
+        with trace_stage("token_truncation"):
+            unique_chunks = truncate_list_by_token_size(
+                unique_chunks,
+                key=lambda x: x.get("content", ""),
+                max_token_size=query_param.max_token_for_text_unit,
+                tokenizer=tokenizer,
+            )
         logger.debug(
             f"Token truncation: {len(unique_chunks)} chunks from {original_count} "
             f"(max tokens: {query_param.max_token_for_text_unit}, source: {source_type})"
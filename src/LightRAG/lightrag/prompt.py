@@ -285,6 +285,43 @@ Output:
 
 """
 
+PROMPTS["keywords_extraction_batch"] = """---Role---
+
+You are a helpful assistant tasked with identifying both high-level and low-level keywords in each of several user queries, taking the conversation history into account.
+
+---Goal---
+
+Given the numbered queries and conversation history, list both high-level and low-level keywords for every query. High-level keywords focus on overarching concepts or themes, while low-level keywords focus on specific entities, details, or concrete terms.
+
+---Instructions---
+
+- Treat each query independently, considering the relevant conversation history
+- Output the keywords in JSON format, it will be parsed by a JSON parser, do not add any extra content in output
+- The JSON must be an object keyed by query number ("1", "2", ...), each value having two keys:
+  - "high_level_keywords" for overarching concepts or themes
+  - "low_level_keywords" for specific entities or details
+- For example, the output for two queries looks like:
+  {{"1": {{"high_level_keywords": [...], "low_level_keywords": [...]}}, "2": {{"high_level_keywords": [...], "low_level_keywords": [...]}}}}
+
+######################
+---Examples (one query each)---
+######################
+{examples}
+
+#############################
+---Real Data---
+######################
+Conversation History:
+{history}
+
+Queries:
+{queries}
+######################
+The `Output` should be human text, not unicode characters. Keep the same language as each query.
+Output:
+
+"""
+
 PROMPTS["keywords_extraction_examples"] = [
     """Example 1:
 
@@ -0,0 +1,228 @@
+"""
+Per-stage timing traces for queries.
+
+A `QueryTrace` is activated for the duration of `LightRAG.aquery`. Query code marks
+its stages with `trace_stage(...)`, which is a no-op when no trace is active. When the
+caller sets `QueryParam.enable_trace`, storages are additionally wrapped so every
+storage round trip is counted and timed, and the finished trace is attached to the
+query parameters as `param.trace`.
+
+Stage durations of every query are also aggregated into process-wide latency
+histograms, available through `get_query_latency_histograms`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from functools import wraps
+from typing import Any, AsyncIterator, Dict, Iterator, Optional
+
+# Upper bounds (milliseconds) of the latency histogram buckets
+LATENCY_BUCKETS_MS = (
+    1,
+    5,
+    10,
+    25,
+    50,
+    100,
+    250,
+    500,
+    1000,
+    2500,
+    5000,
+    10000,
+    30000,
+    60000,
+    float("inf"),
+)
+
+_current_trace: ContextVar[Optional["QueryTrace"]] = ContextVar(
+    "lightrag_query_trace", default=None
+)
+
+
+class LatencyHistograms:
+    """Cumulative latency histograms keyed by stage name."""
+
+    def __init__(self, buckets_ms: tuple = LATENCY_BUCKETS_MS):
+        self.buckets_ms = buckets_ms
+        self._counts: Dict[str, list[int]] = {}
+        self._sums_ms: Dict[str, float] = defaultdict(float)
+
+    def observe(self, name: str, duration_ms: float) -> None:
+        counts = self._counts.setdefault(name, [0] * len(self.buckets_ms))
+        for i, upper in enumerate(self.buckets_ms):
+            if duration_ms <= upper:
+                counts[i] += 1
+                break
+        self._sums_ms[name] += duration_ms
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return cumulative bucket counts, totals and sums for every stage."""
+        result = {}
+        for name, counts in self._counts.items():
+            cumulative, buckets = 0, {}
+            for upper, count in zip(self.buckets_ms, counts):
+                cumulative += count
+                buckets["+Inf" if upper == float("inf") else str(upper)] = cumulative
+            result[name] = {
+                "buckets_ms": buckets,
+                "count": cumulative,
+                "sum_ms": round(self._sums_ms[name], 3),
+            }
+        return result
+
+
+_query_latency_histograms = LatencyHistograms()
+
+
+def get_query_latency_histograms() -> Dict[str, Any]:
+    """Latency histograms of query stages observed by this process."""
+    return _query_latency_histograms.snapshot()
+
+
+class QueryTrace:
+    """Timing trace of a single query.
+
+    Stage durations accumulate, so a stage entered several times (e.g. one vector
+    search per keyword group) reports its total time and entry count. Stages that
+    run concurrently are each timed in full.
+    """
+
+    def __init__(self, detailed: bool = False):
+        self.detailed = detailed
+        self.stages_ms: Dict[str, float] = defaultdict(float)
+        self.stage_calls: Dict[str, int] = defaultdict(int)
+        self.storage_calls: Dict[str, int] = defaultdict(int)
+        self.storage_ms: Dict[str, float] = defaultdict(float)
+        self.counters: Dict[str, int] = defaultdict(int)
+        self.tokens: Dict[str, int] = defaultdict(int)
+        self._start = time.perf_counter()
+        self.total_ms: float | None = None
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages_ms[name] += (time.perf_counter() - start) * 1000
+            self.stage_calls[name] += 1
+
+    def count(self, name: str, n: int = 1) -> None:
+        self.counters[name] += n
+
+    def add_tokens(self, name: str, n: int) -> None:
+        self.tokens[name] += n
+
+    def record_storage_call(self, name: str, duration_ms: float) -> None:
+        self.storage_calls[name] += 1
+        self.storage_ms[name] += duration_ms
+
+    def wrap_storage(self, storage: Any, kind: str) -> Any:
+        """Wrap a storage so its async method calls are counted and timed."""
+        if storage is None or not self.detailed:
+            return storage
+        return _TracedStorage(storage, self, kind)
+
+    async def wrap_stream(self, stream: AsyncIterator[str]) -> AsyncIterator[str]:
+        """Time the consumption of a streamed answer, then finish the trace.
+
+        The generation stage was entered when the stream was opened; its
+        consumption is added to that entry rather than counted as a new one.
+        """
+        start = time.perf_counter()
+        try:
+            async for chunk in stream:
+                yield chunk
+        finally:
+            self.stages_ms["generation"] += (time.perf_counter() - start) * 1000
+            self.stage_calls["generation"] = max(1, self.stage_calls["generation"])
+            self.finish()
+
+    def finish(self) -> None:
+        """Close the trace and record its stage durations in the histograms."""
+        if self.total_ms is not None:
+            return
+        self.total_ms = (time.perf_counter() - self._start) * 1000
+        for name, duration_ms in self.stages_ms.items():
+            _query_latency_histograms.observe(name, duration_ms)
+        _query_latency_histograms.observe("total", self.total_ms)
+
+    def to_dict(self) -> Dict[str, Any]:
+        total_ms = self.total_ms
+        if total_ms is None:
+            total_ms = (time.perf_counter() - self._start) * 1000
+        return {
+            "total_ms": round(total_ms, 3),
+            "stages": {
+                name: {
+                    "ms": round(duration_ms, 3),
+                    "calls": self.stage_calls[name],
+                }
+                for name, duration_ms in self.stages_ms.items()
+            },
+            "storage_calls": {
+                name: {
+                    "calls": calls,
+                    "ms": round(self.storage_ms[name], 3),
+                }
+                for name, calls in self.storage_calls.items()
+            },
+            "counters": dict(self.counters),
+            "tokens": dict(self.tokens),
+        }
+
+
+class _TracedStorage:
+    """Proxy counting and timing every async method call of a storage."""
+
+    def __init__(self, storage: Any, trace: QueryTrace, kind: str):
+        self._storage = storage
+        self._trace = trace
+        self._kind = kind
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._storage, name)
+        if not asyncio.iscoroutinefunction(attr):
+            return attr
+
+        @wraps(attr)
+        async def traced(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return await attr(*args, **kwargs)
+            finally:
+                self._trace.record_storage_call(
+                    f"{self._kind}.{name}", (time.perf_counter() - start) * 1000
+                )
+
+        return traced
+
+
+def activate_query_trace(trace: QueryTrace) -> Token:
+    return _current_trace.set(trace)
+
+
+def deactivate_query_trace(token: Token) -> None:
+    _current_trace.reset(token)
+
+
+def get_query_trace() -> QueryTrace | None:
+    """Return the trace of the query being executed, if any."""
+    return _current_trace.get()
+
+
+@contextmanager
+def trace_stage(name: str) -> Iterator[None]:
+    """Time a query stage in the active trace; no-op outside a traced query."""
+    trace = _current_trace.get()
+    if trace is None:
+        yield
+        return
+    with trace.stage(name):
+        yield
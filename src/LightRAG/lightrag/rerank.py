@@ -5,9 +5,24 @@ import aiohttp
 from typing import Callable, Any, List, Dict, Optional
 from pydantic import BaseModel, Field
 
+from .http_pool import get_http_pool_config, get_pooled_http_client
 from .utils import logger
 
 
+def _get_rerank_session(base_url: str) -> aiohttp.ClientSession:
+    """Return the shared keep-alive session for a rerank endpoint."""
+
+    def create_session() -> aiohttp.ClientSession:
+        config = get_http_pool_config()
+        connector = aiohttp.TCPConnector(
+            limit=config["max_connections"],
+            keepalive_timeout=config["keepalive_expiry"],
+        )
+        return aiohttp.ClientSession(connector=connector)
+
+    return get_pooled_http_client("rerank", base_url, create_session)
+
+
 class RerankModel(BaseModel):
     """
     Pydantic model class for defining a custom rerank model.
@@ -166,33 +181,31 @@ async def generic_rerank_api(
         data["top_k"] = min(top_k, len(prepared_docs))
 
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.post(base_url, headers=headers, json=data) as response:
-                if response.status != 200:
-                    error_text = await response.text()
-                    logger.error(f"Rerank API error {response.status}: {error_text}")
-                    return documents
-
-                result = await response.json()
-
-                # Extract reranked results
-                if "results" in result:
-                    # Standard format: results contain index and relevance_score
-                    reranked_docs = []
-                    for item in result["results"]:
-                        if "index" in item:
-                            doc_idx = item["index"]
-                            if 0 <= doc_idx < len(documents):
-                                reranked_doc = documents[doc_idx].copy()
-                                if "relevance_score" in item:
-                                    reranked_doc["rerank_score"] = item[
-                                        "relevance_score"
-                                    ]
-                                reranked_docs.append(reranked_doc)
-                    return reranked_docs
-                else:
-                    logger.warning("Unexpected rerank API response format")
-                    return documents
+        session = _get_rerank_session(base_url)
+        async with session.post(base_url, headers=headers, json=data) as response:
+            if response.status != 200:
+                error_text = await response.text()
+                logger.error(f"Rerank API error {response.status}: {error_text}")
+                return documents
+
+            result = await response.json()
+
+            # Extract reranked results
+            if "results" in result:
+                # Standard format: results contain index and relevance_score
+                reranked_docs = []
+                for item in result["results"]:
+                    if "index" in item:
+                        doc_idx = item["index"]
+                        if 0 <= doc_idx < len(documents):
+                            reranked_doc = documents[doc_idx].copy()
+                            if "relevance_score" in item:
+                                reranked_doc["rerank_score"] = item["relevance_score"]
+                            reranked_docs.append(reranked_doc)
+                return reranked_docs
+            else:
+                logger.warning("Unexpected rerank API response format")
+                return documents
 
     except Exception as e:
         logger.error(f"Error during reranking: {e}")
@@ -0,0 +1,137 @@
+"""
+Micro-benchmark of the multi-process shared storage locks.
+
+Forks 1, 4 and 16 worker processes sharing the state created by
+initialize_share_data, like Gunicorn workers do, and measures the throughput of
+the global storage lock, the keyed locks and the update flags for each backend,
+along with the median and 99th percentile latency of one operation (for the locks,
+the wait to acquire plus the empty critical section).
+
+Usage:
+    python -m lightrag.tools.lock_benchmark [--iterations 2000] [--keys 64]
+"""
+
+import argparse
+import asyncio
+import multiprocessing as mp
+import time
+from typing import List, Tuple
+
+from lightrag.kg import shared_storage
+from lightrag.kg.shared_storage import (
+    finalize_share_data,
+    get_storage_keyed_lock,
+    get_storage_lock,
+    get_update_flag,
+    initialize_share_data,
+    set_all_update_flags,
+)
+
+BACKENDS = ("manager", "shared_memory")
+WORKER_COUNTS = (1, 4, 16)
+OPERATIONS = ("storage_lock", "keyed_lock", "update_flags")
+
+
+async def _run_operation(
+    operation: str, worker_id: int, iterations: int, keys: int
+) -> List[float]:
+    """Run the operation, returning the latency of each iteration in seconds"""
+    latencies = []
+    if operation == "update_flags":
+        await get_update_flag("benchmark")
+    for i in range(iterations):
+        started = time.perf_counter()
+        if operation == "storage_lock":
+            async with get_storage_lock():
+                pass
+        elif operation == "keyed_lock":
+            key = f"entity-{(worker_id * 7919 + i) % keys}"
+            async with get_storage_keyed_lock(key, namespace="benchmark"):
+                pass
+        else:
+            await set_all_update_flags("benchmark")
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+def _worker(operation, worker_id, iterations, keys, start_event, done_queue):
+    # Each forked worker resets its per-process asyncio gates, as a fresh
+    # Gunicorn worker would
+    shared_storage._async_locks = {
+        name: asyncio.Lock() for name in shared_storage._async_locks
+    }
+    shared_storage._storage_keyed_lock = shared_storage.KeyedUnifiedLock(
+        default_enable_logging=False
+    )
+    start_event.wait()
+    latencies = asyncio.run(_run_operation(operation, worker_id, iterations, keys))
+    done_queue.put(latencies)
+
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
+
+
+def run_benchmark(
+    backend: str, operation: str, workers: int, iterations: int, keys: int
+) -> Tuple[float, float, float]:
+    """Return the aggregate operations per second of `workers` processes and the
+    p50 and p99 latency of one operation in seconds"""
+    ctx = mp.get_context("fork")
+    start_event = ctx.Event()
+    done_queue = ctx.Queue()
+    processes = [
+        ctx.Process(
+            target=_worker,
+            args=(operation, i, iterations, keys, start_event, done_queue),
+        )
+        for i in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    started = time.perf_counter()
+    start_event.set()
+    latencies = []
+    for _ in processes:
+        latencies.extend(done_queue.get())
+    elapsed = time.perf_counter() - started
+    for process in processes:
+        process.join()
+    latencies.sort()
+    return (
+        workers * iterations / elapsed,
+        _percentile(latencies, 0.5),
+        _percentile(latencies, 0.99),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--keys", type=int, default=64)
+    args = parser.parse_args()
+
+    print(
+        f"{'backend':<15}{'operation':<15}{'workers':>8}{'ops/s':>14}"
+        f"{'p50 ms':>10}{'p99 ms':>10}"
+    )
+    for backend in BACKENDS:
+        # Any worker count above 1 selects the multi-process shared state
+        initialize_share_data(workers=max(WORKER_COUNTS), backend=backend)
+        try:
+            for operation in OPERATIONS:
+                for workers in WORKER_COUNTS:
+                    ops, p50, p99 = run_benchmark(
+                        backend, operation, workers, args.iterations, args.keys
+                    )
+                    print(
+                        f"{backend:<15}{operation:<15}{workers:>8}{ops:>14,.0f}"
+                        f"{p50 * 1000:>10.3f}{p99 * 1000:>10.3f}"
+                    )
+        finally:
+            finalize_share_data()
+
+
+if __name__ == "__main__":
+    main()
@@ -9,6 +9,7 @@ import logging
 import logging.handlers
 import os
 import re
+from collections import OrderedDict
 from dataclasses import dataclass
 from functools import wraps
 from hashlib import md5
@@ -117,6 +118,8 @@ class LightragPathFilter(logging.Filter):
         self.filtered_paths = [
             "/documents",
             "/health",
+            "/health/live",
+            "/health/ready",
             "/webui/",
             "/documents/pipeline_status",
         ]
@@ -943,6 +946,56 @@ async def save_to_cache(hashing_kv, cache_data: CacheData):
     await hashing_kv.upsert({flattened_key: cache_entry})
 
 
+class QueryContextCache:
+    """Process-local LRU cache of retrieval contexts built for queries.
+
+    Keys combine the retrieval inputs with the storage generation, so any insert or
+    deletion that bumps the generation (see `bump_storage_generation`) invalidates
+    every cached context without explicit bookkeeping.
+    """
+
+    def __init__(self, max_size: int = 256):
+        self.max_size = max_size
+        self._entries: OrderedDict[str, Any] = OrderedDict()
+        self._generation: int | None = None
+        self.hits = 0
+        self.misses = 0
+
+    async def make_key(self, *args: Any) -> str:
+        """Build a cache key for the retrieval inputs at the current storage generation."""
+        from .kg.shared_storage import get_storage_generation
+
+        generation = await get_storage_generation()
+        if generation != self._generation:
+            # Data changed since the entries were built: they can never hit again
+            self._entries.clear()
+            self._generation = generation
+        return compute_args_hash(generation, *args)
+
+    def get(self, key: str) -> Any | None:
+        value = self._entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: str, value: Any) -> None:
+        if value is None or self.max_size <= 0:
+            return
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        return {"size": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
 def safe_unicode_decode(content):
     # Regular expression to find all Unicode escape sequences of the form \uXXXX
     unicode_escape_pattern = re.compile(r"\\u([0-9a-fA-F]{4})")
@@ -1406,12 +1459,13 @@ def export_data(
 
 def lazy_external_import(module_name: str, class_name: str) -> Callable[..., Any]:
     """Lazily import a class from an external module based on the package of the caller."""
-    # Get the caller's module and package
+    # Get the caller's package. Read from the frame rather than looked up by file
+    # name, which is ambiguous when the package is imported under two names
+    # (lightrag and src.LightRAG.lightrag)
     import inspect
 
     caller_frame = inspect.currentframe().f_back
-    module = inspect.getmodule(caller_frame)
-    package = module.__package__ if module else None
+    package = caller_frame.f_globals.get("__package__") if caller_frame else None
 
     def import_class(*args: Any, **kwargs: Any):
         import importlib
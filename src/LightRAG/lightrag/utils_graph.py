@@ -5,7 +5,7 @@ import asyncio
 from typing import Any, cast
 
 from .base import DeletionResult
-from .kg.shared_storage import get_graph_db_lock
+from .kg.shared_storage import bump_storage_generation, get_graph_db_lock
 from .constants import GRAPH_FIELD_SEP
 from .utils import compute_mdhash_id, logger
 from .base import StorageNameSpace
@@ -79,6 +79,7 @@ async def _delete_by_entity_done(
             ]
         ]
     )
+    await bump_storage_generation()
 
 
 async def adelete_by_relation(
@@ -158,6 +159,7 @@ async def _delete_relation_done(relationships_vdb, chunk_entity_relation_graph)
             ]
         ]
     )
+    await bump_storage_generation()
 
 
 async def aedit_entity(
@@ -370,6 +372,7 @@ async def _edit_entity_done(
             ]
         ]
     )
+    await bump_storage_generation()
 
 
 async def aedit_relation(
@@ -486,6 +489,7 @@ async def _edit_relation_done(relationships_vdb, chunk_entity_relation_graph) ->
             ]
         ]
     )
+    await bump_storage_generation()
 
 
 async def acreate_entity(
@@ -1058,6 +1062,7 @@ async def _merge_entities_done(
             ]
         ]
     )
+    await bump_storage_generation()
 
 
 async def get_entity_info(
@@ -0,0 +1,201 @@
+"""
+Two instances of an in-memory storage on the same namespace must converge when
+one of them falls further behind than the change journal reaches while holding
+unsaved changes: it reloads the file and keeps its own changes.
+
+Run with: pytest src/LightRAG/tests/test_change_journal.py
+"""
+
+import asyncio
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lightrag.kg import shared_storage
+from lightrag.kg.shared_storage import finalize_share_data, initialize_share_data
+from lightrag.utils import EmbeddingFunc
+
+DIM = 8
+JOURNAL_ENTRIES = 2
+
+
+async def _embed(texts, **kwargs):
+    return np.array(
+        [
+            np.random.default_rng(abs(hash(text)) % (2**32)).random(DIM)
+            for text in texts
+        ],
+        dtype=np.float32,
+    )
+
+
+def _global_config(working_dir):
+    return {
+        "working_dir": str(working_dir),
+        "embedding_batch_num": 4,
+        "vector_db_storage_cls_kwargs": {"cosine_better_than_threshold": 0.0},
+    }
+
+
+def _vector_storage_classes():
+    from lightrag.kg.nano_vector_db_impl import NanoVectorDBStorage
+
+    classes = [NanoVectorDBStorage]
+    try:
+        from lightrag.kg.faiss_impl import FaissVectorDBStorage
+
+        classes.append(FaissVectorDBStorage)
+    except ImportError:
+        pass
+    return classes
+
+
+@pytest.fixture
+def shared_data(monkeypatch):
+    initialize_share_data(1)
+    monkeypatch.setattr(shared_storage, "CHANGE_JOURNAL_MAX_ENTRIES", JOURNAL_ENTRIES)
+    yield
+    finalize_share_data()
+
+
+@pytest.mark.parametrize("storage_cls", _vector_storage_classes())
+def test_vector_instances_converge_after_journal_overflow(
+    storage_cls, tmp_path, shared_data
+):
+    def make_storage():
+        return storage_cls(
+            namespace="entities",
+            workspace="",
+            global_config=_global_config(tmp_path),
+            embedding_func=EmbeddingFunc(
+                embedding_dim=DIM, max_token_size=512, func=_embed
+            ),
+            meta_fields={"content"},
+        )
+
+    async def run():
+        first, second = make_storage(), make_storage()
+        await first.initialize()
+        await second.initialize()
+
+        # Unsaved change of the second instance
+        await second.upsert({"late": {"content": "late"}})
+        # More saves of the first instance than the journal keeps
+        for i in range(JOURNAL_ENTRIES + 2):
+            await first.upsert({f"early-{i}": {"content": f"early {i}"}})
+            await first.index_done_callback()
+
+        await second.index_done_callback()
+        await first.index_done_callback()
+
+        ids = ["late"] + [f"early-{i}" for i in range(JOURNAL_ENTRIES + 2)]
+        found = []
+        for storage in (first, second):
+            found.append([await storage.get_by_id(id_) is not None for id_ in ids])
+        return found
+
+    first_found, second_found = asyncio.run(run())
+    assert all(first_found)
+    assert all(second_found)
+
+
+def test_graph_instances_converge_after_journal_overflow(tmp_path, shared_data):
+    from lightrag.kg.networkx_impl import NetworkXStorage
+
+    def make_storage():
+        return NetworkXStorage(
+            namespace="chunk_entity_relation",
+            workspace="",
+            global_config=_global_config(tmp_path),
+            embedding_func=None,
+        )
+
+    async def run():
+        first, second = make_storage(), make_storage()
+        await first.initialize()
+        await second.initialize()
+
+        await second.upsert_node("late", {"entity_type": "test"})
+        for i in range(JOURNAL_ENTRIES + 2):
+            await first.upsert_node(f"early-{i}", {"entity_type": "test"})
+            await first.index_done_callback()
+
+        await second.index_done_callback()
+        await first.index_done_callback()
+
+        ids = ["late"] + [f"early-{i}" for i in range(JOURNAL_ENTRIES + 2)]
+        return [
+            [await storage.has_node(node_id) for node_id in ids]
+            for storage in (first, second)
+        ]
+
+    first_found, second_found = asyncio.run(run())
+    assert all(first_found)
+    assert all(second_found)
+
+
+def test_journal_is_capped_by_size(monkeypatch, shared_data):
+    monkeypatch.setattr(shared_storage, "CHANGE_JOURNAL_MAX_BYTES", 1000)
+    monkeypatch.setattr(shared_storage, "CHANGE_JOURNAL_MAX_ENTRIES", 100)
+
+    async def run():
+        await shared_storage.register_change_reader("ns")
+        start = await shared_storage.register_change_reader("ns")
+        small = [("delete", ["a"])]
+        generations = [
+            await shared_storage.publish_changes("ns", small) for _ in range(3)
+        ]
+        sizes = await shared_storage.get_namespace_data("ns_journal_sizes")
+        replayed = await shared_storage.get_changes_since("ns", start)
+
+        # Too large to journal at all
+        await shared_storage.publish_changes("ns", [("delete", ["x" * 2000])])
+        after_large = await shared_storage.get_changes_since("ns", generations[-1])
+        # Older entries are dropped once the total size exceeds the cap
+        for _ in range(40):
+            await shared_storage.publish_changes("ns", small)
+        return dict(sizes), replayed, after_large
+
+    sizes, replayed, after_large = asyncio.run(run())
+    assert replayed[1] == [("delete", ["a"])] * 3
+    assert after_large[1] is None
+    assert 0 < sum(sizes.values()) <= 1000
+    assert len(sizes) < 40
+
+
+def test_finalized_instances_stop_reading_the_journal(tmp_path, shared_data):
+    from lightrag.kg.nano_vector_db_impl import NanoVectorDBStorage
+
+    def make_storage():
+        return NanoVectorDBStorage(
+            namespace="entities",
+            workspace="",
+            global_config=_global_config(tmp_path),
+            embedding_func=EmbeddingFunc(
+                embedding_dim=DIM, max_token_size=512, func=_embed
+            ),
+            meta_fields={"content"},
+        )
+
+    async def run():
+        first, second = make_storage(), make_storage()
+        await first.initialize()
+        await second.initialize()
+        readers = [await shared_storage.get_shared_counter("entities_readers")]
+        await second.finalize()
+        await second.finalize()
+        readers.append(await shared_storage.get_shared_counter("entities_readers"))
+
+        # Nobody else replays the changes of the remaining instance
+        await first.upsert({"a": {"content": "a"}})
+        await first.index_done_callback()
+        journal = await shared_storage.get_namespace_data("entities_journal")
+        return readers, len(journal)
+
+    readers, journaled = asyncio.run(run())
+    assert readers == [2, 1]
+    assert journaled == 0
@@ -0,0 +1,111 @@
+"""
+adelete_by_doc_ids reads the statuses of all documents at once and reports each
+document, found or not, in the order it was requested.
+
+Run with: pytest src/LightRAG/tests/test_delete_documents.py
+"""
+
+import asyncio
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lightrag import LightRAG
+from lightrag.kg.json_doc_status_impl import JsonDocStatusStorage
+from lightrag.kg.shared_storage import (
+    finalize_share_data,
+    initialize_pipeline_status,
+    initialize_share_data,
+)
+from lightrag.utils import EmbeddingFunc, Tokenizer
+
+DIM = 8
+
+
+class _CharTokenizer:
+    def encode(self, content: str) -> list[int]:
+        return [ord(c) for c in content]
+
+    def decode(self, tokens: list[int]) -> str:
+        return "".join(chr(t) for t in tokens)
+
+
+async def _embed(texts, **kwargs):
+    return np.ones((len(texts), DIM), dtype=np.float32)
+
+
+async def _llm(prompt, **kwargs):
+    return ""
+
+
+def _doc_status(file_path: str) -> dict:
+    return {
+        "content": f"content of {file_path}",
+        "content_summary": file_path,
+        "content_length": 10,
+        "status": "processed",
+        "chunks_count": 0,
+        "chunks_list": [],
+        "created_at": "2025-01-01T00:00:00+00:00",
+        "updated_at": "2025-01-01T00:00:00+00:00",
+        "file_path": file_path,
+    }
+
+
+@pytest.fixture
+def shared_data():
+    initialize_share_data(1)
+    yield
+    finalize_share_data()
+
+
+def test_json_doc_status_get_by_ids_tags_records(tmp_path, shared_data):
+    async def run():
+        storage = JsonDocStatusStorage(
+            namespace="doc_status",
+            workspace="",
+            global_config={"working_dir": str(tmp_path)},
+            embedding_func=None,
+        )
+        await storage.initialize()
+        await storage.upsert({"doc-1": _doc_status("a.txt")})
+        records = await storage.get_by_ids(["missing", "doc-1"])
+        stored = await storage.get_by_id("doc-1")
+        return records, stored
+
+    records, stored = asyncio.run(run())
+    assert [record["_id"] for record in records] == ["doc-1"]
+    assert records[0]["file_path"] == "a.txt"
+    # The stored record is not modified
+    assert "_id" not in stored
+
+
+def test_delete_found_and_missing_documents(tmp_path, shared_data):
+    async def run():
+        rag = LightRAG(
+            working_dir=str(tmp_path),
+            llm_model_func=_llm,
+            tokenizer=Tokenizer("chars", _CharTokenizer()),
+            embedding_func=EmbeddingFunc(
+                embedding_dim=DIM, max_token_size=512, func=_embed
+            ),
+        )
+        await rag.initialize_storages()
+        await initialize_pipeline_status()
+        await rag.doc_status.upsert(
+            {"doc-1": _doc_status("a.txt"), "doc-2": _doc_status("b.txt")}
+        )
+        results = await rag.adelete_by_doc_ids(["doc-2", "missing", "doc-1"])
+        remaining = await rag.doc_status.get_by_ids(["doc-1", "doc-2"])
+        await rag.finalize_storages()
+        return results, remaining
+
+    results, remaining = asyncio.run(run())
+    assert [r.doc_id for r in results] == ["doc-2", "missing", "doc-1"]
+    assert [r.status for r in results] == ["success", "not_found", "success"]
+    assert [r.file_path for r in results] == ["b.txt", "", "a.txt"]
+    assert remaining == []
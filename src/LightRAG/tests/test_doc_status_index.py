@@ -0,0 +1,183 @@
+"""
+Document status listings page with keyset cursors, through the in-memory
+secondary indexes or over plain records, and count statuses stored as DocStatus
+members whichever module path DocStatus was imported from.
+
+Run with: pytest src/LightRAG/tests/test_doc_status_index.py
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+# The API server imports the package as src.LightRAG.lightrag
+sys.path.append(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lightrag.base import DocStatus
+from lightrag.doc_status_index import (
+    DocStatusIndex,
+    decode_cursor,
+    encode_cursor,
+    paginate_records,
+    status_value,
+    validate_page_request,
+)
+from src.LightRAG.lightrag.base import DocStatus as ServerDocStatus
+from src.LightRAG.lightrag.kg.json_doc_status_impl import JsonDocStatusStorage
+from src.LightRAG.lightrag.kg.shared_storage import (
+    finalize_share_data,
+    initialize_share_data,
+)
+
+
+def _record(status, updated_at, file_path):
+    return {
+        "status": status,
+        "content_summary": file_path,
+        "content_length": 1,
+        "created_at": "2025-01-01T00:00:00",
+        "updated_at": updated_at,
+        "file_path": file_path,
+    }
+
+
+RECORDS = {
+    "doc-1": _record("processed", "2025-01-05", "reports/a.pdf"),
+    "doc-2": _record("pending", "2025-01-04", "reports/b.pdf"),
+    "doc-3": _record("processed", "2025-01-03", "notes/c.txt"),
+    "doc-4": _record("failed", "2025-01-02", "reports/d.pdf"),
+    "doc-5": _record("processed", "2025-01-01", "notes/e.txt"),
+}
+
+
+def _all_pages(page_func, page_size):
+    ids, cursor = [], None
+    while True:
+        page, cursor, total = page_func(page_size, cursor)
+        ids.extend(page)
+        if cursor is None:
+            return ids, total
+
+
+def _index():
+    index = DocStatusIndex()
+    index.rebuild(RECORDS.items())
+    return index
+
+
+def test_cursor_round_trip_and_validation():
+    assert decode_cursor(encode_cursor("2025-01-01", "doc-1")) == (
+        "2025-01-01",
+        "doc-1",
+    )
+    with pytest.raises(ValueError):
+        decode_cursor("not a cursor")
+    with pytest.raises(ValueError):
+        validate_page_request("content", "asc", 10)
+    with pytest.raises(ValueError):
+        validate_page_request("id", "up", 10)
+    with pytest.raises(ValueError):
+        validate_page_request("id", "asc", 0)
+
+
+def test_status_value_of_enum_members():
+    assert status_value(DocStatus.PENDING) == "pending"
+    assert status_value(ServerDocStatus.PENDING) == "pending"
+    assert status_value("processed") == "processed"
+
+
+@pytest.mark.parametrize("sort_direction", ["asc", "desc"])
+@pytest.mark.parametrize("sort_field", ["updated_at", "file_path", "id"])
+def test_index_pages_match_sorted_records(sort_field, sort_direction):
+    index = _index()
+    expected = sorted(
+        RECORDS,
+        key=lambda doc_id: (
+            doc_id if sort_field == "id" else RECORDS[doc_id][sort_field]
+        ),
+        reverse=sort_direction == "desc",
+    )
+
+    for page_size in (1, 2, 5):
+        ids, total = _all_pages(
+            lambda size, cursor: index.page(
+                None, None, sort_field, sort_direction, size, cursor
+            ),
+            page_size,
+        )
+        assert ids == expected
+        assert total == 5
+
+        ids, total = _all_pages(
+            lambda size, cursor: paginate_records(
+                RECORDS.items(), None, sort_field, sort_direction, size, cursor
+            ),
+            page_size,
+        )
+        assert ids == expected
+        assert total == 5
+
+
+def test_index_filters_and_updates():
+    index = _index()
+
+    ids, _, total = index.page("processed", None, "updated_at", "desc", 10, None)
+    assert ids == ["doc-1", "doc-3", "doc-5"]
+    assert total == 3
+    ids, _, total = index.page("processed", "NOTES/", "updated_at", "asc", 10, None)
+    assert ids == ["doc-5", "doc-3"]
+    assert total == 2
+    ids, _, total = paginate_records(RECORDS.items(), "reports", "id", "asc", 10, None)
+    assert ids == ["doc-1", "doc-2", "doc-4"]
+    assert total == 3
+
+    # Changes made after a page was read do not shift the next page
+    first, cursor, _ = index.page(None, None, "updated_at", "desc", 2, None)
+    index.add("doc-2", {**RECORDS["doc-2"], "status": DocStatus.PROCESSED})
+    index.remove("doc-4")
+    rest, _, total = index.page(None, None, "updated_at", "desc", 10, cursor)
+    assert first + rest == ["doc-1", "doc-2", "doc-3", "doc-5"]
+    assert total == 4
+    assert index.status_counts()["processed"] == 4
+    assert index.status_counts()["failed"] == 0
+    assert index.ids_by_file_path("reports/b.pdf") == {"doc-2"}
+    assert index.ids_by_file_path("reports/d.pdf") == set()
+
+
+@pytest.fixture
+def shared_data():
+    initialize_share_data(1)
+    yield
+    finalize_share_data()
+
+
+def test_storage_counts_and_pages_server_enum_statuses(tmp_path, shared_data):
+    async def run():
+        storage = JsonDocStatusStorage(
+            namespace="doc_status",
+            workspace="",
+            global_config={"working_dir": str(tmp_path)},
+            embedding_func=None,
+        )
+        await storage.initialize()
+        await storage.upsert(
+            {
+                "doc-1": _record(ServerDocStatus.PENDING, "2025-01-02", "a.pdf"),
+                "doc-2": _record(ServerDocStatus.PROCESSED, "2025-01-01", "b.pdf"),
+            }
+        )
+        counts = await storage.get_status_counts()
+        page = await storage.get_docs_paginated(status=ServerDocStatus.PENDING)
+        return counts, page
+
+    counts, page = asyncio.run(run())
+    assert counts["pending"] == 1
+    assert counts["processed"] == 1
+    assert sum(counts.values()) == 2
+    assert page.total == 1
+    assert [doc_id for doc_id, _ in page.documents] == ["doc-1"]
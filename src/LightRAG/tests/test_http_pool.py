@@ -0,0 +1,82 @@
+"""
+Pooled HTTP clients are closed when the last LightRAG instance of their event
+loop is finalized, and clients of other live loops are left open.
+
+Run with: pytest src/LightRAG/tests/test_http_pool.py
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lightrag import http_pool
+
+
+class _Client:
+    def __init__(self):
+        self.closed = False
+
+    async def aclose(self):
+        self.closed = True
+
+
+@pytest.fixture(autouse=True)
+def empty_pool():
+    http_pool._http_clients.clear()
+    http_pool._http_client_users.clear()
+    yield
+    http_pool._http_clients.clear()
+    http_pool._http_client_users.clear()
+
+
+def test_clients_closed_by_last_user_of_the_loop():
+    async def run():
+        http_pool.acquire_http_clients()
+        http_pool.acquire_http_clients()
+        client = http_pool.get_pooled_http_client("test", "endpoint", _Client)
+        assert http_pool.get_pooled_http_client("test", "endpoint", _Client) is client
+
+        await http_pool.release_http_clients()
+        closed_by_first = client.closed
+        await http_pool.release_http_clients()
+        return client, closed_by_first
+
+    client, closed_by_first = asyncio.run(run())
+    assert not closed_by_first
+    assert client.closed
+    assert http_pool._http_clients == {}
+
+
+def test_clients_of_other_loops_are_kept_open():
+    other_loop = asyncio.new_event_loop()
+    try:
+
+        async def create():
+            return http_pool.get_pooled_http_client("test", "endpoint", _Client)
+
+        other_client = other_loop.run_until_complete(create())
+
+        async def run():
+            http_pool.acquire_http_clients()
+            client = http_pool.get_pooled_http_client("test", "endpoint", _Client)
+            await http_pool.release_http_clients()
+            return client
+
+        client = asyncio.run(run())
+        assert client.closed
+        assert not other_client.closed
+        assert len(http_pool._http_clients) == 1
+
+        async def release_other():
+            http_pool.acquire_http_clients()
+            await http_pool.release_http_clients()
+
+        other_loop.run_until_complete(release_other())
+        assert other_client.closed
+    finally:
+        other_loop.close()
+    assert http_pool._http_clients == {}
@@ -0,0 +1,51 @@
+"""
+Keyed lock status reports the lock counts of the worker, with the lock metrics
+only when they are asked for.
+
+Run with: pytest src/LightRAG/tests/test_keyed_lock_status.py
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lightrag.kg import shared_storage
+from lightrag.kg.shared_storage import (
+    finalize_share_data,
+    get_keyed_lock_status,
+    initialize_share_data,
+)
+
+COUNT_FIELDS = {
+    "total_mp_locks",
+    "pending_mp_cleanup",
+    "total_async_locks",
+    "pending_async_cleanup",
+}
+
+
+@pytest.fixture
+def shared_data():
+    initialize_share_data(1)
+    yield
+    finalize_share_data()
+
+
+@pytest.mark.parametrize("initialized", [True, False])
+def test_lock_counts_without_metrics(monkeypatch, request, initialized):
+    if initialized:
+        request.getfixturevalue("shared_data")
+
+    def fail_metrics(top_n=None):
+        raise AssertionError("lock metrics collected")
+
+    with_metrics = get_keyed_lock_status()
+    monkeypatch.setattr(shared_storage, "get_lock_metrics", fail_metrics)
+    status = get_keyed_lock_status(include_metrics=False)
+
+    assert "metrics" in with_metrics
+    assert set(status) == COUNT_FIELDS | {"process_id"}
+    assert status["process_id"] == os.getpid()
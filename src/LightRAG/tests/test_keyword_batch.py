@@ -0,0 +1,42 @@
+"""
+Batched keyword extraction must work without an LLM cache storage.
+
+Run with: pytest src/LightRAG/tests/test_keyword_batch.py
+"""
+
+import asyncio
+import json
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lightrag.base import QueryParam
+from lightrag.operate import _extract_keywords_single_call
+
+
+class _CharTokenizer:
+    def encode(self, content: str) -> list[int]:
+        return [ord(c) for c in content]
+
+
+def test_batched_keywords_without_hashing_kv():
+    answer = {
+        "1": {"high_level_keywords": ["rice"], "low_level_keywords": ["paddy"]},
+        "2": {"high_level_keywords": ["soil"], "low_level_keywords": ["ph"]},
+    }
+
+    async def llm(prompt, **kwargs):
+        return json.dumps(answer)
+
+    global_config = {
+        "llm_model_func": llm,
+        "tokenizer": _CharTokenizer(),
+        "addon_params": {},
+    }
+    results = asyncio.run(
+        _extract_keywords_single_call(
+            ["rice farming", "soil acidity"], QueryParam(), global_config, None
+        )
+    )
+    assert results == [(["rice"], ["paddy"]), (["soil"], ["ph"])]
@@ -0,0 +1,49 @@
+"""
+The query context cache reads the storage generation from the shared storage
+module of its own package, so bumps made by the server invalidate it.
+
+Run with: pytest src/LightRAG/tests/test_query_context_cache.py
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+# The API server imports the package as src.LightRAG.lightrag
+sys.path.append(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.LightRAG.lightrag.kg.shared_storage import (
+    bump_storage_generation,
+    finalize_share_data,
+    initialize_share_data,
+)
+from src.LightRAG.lightrag.utils import QueryContextCache
+
+
+@pytest.fixture
+def shared_data():
+    initialize_share_data(1)
+    yield
+    finalize_share_data()
+
+
+def test_generation_bump_invalidates_cached_contexts(shared_data):
+    async def run():
+        cache = QueryContextCache()
+        key = await cache.make_key("query", "local")
+        cache.put(key, "context")
+        hit = cache.get(await cache.make_key("query", "local"))
+
+        await bump_storage_generation()
+        new_key = await cache.make_key("query", "local")
+        return key, hit, new_key, cache.get(new_key)
+
+    key, hit, new_key, after_bump = asyncio.run(run())
+    assert hit == "context"
+    assert new_key != key
+    assert after_bump is None
@@ -0,0 +1,54 @@
+"""
+Query traces must count the generation stage of a streamed answer once.
+
+Run with: pytest src/LightRAG/tests/test_query_trace.py
+"""
+
+import asyncio
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lightrag.query_trace import (
+    QueryTrace,
+    activate_query_trace,
+    deactivate_query_trace,
+    get_query_latency_histograms,
+    trace_stage,
+)
+
+
+async def _stream():
+    for chunk in ("a", "b", "c"):
+        await asyncio.sleep(0.01)
+        yield chunk
+
+
+def _generation_count() -> int:
+    return get_query_latency_histograms().get("generation", {}).get("count", 0)
+
+
+def test_streamed_generation_is_recorded_once():
+    async def run():
+        trace = QueryTrace()
+        token = activate_query_trace(trace)
+        try:
+            # Opening the stream, as kg_query and naive_query do
+            with trace_stage("generation"):
+                response = _stream()
+        finally:
+            deactivate_query_trace(token)
+
+        assert trace.total_ms is None
+        chunks = [chunk async for chunk in trace.wrap_stream(response)]
+        return trace, chunks
+
+    before = _generation_count()
+    trace, chunks = asyncio.run(run())
+
+    assert chunks == ["a", "b", "c"]
+    assert trace.stage_calls["generation"] == 1
+    assert trace.stages_ms["generation"] >= 30
+    assert trace.total_ms is not None
+    assert _generation_count() == before + 1
@@ -0,0 +1,92 @@
+"""
+Shared-memory backend: update flag slots of exited workers are reused, and
+process locks are handed over without polling delays.
+
+Run with: pytest src/LightRAG/tests/test_shm_primitives.py
+"""
+
+import asyncio
+import multiprocessing as mp
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lightrag.kg.shared_storage import _acquire_process_lock
+from lightrag.kg.shm_primitives import SharedFlagTable
+
+pytestmark = pytest.mark.skipif(
+    "fork" not in mp.get_all_start_methods(), reason="needs forked workers"
+)
+
+
+def _allocate_and_exit(table: SharedFlagTable) -> None:
+    table.allocate("entities")
+    os._exit(0)
+
+
+def test_flag_slots_of_exited_workers_are_reused():
+    table = SharedFlagTable(slots=2)
+    try:
+        ctx = mp.get_context("fork")
+        # More worker restarts than slots
+        for _ in range(5):
+            worker = ctx.Process(target=_allocate_and_exit, args=(table,))
+            worker.start()
+            worker.join()
+            assert worker.exitcode == 0
+
+        flag = table.allocate("entities")
+        table.set_all("entities", True)
+        assert flag.value is True
+        # Only the flag of the live process is reported
+        assert table.values("entities") == [True]
+    finally:
+        table.close()
+
+
+def test_process_lock_is_handed_over_on_release():
+    lock = mp.get_context("fork").Lock()
+
+    async def handover(hold_seconds: float) -> float:
+        lock.acquire()
+        released_at = []
+
+        def release():
+            released_at.append(time.perf_counter())
+            lock.release()
+
+        asyncio.get_running_loop().call_later(hold_seconds, release)
+        await _acquire_process_lock(lock)
+        waited = time.perf_counter() - released_at[0]
+        lock.release()
+        return waited
+
+    async def run():
+        return [await handover(0.1 + 0.011 * i) for i in range(5)]
+
+    assert max(asyncio.run(run())) < 0.02
+
+
+def test_cancelled_wait_does_not_keep_the_lock():
+    lock = mp.get_context("fork").Lock()
+
+    async def run():
+        lock.acquire()
+        waiter = asyncio.ensure_future(_acquire_process_lock(lock))
+        await asyncio.sleep(0.05)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        lock.release()
+        # The waiting thread takes the lock, then gives it back
+        for _ in range(100):
+            await asyncio.sleep(0.01)
+            if lock.acquire(False):
+                return True
+        return False
+
+    assert asyncio.run(run())
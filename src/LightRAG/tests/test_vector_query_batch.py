@@ -0,0 +1,98 @@
+"""
+query_batch of the in-memory vector storages must return what query returns for
+each query, including when the results are restricted to a list of ids.
+
+Run with: pytest src/LightRAG/tests/test_vector_query_batch.py
+"""
+
+import asyncio
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lightrag.kg.shared_storage import finalize_share_data, initialize_share_data
+from lightrag.utils import EmbeddingFunc
+
+DIM = 8
+TEXTS = [f"text {i}" for i in range(12)]
+
+
+def _vector(text: str) -> np.ndarray:
+    rng = np.random.default_rng(abs(hash(text)) % (2**32))
+    return rng.random(DIM).astype(np.float32)
+
+
+async def _embed(texts, **kwargs):
+    return np.array([_vector(text) for text in texts])
+
+
+def _make_storage(storage_cls, working_dir):
+    return storage_cls(
+        namespace="chunks",
+        workspace="",
+        global_config={
+            "working_dir": str(working_dir),
+            "embedding_batch_num": 4,
+            "vector_db_storage_cls_kwargs": {"cosine_better_than_threshold": 0.0},
+        },
+        embedding_func=EmbeddingFunc(
+            embedding_dim=DIM, max_token_size=512, func=_embed
+        ),
+        meta_fields={"content"},
+    )
+
+
+def _storage_classes():
+    from lightrag.kg.nano_vector_db_impl import NanoVectorDBStorage
+
+    classes = [NanoVectorDBStorage]
+    try:
+        from lightrag.kg.faiss_impl import FaissVectorDBStorage
+
+        classes.append(FaissVectorDBStorage)
+    except ImportError:
+        pass
+    return classes
+
+
+@pytest.fixture
+def shared_data():
+    initialize_share_data(1)
+    yield
+    finalize_share_data()
+
+
+def _assert_same_results(batch_results, single_results):
+    assert [r["id"] for r in batch_results] == [r["id"] for r in single_results]
+    assert [r["distance"] for r in batch_results] == pytest.approx(
+        [float(r["distance"]) for r in single_results], abs=1e-4
+    )
+
+
+@pytest.mark.parametrize("storage_cls", _storage_classes())
+@pytest.mark.parametrize("ids", [None, ["id-1", "id-4", "id-7"], ["missing"]])
+def test_query_batch_matches_query(storage_cls, ids, tmp_path, shared_data):
+    async def run():
+        storage = _make_storage(storage_cls, tmp_path)
+        await storage.initialize()
+        await storage.upsert(
+            {f"id-{i}": {"content": text} for i, text in enumerate(TEXTS)}
+        )
+
+        queries = ["text 1", "text 5", "something else"]
+        batch = await storage.query_batch(queries, top_k=3, ids=ids)
+        single = [await storage.query(q, top_k=3, ids=ids) for q in queries]
+        return batch, single
+
+    batch, single = asyncio.run(run())
+    for batch_results, single_results in zip(batch, single):
+        _assert_same_results(batch_results, single_results)
+        assert len(single_results) <= 3
+        if ids is not None:
+            assert {r["id"] for r in single_results} <= set(ids)
+    if ids == ["missing"]:
+        assert single == [[], [], []]
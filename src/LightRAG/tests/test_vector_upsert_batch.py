@@ -0,0 +1,70 @@
+"""
+The vector batch of the knowledge rebuild upserts before deleting stale records,
+and a batch that fails keeps the stale records and is reported instead of raised.
+
+Run with: pytest src/LightRAG/tests/test_vector_upsert_batch.py
+"""
+
+import asyncio
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lightrag.operate import _VectorUpsertBatch
+
+
+class _RecordingVdb:
+    def __init__(self, fail_upserts: int = 0):
+        self.records = {"old-a": {}, "old-b": {}, "rel-1": {}}
+        self.calls = []
+        self._fail_upserts = fail_upserts
+
+    async def upsert(self, data):
+        self.calls.append(("upsert", sorted(data)))
+        if self._fail_upserts:
+            self._fail_upserts -= 1
+            raise RuntimeError("embedding failed")
+        self.records.update(data)
+
+    async def delete(self, ids):
+        self.calls.append(("delete", sorted(ids)))
+        for id_ in ids:
+            self.records.pop(id_, None)
+
+
+def test_upsert_before_deleting_stale_records():
+    vdb = _RecordingVdb()
+
+    async def run():
+        batch = _VectorUpsertBatch(vdb, batch_size=10)
+        await batch.delete(["old-a"])
+        await batch.upsert({"new-a": {"entity_name": "A"}})
+        # A record replaced under the same id
+        await batch.delete(["rel-1"])
+        await batch.upsert({"rel-1": {"src_id": "A", "tgt_id": "B"}})
+        await batch.flush()
+        return batch
+
+    batch = asyncio.run(run())
+    assert vdb.calls == [("upsert", ["new-a", "rel-1"]), ("delete", ["old-a"])]
+    assert set(vdb.records) == {"old-b", "new-a", "rel-1"}
+    assert batch.failed == {}
+
+
+def test_failed_batch_keeps_stale_records_and_is_reported():
+    vdb = _RecordingVdb(fail_upserts=1)
+
+    async def run():
+        batch = _VectorUpsertBatch(vdb, batch_size=1)
+        await batch.delete(["old-a"])
+        # Fills the batch, which fails without raising into this caller
+        await batch.upsert({"new-a": {"entity_name": "A"}})
+        await batch.delete(["old-b"])
+        await batch.upsert({"new-b": {"entity_name": "B"}})
+        await batch.flush()
+        return batch
+
+    batch = asyncio.run(run())
+    assert set(batch.failed) == {"new-a"}
+    assert set(vdb.records) == {"old-a", "rel-1", "new-b"}
@@ -5,9 +5,19 @@ Contains methods for processing multiple files in batches
 """
 
 import asyncio
+import os
 from typing import Optional, List
 from pathlib import Path
 
+from raganything.folder_ingest import (
+    IngestCheckpoint,
+    create_parse_process_pool,
+    default_checkpoint_path,
+    iter_folder_files,
+    parse_in_process_pool,
+)
+from raganything.parse_cache import ParseCache
+
 
 class BatchMixin:
     """BatchMixin class containing batch processing functionality for RAGAnything"""
@@ -23,10 +33,17 @@ class BatchMixin:
         file_extensions: Optional[List[str]] = None,
         recursive: bool = None,
         max_workers: int = None,
+        parse_processes: int = None,
+        resume: bool = True,
+        checkpoint_path: str = None,
     ):
         """
         Process all files in a folder in batch
 
+        Files are discovered while earlier ones are already being processed, and
+        parsed in a pool of worker processes. Completed files are recorded in a
+        checkpoint manifest, so an interrupted run resumes where it stopped.
+
         Args:
             folder_path: Path to the folder to process
             output_dir: MinerU output directory (defaults to config.mineru_output_dir)
@@ -37,6 +54,9 @@ class BatchMixin:
             file_extensions: List of file extensions to process (defaults to config.supported_file_extensions)
             recursive: Whether to recursively process subfolders (defaults to config.recursive_folder_processing)
             max_workers: Maximum number of concurrent workers (defaults to config.max_concurrent_files)
+            parse_processes: Number of parse worker processes, 0 parses in the parse service threads (defaults to config.folder_parse_processes)
+            resume: Whether to skip files completed by an earlier run
+            checkpoint_path: Checkpoint manifest (defaults to <working_dir>/ingest_checkpoints/<folder hash>.jsonl)
         """
         # Ensure LightRAG is initialized
         await self._ensure_lightrag_initialized()
@@ -52,6 +72,8 @@ class BatchMixin:
             recursive = self.config.recursive_folder_processing
         if max_workers is None:
             max_workers = self.config.max_concurrent_files
+        if parse_processes is None:
+            parse_processes = self.config.folder_parse_processes
         if file_extensions is None:
             file_extensions = self.config.supported_file_extensions
 
@@ -69,97 +91,168 @@ class BatchMixin:
             f"Processing files with extensions: {sorted(target_extensions)}"
         )
 
-        # Collect all files to process
-        files_to_process = []
-
-        if recursive:
-            # Recursively traverse all subfolders
-            for file_path in folder_path.rglob("*"):
-                if (
-                    file_path.is_file()
-                    and file_path.suffix.lower() in target_extensions
-                ):
-                    files_to_process.append(file_path)
-        else:
-            # Process only current folder
-            for file_path in folder_path.glob("*"):
-                if (
-                    file_path.is_file()
-                    and file_path.suffix.lower() in target_extensions
-                ):
-                    files_to_process.append(file_path)
-
-        if not files_to_process:
-            self.logger.info(f"No files to process found in {folder_path}")
-            return
-
-        self.logger.info(f"Found {len(files_to_process)} files to process")
-        self.logger.info("File type distribution:")
-
-        # Count file types
-        file_type_count = {}
-        for file_path in files_to_process:
-            ext = file_path.suffix.lower()
-            file_type_count[ext] = file_type_count.get(ext, 0) + 1
+        checkpoint_path = Path(
+            checkpoint_path or default_checkpoint_path(self.working_dir, folder_path)
+        )
+        if not resume and checkpoint_path.exists():
+            checkpoint_path.unlink()
+        checkpoint = IngestCheckpoint(checkpoint_path)
+        if checkpoint.completed:
+            self.logger.info(
+                f"Resuming from checkpoint {checkpoint_path}: "
+                f"{checkpoint.completed} files already processed"
+            )
 
-        for ext, count in sorted(file_type_count.items()):
-            self.logger.info(f"  {ext}: {count} files")
+        pool = (
+            create_parse_process_pool(self.config, parse_processes)
+            if parse_processes > 0
+            else None
+        )
 
         # Create progress tracking
+        discovered_count = 0
         processed_count = 0
+        skipped_count = 0
         failed_files = []
+        file_type_count = {}
 
-        # Use semaphore to control concurrency
+        # Use semaphore to control extraction concurrency. Parsing runs outside of
+        # it, so files are parsed while already-parsed files are being extracted
         semaphore = asyncio.Semaphore(max_workers)
+        parse_slots = parse_processes or self.config.max_concurrent_parses
+        queue: asyncio.Queue = asyncio.Queue(maxsize=(max_workers + parse_slots) * 4)
+
+        async def parse_file(file_path: Path, file_output_dir: Path):
+            if pool is None:
+                # Parse file off the event loop
+                return await self.aparse_document(
+                    str(file_path),
+                    str(file_output_dir),
+                    parse_method,
+                    display_stats,
+                )
+            future = parse_in_process_pool(
+                pool,
+                str(file_path),
+                str(file_output_dir),
+                parse_method,
+                display_stats,
+                timeout=self.config.parse_timeout or None,
+            )
+            return await asyncio.wait_for(
+                asyncio.wrap_future(future),
+                timeout=self.config.parse_timeout or None,
+            )
 
-        async def process_single_file(file_path: Path, index: int) -> None:
+        async def process_single_file(entry: os.DirEntry, index: int) -> None:
             """Process a single file"""
-            async with semaphore:
-                nonlocal processed_count
-                try:
-                    self.logger.info(
-                        f"[{index}/{len(files_to_process)}] Processing: {file_path}"
-                    )
+            nonlocal processed_count, skipped_count
+            file_path = Path(entry.path)
+            try:
+                stat = entry.stat()
+                # Unchanged files completed earlier are skipped without rehashing
+                file_hash = checkpoint.lookup(entry.path, stat.st_size, stat.st_mtime)
+                if file_hash is None:
+                    file_hash = await asyncio.to_thread(ParseCache.hash_file, file_path)
+            except OSError as e:
+                self.logger.error(f"[{index}] Cannot read: {file_path}: {e}")
+                failed_files.append((file_path, str(e)))
+                return
+
+            if checkpoint.is_done(file_hash):
+                skipped_count += 1
+                self.logger.debug(f"[{index}] Already processed, skipping: {file_path}")
+                return
+
+            try:
+                self.logger.info(f"[{index}] Processing: {file_path}")
 
-                    # Create separate output directory for each file
-                    file_output_dir = Path(output_dir) / file_path.stem
-                    file_output_dir.mkdir(parents=True, exist_ok=True)
+                # Create separate output directory for each file
+                file_output_dir = Path(output_dir) / file_path.stem
+                file_output_dir.mkdir(parents=True, exist_ok=True)
 
-                    # Process file
-                    await self.process_document_complete(
-                        file_path=str(file_path),
-                        output_dir=str(file_output_dir),
-                        parse_method=parse_method,
-                        display_stats=display_stats,
+                content_list, _ = await parse_file(file_path, file_output_dir)
+
+                # Insert parsed content
+                async with semaphore:
+                    await self._insert_parsed_document(
+                        str(file_path),
+                        content_list,
                         split_by_character=split_by_character,
                         split_by_character_only=split_by_character_only,
                     )
 
-                    processed_count += 1
-                    self.logger.info(
-                        f"[{index}/{len(files_to_process)}] Successfully processed: {file_path}"
-                    )
+                checkpoint.record(
+                    entry.path, stat.st_size, stat.st_mtime, file_hash, "done"
+                )
+                processed_count += 1
+                self.logger.info(f"[{index}] Successfully processed: {file_path}")
 
-                except Exception as e:
-                    self.logger.error(
-                        f"[{index}/{len(files_to_process)}] Failed to process: {file_path}"
-                    )
-                    self.logger.error(f"Error: {str(e)}")
-                    failed_files.append((file_path, str(e)))
+            except Exception as e:
+                self.logger.error(f"[{index}] Failed to process: {file_path}")
+                self.logger.error(f"Error: {str(e)}")
+                checkpoint.record(
+                    entry.path,
+                    stat.st_size,
+                    stat.st_mtime,
+                    file_hash,
+                    "failed",
+                    error=str(e),
+                )
+                failed_files.append((file_path, str(e)))
+
+        async def discover() -> None:
+            """Feed files to the workers as they are found"""
+            nonlocal discovered_count
+            files = iter_folder_files(folder_path, target_extensions, recursive)
+            while True:
+                entry = await asyncio.to_thread(next, files, None)
+                if entry is None:
+                    break
+                discovered_count += 1
+                ext = os.path.splitext(entry.name)[1].lower()
+                file_type_count[ext] = file_type_count.get(ext, 0) + 1
+                await queue.put((entry, discovered_count))
 
-        # Create all processing tasks
-        tasks = []
-        for index, file_path in enumerate(files_to_process, 1):
-            task = process_single_file(file_path, index)
-            tasks.append(task)
+        async def worker() -> None:
+            while True:
+                item = await queue.get()
+                try:
+                    if item is None:
+                        return
+                    await process_single_file(*item)
+                finally:
+                    queue.task_done()
+
+        # One worker per file that can be parsing or extracting at a time
+        workers = [
+            asyncio.create_task(worker()) for _ in range(max_workers + parse_slots)
+        ]
+        try:
+            await discover()
+            for _ in workers:
+                await queue.put(None)
+            await asyncio.gather(*workers)
+        finally:
+            for task in workers:
+                task.cancel()
+            checkpoint.close()
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+
+        if not discovered_count:
+            self.logger.info(f"No files to process found in {folder_path}")
+            return
 
-        # Wait for all tasks to complete
-        await asyncio.gather(*tasks, return_exceptions=True)
+        self.logger.info("File type distribution:")
+        for ext, count in sorted(file_type_count.items()):
+            self.logger.info(f"  {ext}: {count} files")
 
         # Output processing statistics
         self.logger.info("\n===== Batch Processing Complete =====")
-        self.logger.info(f"Total files: {len(files_to_process)}")
+        self.logger.info(f"Total files: {discovered_count}")
         self.logger.info(f"Successfully processed: {processed_count}")
+        self.logger.info(f"Skipped (already processed): {skipped_count}")
         self.logger.info(f"Failed: {len(failed_files)}")
 
         if failed_files:
@@ -168,8 +261,9 @@ class BatchMixin:
                 self.logger.info(f"  - {file_path}: {error}")
 
         return {
-            "total": len(files_to_process),
+            "total": discovered_count,
             "success": processed_count,
+            "skipped": skipped_count,
             "failed": len(failed_files),
             "failed_files": failed_files,
         }
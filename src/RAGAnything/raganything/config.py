@@ -4,6 +4,7 @@ Configuration classes for RAGAnything
 Contains configuration dataclasses with environment variable support
 """
 
+import os
 from dataclasses import dataclass, field
 from typing import List
 
@@ -36,6 +37,50 @@ class RAGAnythingConfig:
     )
     """Whether to display content statistics during parsing."""
 
+    max_concurrent_parses: int = field(
+        default=get_env_value("MAX_CONCURRENT_PARSES", 2, int)
+    )
+    """Maximum number of documents parsed by MinerU concurrently."""
+
+    parse_timeout: int = field(default=get_env_value("PARSE_TIMEOUT", 3600, int))
+    """Timeout in seconds for parsing one document (0 disables the timeout)."""
+
+    pdf_shard_pages: int = field(default=get_env_value("PDF_SHARD_PAGES", 0, int))
+    """Split PDFs with more pages into page-range shards of this size parsed in parallel (0 disables sharding)."""
+
+    max_pdf_shard_workers: int = field(
+        default=get_env_value("MAX_PDF_SHARD_WORKERS", 4, int)
+    )
+    """Maximum number of PDF shards parsed concurrently."""
+
+    text_parse_via_pdf: bool = field(
+        default=get_env_value("TEXT_PARSE_VIA_PDF", False, bool)
+    )
+    """Render .txt/.md files to PDF and parse them with MinerU instead of parsing them directly."""
+
+    libreoffice_workers: int = field(
+        default=get_env_value("LIBREOFFICE_WORKERS", min(4, os.cpu_count() or 1), int)
+    )
+    """Number of long-lived LibreOffice workers converting Office documents to PDF concurrently."""
+
+    libreoffice_timeout: int = field(
+        default=get_env_value("LIBREOFFICE_TIMEOUT", 120, int)
+    )
+    """Timeout in seconds for converting one Office document, after which the worker is restarted."""
+
+    enable_parse_cache: bool = field(
+        default=get_env_value("ENABLE_PARSE_CACHE", True, bool)
+    )
+    """Reuse parse results of files with identical content and parser options."""
+
+    parse_cache_dir: str = field(default=get_env_value("PARSE_CACHE_DIR", "", str))
+    """Directory of the parse cache (defaults to <working_dir>/parse_cache)."""
+
+    parse_cache_max_size_mb: int = field(
+        default=get_env_value("PARSE_CACHE_MAX_SIZE_MB", 2048, int)
+    )
+    """Maximum size of the parse cache in megabytes; least recently used entries are evicted."""
+
     # Multimodal Processing Configuration
     # ---
     enable_image_processing: bool = field(
@@ -53,6 +98,61 @@ class RAGAnythingConfig:
     )
     """Enable equation content processing."""
 
+    max_concurrent_multimodal_items: int = field(
+        default=get_env_value("MAX_CONCURRENT_MULTIMODAL_ITEMS", 8, int)
+    )
+    """Maximum number of multimodal items processed concurrently within a document."""
+
+    max_concurrent_image_items: int = field(
+        default=get_env_value("MAX_CONCURRENT_IMAGE_ITEMS", 4, int)
+    )
+    """Maximum number of images processed concurrently (vision model calls)."""
+
+    max_concurrent_table_items: int = field(
+        default=get_env_value("MAX_CONCURRENT_TABLE_ITEMS", 8, int)
+    )
+    """Maximum number of tables processed concurrently."""
+
+    max_concurrent_equation_items: int = field(
+        default=get_env_value("MAX_CONCURRENT_EQUATION_ITEMS", 8, int)
+    )
+    """Maximum number of equations processed concurrently."""
+
+    image_max_dimension: int = field(
+        default=get_env_value("IMAGE_MAX_DIMENSION", 1568, int)
+    )
+    """Downsample images sent to the vision model to this maximum width/height in pixels (0 keeps the original size)."""
+
+    image_jpeg_quality: int = field(
+        default=get_env_value("IMAGE_JPEG_QUALITY", 85, int)
+    )
+    """JPEG quality used when re-encoding images for the vision model."""
+
+    image_preprocess_workers: int = field(
+        default=get_env_value("IMAGE_PREPROCESS_WORKERS", 4, int)
+    )
+    """Number of threads resizing and re-encoding images."""
+
+    image_description_cache_size: int = field(
+        default=get_env_value("IMAGE_DESCRIPTION_CACHE_SIZE", 1024, int)
+    )
+    """Number of image descriptions kept so repeated images (same pixels) are described once (0 disables reuse)."""
+
+    multimodal_batch_size: int = field(
+        default=get_env_value("MULTIMODAL_BATCH_SIZE", 8, int)
+    )
+    """Maximum number of small tables/equations described in one LLM call (1 disables batching)."""
+
+    multimodal_batch_window_ms: float = field(
+        default=get_env_value("MULTIMODAL_BATCH_WINDOW_MS", 50, float)
+    )
+    """Time in milliseconds to wait for more tables/equations before sending a batch."""
+
+    multimodal_batch_max_item_chars: int = field(
+        default=get_env_value("MULTIMODAL_BATCH_MAX_ITEM_CHARS", 2000, int)
+    )
+    """Tables/equations larger than this many characters are always described on their own."""
+
     # Batch Processing Configuration
     # ---
     max_concurrent_files: int = field(
@@ -60,6 +160,11 @@ class RAGAnythingConfig:
     )
     """Maximum number of files to process concurrently."""
 
+    folder_parse_processes: int = field(
+        default=get_env_value("FOLDER_PARSE_PROCESSES", 2, int)
+    )
+    """Number of worker processes parsing files during folder processing (0 parses in the parse service threads)."""
+
     supported_file_extensions: List[str] = field(
         default_factory=lambda: get_env_value(
             "SUPPORTED_FILE_EXTENSIONS",
@@ -0,0 +1,257 @@
+"""
+Folder ingestion helpers for RAGAnything
+
+Streams file discovery, records completed files in a checkpoint manifest so an
+interrupted ingestion resumes where it stopped, and parses files in a pool of
+worker processes.
+"""
+
+import hashlib
+import json
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from raganything.mineru_parser import ParseJob, current_parse_job
+from raganything.parse_cache import ParseCache
+from raganything.processor import ProcessorMixin
+from src.LightRAG.lightrag.utils import logger
+
+# Flush the manifest to disk every this many records
+CHECKPOINT_FSYNC_INTERVAL = 64
+
+
+def iter_folder_files(
+    folder_path: Path, extensions: Set[str], recursive: bool = True
+) -> Iterator[os.DirEntry]:
+    """
+    Yield the files of a folder with a matching extension, as they are found
+
+    Args:
+        folder_path: Folder to walk
+        extensions: Lowercase file extensions to include (e.g. ".pdf")
+        recursive: Whether to descend into subfolders
+
+    Yields:
+        os.DirEntry of each matching file
+    """
+    pending = [str(folder_path)]
+    while pending:
+        directory = pending.pop()
+        try:
+            with os.scandir(directory) as entries:
+                subdirectories = []
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if recursive:
+                                subdirectories.append(entry.path)
+                        elif (
+                            entry.is_file()
+                            and os.path.splitext(entry.name)[1].lower() in extensions
+                        ):
+                            yield entry
+                    except OSError as e:
+                        logger.warning(f"Skipping {entry.path}: {e}")
+        except OSError as e:
+            logger.warning(f"Cannot read directory {directory}: {e}")
+            continue
+        # Depth-first, in name order, so runs visit files in a stable order
+        pending.extend(sorted(subdirectories, reverse=True))
+
+
+class IngestCheckpoint:
+    """
+    Append-only manifest of the files handled by a folder ingestion
+
+    Each line records a file's path, size, mtime, content hash and status. Files
+    recorded as done are skipped on the next run, matched by path, size and mtime
+    without rehashing, or by content hash when the same content appears again.
+    """
+
+    def __init__(self, path: Path):
+        """
+        Args:
+            path: Manifest file, created if it does not exist
+        """
+        self.path = Path(path)
+        self._done_hashes: Set[str] = set()
+        self._done_files: Dict[str, Tuple[int, float, str]] = {}
+        self._unsynced = 0
+
+        if self.path.exists():
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        # Partial line of an interrupted run
+                        continue
+                    if record.get("status") == "done":
+                        self._done_hashes.add(record["hash"])
+                        self._done_files[record["path"]] = (
+                            record["size"],
+                            record["mtime"],
+                            record["hash"],
+                        )
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "a", encoding="utf-8")
+        if self._file.tell() > 0:
+            with open(self.path, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    # Terminate the partial line so the next record stays parseable
+                    self._file.write("\n")
+
+    @property
+    def completed(self) -> int:
+        """Number of distinct file contents recorded as done"""
+        return len(self._done_hashes)
+
+    def lookup(self, path: str, size: int, mtime: float) -> Optional[str]:
+        """Return the recorded hash of an unchanged completed file, else None"""
+        recorded = self._done_files.get(path)
+        if recorded and recorded[0] == size and recorded[1] == mtime:
+            return recorded[2]
+        return None
+
+    def is_done(self, file_hash: str) -> bool:
+        """Whether a file with this content hash was completed"""
+        return file_hash in self._done_hashes
+
+    def record(
+        self,
+        path: str,
+        size: int,
+        mtime: float,
+        file_hash: str,
+        status: str,
+        error: Optional[str] = None,
+    ) -> None:
+        """Append a file record ("done" or "failed")"""
+        record = {
+            "path": path,
+            "size": size,
+            "mtime": mtime,
+            "hash": file_hash,
+            "status": status,
+        }
+        if error:
+            record["error"] = error
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._file.flush()
+
+        if status == "done":
+            self._done_hashes.add(file_hash)
+            self._done_files[path] = (size, mtime, file_hash)
+
+        self._unsynced += 1
+        if self._unsynced >= CHECKPOINT_FSYNC_INTERVAL:
+            os.fsync(self._file.fileno())
+            self._unsynced = 0
+
+    def close(self) -> None:
+        """Flush and close the manifest"""
+        if not self._file.closed:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+
+
+def default_checkpoint_path(working_dir: str, folder_path: Path) -> Path:
+    """Manifest location of a folder: <working_dir>/ingest_checkpoints/<folder hash>.jsonl"""
+    folder_key = hashlib.md5(str(folder_path.resolve()).encode("utf-8")).hexdigest()
+    return Path(working_dir) / "ingest_checkpoints" / f"{folder_key}.jsonl"
+
+
+class _ParseWorker(ProcessorMixin):
+    """Parsing-only stand-in for RAGAnything inside a worker process"""
+
+    def __init__(self, config):
+        self.config = config
+        self.logger = logger
+        self.parse_cache = None
+        if config.enable_parse_cache:
+            self.parse_cache = ParseCache(
+                config.parse_cache_dir
+                or os.path.join(config.working_dir, "parse_cache"),
+                max_size_mb=config.parse_cache_max_size_mb,
+            )
+
+
+_worker: Optional[_ParseWorker] = None
+
+
+def _init_parse_worker(config) -> None:
+    global _worker
+    _worker = _ParseWorker(config)
+
+
+def _parse_in_worker(
+    file_path: str,
+    output_dir: str,
+    parse_method: str,
+    display_stats: bool,
+    deadline: Optional[float] = None,
+) -> Tuple[List[Dict[str, Any]], str]:
+    # Kill MinerU at the deadline, as the parse service does for its jobs, so a
+    # timed out parse frees its worker process
+    job = ParseJob()
+    token = current_parse_job.set(job)
+    watchdog = None
+    if deadline is not None:
+        watchdog = threading.Timer(max(0.0, deadline - time.time()), job.cancel)
+        watchdog.daemon = True
+        watchdog.start()
+    try:
+        return _worker.parse_document(
+            file_path, output_dir, parse_method, display_stats
+        )
+    finally:
+        if watchdog is not None:
+            watchdog.cancel()
+        current_parse_job.reset(token)
+
+
+def create_parse_process_pool(config, max_workers: int) -> ProcessPoolExecutor:
+    """
+    Create a pool of worker processes parsing documents
+
+    Workers are spawned rather than forked, since the parent runs an event loop
+    and helper threads.
+
+    Args:
+        config: RAGAnythingConfig used by the workers
+        max_workers: Number of worker processes
+    """
+    return ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_parse_worker,
+        initargs=(config,),
+    )
+
+
+def parse_in_process_pool(
+    pool: ProcessPoolExecutor,
+    file_path: str,
+    output_dir: str,
+    parse_method: str,
+    display_stats: bool,
+    timeout: Optional[float] = None,
+):
+    """
+    Submit a parse to the process pool, returning a concurrent future
+
+    The timeout counts from submission; when it expires the worker kills MinerU
+    and the future fails with ParseCancelledError.
+    """
+    deadline = time.time() + timeout if timeout else None
+    return pool.submit(
+        _parse_in_worker, file_path, output_dir, parse_method, display_stats, deadline
+    )
@@ -0,0 +1,210 @@
+"""
+Image preprocessing for vision model calls
+
+Images are downsampled to a maximum resolution and re-encoded as JPEG before they
+are sent to the vision model, and identified by a hash of their pixels so repeated
+images (logos, page decorations) can reuse an earlier description. Decoding and
+encoding run in a thread pool. Pillow is optional; without it images are sent
+unchanged and identified by a hash of their file content.
+"""
+
+import asyncio
+import base64
+import hashlib
+import io
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from src.LightRAG.lightrag.utils import logger
+
+try:
+    from PIL import Image, ImageOps
+
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+
+@dataclass
+class PreparedImage:
+    """Image ready to be sent to the vision model"""
+
+    base64_data: str
+    image_hash: str  # Hash of the decoded pixels (of the file without Pillow)
+    original_bytes: int
+    encoded_bytes: int
+
+
+class ImagePreprocessor:
+    """Downsample, re-encode and hash images, with a cache of descriptions"""
+
+    def __init__(
+        self,
+        max_dimension: int = 1568,
+        jpeg_quality: int = 85,
+        max_workers: int = 4,
+        description_cache_size: int = 1024,
+    ):
+        """
+        Args:
+            max_dimension: Maximum width/height in pixels (0 keeps the original size)
+            jpeg_quality: JPEG quality used for re-encoding
+            max_workers: Number of threads decoding and encoding images
+            description_cache_size: Number of image descriptions kept for reuse
+        """
+        self.max_dimension = max_dimension
+        self.jpeg_quality = jpeg_quality
+        self.max_workers = max(1, max_workers)
+        self.description_cache_size = description_cache_size
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._descriptions: "OrderedDict[str, str]" = OrderedDict()
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._lock = threading.Lock()
+        self._stats = {
+            "images": 0,
+            "original_bytes": 0,
+            "encoded_bytes": 0,
+            "description_cache_hits": 0,
+        }
+
+    def prepare(self, image_path: str) -> PreparedImage:
+        """Load an image, downsample and re-encode it (blocking)"""
+        with open(image_path, "rb") as f:
+            raw = f.read()
+
+        prepared = None
+        if PIL_AVAILABLE:
+            try:
+                prepared = self._reencode(raw)
+            except Exception as e:
+                logger.debug(f"Sending {image_path} unchanged, re-encoding failed: {e}")
+
+        if prepared is None:
+            prepared = PreparedImage(
+                base64_data=base64.b64encode(raw).decode("utf-8"),
+                image_hash=hashlib.sha256(raw).hexdigest(),
+                original_bytes=len(raw),
+                encoded_bytes=len(raw),
+            )
+
+        with self._lock:
+            self._stats["images"] += 1
+            self._stats["original_bytes"] += prepared.original_bytes
+            self._stats["encoded_bytes"] += prepared.encoded_bytes
+        return prepared
+
+    def _reencode(self, raw: bytes) -> PreparedImage:
+        with Image.open(io.BytesIO(raw)) as image:
+            image = ImageOps.exif_transpose(image)
+            if image.mode in ("RGBA", "LA", "P"):
+                # JPEG has no alpha channel, flatten onto white
+                image = image.convert("RGBA")
+                background = Image.new("RGB", image.size, (255, 255, 255))
+                background.paste(image, mask=image.getchannel("A"))
+                image = background
+            elif image.mode != "RGB":
+                image = image.convert("RGB")
+
+            image_hash = hashlib.sha256(
+                f"{image.size}".encode("utf-8") + image.tobytes()
+            ).hexdigest()
+
+            if self.max_dimension and max(image.size) > self.max_dimension:
+                image.thumbnail(
+                    (self.max_dimension, self.max_dimension), Image.Resampling.LANCZOS
+                )
+
+            buffer = io.BytesIO()
+            image.save(buffer, format="JPEG", quality=self.jpeg_quality, optimize=True)
+            encoded = buffer.getvalue()
+
+        # Keep the original when re-encoding does not make it smaller
+        if len(encoded) >= len(raw) and raw[:3] == b"\xff\xd8\xff":
+            encoded = raw
+
+        return PreparedImage(
+            base64_data=base64.b64encode(encoded).decode("utf-8"),
+            image_hash=image_hash,
+            original_bytes=len(raw),
+            encoded_bytes=len(encoded),
+        )
+
+    async def aprepare(self, image_path: str) -> PreparedImage:
+        """Prepare an image in the preprocessing thread pool"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="image-preprocess"
+            )
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self.prepare, image_path)
+
+    async def describe(
+        self, image: PreparedImage, describe_func, variant: str = ""
+    ) -> str:
+        """
+        Return the cached description of an image, or generate it
+
+        Descriptions are reused for the same image with the same variant wherever
+        it appears, so a logo or figure repeated on other pages or in other
+        documents is described once; concurrent requests for it wait for a single
+        call.
+
+        Args:
+            image: Prepared image
+            describe_func: Coroutine function called with the image to describe it
+            variant: Text that makes descriptions of the same pixels differ, e.g.
+                the image caption and footnotes. Page context should not be part
+                of it.
+
+        Returns:
+            The image description
+        """
+        variant_hash = hashlib.sha256(variant.encode("utf-8")).hexdigest()
+        key = f"{image.image_hash}:{variant_hash}"
+        if key in self._descriptions:
+            self._descriptions.move_to_end(key)
+            self._stats["description_cache_hits"] += 1
+            return self._descriptions[key]
+
+        pending = self._pending.get(key)
+        if pending is not None:
+            self._stats["description_cache_hits"] += 1
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending[key] = future
+        try:
+            description = await describe_func(image)
+        except asyncio.CancelledError:
+            future.set_exception(RuntimeError("Image description was cancelled"))
+            future.exception()  # Avoid "exception never retrieved" warnings
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()
+            raise
+        else:
+            future.set_result(description)
+            if self.description_cache_size > 0:
+                self._descriptions[key] = description
+                while len(self._descriptions) > self.description_cache_size:
+                    self._descriptions.popitem(last=False)
+            return description
+        finally:
+            self._pending.pop(key, None)
+
+    def report(self) -> Dict[str, Any]:
+        """Return image counts, bytes sent and bytes saved by preprocessing"""
+        with self._lock:
+            stats = dict(self._stats)
+        stats["bytes_saved"] = stats["original_bytes"] - stats["encoded_bytes"]
+        return stats
+
+    def shutdown(self) -> None:
+        """Release the preprocessing thread pool"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
@@ -11,15 +11,22 @@ For Office documents (.doc, .docx, .ppt, .pptx), please convert them to PDF form
 
 from __future__ import annotations
 
-__all__ = ["MineruParser"]
+__all__ = ["MineruParser", "ParseCancelledError", "ParseJob"]
 
 import json
 import argparse
+import contextvars
+import re
+import shutil
 import subprocess
 import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
 from pathlib import Path
 from typing import (
     Dict,
+    Iterable,
     List,
     Optional,
     Union,
@@ -30,6 +37,76 @@ from typing import (
 
 T = TypeVar("T")
 
+# Markdown patterns used by the native text parser
+_HEADING_RE = re.compile(r"^(#{1,6})\s+(.*?)(?:\s+#+)?\s*$")
+_IMAGE_RE = re.compile(r'^!\[([^\]]*)\]\(\s*<?([^)\s>]+)>?(?:\s+"[^"]*")?\s*\)$')
+_TABLE_SEPARATOR_RE = re.compile(r"^\|?\s*:?-+:?\s*(?:\|\s*:?-+:?\s*)*\|?$")
+_FENCE_RE = re.compile(r"^(`{3,}|~{3,})")
+
+# Office formats converted to PDF with LibreOffice before parsing
+OFFICE_FORMATS = {".doc", ".docx", ".ppt", ".pptx", ".xls", ".xlsx"}
+
+
+def _closes_fence(line: str, fence: str) -> bool:
+    """Whether a stripped line closes a code block opened with fence
+
+    The closing fence is a bare run of the same character, at least as long as
+    the opening one; "```js" or a shorter run is block content.
+    """
+    closing = _FENCE_RE.match(line)
+    return (
+        closing is not None
+        and closing.group(1) == line
+        and line[0] == fence[0]
+        and len(line) >= len(fence)
+    )
+
+
+class ParseCancelledError(RuntimeError):
+    """Raised when a parse job is cancelled or times out while MinerU is running."""
+
+
+class ParseJob:
+    """
+    Handle of a running parse job
+
+    Tracks the MinerU subprocesses started on behalf of the job so that a timeout
+    or cancellation can kill them instead of waiting for the parse to finish.
+    """
+
+    def __init__(self) -> None:
+        self._processes = set()
+        self._lock = threading.Lock()
+        self.cancelled = False
+
+    def register(self, process: subprocess.Popen) -> None:
+        with self._lock:
+            if self.cancelled:
+                process.kill()
+                raise ParseCancelledError("Parse job was cancelled")
+            self._processes.add(process)
+
+    def unregister(self, process: subprocess.Popen) -> None:
+        with self._lock:
+            self._processes.discard(process)
+
+    def cancel(self) -> None:
+        """Cancel the job and kill its running subprocesses"""
+        with self._lock:
+            self.cancelled = True
+            processes = list(self._processes)
+        for process in processes:
+            try:
+                process.kill()
+            except OSError:
+                pass
+
+
+# Parse job of the current thread, set by the parse service for the duration of a job
+current_parse_job: ContextVar[Optional[ParseJob]] = ContextVar(
+    "mineru_parse_job", default=None
+)
+
 
 class MineruParser:
     """
@@ -107,18 +184,33 @@ class MineruParser:
         if vlm_url:
             cmd.extend(["-u", vlm_url])
 
+        job = current_parse_job.get()
         try:
-            result = subprocess.run(
+            process = subprocess.Popen(
                 cmd,
-                capture_output=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
                 text=True,
-                check=True,
                 encoding="utf-8",
                 errors="ignore",
             )
+            if job is not None:
+                job.register(process)
+            try:
+                stdout, stderr = process.communicate()
+            finally:
+                if job is not None:
+                    job.unregister(process)
+
+            if job is not None and job.cancelled:
+                raise ParseCancelledError(f"MinerU parsing of {input_path} cancelled")
+            if process.returncode != 0:
+                raise subprocess.CalledProcessError(
+                    process.returncode, cmd, output=stdout, stderr=stderr
+                )
             print("MinerU command executed successfully")
-            if result.stdout:
-                print(f"Output: {result.stdout}")
+            if stdout:
+                print(f"Output: {stdout}")
         except subprocess.CalledProcessError as e:
             print(f"Error running mineru command: {e}")
             if e.stderr:
@@ -196,12 +288,173 @@ class MineruParser:
 
         return content_list, md_content
 
+    @staticmethod
+    def _get_pdf_page_count(pdf_path: Path) -> Optional[int]:
+        """
+        Count the pages of a PDF file
+
+        Args:
+            pdf_path: Path to the PDF file
+
+        Returns:
+            Number of pages, or None if no PDF library is available or the file cannot be read
+        """
+        try:
+            from pypdf import PdfReader
+
+            return len(PdfReader(str(pdf_path)).pages)
+        except ImportError:
+            pass
+        except Exception as e:
+            print(f"Warning: Could not count pages of {pdf_path}: {e}")
+            return None
+
+        try:
+            # Installed together with MinerU
+            import pypdfium2 as pdfium
+
+            pdf = pdfium.PdfDocument(str(pdf_path))
+            try:
+                return len(pdf)
+            finally:
+                pdf.close()
+        except Exception as e:
+            print(f"Warning: Could not count pages of {pdf_path}: {e}")
+            return None
+
+    @staticmethod
+    def _parse_pdf_sharded(
+        pdf_path: Path,
+        base_output_dir: Path,
+        page_count: int,
+        shard_pages: int,
+        max_workers: int,
+        method: str = "auto",
+        lang: Optional[str] = None,
+        **kwargs,
+    ) -> Tuple[List[Dict[str, Any]], str]:
+        """
+        Parse a PDF as page-range shards in parallel MinerU processes
+
+        Each shard is parsed into its own output directory. The content lists are
+        stitched back in page order with global page_idx values, shard images are
+        moved into the document's images directory, and the stitched outputs are
+        written where an unsharded parse would put them.
+
+        Args:
+            pdf_path: Path to the PDF file
+            base_output_dir: Output directory path
+            page_count: Number of pages in the PDF
+            shard_pages: Number of pages per shard
+            max_workers: Maximum number of shards parsed concurrently
+            method: Parsing method (auto, txt, ocr)
+            lang: Document language for OCR optimization
+            **kwargs: Additional parameters for mineru command
+
+        Returns:
+            Tuple[List[Dict[str, Any]], str]: Tuple containing (content list JSON, Markdown text)
+        """
+        kwargs.pop("start_page", None)
+        kwargs.pop("end_page", None)
+        name_without_suff = pdf_path.stem
+        read_method = "vlm" if kwargs.get("backend", "").startswith("vlm-") else method
+        final_dir = base_output_dir / name_without_suff / read_method
+        shards_dir = base_output_dir / name_without_suff / "shards"
+
+        shards = [
+            (start, min(start + shard_pages, page_count) - 1)
+            for start in range(0, page_count, shard_pages)
+        ]
+        print(
+            f"Parsing {pdf_path.name} ({page_count} pages) as {len(shards)} shards "
+            f"of {shard_pages} pages with {max_workers} workers"
+        )
+
+        def parse_shard(start: int, end: int) -> Tuple[List[Dict[str, Any]], str]:
+            shard_dir = shards_dir / f"{start:05d}-{end:05d}"
+            shard_dir.mkdir(parents=True, exist_ok=True)
+            MineruParser._run_mineru_command(
+                input_path=pdf_path,
+                output_dir=shard_dir,
+                method=method,
+                lang=lang,
+                start_page=start,
+                end_page=end,
+                **kwargs,
+            )
+            content_list, md_content = MineruParser._read_output_files(
+                shard_dir, name_without_suff, method=read_method
+            )
+
+            # MinerU numbers the pages of a shard from 0; shift them to global
+            # indices unless they already are global
+            shard_size = end - start + 1
+            page_indices = [
+                item["page_idx"]
+                for item in content_list
+                if isinstance(item.get("page_idx"), int)
+            ]
+            if page_indices and max(page_indices) < shard_size:
+                for item in content_list:
+                    if isinstance(item.get("page_idx"), int):
+                        item["page_idx"] += start
+
+            # Move shard images next to the stitched outputs; MinerU names images
+            # by content hash, so relative image paths stay valid
+            shard_images = shard_dir / name_without_suff / read_method / "images"
+            if shard_images.exists():
+                final_images = final_dir / "images"
+                final_images.mkdir(parents=True, exist_ok=True)
+                for image in shard_images.iterdir():
+                    target = final_images / image.name
+                    if not target.exists():
+                        shutil.move(str(image), str(target))
+
+            return content_list, md_content
+
+        # Propagate the parse job (for timeouts and cancellation) to the shard threads
+        with ThreadPoolExecutor(
+            max_workers=max(1, max_workers), thread_name_prefix="mineru-shard"
+        ) as executor:
+            futures = [
+                executor.submit(
+                    contextvars.copy_context().run, parse_shard, start, end
+                )
+                for start, end in shards
+            ]
+            try:
+                results = [future.result() for future in futures]
+            except BaseException:
+                job = current_parse_job.get()
+                if job is not None:
+                    job.cancel()
+                for future in futures:
+                    future.cancel()
+                raise
+
+        content_list = [item for shard_list, _ in results for item in shard_list]
+        md_content = "\n\n".join(md for _, md in results if md)
+
+        # Write the stitched outputs where an unsharded parse would put them
+        final_dir.mkdir(parents=True, exist_ok=True)
+        with open(
+            final_dir / f"{name_without_suff}_content_list.json", "w", encoding="utf-8"
+        ) as f:
+            json.dump(content_list, f, ensure_ascii=False, indent=2)
+        with open(final_dir / f"{name_without_suff}.md", "w", encoding="utf-8") as f:
+            f.write(md_content)
+        shutil.rmtree(shards_dir, ignore_errors=True)
+
+        return content_list, md_content
+
     @staticmethod
     def parse_pdf(
         pdf_path: Union[str, Path],
         output_dir: Optional[str] = None,
         method: str = "auto",
         lang: Optional[str] = None,
+        shard_pages: Optional[int] = None,
+        shard_workers: int = 4,
         **kwargs,
     ) -> Tuple[List[Dict[str, Any]], str]:
         """
@@ -212,6 +465,8 @@ class MineruParser:
             output_dir: Output directory path
             method: Parsing method (auto, txt, ocr)
             lang: Document language for OCR optimization
+            shard_pages: If set, PDFs with more pages are split into page-range shards of this size and parsed in parallel
+            shard_workers: Maximum number of shards parsed concurrently
             **kwargs: Additional parameters for mineru command
 
         Returns:
@@ -233,6 +488,25 @@ class MineruParser:
 
             base_output_dir.mkdir(parents=True, exist_ok=True)
 
+            # Split large PDFs into page shards, unless a page range was requested
+            if (
+                shard_pages
+                and kwargs.get("start_page") is None
+                and kwargs.get("end_page") is None
+            ):
+                page_count = MineruParser._get_pdf_page_count(pdf_path)
+                if page_count is not None and page_count > shard_pages:
+                    return MineruParser._parse_pdf_sharded(
+                        pdf_path=pdf_path,
+                        base_output_dir=base_output_dir,
+                        page_count=page_count,
+                        shard_pages=shard_pages,
+                        max_workers=shard_workers,
+                        method=method,
+                        lang=lang,
+                        **kwargs,
+                    )
+
             # Run mineru command
             MineruParser._run_mineru_command(
                 input_path=pdf_path,
@@ -405,11 +679,73 @@ class MineruParser:
             print(f"Error in parse_image: {str(e)}")
             raise
 
+    @staticmethod
+    def convert_office_to_pdf(
+        doc_path: Union[str, Path], output_dir: Union[str, Path]
+    ) -> Path:
+        """
+        Convert an Office document to PDF on the shared LibreOffice pool
+
+        Conversions are bounded by the pool size (LIBREOFFICE_WORKERS), not by the
+        number of concurrent MinerU parses.
+
+        Args:
+            doc_path: Path to the document file (.doc, .docx, .ppt, .pptx, .xls, .xlsx)
+            output_dir: Directory receiving the PDF
+
+        Returns:
+            Path: The generated PDF
+        """
+        doc_path = Path(doc_path)
+        if not doc_path.exists():
+            raise FileNotFoundError(f"Document file does not exist: {doc_path}")
+        if doc_path.suffix.lower() not in OFFICE_FORMATS:
+            raise ValueError(f"Unsupported office format: {doc_path.suffix}")
+
+        # Long-lived LibreOffice workers are shared by all conversions
+        try:
+            from .office_converter import get_office_converter
+        except ImportError:
+            # Running as a script
+            from office_converter import get_office_converter
+
+        converter = get_office_converter()
+        output_path = Path(output_dir)
+
+        # Convert to PDF using LibreOffice
+        print(f"Converting {doc_path.name} to PDF using LibreOffice...")
+        try:
+            converter.convert(doc_path, output_path)
+            print(f"Successfully converted {doc_path.name} to PDF")
+        except Exception as e:
+            raise RuntimeError(
+                f"LibreOffice conversion failed for {doc_path.name}: {e}. "
+                f"Please check if the file is corrupted or try converting manually."
+            ) from e
+
+        # Find the generated PDF
+        pdf_path = output_path / f"{doc_path.stem}.pdf"
+        if not pdf_path.exists():
+            raise RuntimeError(
+                f"PDF conversion failed for {doc_path.name} - no PDF file generated. "
+                f"Please check LibreOffice installation or try manual conversion."
+            )
+        print(f"Generated PDF: {pdf_path.name} ({pdf_path.stat().st_size} bytes)")
+
+        # Validate the generated PDF
+        if pdf_path.stat().st_size < 100:  # Very small file, likely empty
+            raise RuntimeError(
+                "Generated PDF appears to be empty or corrupted. "
+                "Original file may have issues or LibreOffice conversion failed."
+            )
+        return pdf_path
+
     @staticmethod
     def parse_office_doc(
         doc_path: Union[str, Path],
         output_dir: Optional[str] = None,
         lang: Optional[str] = None,
+        pdf_path: Optional[Union[str, Path]] = None,
         **kwargs,
     ) -> Tuple[List[Dict[str, Any]], str]:
         """
@@ -424,180 +760,283 @@ class MineruParser:
             doc_path: Path to the document file (.doc, .docx, .ppt, .pptx, .xls, .xlsx)
             output_dir: Output directory path
             lang: Document language for OCR optimization
+            pdf_path: PDF already converted from doc_path, skips the conversion
             **kwargs: Additional parameters for mineru command
 
         Returns:
             Tuple[List[Dict[str, Any]], str]: Tuple containing (content list JSON, Markdown text)
         """
         try:
-            doc_path = Path(doc_path)
-            if not doc_path.exists():
-                raise FileNotFoundError(f"Document file does not exist: {doc_path}")
-
-            # Supported office formats
-            supported_office_formats = {
-                ".doc",
-                ".docx",
-                ".ppt",
-                ".pptx",
-                ".xls",
-                ".xlsx",
-            }
-            if doc_path.suffix.lower() not in supported_office_formats:
-                raise ValueError(f"Unsupported office format: {doc_path.suffix}")
-
-            # Check if LibreOffice is available
-            libreoffice_available = False
-            working_libreoffice_cmd = None
-            try:
-                result = subprocess.run(
-                    ["libreoffice", "--version"],
-                    capture_output=True,
-                    check=True,
-                    timeout=10,
-                    encoding="utf-8",
-                    errors="ignore",
+            if pdf_path is not None:
+                return MineruParser.parse_pdf(
+                    pdf_path=pdf_path, output_dir=output_dir, lang=lang, **kwargs
                 )
-                libreoffice_available = True
-                working_libreoffice_cmd = "libreoffice"
-                print(f"LibreOffice detected: {result.stdout.strip()}")
-            except (
-                subprocess.CalledProcessError,
-                FileNotFoundError,
-                subprocess.TimeoutExpired,
-            ):
-                pass
 
-            # Try alternative commands for LibreOffice
-            if not libreoffice_available:
-                for cmd in ["soffice", "libreoffice"]:
-                    try:
-                        result = subprocess.run(
-                            [cmd, "--version"],
-                            capture_output=True,
-                            check=True,
-                            timeout=10,
-                            encoding="utf-8",
-                            errors="ignore",
-                        )
-                        libreoffice_available = True
-                        working_libreoffice_cmd = cmd
-                        print(
-                            f"LibreOffice detected with command '{cmd}': {result.stdout.strip()}"
-                        )
-                        break
-                    except (
-                        subprocess.CalledProcessError,
-                        FileNotFoundError,
-                        subprocess.TimeoutExpired,
-                    ):
-                        continue
+            # Create temporary directory for PDF conversion
+            with tempfile.TemporaryDirectory() as temp_dir:
+                converted = MineruParser.convert_office_to_pdf(doc_path, temp_dir)
 
-            if not libreoffice_available:
-                raise RuntimeError(
-                    "LibreOffice is required for Office document conversion but was not found.\n"
-                    "Please install LibreOffice:\n"
-                    "- Windows: Download from https://www.libreoffice.org/download/download/\n"
-                    "- macOS: brew install --cask libreoffice\n"
-                    "- Ubuntu/Debian: sudo apt-get install libreoffice\n"
-                    "- CentOS/RHEL: sudo yum install libreoffice\n"
-                    "Alternatively, convert the document to PDF manually.\n"
-                    "MinerU 2.0 no longer includes built-in Office document conversion."
+                # Parse the converted PDF
+                return MineruParser.parse_pdf(
+                    pdf_path=converted, output_dir=output_dir, lang=lang, **kwargs
                 )
 
-            # Create temporary directory for PDF conversion
-            with tempfile.TemporaryDirectory() as temp_dir:
-                temp_path = Path(temp_dir)
+        except Exception as e:
+            print(f"Error in parse_office_doc: {str(e)}")
+            raise
 
-                # Convert to PDF using LibreOffice
-                print(f"Converting {doc_path.name} to PDF using LibreOffice...")
+    @staticmethod
+    def _markdown_table_to_html(rows: List[str]) -> str:
+        """Convert the rows of a pipe table (without the separator row) to HTML"""
+        html_rows = []
+        for row_index, row in enumerate(rows):
+            cells = [cell.strip() for cell in row.strip().strip("|").split("|")]
+            tag = "th" if row_index == 0 else "td"
+            html_rows.append(
+                "<tr>" + "".join(f"<{tag}>{cell}</{tag}>" for cell in cells) + "</tr>"
+            )
+        return "<table>" + "".join(html_rows) + "</table>"
 
-                # Use the working LibreOffice command first, then try alternatives if it fails
-                commands_to_try = [working_libreoffice_cmd]
-                if working_libreoffice_cmd == "libreoffice":
-                    commands_to_try.append("soffice")
-                else:
-                    commands_to_try.append("libreoffice")
+    @staticmethod
+    def _parse_text_lines(
+        lines: Iterable[str],
+        base_dir: Path,
+        is_markdown: bool = True,
+        chars_per_page: int = 3000,
+    ) -> List[Dict[str, Any]]:
+        """
+        Build a MinerU-style content list from the lines of a text or markdown file
 
-                conversion_successful = False
-                for cmd in commands_to_try:
-                    try:
-                        convert_cmd = [
-                            cmd,
-                            "--headless",
-                            "--convert-to",
-                            "pdf",
-                            "--outdir",
-                            str(temp_path),
-                            str(doc_path),
-                        ]
-
-                        result = subprocess.run(
-                            convert_cmd,
-                            capture_output=True,
-                            text=True,
-                            timeout=60,  # 60 second timeout
-                            encoding="utf-8",
-                            errors="ignore",
-                        )
+        Markdown produces headings (text_level), pipe and HTML tables (HTML
+        table_body), $$ equation blocks and standalone image references; plain text
+        produces paragraphs. Pseudo page numbers are assigned every chars_per_page
+        characters so page-based context extraction keeps working.
 
-                        if result.returncode == 0:
-                            conversion_successful = True
-                            print(f"Successfully converted {doc_path.name} to PDF")
-                            break
-                        else:
-                            print(
-                                f"LibreOffice command '{cmd}' failed: {result.stderr}"
-                            )
-                    except subprocess.TimeoutExpired:
-                        print(f"LibreOffice command '{cmd}' timed out")
-                    except Exception as e:
-                        print(f"LibreOffice command '{cmd}' failed with exception: {e}")
+        Args:
+            lines: Lines of the file, consumed in a single pass
+            base_dir: Directory that relative image paths are resolved against
+            is_markdown: Whether to interpret markdown syntax
+            chars_per_page: Approximate number of characters per pseudo page
 
-                if not conversion_successful:
-                    raise RuntimeError(
-                        f"LibreOffice conversion failed for {doc_path.name}. "
-                        f"Please check if the file is corrupted or try converting manually."
-                    )
+        Returns:
+            List[Dict[str, Any]]: Content list
+        """
+        content_list: List[Dict[str, Any]] = []
+        chars = 0
+        paragraph: List[str] = []
+        block: List[str] = []
+        block_kind: Optional[str] = None  # "code", "equation" or "html_table"
+        fence = ""  # Opening fence of the current code block
+        table_rows: List[str] = []
+        table_started = False
+
+        def emit(item: Dict[str, Any], text: str) -> None:
+            nonlocal chars
+            item["page_idx"] = chars // chars_per_page
+            content_list.append(item)
+            chars += len(text)
+
+        def table_item(body: str) -> Dict[str, Any]:
+            return {
+                "type": "table",
+                "img_path": "",
+                "table_caption": [],
+                "table_footnote": [],
+                "table_body": body,
+            }
 
-                # Find the generated PDF
-                pdf_files = list(temp_path.glob("*.pdf"))
-                if not pdf_files:
-                    raise RuntimeError(
-                        f"PDF conversion failed for {doc_path.name} - no PDF file generated. "
-                        f"Please check LibreOffice installation or try manual conversion."
+        def flush_paragraph() -> None:
+            if paragraph:
+                text = "\n".join(paragraph)
+                emit({"type": "text", "text": text}, text)
+                paragraph.clear()
+
+        def flush_block() -> None:
+            nonlocal block_kind
+            text = "\n".join(block)
+            if block_kind == "equation":
+                emit({"type": "equation", "text": text, "text_format": "latex"}, text)
+            elif block_kind == "html_table":
+                emit(table_item(text), text)
+            else:
+                emit({"type": "text", "text": text}, text)
+            block.clear()
+            block_kind = None
+
+        def flush_table() -> None:
+            nonlocal table_started
+            if table_rows:
+                body = MineruParser._markdown_table_to_html(table_rows)
+                emit(table_item(body), body)
+                table_rows.clear()
+            table_started = False
+
+        for raw_line in lines:
+            line = raw_line.rstrip("\r\n")
+            stripped = line.strip()
+
+            if not is_markdown:
+                if stripped:
+                    paragraph.append(line)
+                else:
+                    flush_paragraph()
+                continue
+
+            # Inside a fenced code, equation or HTML table block
+            if block_kind is not None:
+                block.append(line)
+                if (
+                    (block_kind == "code" and _closes_fence(stripped, fence))
+                    or (block_kind == "equation" and stripped.endswith("$$"))
+                    or (block_kind == "html_table" and "</table>" in stripped.lower())
+                ):
+                    flush_block()
+                continue
+
+            # Pipe tables: a header row, a separator row, then body rows
+            if table_rows:
+                if table_started:
+                    if "|" in stripped:
+                        table_rows.append(line)
+                        continue
+                    flush_table()
+                elif _TABLE_SEPARATOR_RE.match(stripped):
+                    # A table may follow a paragraph line without a blank line
+                    flush_paragraph()
+                    table_started = True
+                    continue
+                else:
+                    # The candidate header row was ordinary text
+                    paragraph.append(table_rows.pop())
+
+            if not stripped:
+                flush_paragraph()
+                continue
+
+            opening_fence = _FENCE_RE.match(stripped)
+            if opening_fence:
+                flush_paragraph()
+                block_kind = "code"
+                fence = opening_fence.group(1)
+                block.append(line)
+                continue
+
+            if stripped.startswith("$$"):
+                flush_paragraph()
+                if len(stripped) >= 4 and stripped.endswith("$$"):
+                    emit(
+                        {"type": "equation", "text": stripped, "text_format": "latex"},
+                        stripped,
                     )
-
-                pdf_path = pdf_files[0]
-                print(
-                    f"Generated PDF: {pdf_path.name} ({pdf_path.stat().st_size} bytes)"
+                else:
+                    block_kind = "equation"
+                    block.append(line)
+                continue
+
+            if stripped.lower().startswith("<table"):
+                flush_paragraph()
+                block_kind = "html_table"
+                block.append(line)
+                if "</table>" in stripped.lower():
+                    flush_block()
+                continue
+
+            heading = _HEADING_RE.match(stripped)
+            if heading:
+                flush_paragraph()
+                emit(
+                    {
+                        "type": "text",
+                        "text": heading.group(2),
+                        "text_level": len(heading.group(1)),
+                    },
+                    stripped,
+                )
+                continue
+
+            image = _IMAGE_RE.match(stripped)
+            if image:
+                flush_paragraph()
+                alt, src = image.group(1), image.group(2)
+                img_path = src
+                if "://" not in src and not Path(src).is_absolute():
+                    candidate = base_dir / src
+                    if candidate.exists():
+                        img_path = str(candidate.resolve())
+                emit(
+                    {
+                        "type": "image",
+                        "img_path": img_path,
+                        "img_caption": [alt] if alt else [],
+                        "img_footnote": [],
+                    },
+                    stripped,
                 )
+                continue
 
-                # Validate the generated PDF
-                if pdf_path.stat().st_size < 100:  # Very small file, likely empty
-                    raise RuntimeError(
-                        "Generated PDF appears to be empty or corrupted. "
-                        "Original file may have issues or LibreOffice conversion failed."
+            if stripped.startswith("|"):
+                table_rows.append(line)
+                continue
+
+            paragraph.append(line)
+
+        # Close whatever is still open at the end of the file
+        if table_rows and not table_started:
+            paragraph.append(table_rows.pop())
+        flush_table()
+        if block:
+            paragraph.extend(block)
+            block.clear()
+        flush_paragraph()
+
+        return content_list
+
+    @staticmethod
+    def _parse_text_native(text_path: Path) -> Tuple[List[Dict[str, Any]], str]:
+        """
+        Parse a text or markdown file directly, without rendering it to PDF
+
+        Args:
+            text_path: Path to the text file (.txt, .md)
+
+        Returns:
+            Tuple[List[Dict[str, Any]], str]: Tuple containing (content list JSON, Markdown text)
+        """
+        is_markdown = text_path.suffix.lower() == ".md"
+        for encoding in ["utf-8", "gbk", "latin-1", "cp1252"]:
+            md_lines: List[str] = []
+
+            def read_lines(f) -> Iterable[str]:
+                for line in f:
+                    md_lines.append(line)
+                    yield line
+
+            try:
+                with open(text_path, "r", encoding=encoding) as f:
+                    content_list = MineruParser._parse_text_lines(
+                        read_lines(f), text_path.parent, is_markdown=is_markdown
                     )
+            except UnicodeDecodeError:
+                continue
 
-                # Parse the converted PDF
-                return MineruParser.parse_pdf(
-                    pdf_path=pdf_path, output_dir=output_dir, lang=lang, **kwargs
-                )
+            if encoding != "utf-8":
+                print(f"Successfully read file with {encoding} encoding")
+            return content_list, "".join(md_lines)
 
-        except Exception as e:
-            print(f"Error in parse_office_doc: {str(e)}")
-            raise
+        raise RuntimeError(
+            f"Could not decode text file {text_path.name} with any supported encoding"
+        )
 
     @staticmethod
     def parse_text_file(
         text_path: Union[str, Path],
         output_dir: Optional[str] = None,
         lang: Optional[str] = None,
+        use_pdf_rendering: bool = False,
         **kwargs,
     ) -> Tuple[List[Dict[str, Any]], str]:
         """
-        Parse text file by first converting to PDF, then parsing with MinerU 2.0
+        Parse text file, natively or by first converting to PDF and parsing with MinerU 2.0
 
         Supported formats: .txt, .md
 
@@ -605,6 +1044,7 @@ class MineruParser:
             text_path: Path to the text file (.txt, .md)
             output_dir: Output directory path
             lang: Document language for OCR optimization
+            use_pdf_rendering: Render the file to PDF and parse it with MinerU instead of parsing it directly
             **kwargs: Additional parameters for mineru command
 
         Returns:
@@ -620,6 +1060,9 @@ class MineruParser:
             if text_path.suffix.lower() not in supported_text_formats:
                 raise ValueError(f"Unsupported text format: {text_path.suffix}")
 
+            if not use_pdf_rendering:
+                return MineruParser._parse_text_native(text_path)
+
             # Read the text content
             try:
                 with open(text_path, "r", encoding="utf-8") as f:
@@ -9,13 +9,14 @@ Includes:
 - GenericModalProcessor: Processor for other modal content
 """
 
-import base64
+import asyncio
 import json
 import re
 import time
-from dataclasses import asdict, dataclass
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 
 from src.LightRAG.lightrag import LightRAG
 from src.LightRAG.lightrag.kg.shared_storage import (
@@ -28,6 +29,11 @@ from src.LightRAG.lightrag.utils import (
     logger,
 )
 
+from src.RAGAnything.raganything.image_preprocessor import (
+    ImagePreprocessor,
+    PreparedImage,
+)
+
 # Import prompt templates
 from src.RAGAnything.raganything.prompt import PROMPTS
 
@@ -48,9 +54,39 @@ class ContextConfig:
             self.filter_content_types = ["text"]
 
 
+@dataclass
+class IndexedBlock:
+    """Content block text prepared for context extraction"""
+
+    position: int  # Position in the content list
+    page_idx: Any
+    text: str
+    length: int  # Token count, or character count without a tokenizer
+    tokens: Optional[List[int]] = None  # Token ids when a tokenizer is available
+
+
+@dataclass
+class ContentIndex:
+    """Lookup structure for one content list
+
+    Holds the text and token count of every block passing the context filter,
+    and the blocks of each page, so extracting the context of an item only
+    touches the blocks inside its window.
+    """
+
+    source_length: int
+    tokenized: bool
+    blocks: List[IndexedBlock] = field(default_factory=list)
+    pages: Dict[Any, List[int]] = field(default_factory=dict)  # page -> block ids
+    by_position: Dict[int, int] = field(default_factory=dict)  # position -> block id
+
+
 class ContextExtractor:
     """Universal context extractor supporting multiple content source formats"""
 
+    # Number of content lists whose index is kept
+    max_indexed_sources = 8
+
     def __init__(self, config: ContextConfig = None, tokenizer=None):
         """Initialize context extractor
 
@@ -60,6 +96,76 @@ class ContextExtractor:
         """
         self.config = config or ContextConfig()
         self.tokenizer = tokenizer
+        self._indexes: "OrderedDict[int, Tuple[List[Dict], ContentIndex]]" = (
+            OrderedDict()
+        )
+
+    def index_content_source(
+        self, content_source: Any, content_format: str = "auto"
+    ) -> Optional[ContentIndex]:
+        """Build (or reuse) the lookup index of a MinerU-style content list
+
+        Args:
+            content_source: Source content, only content lists are indexed
+            content_format: Format hint for content source
+
+        Returns:
+            The content index, or None if the source is not a content list
+        """
+        if not isinstance(content_source, list) or content_format not in (
+            "minerU",
+            "auto",
+        ):
+            return None
+        return self._get_index(content_source)
+
+    def _get_index(self, content_list: List[Dict]) -> ContentIndex:
+        cached = self._indexes.get(id(content_list))
+        if cached is not None:
+            source, index = cached
+            if (
+                source is content_list
+                and index.source_length == len(content_list)
+                and index.tokenized == (self.tokenizer is not None)
+            ):
+                self._indexes.move_to_end(id(content_list))
+                return index
+
+        index = self._build_index(content_list)
+        self._indexes[id(content_list)] = (content_list, index)
+        self._indexes.move_to_end(id(content_list))
+        while len(self._indexes) > self.max_indexed_sources:
+            self._indexes.popitem(last=False)
+        return index
+
+    def _build_index(self, content_list: List[Dict]) -> ContentIndex:
+        index = ContentIndex(
+            source_length=len(content_list), tokenized=self.tokenizer is not None
+        )
+        for position, item in enumerate(content_list):
+            if item.get("type", "") not in self.config.filter_content_types:
+                continue
+            text = self._extract_text_from_item(item)
+            if not text or not text.strip():
+                continue
+
+            if self.tokenizer:
+                tokens = self.tokenizer.encode(text)
+                block = IndexedBlock(
+                    position, item.get("page_idx", 0), text, len(tokens), tokens
+                )
+            else:
+                block = IndexedBlock(position, item.get("page_idx", 0), text, len(text))
+
+            block_id = len(index.blocks)
+            index.blocks.append(block)
+            index.pages.setdefault(block.page_idx, []).append(block_id)
+            index.by_position[position] = block_id
+
+        logger.debug(
+            f"Indexed {len(index.blocks)} context blocks over {len(index.pages)} pages"
+        )
+        return index
 
     def extract_context(
         self,
@@ -144,33 +250,29 @@ class ContextExtractor:
         Returns:
             Context text from surrounding pages
         """
+        index = self._get_index(content_list)
         current_page = current_item_info.get("page_idx", 0)
         window_size = self.config.context_window
 
         start_page = max(0, current_page - window_size)
         end_page = current_page + window_size + 1
 
-        context_texts = []
-
-        for item in content_list:
-            item_page = item.get("page_idx", 0)
-            item_type = item.get("type", "")
+        block_ids = sorted(
+            block_id
+            for page in range(start_page, end_page)
+            for block_id in index.pages.get(page, ())
+        )
 
-            # Check if item is within context window and matches filter criteria
-            if (
-                start_page <= item_page < end_page
-                and item_type in self.config.filter_content_types
-            ):
-                text_content = self._extract_text_from_item(item)
-                if text_content and text_content.strip():
-                    # Add page marker for better context understanding
-                    if item_page != current_page:
-                        context_texts.append(f"[Page {item_page}] {text_content}")
-                    else:
-                        context_texts.append(text_content)
+        # Add page marker for better context understanding
+        blocks = []
+        for block_id in block_ids:
+            block = index.blocks[block_id]
+            marker = (
+                "" if block.page_idx == current_page else f"[Page {block.page_idx}] "
+            )
+            blocks.append((marker, block))
 
-        context = "\n".join(context_texts)
-        return self._truncate_context(context)
+        return self._join_within_budget(blocks)
 
     def _extract_chunk_context(
         self, content_list: List[Dict], current_item_info: Dict
@@ -184,26 +286,19 @@ class ContextExtractor:
         Returns:
             Context text from surrounding chunks
         """
+        index = self._get_index(content_list)
         current_index = current_item_info.get("index", 0)
         window_size = self.config.context_window
 
         start_idx = max(0, current_index - window_size)
         end_idx = min(len(content_list), current_index + window_size + 1)
 
-        context_texts = []
-
+        blocks = []
         for i in range(start_idx, end_idx):
-            if i != current_index:
-                item = content_list[i]
-                item_type = item.get("type", "")
+            if i != current_index and i in index.by_position:
+                blocks.append(("", index.blocks[index.by_position[i]]))
 
-                if item_type in self.config.filter_content_types:
-                    text_content = self._extract_text_from_item(item)
-                    if text_content and text_content.strip():
-                        context_texts.append(text_content)
-
-        context = "\n".join(context_texts)
-        return self._truncate_context(context)
+        return self._join_within_budget(blocks)
 
     def _extract_text_from_item(self, item: Dict) -> str:
         """Extract text content from a content item
@@ -307,6 +402,66 @@ class ContextExtractor:
         context = "\n".join(context_texts)
         return self._truncate_context(context)
 
+    def _measure(self, text: str) -> int:
+        """Token count of a text, or its character count without a tokenizer"""
+        if not text:
+            return 0
+        if self.tokenizer:
+            return len(self.tokenizer.encode(text))
+        return len(text)
+
+    def _join_within_budget(self, blocks: List[Tuple[str, IndexedBlock]]) -> str:
+        """Join indexed blocks, truncating at the maximum token limit
+
+        Uses the cached block token counts, so only the block crossing the limit
+        is cut; blocks after it are dropped.
+
+        Args:
+            blocks: (prefix, block) pairs in output order
+
+        Returns:
+            Context text within the token limit
+        """
+        budget = self.config.max_context_tokens
+        parts = []
+        used = 0
+        for prefix, block in blocks:
+            # Count one unit for the newline separator
+            separator = 1 if parts else 0
+            prefix_length = self._measure(prefix)
+            cost = separator + prefix_length + block.length
+            if used + cost <= budget:
+                parts.append(prefix + block.text)
+                used += cost
+                continue
+
+            remaining = budget - used - separator - prefix_length
+            if remaining > 0:
+                if block.tokens is not None:
+                    cut = self.tokenizer.decode(block.tokens[:remaining])
+                else:
+                    cut = block.text[:remaining]
+                parts.append(prefix + cut)
+            return self._end_at_boundary("\n".join(parts))
+
+        return "\n".join(parts)
+
+    def _end_at_boundary(self, truncated_text: str) -> str:
+        """Cut truncated text back to a sentence or line boundary when one is close"""
+        if not truncated_text:
+            return ""
+
+        # Try to end at a sentence boundary
+        last_period = truncated_text.rfind(".")
+        last_newline = truncated_text.rfind("\n")
+
+        if last_period > len(truncated_text) * 0.8:
+            return truncated_text[: last_period + 1]
+        elif last_newline > len(truncated_text) * 0.8:
+            return truncated_text[:last_newline]
+        else:
+            return truncated_text + "..."
+
     def _truncate_context(self, context: str) -> str:
         """Truncate context to maximum token limit
 
@@ -327,36 +482,188 @@ class ContextExtractor:
 
             # Truncate to max tokens and decode back to text
             truncated_tokens = tokens[: self.config.max_context_tokens]
-            truncated_text = self.tokenizer.decode(truncated_tokens)
-
-            # Try to end at a sentence boundary
-            last_period = truncated_text.rfind(".")
-            last_newline = truncated_text.rfind("\n")
-
-            if last_period > len(truncated_text) * 0.8:
-                return truncated_text[: last_period + 1]
-            elif last_newline > len(truncated_text) * 0.8:
-                return truncated_text[:last_newline]
-            else:
-                return truncated_text + "..."
+            return self._end_at_boundary(self.tokenizer.decode(truncated_tokens))
         else:
             # Fallback to character-based truncation if no tokenizer
             if len(context) <= self.config.max_context_tokens:
                 return context
 
             # Simple truncation - fallback when no tokenizer available
-            truncated = context[: self.config.max_context_tokens]
+            return self._end_at_boundary(context[: self.config.max_context_tokens])
+
+
+class DescriptionBatcher:
+    """Packs concurrent description requests of small items into one LLM call
+
+    Requests arriving within a short window are grouped, up to batch_size per
+    call. Each item's context is included once per batch, however many items
+    share it. The batched answer maps item numbers to results in the
+    single-item response format. Items missing from the answer or incomplete
+    fall back to their own single-item call.
+    """
 
-            # Try to end at a sentence boundary
-            last_period = truncated.rfind(".")
-            last_newline = truncated.rfind("\n")
+    def __init__(
+        self,
+        modal_caption_func,
+        batch_prompt: str,
+        system_prompt: str,
+        batch_size: int = 8,
+        window_ms: float = 50,
+        max_item_chars: int = 2000,
+    ):
+        """Initialize description batcher
 
-            if last_period > len(truncated) * 0.8:
-                return truncated[: last_period + 1]
-            elif last_newline > len(truncated) * 0.8:
-                return truncated[:last_newline]
+        Args:
+            modal_caption_func: Function for generating descriptions
+            batch_prompt: Prompt template with {count}, {contexts} and {items}
+            system_prompt: System prompt of the batched call
+            batch_size: Maximum number of items per call (1 disables batching)
+            window_ms: Time to wait for more items before sending a batch
+            max_item_chars: Larger items are always described on their own
+        """
+        self.modal_caption_func = modal_caption_func
+        self.batch_prompt = batch_prompt
+        self.system_prompt = system_prompt
+        self.batch_size = batch_size
+        self.window = window_ms / 1000
+        self.max_item_chars = max_item_chars
+        self._pending: List[tuple] = []
+        self._flush_handle = None
+        self._flush_tasks: set = set()
+
+    async def describe(
+        self,
+        item_text: str,
+        context: str,
+        describe_single: Callable[[], Awaitable[str]],
+    ) -> str:
+        """Describe an item, batched with other items when possible
+
+        Args:
+            item_text: Item information as listed in the batch prompt
+            context: Context of the item
+            describe_single: Coroutine function describing the item on its own
+
+        Returns:
+            Response in the single-item format
+        """
+        if self.batch_size <= 1 or len(item_text) > self.max_item_chars:
+            return await describe_single()
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item_text, context, describe_single, future))
+        if len(self._pending) >= self.batch_size:
+            self._schedule_flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.window, self._schedule_flush)
+        return await future
+
+    def _schedule_flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        group, self._pending = self._pending, []
+        if not group:
+            return
+        task = asyncio.create_task(self._flush(group))
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+
+    async def _flush(self, group: List[tuple]) -> None:
+        entries = [None] * len(group)
+        if len(group) > 1:
+            try:
+                response = await self.modal_caption_func(
+                    self._build_prompt(group), system_prompt=self.system_prompt
+                )
+                entries = self._parse_batch_response(response, len(group))
+            except Exception as e:
+                logger.warning(f"Batched description of {len(group)} items failed: {e}")
+
+        retries = []
+        for (_, _, describe_single, future), entry in zip(group, entries):
+            if future.done():
+                continue
+            if entry is not None:
+                future.set_result(json.dumps(entry, ensure_ascii=False))
+            else:
+                retries.append((describe_single, future))
+
+        if retries and len(group) > 1:
+            logger.info(
+                f"{len(retries)} of {len(group)} batched items fall back to single calls"
+            )
+        await asyncio.gather(
+            *[
+                self._resolve_single(describe_single, future)
+                for describe_single, future in retries
+            ]
+        )
+
+    @staticmethod
+    async def _resolve_single(describe_single, future: asyncio.Future) -> None:
+        try:
+            result = await describe_single()
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+            return
+        if not future.done():
+            future.set_result(result)
+
+    def _build_prompt(self, group: List[tuple]) -> str:
+        # Items sharing a context (e.g. on the same page) reference it once
+        contexts: Dict[str, int] = {}
+        items = []
+        for i, (item_text, context, _, _) in enumerate(group, 1):
+            header = f"Item {i}"
+            if context:
+                ref = contexts.setdefault(context, len(contexts) + 1)
+                header += f" (context C{ref})"
+            items.append(f"{header}:\n{item_text}")
+
+        context_text = "\n\n".join(
+            f"Context C{ref} from surrounding content:\n{context}"
+            for context, ref in contexts.items()
+        )
+        return self.batch_prompt.format(
+            count=len(group),
+            contexts=context_text or "None",
+            items="\n\n".join(items),
+        )
+
+    @staticmethod
+    def _parse_batch_response(response: str, count: int) -> List[Optional[Dict]]:
+        """Split a batched answer into single-item results, None where unusable"""
+        match = re.search(r"\{.*\}", response, re.DOTALL)
+        if not match:
+            logger.error("No JSON-like structure found in the batched description")
+            return [None] * count
+        try:
+            batch_data = json.loads(match.group(0))
+        except json.JSONDecodeError as e:
+            logger.error(f"JSON parsing error in batched description: {e}")
+            return [None] * count
+        if not isinstance(batch_data, dict):
+            return [None] * count
+
+        entries = []
+        for i in range(count):
+            entry = batch_data.get(str(i + 1))
+            entity_info = entry.get("entity_info") if isinstance(entry, dict) else None
+            if (
+                isinstance(entity_info, dict)
+                and entry.get("detailed_description")
+                and all(
+                    entity_info.get(key)
+                    for key in ["entity_name", "entity_type", "summary"]
+                )
+            ):
+                entries.append(entry)
             else:
-                return truncated + "..."
+                entries.append(None)
+        return entries
 
 
 class BaseModalProcessor:
@@ -367,6 +674,7 @@ class BaseModalProcessor:
         lightrag: LightRAG,
         modal_caption_func,
         context_extractor: ContextExtractor = None,
+        description_batcher: DescriptionBatcher = None,
     ):
         """Initialize base processor
 
@@ -374,9 +682,11 @@ class BaseModalProcessor:
             lightrag: LightRAG instance
             modal_caption_func: Function for generating descriptions
             context_extractor: Context extractor instance
+            description_batcher: Batcher packing small items into shared calls
         """
         self.lightrag = lightrag
         self.modal_caption_func = modal_caption_func
+        self.description_batcher = description_batcher
 
         # Use LightRAG's storage instances
         self.text_chunks_db = lightrag.text_chunks
@@ -414,6 +724,8 @@ class BaseModalProcessor:
         """
         self.content_source = content_source
         self.content_format = content_format
+        # Processors share the extractor, so the index is built once per source
+        self.context_extractor.index_content_source(content_source, content_format)
         logger.info(f"Content source set with format: {content_format}")
 
     def _get_context_for_item(self, item_info: Dict[str, Any]) -> str:
@@ -441,6 +753,34 @@ class BaseModalProcessor:
             logger.error(f"Error getting context for item {item_info}: {e}")
             return ""
 
+    async def _describe_item(
+        self,
+        prompt: str,
+        system_prompt: str,
+        batch_item: str = None,
+        context: str = "",
+    ) -> str:
+        """Describe an item, through the description batcher when one is set
+
+        Args:
+            prompt: Single-item prompt
+            system_prompt: System prompt of the single-item call
+            batch_item: Item information for the batch prompt
+            context: Context of the item
+
+        Returns:
+            Response in the single-item format
+        """
+
+        async def describe_single():
+            return await self.modal_caption_func(prompt, system_prompt=system_prompt)
+
+        if self.description_batcher is None or batch_item is None:
+            return await describe_single()
+        return await self.description_batcher.describe(
+            batch_item, context, describe_single
+        )
+
     async def process_multimodal_content(
         self,
         modal_content,
@@ -624,6 +964,7 @@ class ImageModalProcessor(BaseModalProcessor):
         lightrag: LightRAG,
         modal_caption_func,
         context_extractor: ContextExtractor = None,
+        image_preprocessor: ImagePreprocessor = None,
     ):
         """Initialize image processor
 
@@ -631,19 +972,27 @@ class ImageModalProcessor(BaseModalProcessor):
             lightrag: LightRAG instance
             modal_caption_func: Function for generating descriptions (supporting image understanding)
             context_extractor: Context extractor instance
+            image_preprocessor: Image preprocessor (resizing, re-encoding, description reuse)
         """
         super().__init__(lightrag, modal_caption_func, context_extractor)
+        self.image_preprocessor = image_preprocessor or ImagePreprocessor()
 
     def _encode_image_to_base64(self, image_path: str) -> str:
-        """Encode image to base64"""
+        """Encode image to base64, downsampled and re-encoded for the vision model"""
         try:
-            with open(image_path, "rb") as image_file:
-                encoded_string = base64.b64encode(image_file.read()).decode("utf-8")
-            return encoded_string
+            return self.image_preprocessor.prepare(image_path).base64_data
         except Exception as e:
             logger.error(f"Failed to encode image {image_path}: {e}")
             return ""
 
+    async def _prepare_image(self, image_path: str) -> Optional[PreparedImage]:
+        """Preprocess an image in the preprocessing thread pool"""
+        try:
+            return await self.image_preprocessor.aprepare(image_path)
+        except Exception as e:
+            logger.error(f"Failed to encode image {image_path}: {e}")
+            return None
+
     async def process_multimodal_content(
         self,
         modal_content,
@@ -697,17 +1046,23 @@ class ImageModalProcessor(BaseModalProcessor):
                 )
 
             # If image path exists, try to encode image
-            image_base64 = ""
+            image = None
             if image_path and Path(image_path).exists():
-                image_base64 = self._encode_image_to_base64(image_path)
+                image = await self._prepare_image(image_path)
 
             # Call vision model
-            if image_base64:
-                # Use real image for analysis
-                response = await self.modal_caption_func(
-                    vision_prompt,
-                    image_data=image_base64,
-                    system_prompt=PROMPTS["IMAGE_ANALYSIS_SYSTEM"],
+            if image is not None:
+                # Use real image for analysis; the same image with the same
+                # captions reuses the description of its first occurrence, the
+                # entity name is still set per item by _parse_response
+                response = await self.image_preprocessor.describe(
+                    image,
+                    lambda prepared: self.modal_caption_func(
+                        vision_prompt,
+                        image_data=prepared.base64_data,
+                        system_prompt=PROMPTS["IMAGE_ANALYSIS_SYSTEM"],
+                    ),
+                    variant=json.dumps([captions, footnotes], ensure_ascii=False),
                 )
             else:
                 # Analyze based on existing text information
@@ -847,9 +1202,19 @@ class TableModalProcessor(BaseModalProcessor):
                 table_footnote=table_footnote if table_footnote else "None",
             )
 
-        response = await self.modal_caption_func(
+        response = await self._describe_item(
             table_prompt,
             system_prompt=PROMPTS["TABLE_ANALYSIS_SYSTEM"],
+            batch_item=PROMPTS["table_batch_item"].format(
+                entity_name=entity_name
+                if entity_name
+                else "descriptive name for this table",
+                table_img_path=table_img_path,
+                table_caption=table_caption if table_caption else "None",
+                table_body=table_body,
+                table_footnote=table_footnote if table_footnote else "None",
+            ),
+            context=context,
         )
 
         # Parse response
@@ -963,9 +1328,17 @@ class EquationModalProcessor(BaseModalProcessor):
                 else "descriptive name for this equation",
             )
 
-        response = await self.modal_caption_func(
+        response = await self._describe_item(
             equation_prompt,
             system_prompt=PROMPTS["EQUATION_ANALYSIS_SYSTEM"],
+            batch_item=PROMPTS["equation_batch_item"].format(
+                entity_name=entity_name
+                if entity_name
+                else "descriptive name for this equation",
+                equation_text=equation_text,
+                equation_format=equation_format,
+            ),
+            context=context,
         )
 
         # Parse response
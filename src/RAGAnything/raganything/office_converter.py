@@ -0,0 +1,455 @@
+"""
+Pool of long-lived headless LibreOffice converters
+
+Office documents are converted to PDF by a fixed number of LibreOffice workers.
+Each worker owns a separate user profile, so conversions run concurrently. When
+the Python UNO bridge is available, a worker keeps one soffice process running
+and drives it over a socket; otherwise each conversion runs `soffice --convert-to`
+against the worker's already initialized profile, which still avoids the costly
+first-start profile creation. Workers are health-checked before use and restarted
+when a conversion hangs or the process dies.
+"""
+
+from __future__ import annotations
+
+__all__ = [
+    "LibreOfficePool",
+    "configure_office_converter",
+    "get_office_converter",
+    "shutdown_office_converter",
+]
+
+import atexit
+import os
+import queue
+import shutil
+import socket
+import subprocess
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from src.LightRAG.lightrag.utils import get_env_value
+
+try:
+    import uno  # type: ignore[import-not-found]
+    from com.sun.star.beans import PropertyValue  # type: ignore[import-not-found]
+
+    UNO_AVAILABLE = True
+except ImportError:
+    UNO_AVAILABLE = False
+
+# PDF export filter per source format (UNO mode)
+PDF_EXPORT_FILTERS = {
+    ".doc": "writer_pdf_Export",
+    ".docx": "writer_pdf_Export",
+    ".ppt": "impress_pdf_Export",
+    ".pptx": "impress_pdf_Export",
+    ".xls": "calc_pdf_Export",
+    ".xlsx": "calc_pdf_Export",
+}
+
+LIBREOFFICE_NOT_FOUND_MESSAGE = (
+    "LibreOffice is required for Office document conversion but was not found.\n"
+    "Please install LibreOffice:\n"
+    "- Windows: Download from https://www.libreoffice.org/download/download/\n"
+    "- macOS: brew install --cask libreoffice\n"
+    "- Ubuntu/Debian: sudo apt-get install libreoffice\n"
+    "- CentOS/RHEL: sudo yum install libreoffice\n"
+    "Alternatively, convert the document to PDF manually.\n"
+    "MinerU 2.0 no longer includes built-in Office document conversion."
+)
+
+
+def find_libreoffice() -> Optional[str]:
+    """Return the LibreOffice executable, or None if it is not installed"""
+    for cmd in ["soffice", "libreoffice"]:
+        path = shutil.which(cmd)
+        if path:
+            return path
+    return None
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        port: int = s.getsockname()[1]
+        return port
+
+
+def _properties(**kwargs: Any) -> tuple:
+    properties = []
+    for name, value in kwargs.items():
+        prop = PropertyValue()
+        prop.Name = name
+        prop.Value = value
+        properties.append(prop)
+    return tuple(properties)
+
+
+class LibreOfficeWorker:
+    """One LibreOffice instance with its own user profile"""
+
+    def __init__(self, command: str, index: int, startup_timeout: float = 60.0):
+        self.command = command
+        self.index = index
+        self.startup_timeout = startup_timeout
+        self.profile_dir: Optional[Path] = None
+        self.process: Optional[subprocess.Popen] = None
+        self.desktop: Any = None
+        self.conversions = 0
+        self._timed_out = False
+
+    @property
+    def _profile_arg(self) -> str:
+        if self.profile_dir is None:
+            raise RuntimeError(f"LibreOffice worker {self.index} is not started")
+        return f"-env:UserInstallation={self.profile_dir.resolve().as_uri()}"
+
+    def start(self) -> None:
+        """Create the worker profile and, in UNO mode, start the soffice server"""
+        self.profile_dir = Path(tempfile.mkdtemp(prefix=f"lo_profile_{self.index}_"))
+        if UNO_AVAILABLE:
+            self._start_server()
+        else:
+            # The first start creates the user profile, which dominates cold start
+            subprocess.run(
+                [
+                    self.command,
+                    self._profile_arg,
+                    "--headless",
+                    "--terminate_after_init",
+                ],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                timeout=self.startup_timeout,
+            )
+
+    def _start_server(self) -> None:
+        port = _free_port()
+        self.process = subprocess.Popen(
+            [
+                self.command,
+                self._profile_arg,
+                "--headless",
+                "--invisible",
+                "--nologo",
+                "--nodefault",
+                "--norestore",
+                f"--accept=socket,host=127.0.0.1,port={port};urp;StarOffice.ComponentContext",
+            ],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+
+        local_context = uno.getComponentContext()
+        resolver = local_context.ServiceManager.createInstanceWithContext(
+            "com.sun.star.bridge.UnoUrlResolver", local_context
+        )
+        deadline = time.monotonic() + self.startup_timeout
+        while True:
+            try:
+                context = resolver.resolve(
+                    f"uno:socket,host=127.0.0.1,port={port};urp;StarOffice.ComponentContext"
+                )
+                break
+            except Exception:
+                if self.process.poll() is not None or time.monotonic() > deadline:
+                    self.close()
+                    raise RuntimeError(
+                        f"LibreOffice worker {self.index} failed to start"
+                    )
+                time.sleep(0.25)
+
+        self.desktop = context.ServiceManager.createInstanceWithContext(
+            "com.sun.star.frame.Desktop", context
+        )
+
+    def is_healthy(self) -> bool:
+        """Check that the worker can take a conversion"""
+        if self.profile_dir is None:
+            return False
+        if not UNO_AVAILABLE:
+            return True
+        if self.process is None or self.process.poll() is not None:
+            return False
+        try:
+            # Round trip over the UNO bridge
+            self.desktop.getComponents()
+            return True
+        except Exception:
+            return False
+
+    def convert(self, input_path: Path, output_dir: Path, timeout: float) -> Path:
+        """
+        Convert a document to PDF
+
+        Args:
+            input_path: Document to convert
+            output_dir: Directory receiving <stem>.pdf
+            timeout: Timeout in seconds, after which the conversion is killed
+
+        Returns:
+            Path: The generated PDF
+        """
+        output_path = output_dir / f"{input_path.stem}.pdf"
+        if UNO_AVAILABLE:
+            self._convert_uno(input_path, output_path, timeout)
+        else:
+            result = subprocess.run(
+                [
+                    self.command,
+                    self._profile_arg,
+                    "--headless",
+                    "--convert-to",
+                    "pdf",
+                    "--outdir",
+                    str(output_dir),
+                    str(input_path),
+                ],
+                capture_output=True,
+                text=True,
+                timeout=timeout,
+                encoding="utf-8",
+                errors="ignore",
+            )
+            if result.returncode != 0:
+                raise RuntimeError(f"LibreOffice conversion failed: {result.stderr}")
+
+        if not output_path.exists():
+            raise RuntimeError(
+                f"PDF conversion failed for {input_path.name} - no PDF file generated"
+            )
+        self.conversions += 1
+        return output_path
+
+    def _on_timeout(self) -> None:
+        self._timed_out = True
+        self.kill()
+
+    def _convert_uno(self, input_path: Path, output_path: Path, timeout: float) -> None:
+        # A hung UNO call cannot be interrupted, so a watchdog kills the server
+        self._timed_out = False
+        watchdog = threading.Timer(timeout, self._on_timeout)
+        watchdog.daemon = True
+        watchdog.start()
+        document = None
+        try:
+            document = self.desktop.loadComponentFromURL(
+                input_path.resolve().as_uri(),
+                "_blank",
+                0,
+                _properties(Hidden=True, ReadOnly=True),
+            )
+            if document is None:
+                raise RuntimeError(f"LibreOffice could not open {input_path.name}")
+            document.storeToURL(
+                output_path.resolve().as_uri(),
+                _properties(
+                    FilterName=PDF_EXPORT_FILTERS.get(
+                        input_path.suffix.lower(), "writer_pdf_Export"
+                    )
+                ),
+            )
+        except Exception as e:
+            if self._timed_out:
+                raise TimeoutError(
+                    f"LibreOffice conversion of {input_path.name} timed out after {timeout} seconds"
+                ) from e
+            raise
+        finally:
+            watchdog.cancel()
+            if document is not None and not self._timed_out:
+                try:
+                    document.close(True)
+                except Exception:
+                    pass
+
+    def kill(self) -> None:
+        """Kill the soffice server"""
+        self.desktop = None
+        if self.process is not None and self.process.poll() is None:
+            self.process.kill()
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                pass
+        self.process = None
+
+    def close(self) -> None:
+        """Stop the worker and remove its profile"""
+        if self.desktop is not None:
+            try:
+                self.desktop.terminate()
+            except Exception:
+                pass
+        self.kill()
+        if self.profile_dir is not None:
+            shutil.rmtree(self.profile_dir, ignore_errors=True)
+            self.profile_dir = None
+
+    def restart(self) -> None:
+        """Replace the worker's process and profile, e.g. after a hang"""
+        self.close()
+        self.start()
+
+
+class LibreOfficePool:
+    """
+    Fixed-size pool of LibreOffice workers fed by a work queue
+
+    Workers are started lazily up to max_workers. Callers beyond that wait for an
+    idle worker, so concurrent conversions scale with the pool size.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 2,
+        timeout: float = 120.0,
+        command: Optional[str] = None,
+    ):
+        """
+        Args:
+            max_workers: Number of LibreOffice workers
+            timeout: Default timeout in seconds for one conversion
+            command: LibreOffice executable (detected if not given)
+        """
+        command = command or find_libreoffice()
+        if not command:
+            raise RuntimeError(LIBREOFFICE_NOT_FOUND_MESSAGE)
+        self.command = command
+        self.max_workers = max(1, max_workers)
+        self.timeout = timeout
+        self._idle: queue.Queue[LibreOfficeWorker] = queue.Queue()
+        self._workers: List[LibreOfficeWorker] = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _acquire(self) -> LibreOfficeWorker:
+        worker = None
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("LibreOffice pool is closed")
+            if self._idle.empty() and len(self._workers) < self.max_workers:
+                worker = LibreOfficeWorker(self.command, len(self._workers) + 1)
+                self._workers.append(worker)
+
+        if worker is not None:
+            try:
+                worker.start()
+            except Exception:
+                worker.close()
+                with self._lock:
+                    self._workers.remove(worker)
+                raise
+            return worker
+
+        worker = self._idle.get()
+        if not worker.is_healthy():
+            print(f"LibreOffice worker {worker.index} is unhealthy, restarting")
+            try:
+                worker.restart()
+            except Exception:
+                worker.close()
+                with self._lock:
+                    self._workers.remove(worker)
+                raise
+        return worker
+
+    def _release(self, worker: LibreOfficeWorker) -> None:
+        if self._closed:
+            worker.close()
+        else:
+            self._idle.put(worker)
+
+    def convert(
+        self,
+        input_path: Union[str, Path],
+        output_dir: Union[str, Path],
+        timeout: Optional[float] = None,
+    ) -> Path:
+        """
+        Convert a document to PDF on the next idle worker
+
+        Args:
+            input_path: Document to convert
+            output_dir: Directory receiving <stem>.pdf
+            timeout: Timeout in seconds (defaults to the pool timeout)
+
+        Returns:
+            Path: The generated PDF
+        """
+        worker = self._acquire()
+        try:
+            return worker.convert(
+                Path(input_path), Path(output_dir), timeout or self.timeout
+            )
+        finally:
+            # A hung or crashed worker fails its health check and is restarted
+            # by the next caller
+            self._release(worker)
+
+    def status(self) -> dict:
+        """Return the pool size and per-worker conversion counts"""
+        with self._lock:
+            return {
+                "mode": "uno" if UNO_AVAILABLE else "cli",
+                "max_workers": self.max_workers,
+                "workers": [
+                    {"index": w.index, "conversions": w.conversions}
+                    for w in self._workers
+                ],
+                "idle": self._idle.qsize(),
+            }
+
+    def close(self) -> None:
+        """Stop all workers"""
+        with self._lock:
+            self._closed = True
+            workers = list(self._workers)
+            self._workers.clear()
+        for worker in workers:
+            worker.close()
+
+
+_pool: Optional[LibreOfficePool] = None
+_pool_lock = threading.Lock()
+_pool_settings: Dict[str, Any] = {
+    "max_workers": get_env_value(
+        "LIBREOFFICE_WORKERS", min(4, os.cpu_count() or 1), int
+    ),
+    "timeout": get_env_value("LIBREOFFICE_TIMEOUT", 120.0, float),
+}
+
+
+def configure_office_converter(
+    max_workers: Optional[int] = None, timeout: Optional[float] = None
+) -> None:
+    """Set the pool settings used when the shared pool is created"""
+    if max_workers is not None:
+        _pool_settings["max_workers"] = max_workers
+    if timeout is not None:
+        _pool_settings["timeout"] = timeout
+
+
+def get_office_converter() -> LibreOfficePool:
+    """Return the shared LibreOffice pool, creating it on first use"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = LibreOfficePool(**_pool_settings)
+        return _pool
+
+
+def shutdown_office_converter() -> None:
+    """Stop the shared LibreOffice pool"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
+
+
+atexit.register(shutdown_office_converter)
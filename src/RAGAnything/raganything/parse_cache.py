@@ -0,0 +1,203 @@
+"""
+Content-addressed cache for MinerU parse results
+
+Parse results are keyed by the hash of the file content plus the parser options
+that affect the output, so retries, re-indexing and duplicate uploads reuse an
+earlier parse instead of running MinerU again.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+# Bump when the cached parse output changes for the same input and options
+CACHE_FORMAT_VERSION = 1
+
+# Parser options that change the parse output; device, model source and sharding do not
+KEY_OPTIONS = (
+    "lang",
+    "backend",
+    "formula",
+    "table",
+    "start_page",
+    "end_page",
+    "use_pdf_rendering",
+)
+
+ENTRY_FILE = "parse.json.gz"
+
+
+class ParseCache:
+    """
+    On-disk parse cache with a size limit and least-recently-used eviction
+
+    Each entry is a directory holding the gzip-compressed content list and
+    markdown, plus copies of the images referenced by the content list.
+    """
+
+    def __init__(self, cache_dir: Union[str, Path], max_size_mb: int = 2048):
+        """
+        Args:
+            cache_dir: Directory where cache entries are stored
+            max_size_mb: Maximum total size of the cache in megabytes
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_size_bytes = max_size_mb * 1024 * 1024
+        self._lock = threading.Lock()
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def hash_file(file_path: Union[str, Path], chunk_size: int = 1024 * 1024) -> str:
+        """Compute the SHA-256 hash of a file, reading it in chunks"""
+        digest = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            for chunk in iter(lambda: f.read(chunk_size), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def make_key(
+        self, file_path: Union[str, Path], method: str = "auto", **kwargs
+    ) -> str:
+        """
+        Build the cache key of a file and its parser options
+
+        Args:
+            file_path: Path to the file to parse
+            method: Parse method
+            **kwargs: Parser options, only those affecting the output are used
+
+        Returns:
+            Hex digest identifying the parse result
+        """
+        file_path = Path(file_path)
+        options = {
+            "version": CACHE_FORMAT_VERSION,
+            "ext": file_path.suffix.lower(),
+            "method": method,
+            **{name: kwargs.get(name) for name in KEY_OPTIONS},
+        }
+        digest = hashlib.sha256(self.hash_file(file_path).encode("utf-8"))
+        digest.update(json.dumps(options, sort_keys=True).encode("utf-8"))
+        return digest.hexdigest()
+
+    def _entry_dir(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / key
+
+    def contains(self, key: str) -> bool:
+        """Whether a parse result is cached under key"""
+        return (self._entry_dir(key) / ENTRY_FILE).exists()
+
+    def get(self, key: str) -> Optional[Tuple[List[Dict[str, Any]], str]]:
+        """
+        Look up a cached parse result
+
+        Returns:
+            (content_list, md_content), or None on a miss
+        """
+        entry_file = self._entry_dir(key) / ENTRY_FILE
+        try:
+            with gzip.open(entry_file, "rt", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError):
+            # Corrupted entry, drop it
+            shutil.rmtree(self._entry_dir(key), ignore_errors=True)
+            return None
+
+        # Refresh the entry's position for LRU eviction
+        try:
+            os.utime(entry_file)
+        except OSError:
+            pass
+        return data["content_list"], data["md_content"]
+
+    def put(
+        self,
+        key: str,
+        content_list: List[Dict[str, Any]],
+        md_content: str,
+        image_root: Optional[Union[str, Path]] = None,
+    ) -> None:
+        """
+        Store a parse result
+
+        Images referenced by the content list are copied into the entry and their
+        img_path rewritten to the cached copy, so the entry stays usable after the
+        parser output directory is removed.
+
+        Args:
+            key: Cache key from make_key
+            content_list: Parsed content list
+            md_content: Parsed markdown
+            image_root: Directory that relative image paths are resolved against
+        """
+        if not content_list and not md_content:
+            return
+
+        entry_dir = self._entry_dir(key)
+        entry_dir.parent.mkdir(parents=True, exist_ok=True)
+        tmp_dir = Path(tempfile.mkdtemp(prefix=f".{key}.", dir=entry_dir.parent))
+        try:
+            cached_list = []
+            for item in content_list:
+                img_path = item.get("img_path") if isinstance(item, dict) else None
+                if img_path:
+                    source = Path(img_path)
+                    if not source.is_absolute() and image_root is not None:
+                        source = Path(image_root) / source
+                    if source.is_file():
+                        images_dir = tmp_dir / "images"
+                        images_dir.mkdir(exist_ok=True)
+                        shutil.copy2(source, images_dir / source.name)
+                        item = {
+                            **item,
+                            "img_path": str(entry_dir / "images" / source.name),
+                        }
+                cached_list.append(item)
+
+            with gzip.open(tmp_dir / ENTRY_FILE, "wt", encoding="utf-8") as f:
+                json.dump(
+                    {"content_list": cached_list, "md_content": md_content},
+                    f,
+                    ensure_ascii=False,
+                    separators=(",", ":"),
+                )
+
+            with self._lock:
+                shutil.rmtree(entry_dir, ignore_errors=True)
+                os.replace(tmp_dir, entry_dir)
+                self._evict()
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    def _evict(self) -> None:
+        """Remove least recently used entries until the cache fits its size limit"""
+        entries = []
+        total_size = 0
+        for entry_file in self.cache_dir.glob(f"*/*/{ENTRY_FILE}"):
+            entry_dir = entry_file.parent
+            if entry_dir.name.startswith("."):
+                # Entry still being written
+                continue
+            size = sum(f.stat().st_size for f in entry_dir.rglob("*") if f.is_file())
+            entries.append((entry_file.stat().st_mtime, size, entry_dir))
+            total_size += size
+
+        for _, size, entry_dir in sorted(entries, key=lambda entry: entry[0]):
+            if total_size <= self.max_size_bytes:
+                break
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            total_size -= size
+
+    def clear(self) -> None:
+        """Remove all cache entries"""
+        with self._lock:
+            shutil.rmtree(self.cache_dir, ignore_errors=True)
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
@@ -0,0 +1,140 @@
+"""
+Asynchronous parsing service for RAGAnything
+
+Runs the blocking MinerU parsing pipeline off the event loop with a bounded number
+of concurrent parses, a FIFO queue, per-job timeouts and cancellation
+"""
+
+import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, List, Optional
+
+from raganything.mineru_parser import ParseJob, current_parse_job
+
+
+class ParseService:
+    """
+    Bounded pool of parse workers fed by a queue
+
+    Each job runs in a worker thread; the heavy lifting happens in MinerU
+    subprocesses, so several jobs parse in parallel. Timed out or cancelled jobs
+    have their MinerU subprocesses killed.
+    """
+
+    def __init__(self, max_workers: int = 2, timeout: Optional[float] = None):
+        """
+        Args:
+            max_workers: Maximum number of documents parsed concurrently
+            timeout: Default timeout in seconds for one parse job (None or 0 disables it)
+        """
+        self.max_workers = max(1, max_workers)
+        self.timeout = timeout or None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _ensure_workers(self) -> None:
+        """Start the worker tasks on the running event loop"""
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and self._workers:
+            return
+
+        # Workers of a previous (closed) event loop cannot be reused
+        self._loop = loop
+        self._queue = asyncio.Queue()
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="mineru-parse"
+            )
+        self._workers = [
+            loop.create_task(self._worker()) for _ in range(self.max_workers)
+        ]
+
+    @property
+    def pending_jobs(self) -> int:
+        """Number of jobs waiting in the queue"""
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def parse(
+        self,
+        func: Callable[..., Any],
+        *args,
+        timeout: Optional[float] = None,
+        **kwargs,
+    ) -> Any:
+        """
+        Queue a blocking parse function and wait for its result
+
+        Args:
+            func: Blocking parse function, e.g. ProcessorMixin.parse_document
+            *args: Positional arguments for func
+            timeout: Timeout in seconds for this job (defaults to the service timeout)
+            **kwargs: Keyword arguments for func
+
+        Returns:
+            The return value of func
+
+        Raises:
+            asyncio.TimeoutError: If the job does not finish within the timeout
+        """
+        self._ensure_workers()
+        job = ParseJob()
+        future = self._loop.create_future()
+        timeout = timeout or self.timeout
+        await self._queue.put((partial(func, *args, **kwargs), job, future, timeout))
+
+        try:
+            return await future
+        except asyncio.CancelledError:
+            # Kill MinerU if the job already started, skip it otherwise
+            job.cancel()
+            raise
+
+    async def _worker(self) -> None:
+        while True:
+            call, job, future, timeout = await self._queue.get()
+            try:
+                if future.done():
+                    # Cancelled while waiting in the queue
+                    continue
+
+                # Expose the job to the MinerU command runner in the worker thread
+                context = contextvars.copy_context()
+                context.run(current_parse_job.set, job)
+                run = self._loop.run_in_executor(self._executor, context.run, call)
+
+                done, _ = await asyncio.wait({run}, timeout=timeout)
+                if not done:
+                    job.cancel()
+                    if not future.done():
+                        future.set_exception(
+                            asyncio.TimeoutError(
+                                f"Document parsing timed out after {timeout} seconds"
+                            )
+                        )
+
+                # Wait for the thread to unwind so the job keeps its worker slot until then
+                try:
+                    result = await run
+                except Exception as e:
+                    if not future.done():
+                        future.set_exception(e)
+                else:
+                    if not future.done():
+                        future.set_result(result)
+            finally:
+                self._queue.task_done()
+
+    async def shutdown(self) -> None:
+        """Stop the workers and release the thread pool"""
+        for worker in self._workers:
+            worker.cancel()
+        if self._workers:
+            await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
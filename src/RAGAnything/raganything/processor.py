@@ -4,11 +4,17 @@ Document processing functionality for RAGAnything
 Contains methods for parsing documents and processing multimodal content
 """
 
+import asyncio
 import os
+import tempfile
 from pathlib import Path
 from typing import Any, Dict, List, Tuple
 
-from raganything.mineru_parser import MineruParser
+from raganything.mineru_parser import (
+    OFFICE_FORMATS,
+    MineruParser,
+    ParseCancelledError,
+)
 from raganything.utils import (
     get_processor_for_type,
     insert_text_content,
@@ -54,6 +60,75 @@ class ProcessorMixin:
         if not file_path.exists():
             raise FileNotFoundError(f"File not found: {file_path}")
 
+        # Text and markdown are parsed natively unless PDF rendering is enabled
+        if file_path.suffix.lower() in (".txt", ".md"):
+            kwargs = {"use_pdf_rendering": self.config.text_parse_via_pdf, **kwargs}
+
+        # Reuse an earlier parse of the same content with the same parser options
+        cache_key = None
+        cached = None
+        if self.parse_cache is not None:
+            cache_key = self.parse_cache.make_key(file_path, parse_method, **kwargs)
+            cached = self.parse_cache.get(cache_key)
+
+        if cached is not None:
+            content_list, md_content = cached
+            self.logger.info(f"Parse cache hit for {file_path.name}, skipping MinerU")
+        else:
+            content_list, md_content = self._parse_with_mineru(
+                file_path, output_dir, parse_method, **kwargs
+            )
+            if cache_key is not None:
+                # Relative image paths are relative to MinerU's per-document output
+                backend = kwargs.get("backend") or ""
+                method_dir = "vlm" if backend.startswith("vlm-") else parse_method
+                self.parse_cache.put(
+                    cache_key,
+                    content_list,
+                    md_content,
+                    image_root=Path(output_dir) / file_path.stem / method_dir,
+                )
+
+        self.logger.info(
+            f"Parsing complete! Extracted {len(content_list)} content blocks"
+        )
+        self.logger.info(f"Markdown text length: {len(md_content)} characters")
+
+        # Display content statistics if requested
+        if display_stats:
+            self.logger.info("\nContent Information:")
+            self.logger.info(f"* Total blocks in content_list: {len(content_list)}")
+            self.logger.info(f"* Markdown content length: {len(md_content)} characters")
+
+            # Count elements by type
+            block_types: Dict[str, int] = {}
+            for block in content_list:
+                if isinstance(block, dict):
+                    block_type = block.get("type", "unknown")
+                    if isinstance(block_type, str):
+                        block_types[block_type] = block_types.get(block_type, 0) + 1
+
+            self.logger.info("* Content block types:")
+            for block_type, count in block_types.items():
+                self.logger.info(f"  - {block_type}: {count}")
+
+        return content_list, md_content
+
+    def _parse_with_mineru(
+        self, file_path: Path, output_dir: str, parse_method: str, **kwargs
+    ) -> Tuple[List[Dict[str, Any]], str]:
+        """
+        Parse document with the MinerU parser matching its file extension
+
+        Args:
+            file_path: Path to the file to parse
+            output_dir: Output directory
+            parse_method: Parse method
+            **kwargs: Additional parameters for MinerU parser
+
+        Returns:
+            (content_list, md_content): Content list and markdown text
+        """
         # Choose appropriate parsing method based on file extension
         ext = file_path.suffix.lower()
 
@@ -62,11 +137,17 @@ class ProcessorMixin:
                 self.logger.info(
                     f"Detected PDF file, using PDF parser (method={parse_method})..."
                 )
+                # Large PDFs are parsed as page shards in parallel when enabled
+                pdf_kwargs = {
+                    "shard_pages": self.config.pdf_shard_pages or None,
+                    "shard_workers": self.config.max_pdf_shard_workers,
+                    **kwargs,
+                }
                 content_list, md_content = MineruParser.parse_pdf(
                     pdf_path=file_path,
                     output_dir=output_dir,
                     method=parse_method,
-                    **kwargs,
+                    **pdf_kwargs,
                 )
             elif ext in [
                 ".jpg",
@@ -82,11 +163,16 @@ class ProcessorMixin:
                 content_list, md_content = MineruParser.parse_image(
                     image_path=file_path, output_dir=output_dir, **kwargs
                 )
-            elif ext in [".doc", ".docx", ".ppt", ".pptx", ".xls", ".xlsx"]:
+            elif ext in OFFICE_FORMATS:
                 self.logger.info("Detected Office document, using Office parser...")
                 content_list, md_content = MineruParser.parse_office_doc(
                     doc_path=file_path, output_dir=output_dir, **kwargs
                 )
+            elif ext in [".txt", ".md"]:
+                self.logger.info("Detected text file, using text parser...")
+                content_list, md_content = MineruParser.parse_text_file(
+                    text_path=file_path, output_dir=output_dir, **kwargs
+                )
             else:
                 # For other or unknown formats, use generic parser
                 self.logger.info(
@@ -99,6 +185,8 @@ class ProcessorMixin:
                     **kwargs,
                 )
 
+        except ParseCancelledError:
+            raise
         except Exception as e:
             self.logger.error(f"Error during parsing with specific parser: {str(e)}")
             self.logger.warning("Falling back to generic parser...")
@@ -110,30 +198,77 @@ class ProcessorMixin:
                 **kwargs,
             )
 
-        self.logger.info(
-            f"Parsing complete! Extracted {len(content_list)} content blocks"
-        )
-        self.logger.info(f"Markdown text length: {len(md_content)} characters")
+        return content_list, md_content
 
-        # Display content statistics if requested
-        if display_stats:
-            self.logger.info("\nContent Information:")
-            self.logger.info(f"* Total blocks in content_list: {len(content_list)}")
-            self.logger.info(f"* Markdown content length: {len(md_content)} characters")
+    async def aparse_document(
+        self,
+        file_path: str,
+        output_dir: str = None,
+        parse_method: str = None,
+        display_stats: bool = None,
+        timeout: float | None = None,
+        **kwargs,
+    ) -> Tuple[List[Dict[str, Any]], str]:
+        """
+        Parse document using MinerU without blocking the event loop
 
-            # Count elements by type
-            block_types: Dict[str, int] = {}
-            for block in content_list:
-                if isinstance(block, dict):
-                    block_type = block.get("type", "unknown")
-                    if isinstance(block_type, str):
-                        block_types[block_type] = block_types.get(block_type, 0) + 1
+        The parse is queued on the parse service, which bounds the number of
+        concurrent MinerU runs (config.max_concurrent_parses) and kills MinerU when
+        the job times out or the caller is cancelled. Office documents are first
+        converted to PDF on the LibreOffice pool (config.libreoffice_workers), so
+        conversions do not hold parse slots.
 
-            self.logger.info("* Content block types:")
-            for block_type, count in block_types.items():
-                self.logger.info(f"  - {block_type}: {count}")
+        Args:
+            file_path: Path to the file to parse
+            output_dir: Output directory (defaults to config.mineru_output_dir)
+            parse_method: Parse method (defaults to config.mineru_parse_method)
+            display_stats: Whether to display content statistics (defaults to config.display_content_stats)
+            timeout: Timeout in seconds (defaults to config.parse_timeout)
+            **kwargs: Additional parameters for MinerU parser, see parse_document
 
-        return content_list, md_content
+        Returns:
+            (content_list, md_content): Content list and markdown text
+        """
+        if Path(file_path).suffix.lower() in OFFICE_FORMATS and not (
+            await asyncio.to_thread(
+                self._is_parse_cached, file_path, parse_method, **kwargs
+            )
+        ):
+            with tempfile.TemporaryDirectory() as temp_dir:
+                pdf_path = await asyncio.to_thread(
+                    MineruParser.convert_office_to_pdf, file_path, temp_dir
+                )
+                return await self.parse_service.parse(
+                    self.parse_document,
+                    file_path,
+                    output_dir,
+                    parse_method,
+                    display_stats,
+                    timeout=timeout,
+                    pdf_path=pdf_path,
+                    **kwargs,
+                )
+
+        return await self.parse_service.parse(
+            self.parse_document,
+            file_path,
+            output_dir,
+            parse_method,
+            display_stats,
+            timeout=timeout,
+            **kwargs,
+        )
+
+    def _is_parse_cached(
+        self, file_path: str, parse_method: str = None, **kwargs
+    ) -> bool:
+        """Whether parse_document would be served from the parse cache"""
+        if self.parse_cache is None:
+            return False
+        cache_key = self.parse_cache.make_key(
+            file_path, parse_method or self.config.mineru_parse_method, **kwargs
+        )
+        return self.parse_cache.contains(cache_key)
 
     async def _process_multimodal_content(
         self, multimodal_items: List[Dict[str, Any]], file_path: str
@@ -141,6 +276,9 @@ class ProcessorMixin:
         """
         Process multimodal content (using specialized processors)
 
+        Items are processed concurrently, bounded by max_concurrent_multimodal_items
+        and the per-modality limits in the config, then merged in input order.
+
         Args:
             multimodal_items: List of multimodal items
             file_path: File path (for reference)
@@ -151,70 +289,108 @@ class ProcessorMixin:
 
         self.logger.info("Starting multimodal content processing...")
 
+        from LightRAG.lightrag.kg.shared_storage import (
+            get_namespace_data,
+            get_pipeline_status_lock,
+        )
+
+        # Get pipeline status and lock from shared storage
+        pipeline_status = await get_namespace_data("pipeline_status")
+        pipeline_status_lock = get_pipeline_status_lock()
+
         file_name = os.path.basename(file_path)
+        total_items = len(multimodal_items)
+        processed_items = 0
 
-        # Collect all chunk results for batch processing (similar to text content processing)
-        all_chunk_results = []
+        # Global limit plus per-modality limits (vision calls are the most expensive)
+        global_semaphore = asyncio.Semaphore(
+            max(1, self.config.max_concurrent_multimodal_items)
+        )
+        modality_semaphores = {
+            "image": asyncio.Semaphore(max(1, self.config.max_concurrent_image_items)),
+            "table": asyncio.Semaphore(max(1, self.config.max_concurrent_table_items)),
+            "equation": asyncio.Semaphore(
+                max(1, self.config.max_concurrent_equation_items)
+            ),
+        }
+
+        async def _process_item(i: int, item: Dict[str, Any]) -> List:
+            nonlocal processed_items
+            content_type = item.get("type", "unknown")
+
+            # Select appropriate processor
+            processor = get_processor_for_type(self.modal_processors, content_type)
+            if not processor:
+                self.logger.warning(
+                    f"No suitable processor found for {content_type} type content"
+                )
+                return []
 
-        for i, item in enumerate(multimodal_items):
+            # Prepare item info for context extraction
+            item_info = {
+                "page_idx": item.get("page_idx", 0),
+                "index": i,
+                "type": content_type,
+            }
+
+            modality_semaphore = modality_semaphores.get(content_type)
             try:
-                content_type = item.get("type", "unknown")
+                # Wait for the modality limit before taking a global slot, so items
+                # queued behind a busy modality do not hold slots the others could use
+                if modality_semaphore is not None:
+                    await modality_semaphore.acquire()
+                try:
+                    async with global_semaphore:
+                        self.logger.info(
+                            f"Processing item {i + 1}/{total_items}: {content_type} content"
+                        )
+                        # Process content and get chunk results instead of immediately merging
+                        (
+                            enhanced_caption,
+                            entity_info,
+                            chunk_results,
+                        ) = await processor.process_multimodal_content(
+                            modal_content=item,
+                            content_type=content_type,
+                            file_path=file_name,
+                            item_info=item_info,  # Pass item info for context extraction
+                            batch_mode=True,
+                        )
+                finally:
+                    if modality_semaphore is not None:
+                        modality_semaphore.release()
+
                 self.logger.info(
-                    f"Processing item {i + 1}/{len(multimodal_items)}: {content_type} content"
+                    f"{content_type} processing complete: {entity_info.get('entity_name', 'Unknown')}"
                 )
-
-                # Select appropriate processor
-                processor = get_processor_for_type(self.modal_processors, content_type)
-
-                if processor:
-                    # Prepare item info for context extraction
-                    item_info = {
-                        "page_idx": item.get("page_idx", 0),
-                        "index": i,
-                        "type": content_type,
-                    }
-
-                    # Process content and get chunk results instead of immediately merging
-                    (
-                        enhanced_caption,
-                        entity_info,
-                        chunk_results,
-                    ) = await processor.process_multimodal_content(
-                        modal_content=item,
-                        content_type=content_type,
-                        file_path=file_name,
-                        item_info=item_info,  # Pass item info for context extraction
-                        batch_mode=True,
-                    )
-
-                    # Collect chunk results for batch processing
-                    all_chunk_results.extend(chunk_results)
-
-                    self.logger.info(
-                        f"{content_type} processing complete: {entity_info.get('entity_name', 'Unknown')}"
-                    )
-                else:
-                    self.logger.warning(
-                        f"No suitable processor found for {content_type} type content"
-                    )
-
             except Exception as e:
                 self.logger.error(f"Error processing multimodal content: {str(e)}")
                 self.logger.debug("Exception details:", exc_info=True)
-                continue
+                chunk_results = []
+
+            async with pipeline_status_lock:
+                processed_items += 1
+                log_message = f"Multimodal item {processed_items}/{total_items} processed ({content_type}) for {file_name}"
+                pipeline_status["latest_message"] = log_message
+                pipeline_status["history_messages"].append(log_message)
+
+            return chunk_results
+
+        # Items run concurrently; results are collected in input order so the
+        # merge below is deterministic regardless of completion order
+        item_chunk_results = await asyncio.gather(
+            *[_process_item(i, item) for i, item in enumerate(multimodal_items)]
+        )
+        all_chunk_results = [
+            chunk_result
+            for chunk_results in item_chunk_results
+            for chunk_result in chunk_results
+        ]
 
         # Batch merge all multimodal content results (similar to text content processing)
         if all_chunk_results:
-            from LightRAG.lightrag.kg.shared_storage import (
-                get_namespace_data,
-                get_pipeline_status_lock,
-            )
             from LightRAG.lightrag.operate import merge_nodes_and_edges
 
-            # Get pipeline status and lock from shared storage
-            pipeline_status = await get_namespace_data("pipeline_status")
-            pipeline_status_lock = get_pipeline_status_lock()
-
             await merge_nodes_and_edges(
                 chunk_results=all_chunk_results,
                 knowledge_graph_inst=self.lightrag.chunk_entity_relation_graph,
@@ -231,6 +407,15 @@ class ProcessorMixin:
 
             await self.lightrag._insert_done()
 
+        image_processor = self.modal_processors.get("image")
+        if image_processor is not None:
+            report = image_processor.image_preprocessor.report()
+            self.logger.info(
+                f"Image preprocessing: {report['images']} images prepared, "
+                f"{report['bytes_saved']} bytes saved, "
+                f"{report['description_cache_hits']} descriptions reused"
+            )
+
         self.logger.info("Multimodal content processing complete")
 
     async def process_document_complete(
@@ -271,10 +456,36 @@ class ProcessorMixin:
         self.logger.info(f"Starting complete document processing: {file_path}")
 
         # Step 1: Parse document using MinerU
-        content_list, md_content = self.parse_document(
+        content_list, md_content = await self.aparse_document(
             file_path, output_dir, parse_method, display_stats, **kwargs
         )
 
+        await self._insert_parsed_document(
+            file_path,
+            content_list,
+            split_by_character=split_by_character,
+            split_by_character_only=split_by_character_only,
+            doc_id=doc_id,
+        )
+
+    async def _insert_parsed_document(
+        self,
+        file_path: str,
+        content_list: List[Dict[str, Any]],
+        split_by_character: str | None = None,
+        split_by_character_only: bool = False,
+        doc_id: str | None = None,
+    ):
+        """
+        Insert the text and multimodal content of a parsed document
+
+        Args:
+            file_path: Path of the parsed file
+            content_list: Content list produced by parse_document
+            split_by_character: Optional character to split the text by
+            split_by_character_only: If True, split only by the specified character
+            doc_id: Optional document ID, if not provided MD5 hash will be generated
+        """
         # Step 2: Separate text and multimodal content
         text_content, multimodal_items = separate_content(content_list)
 
@@ -219,6 +219,81 @@ Format: {equation_format}
 
 Focus on providing mathematical insights and explaining the equation's significance within the broader context."""
 
+# Batched table analysis prompt, one result per item
+PROMPTS[
+    "table_batch_prompt"
+] = """Please analyze each of the following {count} tables and provide a JSON response mapping every item number to its analysis:
+
+{{
+    "1": {{
+        "detailed_description": "A comprehensive analysis of the table including:
+        - Table structure and organization
+        - Column headers and their meanings
+        - Key data points and patterns
+        - Statistical insights and trends
+        - Relationships between data elements
+        - Significance of the data presented, in relation to the item's context if one is given
+        Always use specific names and values instead of general references.",
+        "entity_info": {{
+            "entity_name": "the entity name given for the item",
+            "entity_type": "table",
+            "summary": "concise summary of the table's purpose and key findings (max 100 words)"
+        }}
+    }},
+    "2": {{ ... }}
+}}
+
+Return an entry for every item, keyed by its item number. Analyze each table on its own.
+
+{contexts}
+
+{items}
+
+Focus on extracting meaningful insights and relationships from the tabular data."""
+
+PROMPTS["table_batch_item"] = """Entity Name: {entity_name}
+Image Path: {table_img_path}
+Caption: {table_caption}
+Body: {table_body}
+Footnotes: {table_footnote}"""
+
+# Batched equation analysis prompt, one result per item
+PROMPTS[
+    "equation_batch_prompt"
+] = """Please analyze each of the following {count} mathematical equations and provide a JSON response mapping every item number to its analysis:
+
+{{
+    "1": {{
+        "detailed_description": "A comprehensive analysis of the equation including:
+        - Mathematical meaning and interpretation
+        - Variables and their definitions, in the context of the item's surrounding content if given
+        - Mathematical operations and functions used
+        - Application domain and context
+        - Physical or theoretical significance
+        - Relationship to other mathematical concepts
+        - Practical applications or use cases
+        Always use specific mathematical terminology.",
+        "entity_info": {{
+            "entity_name": "the entity name given for the item",
+            "entity_type": "equation",
+            "summary": "concise summary of the equation's purpose and significance (max 100 words)"
+        }}
+    }},
+    "2": {{ ... }}
+}}
+
+Return an entry for every item, keyed by its item number. Analyze each equation on its own.
+
+{contexts}
+
+{items}
+
+Focus on providing mathematical insights and explaining each equation's significance."""
+
+PROMPTS["equation_batch_item"] = """Entity Name: {entity_name}
+Equation: {equation_text}
+Format: {equation_format}"""
+
 # Generic content analysis prompt template
 PROMPTS[
     "generic_prompt"
@@ -48,6 +48,38 @@ class QueryMixin:
         self.logger.info("Text query completed")
         return result
 
+    async def aquery_batch(
+        self, queries: List[str], mode: str = "hybrid", **kwargs
+    ) -> List[str]:
+        """
+        Batch text query - answers many queries with LightRAG, sharing retrieval work
+
+        Args:
+            queries: Query texts
+            mode: Query mode ("local", "global", "hybrid", "naive", "mix", "bypass")
+            **kwargs: Other query parameters, will be passed to QueryParam
+
+        Returns:
+            List[str]: Query results, in the same order as the queries
+        """
+        if self.lightrag is None:
+            raise ValueError(
+                "No LightRAG instance available. Please process documents first or provide a pre-initialized LightRAG instance."
+            )
+
+        if "param" in kwargs:
+            query_param = kwargs.pop("param")
+        else:
+            query_param = QueryParam(mode=mode, **kwargs)
+
+        self.logger.info(f"Executing batch text query: {len(queries)} queries")
+        self.logger.info(f"Query mode: {query_param.mode}")
+
+        results = await self.lightrag.aquery_batch(queries, param=query_param)
+
+        self.logger.info("Batch text query completed")
+        return results
+
     async def aquery_with_multimodal(
         self,
         query: str,
@@ -303,6 +335,23 @@ class QueryMixin:
         loop = always_get_an_event_loop()
         return loop.run_until_complete(self.aquery(query, mode=mode, **kwargs))
 
+    def query_batch(
+        self, queries: List[str], mode: str = "hybrid", **kwargs
+    ) -> List[str]:
+        """
+        Synchronous version of batch text query
+
+        Args:
+            queries: Query texts
+            mode: Query mode ("local", "global", "hybrid", "naive", "mix", "bypass")
+            **kwargs: Other query parameters, will be passed to QueryParam
+
+        Returns:
+            List[str]: Query results
+        """
+        loop = always_get_an_event_loop()
+        return loop.run_until_complete(self.aquery_batch(queries, mode=mode, **kwargs))
+
     def query_with_multimodal(
         self,
         query: str,
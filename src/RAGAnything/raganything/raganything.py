@@ -22,19 +22,25 @@ from dotenv import load_dotenv
 from raganything.modalprocessors import (
     ContextConfig,
     ContextExtractor,
+    DescriptionBatcher,
     EquationModalProcessor,
     GenericModalProcessor,
     ImageModalProcessor,
     TableModalProcessor,
 )
+from raganything.office_converter import configure_office_converter
+from raganything.parse_cache import ParseCache
+from raganything.parse_service import ParseService
 from src.LightRAG.lightrag import LightRAG
 from src.LightRAG.lightrag.utils import logger
 from src.RAGAnything.raganything.batch import BatchMixin
+from src.RAGAnything.raganything.image_preprocessor import ImagePreprocessor
 
 # Import configuration and modules
 from src.RAGAnything.raganything.config import RAGAnythingConfig
 from src.RAGAnything.raganything.mineru_parser import MineruParser
 from src.RAGAnything.raganything.processor import ProcessorMixin
+from src.RAGAnything.raganything.prompt import PROMPTS
 from src.RAGAnything.raganything.query import QueryMixin
 from src.RAGAnything.raganything.utils import get_processor_supports
 
@@ -72,6 +78,12 @@ class RAGAnything(QueryMixin, ProcessorMixin, BatchMixin):
     context_extractor: Optional[ContextExtractor] = field(default=None, init=False)
     """Context extractor for providing surrounding content to modal processors."""
 
+    parse_service: Optional[ParseService] = field(default=None, init=False)
+    """Service running MinerU parsing off the event loop."""
+
+    parse_cache: Optional[ParseCache] = field(default=None, init=False)
+    """Content-addressed cache of parse results."""
+
     def __post_init__(self):
         """Post-initialization setup following LightRAG pattern"""
         # Initialize configuration if not provided
@@ -84,11 +96,28 @@ class RAGAnything(QueryMixin, ProcessorMixin, BatchMixin):
         # Set up logger (use existing logger, don't configure it)
         self.logger = logger
 
+        # Parsing runs in a bounded worker pool so it does not block the event loop
+        self.parse_service = ParseService(
+            max_workers=self.config.max_concurrent_parses,
+            timeout=self.config.parse_timeout,
+        )
+        configure_office_converter(
+            max_workers=self.config.libreoffice_workers,
+            timeout=self.config.libreoffice_timeout,
+        )
+
         # Create working directory if needed
         if not os.path.exists(self.working_dir):
             os.makedirs(self.working_dir)
             self.logger.info(f"Created working directory: {self.working_dir}")
 
+        if self.config.enable_parse_cache:
+            self.parse_cache = ParseCache(
+                self.config.parse_cache_dir
+                or os.path.join(self.working_dir, "parse_cache"),
+                max_size_mb=self.config.parse_cache_max_size_mb,
+            )
+
         # If LightRAG is provided, initialize processors immediately
         if self.lightrag is not None:
             self._initialize_processors()
@@ -127,6 +156,21 @@ class RAGAnything(QueryMixin, ProcessorMixin, BatchMixin):
             config=context_config, tokenizer=self.lightrag.tokenizer
         )
 
+    def _create_description_batcher(
+        self, batch_prompt: str, system_prompt: str
+    ) -> Optional[DescriptionBatcher]:
+        """Create a batcher for table/equation descriptions, None if batching is disabled"""
+        if self.config.multimodal_batch_size <= 1:
+            return None
+        return DescriptionBatcher(
+            modal_caption_func=self.llm_model_func,
+            batch_prompt=PROMPTS[batch_prompt],
+            system_prompt=PROMPTS[system_prompt],
+            batch_size=self.config.multimodal_batch_size,
+            window_ms=self.config.multimodal_batch_window_ms,
+            max_item_chars=self.config.multimodal_batch_max_item_chars,
+        )
+
     def _initialize_processors(self):
         """Initialize multimodal processors with appropriate model functions"""
         if self.lightrag is None:
@@ -145,6 +189,12 @@ class RAGAnything(QueryMixin, ProcessorMixin, BatchMixin):
                 lightrag=self.lightrag,
                 modal_caption_func=self.vision_model_func or self.llm_model_func,
                 context_extractor=self.context_extractor,
+                image_preprocessor=ImagePreprocessor(
+                    max_dimension=self.config.image_max_dimension,
+                    jpeg_quality=self.config.image_jpeg_quality,
+                    max_workers=self.config.image_preprocess_workers,
+                    description_cache_size=self.config.image_description_cache_size,
+                ),
             )
 
         if self.config.enable_table_processing:
@@ -152,6 +202,9 @@ class RAGAnything(QueryMixin, ProcessorMixin, BatchMixin):
                 lightrag=self.lightrag,
                 modal_caption_func=self.llm_model_func,
                 context_extractor=self.context_extractor,
+                description_batcher=self._create_description_batcher(
+                    "table_batch_prompt", "TABLE_ANALYSIS_SYSTEM"
+                ),
             )
 
         if self.config.enable_equation_processing:
@@ -159,6 +212,9 @@ class RAGAnything(QueryMixin, ProcessorMixin, BatchMixin):
                 lightrag=self.lightrag,
                 modal_caption_func=self.llm_model_func,
                 context_extractor=self.context_extractor,
+                description_batcher=self._create_description_batcher(
+                    "equation_batch_prompt", "EQUATION_ANALYSIS_SYSTEM"
+                ),
             )
 
         # Always include generic processor as fallback
@@ -355,5 +411,9 @@ class RAGAnything(QueryMixin, ProcessorMixin, BatchMixin):
                     "supports": get_processor_supports(proc_type),
                     "enabled": True,
                 }
+                if isinstance(processor, ImageModalProcessor):
+                    base_info["processors"][proc_type][
+                        "preprocessing"
+                    ] = processor.image_preprocessor.report()
 
         return base_info
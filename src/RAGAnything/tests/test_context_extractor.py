@@ -0,0 +1,106 @@
+"""
+Context of multimodal items is read from the cached index of the content list:
+surrounding pages or chunks, within the token budget, with the index rebuilt
+when the content list grows.
+
+Run with: pytest src/RAGAnything/tests/test_context_extractor.py
+"""
+
+import os
+import sys
+
+_ROOT = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+)
+sys.path.extend(
+    [
+        _ROOT,
+        os.path.join(_ROOT, "src", "LightRAG"),
+        os.path.join(_ROOT, "src", "RAGAnything"),
+    ]
+)
+
+from src.RAGAnything.raganything.modalprocessors import ContextConfig, ContextExtractor
+
+
+class _WordTokenizer:
+    """One token per space separated word"""
+
+    def encode(self, text):
+        return text.split(" ")
+
+    def decode(self, tokens):
+        return " ".join(tokens)
+
+
+def _content_list():
+    return [
+        {"type": "text", "text": "Intro", "text_level": 1, "page_idx": 0},
+        {"type": "text", "text": "page one", "page_idx": 1},
+        {"type": "image", "img_caption": ["Figure"], "page_idx": 2},
+        {"type": "text", "text": "page two", "page_idx": 2},
+        {"type": "text", "text": "   ", "page_idx": 3},
+        {"type": "text", "text": "page three", "page_idx": 3},
+        {"type": "text", "text": "page four", "page_idx": 4},
+    ]
+
+
+def test_page_context_marks_neighbour_pages():
+    extractor = ContextExtractor(ContextConfig(context_window=1))
+
+    context = extractor.extract_context(_content_list(), {"page_idx": 2})
+
+    assert context == "[Page 1] page one\npage two\n[Page 3] page three"
+
+
+def test_chunk_context_skips_current_and_filtered_items():
+    extractor = ContextExtractor(ContextConfig(context_window=2, context_mode="chunk"))
+
+    context = extractor.extract_context(_content_list(), {"index": 2})
+
+    assert context == "# Intro\npage one\npage two"
+    extractor = ContextExtractor(
+        ContextConfig(
+            context_window=2,
+            context_mode="chunk",
+            filter_content_types=["text", "image"],
+        )
+    )
+    context = extractor.extract_context(_content_list(), {"index": 3})
+    assert context == "page one\n[Image: Figure]\npage three"
+
+
+def test_context_is_cut_at_the_token_budget():
+    content_list = [
+        {"type": "text", "text": "one two three", "page_idx": 0},
+        {"type": "text", "text": "four five six seven", "page_idx": 0},
+        {"type": "text", "text": "eight", "page_idx": 0},
+    ]
+    config = ContextConfig(context_window=0, max_context_tokens=6)
+
+    extractor = ContextExtractor(config, tokenizer=_WordTokenizer())
+    assert extractor.extract_context(content_list, {"page_idx": 0}) == (
+        "one two three\nfour five..."
+    )
+
+    # Without a tokenizer the budget counts characters
+    extractor = ContextExtractor(config)
+    assert extractor.extract_context(content_list, {"page_idx": 0}) == "one tw..."
+
+
+def test_index_is_reused_until_the_list_changes():
+    extractor = ContextExtractor(ContextConfig(context_window=0))
+    content_list = _content_list()
+
+    index = extractor.index_content_source(content_list)
+    assert extractor.index_content_source(content_list) is index
+    assert extractor.index_content_source("plain text") is None
+
+    content_list.append({"type": "text", "text": "late", "page_idx": 4})
+    assert extractor.index_content_source(content_list) is not index
+    assert extractor.extract_context(content_list, {"page_idx": 4}) == (
+        "page four\nlate"
+    )
+
+    extractor.tokenizer = _WordTokenizer()
+    assert extractor.index_content_source(content_list).tokenized
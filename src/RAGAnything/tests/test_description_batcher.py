@@ -0,0 +1,102 @@
+"""
+Small table and equation descriptions requested together share one LLM call,
+list a shared context once, and fall back to single calls for items the
+batched answer misses or leaves incomplete.
+
+Run with: pytest src/RAGAnything/tests/test_description_batcher.py
+"""
+
+import asyncio
+import json
+import os
+import sys
+
+_ROOT = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+)
+sys.path.extend(
+    [
+        _ROOT,
+        os.path.join(_ROOT, "src", "LightRAG"),
+        os.path.join(_ROOT, "src", "RAGAnything"),
+    ]
+)
+
+from src.RAGAnything.raganything.modalprocessors import DescriptionBatcher
+
+PROMPT = "Describe {count} items.\n{contexts}\n{items}"
+
+
+def _entry(name):
+    return {
+        "detailed_description": f"about {name}",
+        "entity_info": {"entity_name": name, "entity_type": "table", "summary": name},
+    }
+
+
+def _single(name, calls):
+    async def describe_single():
+        calls.append(name)
+        return f"single {name}"
+
+    return describe_single
+
+
+def _run(batcher, items):
+    calls = []
+
+    async def run():
+        return await asyncio.gather(
+            *[
+                batcher.describe(text, context, _single(text, calls))
+                for text, context in items
+            ]
+        )
+
+    return asyncio.run(run()), calls
+
+
+def test_items_share_one_call_and_context():
+    prompts = []
+
+    async def caption(prompt, system_prompt=None):
+        prompts.append(prompt)
+        return json.dumps({"1": _entry("a"), "2": _entry("b"), "3": _entry("c")})
+
+    batcher = DescriptionBatcher(caption, PROMPT, "system", batch_size=3)
+    results, calls = _run(batcher, [("a", "page 1"), ("b", "page 1"), ("c", "")])
+
+    assert [json.loads(r) for r in results] == [_entry(n) for n in "abc"]
+    assert calls == []
+    assert len(prompts) == 1
+    assert prompts[0].count("page 1") == 1
+    assert "Item 1 (context C1):\na" in prompts[0]
+    assert "Item 2 (context C1):\nb" in prompts[0]
+    assert "Item 3:\nc" in prompts[0]
+
+
+def test_missing_and_incomplete_items_fall_back():
+    async def caption(prompt, system_prompt=None):
+        incomplete = _entry("b")
+        del incomplete["entity_info"]["summary"]
+        return "Answer: " + json.dumps({"1": _entry("a"), "2": incomplete})
+
+    batcher = DescriptionBatcher(caption, PROMPT, "system", window_ms=10)
+    results, calls = _run(batcher, [("a", ""), ("b", ""), ("c", "")])
+
+    assert json.loads(results[0]) == _entry("a")
+    assert results[1:] == ["single b", "single c"]
+    assert sorted(calls) == ["b", "c"]
+
+
+def test_failed_batch_and_large_items_use_single_calls():
+    async def caption(prompt, system_prompt=None):
+        raise RuntimeError("rate limited")
+
+    batcher = DescriptionBatcher(
+        caption, PROMPT, "system", window_ms=10, max_item_chars=5
+    )
+    results, calls = _run(batcher, [("a", ""), ("b", ""), ("too large", "")])
+
+    assert results == ["single a", "single b", "single too large"]
+    assert sorted(calls) == ["a", "b", "too large"]
@@ -0,0 +1,76 @@
+"""
+An image repeated with the same caption is described once, whatever prompt
+(page context, entity name) it is described with.
+
+Run with: pytest src/RAGAnything/tests/test_image_preprocessor.py
+"""
+
+import asyncio
+import os
+import sys
+
+_ROOT = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+)
+sys.path.extend(
+    [
+        _ROOT,
+        os.path.join(_ROOT, "src", "LightRAG"),
+        os.path.join(_ROOT, "src", "RAGAnything"),
+    ]
+)
+
+from src.RAGAnything.raganything.image_preprocessor import ImagePreprocessor
+
+
+def _write_image(path, content: bytes) -> str:
+    path.write_bytes(content)
+    return str(path)
+
+
+def test_repeated_image_reuses_its_description(tmp_path):
+    preprocessor = ImagePreprocessor()
+    calls = []
+
+    def describe_with(prompt):
+        async def describe(prepared):
+            calls.append(prompt)
+            return f"description for {prompt}"
+
+        return describe
+
+    async def run():
+        first = preprocessor.prepare(_write_image(tmp_path / "p1.bin", b"logo"))
+        again = preprocessor.prepare(_write_image(tmp_path / "p7.bin", b"logo"))
+        other = preprocessor.prepare(_write_image(tmp_path / "p9.bin", b"chart"))
+        return [
+            await preprocessor.describe(first, describe_with("page 1"), variant="c"),
+            await preprocessor.describe(again, describe_with("page 7"), variant="c"),
+            await preprocessor.describe(again, describe_with("page 8"), variant="d"),
+            await preprocessor.describe(other, describe_with("page 9"), variant="c"),
+        ]
+
+    descriptions = asyncio.run(run())
+    assert calls == ["page 1", "page 8", "page 9"]
+    assert descriptions[1] == descriptions[0]
+    assert preprocessor.report()["description_cache_hits"] == 1
+
+
+def test_concurrent_requests_share_one_call(tmp_path):
+    preprocessor = ImagePreprocessor()
+    calls = 0
+
+    async def describe(prepared):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "logo"
+
+    async def run():
+        image = preprocessor.prepare(_write_image(tmp_path / "logo.bin", b"logo"))
+        return await asyncio.gather(
+            *(preprocessor.describe(image, describe) for _ in range(3))
+        )
+
+    assert asyncio.run(run()) == ["logo", "logo", "logo"]
+    assert calls == 1
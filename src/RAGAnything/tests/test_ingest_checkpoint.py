@@ -0,0 +1,125 @@
+"""
+Folder ingestion records handled files in a checkpoint manifest: a resumed run
+skips completed files, by path, size and mtime or by content hash, retries
+failed ones, and survives the partial last line of an interrupted run.
+
+Run with: pytest src/RAGAnything/tests/test_ingest_checkpoint.py
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sys
+from types import SimpleNamespace
+
+_ROOT = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+)
+sys.path.extend(
+    [
+        _ROOT,
+        os.path.join(_ROOT, "src", "LightRAG"),
+        os.path.join(_ROOT, "src", "RAGAnything"),
+    ]
+)
+
+from src.RAGAnything.raganything.batch import BatchMixin
+from src.RAGAnything.raganything.folder_ingest import IngestCheckpoint
+
+
+def test_completed_files_are_found_after_reopening(tmp_path):
+    manifest = tmp_path / "checkpoint.jsonl"
+    checkpoint = IngestCheckpoint(manifest)
+    checkpoint.record("a.pdf", 10, 1.5, "hash-a", "done")
+    checkpoint.record("b.pdf", 20, 2.5, "hash-b", "failed", error="boom")
+    checkpoint.close()
+
+    reopened = IngestCheckpoint(manifest)
+    try:
+        assert reopened.completed == 1
+        assert reopened.lookup("a.pdf", 10, 1.5) == "hash-a"
+        # Changed size or mtime needs a rehash
+        assert reopened.lookup("a.pdf", 11, 1.5) is None
+        assert reopened.lookup("a.pdf", 10, 3.0) is None
+        assert reopened.is_done("hash-a")
+        # Failed files are retried
+        assert reopened.lookup("b.pdf", 20, 2.5) is None
+        assert not reopened.is_done("hash-b")
+    finally:
+        reopened.close()
+
+
+def test_partial_last_line_is_skipped_and_terminated(tmp_path):
+    manifest = tmp_path / "checkpoint.jsonl"
+    done = {"path": "a.pdf", "size": 1, "mtime": 1.0, "hash": "h-a", "status": "done"}
+    manifest.write_text(json.dumps(done) + "\n" + '{"path": "b.pdf", "si')
+
+    checkpoint = IngestCheckpoint(manifest)
+    checkpoint.record("c.pdf", 3, 3.0, "h-c", "done")
+    checkpoint.close()
+
+    lines = manifest.read_text().splitlines()
+    assert lines[1] == '{"path": "b.pdf", "si'
+    assert json.loads(lines[2])["path"] == "c.pdf"
+    reopened = IngestCheckpoint(manifest)
+    try:
+        assert reopened.completed == 2
+        assert reopened.is_done("h-a") and reopened.is_done("h-c")
+    finally:
+        reopened.close()
+
+
+class _Ingester(BatchMixin):
+    def __init__(self, working_dir, fail=()):
+        self.working_dir = str(working_dir)
+        self.config = SimpleNamespace(max_concurrent_parses=2, parse_timeout=0)
+        self.logger = logging.getLogger("test_ingest_checkpoint")
+        self.fail = set(fail)
+        self.parsed = []
+        self.inserted = []
+
+    async def _ensure_lightrag_initialized(self):
+        pass
+
+    async def aparse_document(self, file_path, output_dir, method, display_stats):
+        self.parsed.append(os.path.basename(file_path))
+        if os.path.basename(file_path) in self.fail:
+            raise RuntimeError("parse failed")
+        return [{"type": "text", "text": file_path}], ""
+
+    async def _insert_parsed_document(self, file_path, content_list, **kwargs):
+        self.inserted.append(os.path.basename(file_path))
+
+
+def _ingest(ingester, folder, output_dir):
+    asyncio.run(
+        ingester.process_folder_complete(
+            str(folder),
+            output_dir=str(output_dir),
+            parse_method="auto",
+            file_extensions=[".txt"],
+            recursive=False,
+            max_workers=2,
+            parse_processes=0,
+        )
+    )
+
+
+def test_resumed_folder_ingestion_skips_completed_and_duplicate_files(tmp_path):
+    folder = tmp_path / "docs"
+    folder.mkdir()
+    (folder / "a.txt").write_text("alpha")
+    (folder / "b.txt").write_text("beta")
+    output_dir = tmp_path / "output"
+
+    first = _Ingester(tmp_path / "work", fail={"b.txt"})
+    _ingest(first, folder, output_dir)
+    assert sorted(first.inserted) == ["a.txt"]
+
+    # A copy of a completed file and the file that failed before
+    (folder / "a-copy.txt").write_text("alpha")
+    second = _Ingester(tmp_path / "work")
+    _ingest(second, folder, output_dir)
+    assert sorted(second.parsed) == ["b.txt"]
+    assert sorted(second.inserted) == ["b.txt"]
@@ -0,0 +1,130 @@
+"""
+Text and markdown files are parsed natively into a MinerU-style content list:
+headings, paragraphs, fenced code, equations, pipe and HTML tables and images.
+
+Run with: pytest src/RAGAnything/tests/test_markdown_parser.py
+"""
+
+import os
+import sys
+
+_ROOT = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+)
+sys.path.extend(
+    [
+        _ROOT,
+        os.path.join(_ROOT, "src", "LightRAG"),
+        os.path.join(_ROOT, "src", "RAGAnything"),
+    ]
+)
+
+from src.RAGAnything.raganything.mineru_parser import MineruParser
+
+
+def _parse(text, base_dir, **kwargs):
+    return MineruParser._parse_text_lines(
+        text.splitlines(keepends=True), base_dir, **kwargs
+    )
+
+
+def test_markdown_blocks(tmp_path):
+    (tmp_path / "fig.png").write_bytes(b"png")
+    content_list = _parse(
+        "# Title\n"
+        "\n"
+        "First line\n"
+        "second line\n"
+        "\n"
+        "$$\n"
+        "E = mc^2\n"
+        "$$\n"
+        "\n"
+        "<table><tr><td>1</td></tr></table>\n"
+        "![A figure](fig.png)\n"
+        "## Section ##\n",
+        tmp_path,
+    )
+
+    assert content_list == [
+        {"type": "text", "text": "Title", "text_level": 1, "page_idx": 0},
+        {"type": "text", "text": "First line\nsecond line", "page_idx": 0},
+        {
+            "type": "equation",
+            "text": "$$\nE = mc^2\n$$",
+            "text_format": "latex",
+            "page_idx": 0,
+        },
+        {
+            "type": "table",
+            "img_path": "",
+            "table_caption": [],
+            "table_footnote": [],
+            "table_body": "<table><tr><td>1</td></tr></table>",
+            "page_idx": 0,
+        },
+        {
+            "type": "image",
+            "img_path": str((tmp_path / "fig.png").resolve()),
+            "img_caption": ["A figure"],
+            "img_footnote": [],
+            "page_idx": 0,
+        },
+        {"type": "text", "text": "Section", "text_level": 2, "page_idx": 0},
+    ]
+
+
+def test_pipe_table_after_paragraph_line(tmp_path):
+    content_list = _parse(
+        "Results:\n| a | b |\n|---|:-:|\n| 1 | 2 |\nAfter\n", tmp_path
+    )
+
+    assert [item["type"] for item in content_list] == ["text", "table", "text"]
+    assert content_list[0]["text"] == "Results:"
+    assert content_list[1]["table_body"] == (
+        "<table><tr><th>a</th><th>b</th></tr><tr><td>1</td><td>2</td></tr></table>"
+    )
+    assert content_list[2]["text"] == "After"
+
+
+def test_pipe_line_without_separator_stays_text(tmp_path):
+    content_list = _parse("| not a table\nmore text\n", tmp_path)
+
+    assert content_list == [
+        {"type": "text", "text": "| not a table\nmore text", "page_idx": 0}
+    ]
+
+
+def test_code_fence_closes_on_matching_fence_only(tmp_path):
+    content_list = _parse(
+        "````\n```python\n# not a heading\n```\n````\n# Heading\n", tmp_path
+    )
+
+    assert content_list[0]["text"] == "````\n```python\n# not a heading\n```\n````"
+    assert content_list[1] == {
+        "type": "text",
+        "text": "Heading",
+        "text_level": 1,
+        "page_idx": 0,
+    }
+
+
+def test_unclosed_block_and_pages(tmp_path):
+    content_list = _parse("```\ncode", tmp_path)
+    assert content_list == [{"type": "text", "text": "```\ncode", "page_idx": 0}]
+
+    content_list = _parse("a\n\nb\n\n# c\n", tmp_path, chars_per_page=1)
+    assert [item["page_idx"] for item in content_list] == [0, 1, 2]
+
+
+def test_plain_text_ignores_markdown(tmp_path):
+    doc = tmp_path / "notes.txt"
+    doc.write_text("# not a heading\n\nsecond\n", encoding="utf-8")
+
+    content_list, text = MineruParser._parse_text_native(doc)
+
+    assert text == "# not a heading\n\nsecond\n"
+    assert content_list == [
+        {"type": "text", "text": "# not a heading", "page_idx": 0},
+        {"type": "text", "text": "second", "page_idx": 0},
+    ]
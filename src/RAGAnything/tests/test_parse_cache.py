@@ -0,0 +1,65 @@
+"""
+Parse cache keys depend on the file content and the options that change the
+parse output only, and cached entries survive removal of the parser output.
+
+Run with: pytest src/RAGAnything/tests/test_parse_cache.py
+"""
+
+import os
+import sys
+
+_ROOT = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+)
+sys.path.extend(
+    [
+        _ROOT,
+        os.path.join(_ROOT, "src", "LightRAG"),
+        os.path.join(_ROOT, "src", "RAGAnything"),
+    ]
+)
+
+from src.RAGAnything.raganything.parse_cache import ParseCache
+
+
+def test_key_depends_on_content_and_output_options(tmp_path):
+    cache = ParseCache(tmp_path / "cache")
+    doc = tmp_path / "report.pdf"
+    doc.write_bytes(b"content")
+    copy = tmp_path / "uploads" / "renamed.pdf"
+    copy.parent.mkdir()
+    copy.write_bytes(b"content")
+
+    key = cache.make_key(doc, "auto", lang="en")
+    # Same content under another name, options that do not change the output
+    assert cache.make_key(copy, "auto", lang="en") == key
+    assert cache.make_key(doc, "auto", lang="en", device="cuda") == key
+
+    assert cache.make_key(doc, "ocr", lang="en") != key
+    assert cache.make_key(doc, "auto", lang="ch") != key
+    assert cache.make_key(doc, "auto", lang="en", start_page=2) != key
+    doc.write_bytes(b"changed")
+    assert cache.make_key(doc, "auto", lang="en") != key
+
+
+def test_entry_keeps_images_after_output_removal(tmp_path):
+    cache = ParseCache(tmp_path / "cache")
+    output = tmp_path / "output"
+    (output / "images").mkdir(parents=True)
+    (output / "images" / "fig.jpg").write_bytes(b"jpeg")
+    content_list = [
+        {"type": "text", "text": "hello"},
+        {"type": "image", "img_path": "images/fig.jpg"},
+    ]
+
+    assert not cache.contains("k" * 64)
+    cache.put("k" * 64, content_list, "# hello", image_root=output)
+    (output / "images" / "fig.jpg").unlink()
+
+    assert cache.contains("k" * 64)
+    cached_list, md_content = cache.get("k" * 64)
+    assert md_content == "# hello"
+    assert cached_list[0] == content_list[0]
+    with open(cached_list[1]["img_path"], "rb") as f:
+        assert f.read() == b"jpeg"
+    assert cache.get("m" * 64) is None
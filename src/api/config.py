@@ -305,11 +305,23 @@ def parse_args() -> argparse.Namespace:
     # Select Document loading tool (DOCLING, DEFAULT)
     args.document_loading_engine = get_env_value("DOCUMENT_LOADING_ENGINE", "DEFAULT")
 
+    # Watch the input directory and index new and changed files continuously
+    args.watch_input_dir = get_env_value("WATCH_INPUT_DIR", False, bool)
+    args.watch_debounce_ms = get_env_value("WATCH_DEBOUNCE_MS", 2000, int)
+
+    # Number of processes extracting uploaded and scanned documents
+    args.extraction_workers = get_env_value(
+        "EXTRACTION_WORKERS", min(4, os.cpu_count() or 1), int
+    )
+
     # Add environment variables that were previously read directly
     args.cors_origins = get_env_value("CORS_ORIGINS", "*")
     args.summary_language = get_env_value("SUMMARY_LANGUAGE", "English")
     args.whitelist_paths = get_env_value("WHITELIST_PATHS", "/health,/api/*")
 
+    # Seconds a readiness check result is served from cache
+    args.health_check_interval = get_env_value("HEALTH_CHECK_INTERVAL", 10, float)
+
     # For JWT Auth
     args.auth_accounts = get_env_value("AUTH_ACCOUNTS", "")
     args.token_secret = get_env_value("TOKEN_SECRET", "lightrag-jwt-default-secret")
@@ -322,6 +334,9 @@ def parse_args() -> argparse.Namespace:
     args.rerank_binding_host = get_env_value("RERANK_BINDING_HOST", None)
     args.rerank_binding_api_key = get_env_value("RERANK_BINDING_API_KEY", None)
 
+    # Query keyword extraction micro-batching window (0 disables batching)
+    args.keyword_batch_window_ms = get_env_value("KEYWORD_BATCH_WINDOW_MS", 0, float)
+
     ollama_server_infos.LIGHTRAG_MODEL = args.simulated_model_name
 
     return args
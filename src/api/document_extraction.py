@@ -0,0 +1,256 @@
+"""
+Text extraction of uploaded and scanned documents for the LightRAG API.
+
+PDF, Office and Docling extraction is CPU bound and runs in a bounded pool of
+worker processes, so the server keeps answering requests while a large scan is
+being extracted. Plain text files are decoded in a thread.
+
+Extractors read the document from its path rather than from a copy of its bytes,
+so parsers that support it (PyPDF2, openpyxl in read-only mode) stream the file.
+"""
+
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Optional
+
+import pipmaster as pm
+
+from src.LightRAG.lightrag.utils import logger
+
+TEXT_EXTENSIONS = {
+    ".txt",
+    ".md",
+    ".html",
+    ".htm",
+    ".tex",
+    ".json",
+    ".xml",
+    ".yaml",
+    ".yml",
+    ".rtf",
+    ".odt",
+    ".epub",
+    ".csv",
+    ".log",
+    ".conf",
+    ".ini",
+    ".properties",
+    ".sql",
+    ".bat",
+    ".sh",
+    ".c",
+    ".cpp",
+    ".py",
+    ".java",
+    ".js",
+    ".ts",
+    ".swift",
+    ".go",
+    ".rb",
+    ".php",
+    ".css",
+    ".scss",
+    ".less",
+}
+
+BINARY_EXTENSIONS = {".pdf", ".docx", ".pptx", ".xlsx"}
+
+
+class ExtractionError(ValueError):
+    """A document has no usable text content"""
+
+
+def _convert_with_docling(file_path: str) -> str:
+    if not pm.is_installed("docling"):  # type: ignore
+        pm.install("docling")
+    from docling.document_converter import DocumentConverter  # type: ignore
+
+    converter = DocumentConverter()
+    result = converter.convert(file_path)
+    return result.document.export_to_markdown()
+
+
+def _extract_text_file(file_path: Path) -> str:
+    try:
+        # Try to decode as UTF-8
+        with open(file_path, "r", encoding="utf-8", newline="") as f:
+            content = f.read()
+    except UnicodeDecodeError:
+        raise ExtractionError(
+            f"File {file_path.name} is not valid UTF-8 encoded text. Please convert it to UTF-8 before processing."
+        )
+
+    # Validate content
+    if not content or len(content.strip()) == 0:
+        raise ExtractionError(f"Empty content in file: {file_path.name}")
+
+    # Check if content looks like binary data string representation
+    if content.startswith("b'") or content.startswith('b"'):
+        raise ExtractionError(
+            f"File {file_path.name} appears to contain binary data representation instead of text"
+        )
+    return content
+
+
+def _extract_pdf(file_path: Path) -> str:
+    if not pm.is_installed("pypdf2"):  # type: ignore
+        pm.install("pypdf2")
+    from PyPDF2 import PdfReader  # type: ignore
+
+    with open(file_path, "rb") as f:
+        # Pages are read from the file as they are extracted
+        reader = PdfReader(f)
+        return "".join(page.extract_text() + "\n" for page in reader.pages)
+
+
+def _extract_docx(file_path: Path) -> str:
+    if not pm.is_installed("python-docx"):  # type: ignore
+        try:
+            pm.install("python-docx")
+        except Exception:
+            pm.install("docx")
+    from docx import Document  # type: ignore
+
+    doc = Document(str(file_path))
+    return "\n".join([paragraph.text for paragraph in doc.paragraphs])
+
+
+def _extract_pptx(file_path: Path) -> str:
+    if not pm.is_installed("python-pptx"):  # type: ignore
+        pm.install("pptx")
+    from pptx import Presentation  # type: ignore
+
+    parts = []
+    prs = Presentation(str(file_path))
+    for slide in prs.slides:
+        for shape in slide.shapes:
+            if hasattr(shape, "text"):
+                parts.append(shape.text + "\n")
+    return "".join(parts)
+
+
+def _extract_xlsx(file_path: Path) -> str:
+    if not pm.is_installed("openpyxl"):  # type: ignore
+        pm.install("openpyxl")
+    from openpyxl import load_workbook  # type: ignore
+
+    parts = []
+    # Read-only workbooks stream rows from the file instead of loading all cells
+    wb = load_workbook(file_path, read_only=True)
+    try:
+        for sheet in wb:
+            parts.append(f"Sheet: {sheet.title}\n")
+            for row in sheet.iter_rows(values_only=True):
+                parts.append(
+                    "\t".join(str(cell) if cell is not None else "" for cell in row)
+                    + "\n"
+                )
+            parts.append("\n")
+    finally:
+        wb.close()
+    return "".join(parts)
+
+
+_BINARY_EXTRACTORS = {
+    ".pdf": _extract_pdf,
+    ".docx": _extract_docx,
+    ".pptx": _extract_pptx,
+    ".xlsx": _extract_xlsx,
+}
+
+
+def extract_text(file_path: str, loading_engine: str = "DEFAULT") -> str:
+    """Extract the text content of a document (blocking)
+
+    Args:
+        file_path: Path of the document
+        loading_engine: "DOCLING" converts PDF and Office documents with Docling
+
+    Returns:
+        The extracted text
+
+    Raises:
+        ExtractionError: If the file type is unsupported or has no usable text
+    """
+    path = Path(file_path)
+    ext = path.suffix.lower()
+    if ext in TEXT_EXTENSIONS:
+        return _extract_text_file(path)
+    if ext in BINARY_EXTENSIONS:
+        if loading_engine == "DOCLING":
+            return _convert_with_docling(file_path)
+        return _BINARY_EXTRACTORS[ext](path)
+    raise ExtractionError(f"Unsupported file type: {path.name} (extension {ext})")
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+def _get_extraction_pool(max_workers: int) -> ProcessPoolExecutor:
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None or _pool_workers != max_workers:
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+            # Spawned rather than forked: the server runs an event loop and threads
+            _pool = ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            _pool_workers = max_workers
+        return _pool
+
+
+def _discard_extraction_pool(pool: ProcessPoolExecutor) -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False)
+
+
+async def aextract_text(
+    file_path: Path, loading_engine: str = "DEFAULT", max_workers: int = 2
+) -> str:
+    """Extract the text content of a document without blocking the event loop
+
+    Text files are decoded in a thread, other formats in the extraction process
+    pool. A pool whose worker died (e.g. a parser crashing on a malformed file)
+    is replaced for the next extraction.
+
+    Args:
+        file_path: Path of the document
+        loading_engine: Document loading engine (DOCLING or DEFAULT)
+        max_workers: Number of extraction processes
+
+    Raises:
+        ExtractionError: If the file type is unsupported or has no usable text
+    """
+    if file_path.suffix.lower() not in BINARY_EXTENSIONS or max_workers <= 0:
+        return await asyncio.to_thread(extract_text, str(file_path), loading_engine)
+
+    pool = _get_extraction_pool(max_workers)
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(
+            pool, extract_text, str(file_path), loading_engine
+        )
+    except BrokenProcessPool:
+        logger.error(f"Extraction worker died while extracting {file_path.name}")
+        _discard_extraction_pool(pool)
+        raise
+
+
+def shutdown_extraction_pool() -> None:
+    """Stop the extraction worker processes"""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,124 @@
+"""
+Readiness checks of the LightRAG API server.
+
+The liveness probe (/health/live) answers without touching shared storage. The
+readiness check (/health/ready) reads the pipeline status, cleans up expired
+keyed locks and times a small read on every storage; its result is cached and
+refreshed at most once per HEALTH_CHECK_INTERVAL seconds, so frequent polling by
+load balancers does not contend with ingestion. Results are per worker process.
+"""
+
+import asyncio
+import os
+import time
+from collections import deque
+from typing import Any, Optional
+
+from src.LightRAG.lightrag.kg.shared_storage import (
+    cleanup_keyed_lock,
+    get_namespace_data,
+)
+from src.LightRAG.lightrag.utils import logger
+
+# Key that is never stored, read to time a storage round trip
+PROBE_ID = "__health_check__"
+# A storage read taking longer than this fails the check
+PROBE_TIMEOUT_SECONDS = 5.0
+# Latency samples kept per storage
+LATENCY_SAMPLES = 10
+
+
+class HealthChecker:
+    """Cached readiness check of a LightRAG instance"""
+
+    def __init__(self, rag, refresh_interval: float = 10.0):
+        self.rag = rag
+        self.refresh_interval = refresh_interval
+        self.started_at = time.time()
+        self._result: Optional[dict[str, Any]] = None
+        self._checked_at = 0.0
+        self._refresh_lock = asyncio.Lock()
+        self._latencies: dict[str, deque] = {}
+
+    def liveness(self) -> dict[str, Any]:
+        """Constant-time answer proving the worker's event loop is running"""
+        return {
+            "status": "alive",
+            "process_id": os.getpid(),
+            "uptime_seconds": round(time.time() - self.started_at, 3),
+        }
+
+    def _probes(self) -> dict[str, Any]:
+        rag = self.rag
+        return {
+            "full_docs": lambda: rag.full_docs.get_by_id(PROBE_ID),
+            "text_chunks": lambda: rag.text_chunks.get_by_id(PROBE_ID),
+            "doc_status": lambda: rag.doc_status.get_by_id(PROBE_ID),
+            "llm_response_cache": lambda: rag.llm_response_cache.get_by_id(PROBE_ID),
+            "chunk_entity_relation": lambda: rag.chunk_entity_relation_graph.has_node(
+                PROBE_ID
+            ),
+            "entities_vdb": lambda: rag.entities_vdb.get_by_id(PROBE_ID),
+            "relationships_vdb": lambda: rag.relationships_vdb.get_by_id(PROBE_ID),
+            "chunks_vdb": lambda: rag.chunks_vdb.get_by_id(PROBE_ID),
+        }
+
+    async def _probe(self, name: str, probe) -> dict[str, Any]:
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(probe(), timeout=PROBE_TIMEOUT_SECONDS)
+        except Exception as e:
+            error = "timeout" if isinstance(e, asyncio.TimeoutError) else str(e)
+            logger.warning(f"Health check of storage {name} failed: {error}")
+            return {"status": "error", "error": error}
+
+        latency_ms = (time.perf_counter() - started) * 1000
+        samples = self._latencies.setdefault(name, deque(maxlen=LATENCY_SAMPLES))
+        samples.append(round(latency_ms, 3))
+        return {
+            "status": "ok",
+            "latency_ms": samples[-1],
+            "avg_latency_ms": round(sum(samples) / len(samples), 3),
+            "max_latency_ms": max(samples),
+            "samples_ms": list(samples),
+        }
+
+    async def _run_checks(self) -> dict[str, Any]:
+        probes = self._probes()
+        results = await asyncio.gather(
+            *(self._probe(name, probe) for name, probe in probes.items())
+        )
+        storages = dict(zip(probes, results))
+
+        pipeline_status = await get_namespace_data("pipeline_status")
+        ready = all(result["status"] == "ok" for result in storages.values())
+        return {
+            "status": "ready" if ready else "not_ready",
+            "process_id": os.getpid(),
+            "checked_at": time.time(),
+            "refresh_interval_seconds": self.refresh_interval,
+            "pipeline_busy": pipeline_status.get("busy", False),
+            # Cleanup expired keyed locks and get status
+            "keyed_locks": cleanup_keyed_lock(),
+            "storages": storages,
+        }
+
+    async def readiness(self) -> dict[str, Any]:
+        """Result of the last check, re-run when older than the refresh interval
+
+        Concurrent callers share one refresh.
+        """
+        if self._is_fresh():
+            return self._result
+        async with self._refresh_lock:
+            if self._is_fresh():
+                return self._result
+            self._result = await self._run_checks()
+            self._checked_at = time.monotonic()
+            return self._result
+
+    def _is_fresh(self) -> bool:
+        return (
+            self._result is not None
+            and time.monotonic() - self._checked_at < self.refresh_interval
+        )
@@ -18,16 +18,19 @@ from ascii_colors import ASCIIColors
 from dotenv import load_dotenv
 from fastapi import Depends, FastAPI, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import RedirectResponse
+from fastapi.responses import JSONResponse, RedirectResponse
 from fastapi.security import OAuth2PasswordRequestForm
 from fastapi.staticfiles import StaticFiles
 
 from src.api import __api_version__
 from src.api.auth import auth_handler
+from src.api.document_extraction import shutdown_extraction_pool
+from src.api.health_check import HealthChecker
 from src.api.routers.document_routes import (
     DocumentManager,
     create_document_routes,
     run_scanning_process,
+    run_watch_process,
 )
 from src.api.routers.graph_routes import create_graph_routes
 from src.api.routers.ollama_api import OllamaAPI
@@ -45,10 +48,11 @@ from src.LightRAG.lightrag.constants import (
     DEFAULT_LOG_MAX_BYTES,
 )
 from src.LightRAG.lightrag.kg.shared_storage import (
-    cleanup_keyed_lock,
+    get_keyed_lock_status,
     get_namespace_data,
     get_pipeline_status_lock,
     initialize_pipeline_status,
+    reset_lock_metrics,
 )
 from src.LightRAG.lightrag.types import GPTKeywordExtractionFormat
 from src.LightRAG.lightrag.utils import (
@@ -129,6 +133,7 @@ def create_app(args):
         """Lifespan context manager for startup and shutdown events"""
         # Store background tasks
         app.state.background_tasks = set()
+        watch_task = None
 
         try:
             # Initialize database connections
@@ -143,12 +148,18 @@ def create_app(args):
             pipeline_status = await get_namespace_data("pipeline_status")
 
             should_start_autoscan = False
+            should_start_watch = False
             async with get_pipeline_status_lock():
                 # Auto scan documents if enabled
                 if args.auto_scan_at_startup:
                     if not pipeline_status.get("autoscanned", False):
                         pipeline_status["autoscanned"] = True
                         should_start_autoscan = True
+                # A single process watches the input directory
+                if args.watch_input_dir:
+                    if not pipeline_status.get("watching", False):
+                        pipeline_status["watching"] = True
+                        should_start_watch = True
 
                 # Only run auto scan when no other process started it first
             if should_start_autoscan:
@@ -157,13 +168,21 @@ def create_app(args):
                 app.state.background_tasks.add(task)
                 task.add_done_callback(app.state.background_tasks.discard)
                 logger.info(f"Process {os.getpid()} auto scan task started at startup.")
+            if should_start_watch:
+                watch_task = asyncio.create_task(
+                    run_watch_process(rag, doc_manager, args.watch_debounce_ms)
+                )
 
             ASCIIColors.green("\nServer is ready to accept connections! 🚀\n")
 
             yield
 
         finally:
-            # Clean up database connections
+            if watch_task is not None:
+                watch_task.cancel()
+            # Stop parse and extraction workers and clean up database connections
+            await rag.parse_service.shutdown()
+            shutdown_extraction_pool()
             await light_rag.finalize_storages()
 
     # Initialize FastAPI
@@ -213,19 +232,28 @@ def create_app(args):
     # Create working directory if it doesn't exist
     Path(args.working_dir).mkdir(parents=True, exist_ok=True)
     if args.llm_binding == "lollms" or args.embedding_binding == "lollms":
-        from lightrag.llm.lollms import lollms_embed, lollms_model_complete
+        from src.LightRAG.lightrag.llm.lollms import (
+            lollms_embed,
+            lollms_model_complete,
+        )
     if args.llm_binding == "ollama" or args.embedding_binding == "ollama":
-        from lightrag.llm.ollama import ollama_embed, ollama_model_complete
+        from src.LightRAG.lightrag.llm.ollama import (
+            ollama_embed,
+            ollama_model_complete,
+        )
     if args.llm_binding == "openai" or args.embedding_binding == "openai":
-        from lightrag.llm.openai import openai_complete_if_cache, openai_embed
+        from src.LightRAG.lightrag.llm.openai import (
+            openai_complete_if_cache,
+            openai_embed,
+        )
     if args.llm_binding == "azure_openai" or args.embedding_binding == "azure_openai":
-        from lightrag.llm.azure_openai import (
+        from src.LightRAG.lightrag.llm.azure_openai import (
             azure_openai_complete_if_cache,
             azure_openai_embed,
         )
     if args.llm_binding_host == "openai-ollama" or args.embedding_binding == "ollama":
-        from lightrag.llm.ollama import ollama_embed
-        from lightrag.llm.openai import openai_complete_if_cache
+        from src.LightRAG.lightrag.llm.ollama import ollama_embed
+        from src.LightRAG.lightrag.llm.openai import openai_complete_if_cache
 
     async def openai_alike_model_complete(
         prompt,
@@ -451,6 +479,9 @@ def create_app(args):
         vision_model_func=vision_model_func,
     )
 
+    # Readiness checks are cached, only /health/ready hits the storages
+    health_checker = HealthChecker(light_rag, args.health_check_interval)
+
     # Add routes
     app.include_router(
         create_document_routes(
@@ -459,7 +490,14 @@ def create_app(args):
             api_key,
         )
     )
-    app.include_router(create_query_routes(rag, api_key, args.top_k))
+    app.include_router(
+        create_query_routes(
+            rag,
+            api_key,
+            args.top_k,
+            keyword_batch_window_ms=args.keyword_batch_window_ms,
+        )
+    )
     app.include_router(create_graph_routes(rag, api_key))
 
     # Add Ollama API routes
@@ -538,11 +576,34 @@ def create_app(args):
             "webui_description": webui_description,
         }
 
+    @app.get("/health/live")
+    async def get_liveness():
+        """Liveness probe: answers in constant time without touching storage"""
+        return health_checker.liveness()
+
+    @app.get("/health/ready", dependencies=[Depends(combined_auth)])
+    async def get_readiness():
+        """Readiness check of the storages, with latency samples
+
+        The result is cached for HEALTH_CHECK_INTERVAL seconds. Responds with
+        503 when a storage could not be read.
+        """
+        try:
+            readiness = await health_checker.readiness()
+        except Exception as e:
+            logger.error(f"Error checking readiness: {str(e)}")
+            raise HTTPException(status_code=500, detail=str(e))
+        status_code = 200 if readiness["status"] == "ready" else 503
+        return JSONResponse(content=readiness, status_code=status_code)
+
     @app.get("/health", dependencies=[Depends(combined_auth)])
     async def get_status():
-        """Get current system status"""
+        """Get current system status
+
+        Reads the pipeline busy flag and the keyed lock counts only, storage
+        probes are left to /health/ready.
+        """
         try:
-            pipeline_busy = False
             pipeline_status = await get_namespace_data("pipeline_status")
             pipeline_busy = pipeline_status.get("busy", False)
 
@@ -551,8 +612,20 @@ def create_app(args):
             else:
                 auth_mode = "enabled"
 
-            # Cleanup expired keyed locks and get status
-            keyed_lock_info = cleanup_keyed_lock()
+            # Lock counts without the cleanup pass or the lock metrics
+            lock_status = get_keyed_lock_status(include_metrics=False)
+            keyed_lock_info = {
+                "process_id": lock_status["process_id"],
+                "current_status": {
+                    key: lock_status[key]
+                    for key in (
+                        "total_mp_locks",
+                        "pending_mp_cleanup",
+                        "total_async_locks",
+                        "pending_async_cleanup",
+                    )
+                },
+            }
 
             return {
                 "status": "healthy",
@@ -595,6 +668,26 @@ def create_app(args):
             logger.error(f"Error getting health status: {str(e)}")
             raise HTTPException(status_code=500, detail=str(e))
 
+    @app.get("/health/locks", dependencies=[Depends(combined_auth)])
+    async def get_lock_status(top_n: Optional[int] = None, reset: bool = False):
+        """Get keyed lock counts and lock contention metrics
+
+        Metrics are collected per worker process: with several workers each
+        request reports the worker that served it (see process_id).
+
+        Args:
+            top_n: Number of hot keys reported
+            reset: Clear the metrics of the worker after reading them
+        """
+        try:
+            lock_status = get_keyed_lock_status(top_n)
+            if reset:
+                reset_lock_metrics()
+            return lock_status
+        except Exception as e:
+            logger.error(f"Error getting lock status: {str(e)}")
+            raise HTTPException(status_code=500, detail=str(e))
+
     # Custom StaticFiles class for smart caching
     class SmartStaticFiles(StaticFiles):  # Renamed from NoCacheStaticFiles
         async def get_response(self, path: str, scope):
@@ -3,7 +3,8 @@ This module contains all document-related routes for the LightRAG API.
 """
 
 import asyncio
-import shutil
+import hashlib
+import os
 import traceback
 from datetime import datetime, timezone
 from pathlib import Path
@@ -17,11 +18,21 @@ from fastapi import (
     Depends,
     File,
     HTTPException,
+    Query,
     UploadFile,
 )
 from pydantic import BaseModel, Field, field_validator
 from pyuca import Collator
 
+from src.api.document_extraction import ExtractionError, aextract_text
+from src.api.scan_manifest import (
+    SCAN_MANIFEST_NAME,
+    STATUS_FAILED,
+    STATUS_INDEXED,
+    ScanManifest,
+    ScanResult,
+    iter_files,
+)
 from src.api.utils_api import get_combined_auth_dependency
 from src.LightRAG.lightrag.base import DeletionResult, DocProcessingStatus, DocStatus
 from src.LightRAG.lightrag.utils import logger
@@ -63,6 +74,9 @@ router = APIRouter(
 # Temporary file prefix
 temp_prefix = "__tmp__"
 
+# Size of the chunks uploads are streamed to disk in
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
 
 def sanitize_filename(filename: str, input_dir: Path) -> str:
     """
@@ -434,6 +448,54 @@ class DocsStatusesResponse(BaseModel):
         }
 
 
+class PaginatedDocsResponse(BaseModel):
+    """Response model for one page of a document listing
+
+    Attributes:
+        documents: Documents of the page, in sort order
+        next_cursor: Cursor to pass to get the next page, None on the last page
+        total: Number of documents matching the filters, across all pages
+    """
+
+    documents: List[DocStatusResponse] = Field(
+        default_factory=list, description="Documents of the page, in sort order"
+    )
+    next_cursor: Optional[str] = Field(
+        default=None,
+        description="Cursor to pass to get the next page, null on the last page",
+    )
+    total: int = Field(
+        description="Number of documents matching the filters, across all pages"
+    )
+
+
+class DocStatusCountsResponse(BaseModel):
+    """Response model for document counts per status
+
+    Attributes:
+        status_counts: Number of documents in each status
+        total: Total number of documents
+    """
+
+    status_counts: Dict[str, int] = Field(
+        description="Number of documents in each status"
+    )
+    total: int = Field(description="Total number of documents")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "status_counts": {
+                    "pending": 2,
+                    "processing": 1,
+                    "processed": 120,
+                    "failed": 0,
+                },
+                "total": 123,
+            }
+        }
+
+
 class PipelineStatusResponse(BaseModel):
     """Response model for pipeline status
 
@@ -473,6 +535,24 @@ class PipelineStatusResponse(BaseModel):
         extra = "allow"  # Allow additional fields from the pipeline status
 
 
+def to_doc_status_response(
+    doc_id: str, doc_status: DocProcessingStatus
+) -> DocStatusResponse:
+    """Convert a stored document status to its API response"""
+    return DocStatusResponse(
+        id=doc_id,
+        content_summary=doc_status.content_summary,
+        content_length=doc_status.content_length,
+        status=doc_status.status,
+        created_at=format_datetime(doc_status.created_at),
+        updated_at=format_datetime(doc_status.updated_at),
+        chunks_count=doc_status.chunks_count,
+        error=doc_status.error,
+        metadata=doc_status.metadata,
+        file_path=doc_status.file_path,
+    )
+
+
 class DocumentManager:
     def __init__(
         self,
@@ -522,7 +602,6 @@ class DocumentManager:
         self.base_input_dir = Path(input_dir)
         self.workspace = workspace
         self.supported_extensions = supported_extensions
-        self.indexed_files = set()
 
         # Create workspace-specific input directory
         # If workspace is provided, create a subdirectory for data isolation
@@ -534,207 +613,104 @@ class DocumentManager:
         # Create input directory if it doesn't exist
         self.input_dir.mkdir(parents=True, exist_ok=True)
 
+        # Fingerprints of the indexed files, kept across restarts
+        self.manifest = ScanManifest(
+            self.input_dir / SCAN_MANIFEST_NAME, root=self.input_dir
+        )
+
+    def scan_directory(self) -> ScanResult:
+        """Walk the input directory once and compare it with the manifest
+
+        Deleted files are dropped from the manifest, and fingerprints of touched
+        but unchanged files are refreshed; the manifest is saved if either
+        happened.
+        """
+        logger.debug(f"Scanning {self.input_dir}")
+        result = self.manifest.classify(
+            iter_files(
+                self.input_dir, self.supported_extensions, skip=self.manifest.path
+            ),
+            complete=True,
+        )
+        self.manifest.save()
+        return result
+
+    def check_files(self, file_paths: List[Path]) -> ScanResult:
+        """Compare some files of the input directory with the manifest
+
+        Files that no longer exist are reported as deleted.
+        """
+        files = []
+        deleted = []
+        for file_path in file_paths:
+            if file_path == self.manifest.path or not self.is_supported_file(
+                file_path.name
+            ):
+                continue
+            try:
+                files.append((file_path, file_path.stat()))
+            except FileNotFoundError:
+                self.manifest.forget(file_path)
+                deleted.append(file_path)
+        result = self.manifest.classify(files)
+        result.deleted = deleted
+        return result
+
     def scan_directory_for_new_files(self) -> List[Path]:
-        """Scan input directory for new files"""
-        new_files = []
-        for ext in self.supported_extensions:
-            logger.debug(f"Scanning for {ext} files in {self.input_dir}")
-            for file_path in self.input_dir.rglob(f"*{ext}"):
-                if file_path not in self.indexed_files:
-                    new_files.append(file_path)
-        return new_files
-
-    def mark_as_indexed(self, file_path: Path):
-        self.indexed_files.add(file_path)
+        """Scan input directory for new and changed files"""
+        return self.scan_directory().to_index
+
+    def record_file(
+        self,
+        file_path: Path,
+        file_hash: Optional[str] = None,
+        status: str = STATUS_INDEXED,
+    ):
+        """Record the fingerprint of an indexed or failed file (blocking, hashes
+        the file unless its hash is given)"""
+        try:
+            self.manifest.record(file_path, file_hash, status)
+        except FileNotFoundError:
+            # Uploaded temporary files are removed once enqueued
+            pass
+
+    def save_manifest(self):
+        self.manifest.save()
 
     def is_supported_file(self, filename: str) -> bool:
         return any(filename.lower().endswith(ext) for ext in self.supported_extensions)
 
 
-async def pipeline_enqueue_file(rag, file_path: Path) -> bool:
+async def pipeline_enqueue_file(
+    rag,
+    file_path: Path,
+    doc_manager: Optional["DocumentManager"] = None,
+    file_hash: Optional[str] = None,
+) -> bool:
     """Add a file to the queue for processing
 
     Args:
         rag: LightRAG instance
         file_path: Path to the saved file
+        doc_manager: Records the fingerprint of the file, if given: as indexed
+            once enqueued, as failed when no text could be extracted from it.
+            Files that failed for another reason are retried by the next scan.
+        file_hash: SHA-256 of the file, if computed while it was saved
     Returns:
         bool: True if the file was successfully enqueued, False otherwise
     """
-
+    manifest_status = None
     try:
-        content = ""
-        ext = file_path.suffix.lower()
-
-        file = None
-        async with aiofiles.open(file_path, "rb") as f:
-            file = await f.read()
-
-        # Process based on file type
-        match ext:
-            case (
-                ".txt"
-                | ".md"
-                | ".html"
-                | ".htm"
-                | ".tex"
-                | ".json"
-                | ".xml"
-                | ".yaml"
-                | ".yml"
-                | ".rtf"
-                | ".odt"
-                | ".epub"
-                | ".csv"
-                | ".log"
-                | ".conf"
-                | ".ini"
-                | ".properties"
-                | ".sql"
-                | ".bat"
-                | ".sh"
-                | ".c"
-                | ".cpp"
-                | ".py"
-                | ".java"
-                | ".js"
-                | ".ts"
-                | ".swift"
-                | ".go"
-                | ".rb"
-                | ".php"
-                | ".css"
-                | ".scss"
-                | ".less"
-            ):
-                try:
-                    # Try to decode as UTF-8
-                    content = file.decode("utf-8")
-
-                    # Validate content
-                    if not content or len(content.strip()) == 0:
-                        logger.error(f"Empty content in file: {file_path.name}")
-                        return False
-
-                    # Check if content looks like binary data string representation
-                    if content.startswith("b'") or content.startswith('b"'):
-                        logger.error(
-                            f"File {file_path.name} appears to contain binary data representation instead of text"
-                        )
-                        return False
-
-                except UnicodeDecodeError:
-                    logger.error(
-                        f"File {file_path.name} is not valid UTF-8 encoded text. Please convert it to UTF-8 before processing."
-                    )
-                    return False
-            case ".pdf":
-                if global_args.document_loading_engine == "DOCLING":
-                    if not pm.is_installed("docling"):  # type: ignore
-                        pm.install("docling")
-                    from docling.document_converter import (
-                        DocumentConverter,  # type: ignore
-                    )
-
-                    converter = DocumentConverter()
-                    result = converter.convert(file_path)
-                    content = result.document.export_to_markdown()
-                else:
-                    if not pm.is_installed("pypdf2"):  # type: ignore
-                        pm.install("pypdf2")
-                    from io import BytesIO
-
-                    from PyPDF2 import PdfReader  # type: ignore
-
-                    pdf_file = BytesIO(file)
-                    reader = PdfReader(pdf_file)
-                    for page in reader.pages:
-                        content += page.extract_text() + "\n"
-            case ".docx":
-                if global_args.document_loading_engine == "DOCLING":
-                    if not pm.is_installed("docling"):  # type: ignore
-                        pm.install("docling")
-                    from docling.document_converter import (
-                        DocumentConverter,  # type: ignore
-                    )
-
-                    converter = DocumentConverter()
-                    result = converter.convert(file_path)
-                    content = result.document.export_to_markdown()
-                else:
-                    if not pm.is_installed("python-docx"):  # type: ignore
-                        try:
-                            pm.install("python-docx")
-                        except Exception:
-                            pm.install("docx")
-                    from io import BytesIO
-
-                    from docx import Document  # type: ignore
-
-                    docx_file = BytesIO(file)
-                    doc = Document(docx_file)
-                    content = "\n".join(
-                        [paragraph.text for paragraph in doc.paragraphs]
-                    )
-            case ".pptx":
-                if global_args.document_loading_engine == "DOCLING":
-                    if not pm.is_installed("docling"):  # type: ignore
-                        pm.install("docling")
-                    from docling.document_converter import (
-                        DocumentConverter,  # type: ignore
-                    )
-
-                    converter = DocumentConverter()
-                    result = converter.convert(file_path)
-                    content = result.document.export_to_markdown()
-                else:
-                    if not pm.is_installed("python-pptx"):  # type: ignore
-                        pm.install("pptx")
-                    from io import BytesIO
-
-                    from pptx import Presentation  # type: ignore
-
-                    pptx_file = BytesIO(file)
-                    prs = Presentation(pptx_file)
-                    for slide in prs.slides:
-                        for shape in slide.shapes:
-                            if hasattr(shape, "text"):
-                                content += shape.text + "\n"
-            case ".xlsx":
-                if global_args.document_loading_engine == "DOCLING":
-                    if not pm.is_installed("docling"):  # type: ignore
-                        pm.install("docling")
-                    from docling.document_converter import (
-                        DocumentConverter,  # type: ignore
-                    )
-
-                    converter = DocumentConverter()
-                    result = converter.convert(file_path)
-                    content = result.document.export_to_markdown()
-                else:
-                    if not pm.is_installed("openpyxl"):  # type: ignore
-                        pm.install("openpyxl")
-                    from io import BytesIO
-
-                    from openpyxl import load_workbook  # type: ignore
-
-                    xlsx_file = BytesIO(file)
-                    wb = load_workbook(xlsx_file)
-                    for sheet in wb:
-                        content += f"Sheet: {sheet.title}\n"
-                        for row in sheet.iter_rows(values_only=True):
-                            content += (
-                                "\t".join(
-                                    str(cell) if cell is not None else ""
-                                    for cell in row
-                                )
-                                + "\n"
-                            )
-                        content += "\n"
-            case _:
-                logger.error(
-                    f"Unsupported file type: {file_path.name} (extension {ext})"
-                )
-                return False
+        try:
+            content = await aextract_text(
+                file_path,
+                global_args.document_loading_engine,
+                global_args.extraction_workers,
+            )
+        except ExtractionError as e:
+            logger.error(str(e))
+            manifest_status = STATUS_FAILED
+            content = None
 
         # Insert into the RAG queue
         if content:
@@ -748,9 +724,10 @@ async def pipeline_enqueue_file(rag, file_path: Path) -> bool:
                 content, file_paths=file_path.name
             )
             logger.info(f"Successfully fetched and enqueued file: {file_path.name}")
-            return True
-        else:
+            manifest_status = STATUS_INDEXED
+        elif manifest_status is None:
             logger.error(f"No content could be extracted from file: {file_path.name}")
+            manifest_status = STATUS_FAILED
 
     except Exception as e:
         logger.error(f"Error processing or enqueueing file {file_path.name}: {str(e)}")
@@ -761,18 +738,33 @@ async def pipeline_enqueue_file(rag, file_path: Path) -> bool:
                 file_path.unlink()
             except Exception as e:
                 logger.error(f"Error deleting file {file_path}: {str(e)}")
-    return False
 
+    if doc_manager is not None and manifest_status is not None:
+        await asyncio.to_thread(
+            doc_manager.record_file, file_path, file_hash, manifest_status
+        )
+    return manifest_status == STATUS_INDEXED
 
-async def pipeline_index_file(rag, file_path: Path):
+
+async def pipeline_index_file(
+    rag,
+    file_path: Path,
+    doc_manager: Optional["DocumentManager"] = None,
+    file_hash: Optional[str] = None,
+):
     """Index a file
 
     Args:
         rag: LightRAG instance
         file_path: Path to the saved file
+        doc_manager: Records the fingerprint of the file, if given
+        file_hash: SHA-256 of the file, if computed while it was saved
     """
     try:
-        if await pipeline_enqueue_file(rag, file_path):
+        enqueued = await pipeline_enqueue_file(rag, file_path, doc_manager, file_hash)
+        if doc_manager is not None:
+            await asyncio.to_thread(doc_manager.save_manifest)
+        if enqueued:
             await rag.lightrag.apipeline_process_enqueue_documents()
 
     except Exception as e:
@@ -780,30 +772,56 @@ async def pipeline_index_file(rag, file_path: Path):
         logger.error(traceback.format_exc())
 
 
-async def pipeline_index_files(rag, file_paths: List[Path]):
-    """Index multiple files sequentially to avoid high CPU load
+async def pipeline_index_files(
+    rag, file_paths: List[Path], doc_manager: Optional["DocumentManager"] = None
+):
+    """Index multiple files, extracting several at a time
+
+    Files are extracted concurrently in the extraction process pool and enqueued
+    as soon as each one is extracted. Indexing starts with the first enqueued
+    file; files enqueued while it runs are picked up by the running pipeline.
 
     Args:
         rag: LightRAG instance
         file_paths: Paths to the files to index
+        doc_manager: Records the fingerprints of the files, if given
     """
     if not file_paths:
         return
+    processing = None
     try:
         enqueued = False
 
         # Create Collator for Unicode sorting
         collator = Collator()
-        sorted_file_paths = sorted(file_paths, key=lambda p: collator.sort_key(str(p)))
+        sorted_file_paths = iter(
+            sorted(file_paths, key=lambda p: collator.sort_key(str(p)))
+        )
+
+        async def extract_worker():
+            nonlocal enqueued, processing
+            for file_path in sorted_file_paths:
+                if await pipeline_enqueue_file(rag, file_path, doc_manager):
+                    enqueued = True
+                    if processing is None:
+                        processing = asyncio.create_task(
+                            rag.lightrag.apipeline_process_enqueue_documents()
+                        )
+
+        # Files are handed out in sorted order to a bounded set of workers
+        await asyncio.gather(
+            *(extract_worker() for _ in range(max(1, global_args.extraction_workers)))
+        )
 
-        # Process files sequentially
-        for file_path in sorted_file_paths:
-            if await pipeline_enqueue_file(rag, file_path):
-                enqueued = True
+        if doc_manager is not None:
+            await asyncio.to_thread(doc_manager.save_manifest)
 
-        # Process the queue only if at least one file was successfully enqueued
+        # Process the queue only if at least one file was successfully enqueued.
+        # If the pipeline is still busy, this flags the late files for it
         if enqueued:
             await rag.lightrag.apipeline_process_enqueue_documents()
+        if processing is not None:
+            await processing
     except Exception as e:
         logger.error(f"Error indexing files: {str(e)}")
         logger.error(traceback.format_exc())
@@ -829,6 +847,33 @@ async def pipeline_index_texts(rag, texts: List[str], file_sources: List[str] =
     await rag.lightrag.apipeline_process_enqueue_documents()
 
 
+async def stream_upload_to_file(file: UploadFile, file_path: Path) -> str:
+    """Stream an uploaded file to disk in chunks, hashing it on the way
+
+    The content is written under a ".part" name and renamed once complete, so
+    directory scans never pick up a partial upload.
+
+    Args:
+        file: The uploaded file
+        file_path: Destination path
+
+    Returns:
+        str: SHA-256 of the file content
+    """
+    partial_path = file_path.with_name(file_path.name + ".part")
+    digest = hashlib.sha256()
+    try:
+        async with aiofiles.open(partial_path, "wb") as buffer:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                digest.update(chunk)
+                await buffer.write(chunk)
+        os.replace(partial_path, file_path)
+    except BaseException:
+        partial_path.unlink(missing_ok=True)
+        raise
+    return digest.hexdigest()
+
+
 # TODO: deprecate after /insert_file is removed
 async def save_temp_file(input_dir: Path, file: UploadFile = File(...)) -> Path:
     """Save the uploaded file to a temporary location
@@ -848,23 +893,31 @@ async def save_temp_file(input_dir: Path, file: UploadFile = File(...)) -> Path:
     temp_path.parent.mkdir(exist_ok=True)
 
     # Save the file
-    with open(temp_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
+    await stream_upload_to_file(file, temp_path)
     return temp_path
 
 
 async def run_scanning_process(rag, doc_manager: DocumentManager):
     """Background task to scan and index documents"""
     try:
-        new_files = doc_manager.scan_directory_for_new_files()
+        # Walk the tree off the event loop; only files whose size or mtime
+        # changed since they were indexed get hashed
+        scan = await asyncio.to_thread(doc_manager.scan_directory)
+        new_files = scan.to_index
         total_files = len(new_files)
-        logger.info(f"Found {total_files} files to index.")
+        logger.info(
+            f"Found {total_files} files to index ({len(scan.new)} new, "
+            f"{len(scan.changed)} changed, {scan.unchanged} unchanged, of which "
+            f"{scan.failed} failed before and are skipped until they change)."
+        )
+        for file_path in scan.deleted:
+            logger.info(f"File removed from input directory: {file_path}")
 
         if not new_files:
             return
 
         # Process all files at once
-        await pipeline_index_files(rag, new_files)
+        await pipeline_index_files(rag, new_files, doc_manager)
         logger.info(f"Scanning process completed: {total_files} files Processed.")
 
     except Exception as e:
@@ -872,6 +925,37 @@ async def run_scanning_process(rag, doc_manager: DocumentManager):
         logger.error(traceback.format_exc())
 
 
+async def run_watch_process(rag, doc_manager: DocumentManager, debounce_ms: int):
+    """Background task indexing files as they are added to or changed in the input directory
+
+    Uses inotify on Linux (via watchfiles) and polling elsewhere. Changes are
+    collected for debounce_ms before they are checked against the manifest.
+    """
+    if not pm.is_installed("watchfiles"):  # type: ignore
+        pm.install("watchfiles")
+    from watchfiles import awatch  # type: ignore
+
+    logger.info(f"Watching {doc_manager.input_dir} for new and changed files")
+    try:
+        async for changes in awatch(doc_manager.input_dir, debounce=debounce_ms):
+            paths = sorted({Path(path) for _, path in changes})
+            scan = await asyncio.to_thread(doc_manager.check_files, paths)
+            for file_path in scan.deleted:
+                logger.info(f"File removed from input directory: {file_path}")
+            # Deletions and refreshed fingerprints of unchanged files
+            await asyncio.to_thread(doc_manager.save_manifest)
+            if scan.to_index:
+                logger.info(
+                    f"Watch: indexing {len(scan.new)} new and {len(scan.changed)} changed files"
+                )
+                await pipeline_index_files(rag, scan.to_index, doc_manager)
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        logger.error(f"Error while watching input directory: {str(e)}")
+        logger.error(traceback.format_exc())
+
+
 async def background_delete_documents(
     rag,
     doc_manager: DocumentManager,
@@ -913,21 +997,24 @@ async def background_delete_documents(
         pipeline_status["history_messages"][:] = ["Starting document deletion process"]
 
     try:
-        # Loop through each document ID and delete them one by one
-        for i, doc_id in enumerate(doc_ids, 1):
+        # Delete all documents together: the affected entities and relations are
+        # analyzed and rebuilt once, and the storages flushed once
+        async with pipeline_status_lock:
+            start_msg = f"Deleting {total_docs} documents"
+            logger.info(start_msg)
+            pipeline_status["latest_message"] = start_msg
+            pipeline_status["history_messages"].append(start_msg)
+
+        results = await rag.adelete_by_doc_ids(doc_ids)
+
+        # Report each document and delete its file if requested
+        for i, (doc_id, result) in enumerate(zip(doc_ids, results), 1):
             async with pipeline_status_lock:
-                start_msg = f"Deleting document {i}/{total_docs}: {doc_id}"
-                logger.info(start_msg)
                 pipeline_status["cur_batch"] = i
-                pipeline_status["latest_message"] = start_msg
-                pipeline_status["history_messages"].append(start_msg)
 
             file_path = "#"
             try:
-                result = await rag.adelete_by_doc_id(doc_id)
-                file_path = (
-                    getattr(result, "file_path", "-") if "result" in locals() else "-"
-                )
+                file_path = getattr(result, "file_path", "-")
                 if result.status == "success":
                     successful_deletions.append(doc_id)
                     success_msg = (
@@ -1098,11 +1185,22 @@ def create_document_routes(
                     message=f"File '{safe_filename}' already exists in the input directory.",
                 )
 
-            with open(file_path, "wb") as buffer:
-                shutil.copyfileobj(file.file, buffer)
+            file_hash = await stream_upload_to_file(file, file_path)
+
+            # Uploads identical to an indexed file are detected from the hash
+            # computed while streaming, without reading the file back
+            existing_path = doc_manager.manifest.find_by_hash(file_hash)
+            if existing_path is not None and existing_path.exists():
+                file_path.unlink()
+                return InsertResponse(
+                    status="duplicated",
+                    message=f"File '{safe_filename}' has the same content as '{existing_path.name}' in the input directory.",
+                )
 
             # Add to background tasks
-            background_tasks.add_task(pipeline_index_file, rag, file_path)
+            background_tasks.add_task(
+                pipeline_index_file, rag, file_path, doc_manager, file_hash
+            )
 
             return InsertResponse(
                 status="success",
@@ -1220,6 +1318,9 @@ def create_document_routes(
             get_pipeline_status_lock,
         )
 
+        # The module the server initialized, which the query cache reads
+        from src.LightRAG.lightrag.kg.shared_storage import bump_storage_generation
+
         # Get pipeline status and lock
         pipeline_status = await get_namespace_data("pipeline_status")
         pipeline_status_lock = get_pipeline_status_lock()
@@ -1275,6 +1376,7 @@ def create_document_routes(
 
             # Wait for all drop tasks to complete
             drop_results = await asyncio.gather(*drop_tasks, return_exceptions=True)
+            await bump_storage_generation()
 
             # Check for errors and log results
             errors = []
@@ -1482,18 +1584,7 @@ def create_document_routes(
                     if status not in response.statuses:
                         response.statuses[status] = []
                     response.statuses[status].append(
-                        DocStatusResponse(
-                            id=doc_id,
-                            content_summary=doc_status.content_summary,
-                            content_length=doc_status.content_length,
-                            status=doc_status.status,
-                            created_at=format_datetime(doc_status.created_at),
-                            updated_at=format_datetime(doc_status.updated_at),
-                            chunks_count=doc_status.chunks_count,
-                            error=doc_status.error,
-                            metadata=doc_status.metadata,
-                            file_path=doc_status.file_path,
-                        )
+                        to_doc_status_response(doc_id, doc_status)
                     )
             return response
         except Exception as e:
@@ -1501,6 +1592,100 @@ def create_document_routes(
             logger.error(traceback.format_exc())
             raise HTTPException(status_code=500, detail=str(e))
 
+    @router.get(
+        "/paginated",
+        response_model=PaginatedDocsResponse,
+        dependencies=[Depends(combined_auth)],
+    )
+    async def documents_paginated(
+        status: Optional[DocStatus] = Query(
+            default=None, description="Only list documents with this status"
+        ),
+        file_path: Optional[str] = Query(
+            default=None,
+            description="Case-insensitive substring the file path must contain",
+        ),
+        sort_field: Literal["updated_at", "created_at", "file_path", "id"] = Query(
+            default="updated_at", description="Field to sort by"
+        ),
+        sort_direction: Literal["asc", "desc"] = Query(
+            default="desc", description="Sort direction"
+        ),
+        page_size: int = Query(
+            default=50, ge=1, le=1000, description="Number of documents per page"
+        ),
+        cursor: Optional[str] = Query(
+            default=None, description="next_cursor of the previous page"
+        ),
+    ) -> PaginatedDocsResponse:
+        """
+        Get one page of documents, filtered and sorted.
+
+        Pages are addressed with cursors rather than offsets: pass the next_cursor of
+        a response to get the following page, until it is null. Listings are served
+        by the status, updated_at and file_path indexes of the document status
+        storage, so deep pages cost the same as the first one.
+
+        Returns:
+            PaginatedDocsResponse: The documents of the page, the cursor of the next
+                                   page and the number of matching documents.
+
+        Raises:
+            HTTPException: If the cursor is invalid (400) or an error occurs while
+                           retrieving documents (500).
+        """
+        try:
+            page = await rag.lightrag.get_docs_paginated(
+                status=status,
+                file_path_filter=file_path,
+                sort_field=sort_field,
+                sort_direction=sort_direction,
+                page_size=page_size,
+                cursor=cursor,
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except Exception as e:
+            logger.error(f"Error GET /documents/paginated: {str(e)}")
+            logger.error(traceback.format_exc())
+            raise HTTPException(status_code=500, detail=str(e))
+
+        return PaginatedDocsResponse(
+            documents=[
+                to_doc_status_response(doc_id, doc_status)
+                for doc_id, doc_status in page.documents
+            ],
+            next_cursor=page.next_cursor,
+            total=page.total,
+        )
+
+    @router.get(
+        "/status_counts",
+        response_model=DocStatusCountsResponse,
+        dependencies=[Depends(combined_auth)],
+    )
+    async def document_status_counts() -> DocStatusCountsResponse:
+        """
+        Get the number of documents in each status, without loading any document.
+
+        Returns:
+            DocStatusCountsResponse: Counts per status and the total.
+
+        Raises:
+            HTTPException: If an error occurs while counting documents (500).
+        """
+        try:
+            counts = await rag.lightrag.get_processing_status()
+            status_counts = {status.value: 0 for status in DocStatus}
+            status_counts.update(counts)
+            return DocStatusCountsResponse(
+                status_counts=status_counts, total=sum(status_counts.values())
+            )
+        except Exception as e:
+            logger.error(f"Error GET /documents/status_counts: {str(e)}")
+            logger.error(traceback.format_exc())
+            raise HTTPException(status_code=500, detail=str(e))
+
     class DeleteDocByIdResponse(BaseModel):
         """Response model for single document deletion operation."""
 
@@ -2,6 +2,7 @@
 This module contains all query-related routes for the LightRAG API.
 """
 
+import asyncio
 import json
 import logging
 from typing import Any, Dict, List, Literal, Optional
@@ -11,17 +12,15 @@ from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel, Field, field_validator
 
 from src.LightRAG.lightrag.base import QueryParam
+from src.LightRAG.lightrag.query_trace import get_query_latency_histograms
 
 from ..utils_api import get_combined_auth_dependency
 
 router = APIRouter(tags=["query"])
 
 
-class QueryRequest(BaseModel):
-    query: str = Field(
-        min_length=1,
-        description="The query text",
-    )
+class QueryOptions(BaseModel):
+    """Query parameters shared by single and batch query requests."""
 
     mode: Literal["local", "global", "hybrid", "naive", "mix", "bypass"] = Field(
         default="hybrid",
@@ -100,11 +99,6 @@ class QueryRequest(BaseModel):
         description="User-provided prompt for the query. If provided, this will be used instead of the default value from prompt template.",
     )
 
-    @field_validator("query", mode="after")
-    @classmethod
-    def query_strip_after(cls, query: str) -> str:
-        return query.strip()
-
     @field_validator("conversation_history", mode="after")
     @classmethod
     def conversation_history_role_check(
@@ -122,7 +116,7 @@ class QueryRequest(BaseModel):
     def to_query_params(self, is_stream: bool) -> "QueryParam":
         """Converts a QueryRequest instance into a QueryParam instance."""
         # Use Pydantic's `.model_dump(exclude_none=True)` to remove None values automatically
-        request_data = self.model_dump(exclude_none=True, exclude={"query"})
+        request_data = self.model_dump(exclude_none=True, exclude={"query", "queries"})
 
         # Ensure `mode` and `stream` are set explicitly
         param = QueryParam(**request_data)
@@ -130,17 +124,129 @@ class QueryRequest(BaseModel):
         return param
 
 
+class QueryRequest(QueryOptions):
+    query: str = Field(
+        min_length=1,
+        description="The query text",
+    )
+
+    enable_trace: Optional[bool] = Field(
+        default=None,
+        description="If True, returns a per-stage timing trace of the query, including storage round trips and token counts.",
+    )
+
+    @field_validator("query", mode="after")
+    @classmethod
+    def query_strip_after(cls, query: str) -> str:
+        return query.strip()
+
+
+class BatchQueryRequest(QueryOptions):
+    queries: List[str] = Field(
+        min_length=1,
+        description="The query texts, answered with the same query parameters",
+    )
+
+    @field_validator("queries", mode="after")
+    @classmethod
+    def queries_strip_after(cls, queries: List[str]) -> List[str]:
+        queries = [query.strip() for query in queries]
+        if not all(queries):
+            raise ValueError("Queries must not be empty.")
+        return queries
+
+
 class QueryResponse(BaseModel):
     response: str = Field(
         description="The generated response",
     )
+    trace: Optional[Dict[str, Any]] = Field(
+        default=None,
+        description="Per-stage timing trace, present when enable_trace was requested",
+    )
 
 
-def create_query_routes(rag, api_key: Optional[str] = None, top_k: int = 60):
+class BatchQueryResponse(BaseModel):
+    responses: List[str] = Field(
+        description="The generated responses, in the same order as the queries",
+    )
+
+
+class KeywordMicroBatcher:
+    """
+    Collects keyword extraction requests arriving within a short window and resolves
+    them with batched LLM calls, one batch per group of compatible query parameters.
+    """
+
+    KG_MODES = ("local", "global", "hybrid", "mix")
+
+    def __init__(self, rag, window_ms: float):
+        self.rag = rag
+        self.window = window_ms / 1000
+        self._pending: Dict[tuple, List[tuple]] = {}
+        self._flush_tasks: set = set()
+
+    async def prefill_keywords(self, query: str, param: QueryParam) -> None:
+        """Set the query keywords on `param`, so retrieval skips its own extraction."""
+        if param.mode not in self.KG_MODES or param.hl_keywords or param.ll_keywords:
+            return
+
+        # Queries are only batched with others sharing the same prompt inputs
+        key = (
+            param.mode,
+            json.dumps(param.conversation_history or [], sort_keys=True),
+            param.history_turns,
+        )
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        if key not in self._pending:
+            self._pending[key] = []
+            loop.call_later(self.window, self._schedule_flush, key)
+        self._pending[key].append((query, param, future))
+
+        param.hl_keywords, param.ll_keywords = await future
+
+    def _schedule_flush(self, key: tuple) -> None:
+        task = asyncio.create_task(self._flush(key))
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+
+    async def _flush(self, key: tuple) -> None:
+        group = self._pending.pop(key, [])
+        if not group:
+            return
+        try:
+            keywords = await self.rag.lightrag.aextract_keywords_batch(
+                [query for query, _, _ in group], param=group[0][1]
+            )
+        except Exception as e:
+            for _, _, future in group:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, _, future), query_keywords in zip(group, keywords):
+            if not future.done():
+                future.set_result(query_keywords)
+
+
+def create_query_routes(
+    rag,
+    api_key: Optional[str] = None,
+    top_k: int = 60,
+    keyword_batch_window_ms: float = 0,
+):
     combined_auth = get_combined_auth_dependency(api_key)
+    keyword_batcher = (
+        KeywordMicroBatcher(rag, keyword_batch_window_ms)
+        if keyword_batch_window_ms > 0
+        else None
+    )
 
     @router.post(
-        "/query", response_model=QueryResponse, dependencies=[Depends(combined_auth)]
+        "/query",
+        response_model=QueryResponse,
+        response_model_exclude_none=True,
+        dependencies=[Depends(combined_auth)],
     )
     async def query_text(request: QueryRequest):
         """
@@ -159,17 +265,57 @@ def create_query_routes(rag, api_key: Optional[str] = None, top_k: int = 60):
         """
         try:
             param = request.to_query_params(False)
+            if keyword_batcher is not None:
+                await keyword_batcher.prefill_keywords(request.query, param)
             response = await rag.aquery(request.query, param=param)
+            trace = param.trace.to_dict() if param.trace is not None else None
 
             # If response is a string (e.g. cache hit), return directly
             if isinstance(response, str):
-                return QueryResponse(response=response)
+                return QueryResponse(response=response, trace=trace)
 
             if isinstance(response, dict):
                 result = json.dumps(response, indent=2)
-                return QueryResponse(response=result)
+                return QueryResponse(response=result, trace=trace)
             else:
-                return QueryResponse(response=str(response))
+                return QueryResponse(response=str(response), trace=trace)
+        except Exception as e:
+            trace_exception(e)
+            raise HTTPException(status_code=500, detail=str(e))
+
+    @router.post(
+        "/query/batch",
+        response_model=BatchQueryResponse,
+        dependencies=[Depends(combined_auth)],
+    )
+    async def query_batch(request: BatchQueryRequest):
+        """
+        Answer many queries in one request, sharing retrieval work across them.
+
+        All queries use the same query parameters. Their vector searches are embedded
+        and executed together, graph and chunk lookups are deduplicated across the
+        batch, and the answers are generated concurrently.
+
+        Parameters:
+            request (BatchQueryRequest): The queries and shared query parameters.
+        Returns:
+            BatchQueryResponse: One response per query, in input order.
+
+        Raises:
+            HTTPException: Raised when an error occurs during the request handling process,
+                       with status code 500 and detail containing the exception message.
+        """
+        try:
+            param = request.to_query_params(False)
+            responses = await rag.aquery_batch(request.queries, param=param)
+
+            results = []
+            for response in responses:
+                if isinstance(response, dict):
+                    results.append(json.dumps(response, indent=2))
+                else:
+                    results.append(str(response))
+            return BatchQueryResponse(responses=results)
         except Exception as e:
             trace_exception(e)
             raise HTTPException(status_code=500, detail=str(e))
@@ -188,6 +334,8 @@ def create_query_routes(rag, api_key: Optional[str] = None, top_k: int = 60):
         """
         try:
             param = request.to_query_params(True)
+            if keyword_batcher is not None:
+                await keyword_batcher.prefill_keywords(request.query, param)
             response = await rag.aquery(request.query, param=param)
 
             from fastapi.responses import StreamingResponse
@@ -209,6 +357,10 @@ def create_query_routes(rag, api_key: Optional[str] = None, top_k: int = 60):
                         logging.error(f"Streaming error: {str(e)}")
                         yield f"{json.dumps({'error': str(e)})}\n"
 
+                # Trailer with the timing trace, once generation has finished
+                if param.trace is not None:
+                    yield f"{json.dumps({'trace': param.trace.to_dict()})}\n"
+
             return StreamingResponse(
                 stream_generator(),
                 media_type="application/x-ndjson",
@@ -223,4 +375,19 @@ def create_query_routes(rag, api_key: Optional[str] = None, top_k: int = 60):
             trace_exception(e)
             raise HTTPException(status_code=500, detail=str(e))
 
+    @router.get("/query/metrics", dependencies=[Depends(combined_auth)])
+    async def query_metrics():
+        """
+        Get latency histograms of the query stages handled by this worker process.
+
+        Every query records the duration of its stages (keyword extraction, vector
+        search, graph and chunk reads, rerank, token truncation, generation) and its
+        total duration, whether or not a trace was requested.
+
+        Returns:
+            Dict: Cumulative bucket counts (upper bounds in milliseconds), count and
+            sum per stage.
+        """
+        return {"histograms": get_query_latency_histograms()}
+
     return router
@@ -0,0 +1,246 @@
+"""
+Persisted fingerprints of the files of the input directory.
+
+A scan walks the input directory once and compares each file's size and mtime
+with the manifest. Only files whose size or mtime changed are hashed, so a file
+that was merely touched is not indexed again, and files that disappeared are
+reported as deleted. Files no text could be extracted from are recorded as
+failed, so they are skipped until their content changes.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from src.LightRAG.lightrag.utils import logger
+
+SCAN_MANIFEST_NAME = ".lightrag_scan_manifest.json"
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# Status of a manifest entry
+STATUS_INDEXED = "indexed"
+STATUS_FAILED = "failed"
+
+
+def hash_file(file_path: Path) -> str:
+    """SHA-256 of a file's content, read in chunks"""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def iter_files(
+    directory: Path, extensions: Iterable[str], skip: Optional[Path] = None
+) -> Iterator[Tuple[Path, os.stat_result]]:
+    """Walk a directory tree once, yielding supported files and their stat
+
+    Args:
+        directory: Root of the walk
+        extensions: Lowercase file extensions to include (e.g. ".pdf")
+        skip: File to leave out (the manifest itself)
+    """
+    extensions = tuple(ext.lower() for ext in extensions)
+    pending = [str(directory)]
+    while pending:
+        current = pending.pop()
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            pending.append(entry.path)
+                        elif entry.is_file() and entry.name.lower().endswith(
+                            extensions
+                        ):
+                            path = Path(entry.path)
+                            if skip is None or path != skip:
+                                yield path, entry.stat()
+                    except OSError as e:
+                        logger.warning(f"Skipping {entry.path}: {e}")
+        except OSError as e:
+            logger.warning(f"Cannot read directory {current}: {e}")
+
+
+@dataclass
+class ScanResult:
+    """Changes of the input directory since the files were last indexed"""
+
+    new: List[Path] = field(default_factory=list)
+    changed: List[Path] = field(default_factory=list)
+    deleted: List[Path] = field(default_factory=list)
+    unchanged: int = 0
+    failed: int = 0  # Unchanged files that failed before, not retried
+
+    @property
+    def to_index(self) -> List[Path]:
+        """Files to (re)index: new files, then changed ones"""
+        return self.new + self.changed
+
+
+class ScanManifest:
+    """(size, mtime, content hash, status) of each handled file, saved as JSON
+
+    Keys are paths relative to the input directory, so the manifest survives a
+    move of the whole directory.
+    """
+
+    def __init__(self, manifest_path: Path, root: Path):
+        """
+        Args:
+            manifest_path: JSON file holding the fingerprints
+            root: Input directory the paths are relative to
+        """
+        self.path = Path(manifest_path)
+        self.root = Path(root)
+        self._entries: Dict[str, Dict] = {}
+        self._by_hash: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+
+        if self.path.exists():
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self._entries = json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                logger.warning(f"Ignoring unreadable scan manifest {self.path}: {e}")
+        for key, entry in self._entries.items():
+            if entry.get("status", STATUS_INDEXED) == STATUS_INDEXED:
+                self._by_hash[entry["hash"]] = key
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _key(self, file_path: Path) -> str:
+        try:
+            return Path(file_path).relative_to(self.root).as_posix()
+        except ValueError:
+            return Path(file_path).as_posix()
+
+    def classify(
+        self, files: Iterable[Tuple[Path, os.stat_result]], complete: bool = False
+    ) -> ScanResult:
+        """Compare files with their fingerprints
+
+        Args:
+            files: (path, stat) of the files to check
+            complete: Whether files lists the whole directory, so that manifest
+                entries missing from it are reported as deleted
+
+        Returns:
+            ScanResult with new, changed and (if complete) deleted files.
+            Unchanged files recorded as failed are counted in failed.
+        """
+        result = ScanResult()
+        seen = set()
+        for file_path, stat in files:
+            key = self._key(file_path)
+            seen.add(key)
+            with self._lock:
+                entry = self._entries.get(key)
+            if entry is None:
+                result.new.append(file_path)
+                continue
+            status = entry.get("status", STATUS_INDEXED)
+            if entry["size"] == stat.st_size and entry["mtime"] == stat.st_mtime:
+                result.unchanged += 1
+                if status == STATUS_FAILED:
+                    result.failed += 1
+                continue
+            # Size or mtime changed: only a different content is a change
+            try:
+                file_hash = hash_file(file_path)
+            except OSError as e:
+                logger.warning(f"Cannot read {file_path}: {e}")
+                continue
+            if file_hash == entry["hash"]:
+                self._set(key, stat.st_size, stat.st_mtime, file_hash, status)
+                result.unchanged += 1
+                if status == STATUS_FAILED:
+                    result.failed += 1
+            else:
+                result.changed.append(file_path)
+
+        if complete:
+            with self._lock:
+                missing = [key for key in self._entries if key not in seen]
+            for key in missing:
+                result.deleted.append(self.root / key)
+                self.forget(self.root / key)
+        return result
+
+    def record(
+        self,
+        file_path: Path,
+        file_hash: Optional[str] = None,
+        status: str = STATUS_INDEXED,
+    ) -> None:
+        """Fingerprint a file that was indexed, or that failed
+
+        Args:
+            file_path: Handled file
+            file_hash: Content hash if already known (e.g. computed while the
+                file was uploaded), otherwise the file is hashed
+            status: STATUS_INDEXED, or STATUS_FAILED for a file no text could
+                be extracted from
+        """
+        stat = file_path.stat()
+        if file_hash is None:
+            file_hash = hash_file(file_path)
+        self._set(self._key(file_path), stat.st_size, stat.st_mtime, file_hash, status)
+
+    def find_by_hash(self, file_hash: str) -> Optional[Path]:
+        """Path of an indexed (not failed) file with this content hash, if any"""
+        with self._lock:
+            key = self._by_hash.get(file_hash)
+        return self.root / key if key is not None else None
+
+    def forget(self, file_path: Path) -> None:
+        """Drop the fingerprint of a file"""
+        key = self._key(file_path)
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                if self._by_hash.get(entry["hash"]) == key:
+                    del self._by_hash[entry["hash"]]
+                self._dirty = True
+
+    def _set(
+        self,
+        key: str,
+        size: int,
+        mtime: float,
+        file_hash: str,
+        status: str = STATUS_INDEXED,
+    ) -> None:
+        with self._lock:
+            previous = self._entries.get(key)
+            if previous is not None and self._by_hash.get(previous["hash"]) == key:
+                del self._by_hash[previous["hash"]]
+            self._entries[key] = {
+                "size": size,
+                "mtime": mtime,
+                "hash": file_hash,
+                "status": status,
+            }
+            if status == STATUS_INDEXED:
+                self._by_hash[file_hash] = key
+            self._dirty = True
+
+    def save(self) -> None:
+        """Write the manifest if it changed, atomically"""
+        with self._lock:
+            if not self._dirty:
+                return
+            data = dict(self._entries)
+            self._dirty = False
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
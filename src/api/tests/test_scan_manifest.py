@@ -0,0 +1,115 @@
+"""
+The scan manifest reports new, changed and deleted files of the input directory,
+does not report files that were only touched, skips files that failed until
+their content changes, and survives a reload.
+
+Run with: pytest src/api/tests/test_scan_manifest.py
+"""
+
+import os
+import sys
+
+_ROOT = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+)
+sys.path.extend([_ROOT, os.path.join(_ROOT, "src", "LightRAG")])
+
+from src.api.scan_manifest import (
+    SCAN_MANIFEST_NAME,
+    STATUS_FAILED,
+    ScanManifest,
+    hash_file,
+    iter_files,
+)
+
+EXTENSIONS = [".txt", ".md"]
+
+
+def _scan(manifest, root):
+    return manifest.classify(
+        iter_files(root, EXTENSIONS, skip=manifest.path), complete=True
+    )
+
+
+def _touch(path, offset):
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + offset))
+
+
+def test_classify_new_changed_touched_and_deleted(tmp_path):
+    (tmp_path / "sub").mkdir()
+    for name in ("a.txt", "b.txt", "c.txt", "sub/d.md"):
+        (tmp_path / name).write_text(f"content of {name}")
+    (tmp_path / "ignored.bin").write_text("not supported")
+    manifest = ScanManifest(tmp_path / SCAN_MANIFEST_NAME, root=tmp_path)
+
+    result = _scan(manifest, tmp_path)
+    assert sorted(p.name for p in result.new) == ["a.txt", "b.txt", "c.txt", "d.md"]
+    for file_path in result.to_index:
+        manifest.record(file_path)
+
+    (tmp_path / "a.txt").write_text("new content of a.txt")
+    _touch(tmp_path / "b.txt", 10**9)
+    (tmp_path / "c.txt").unlink()
+    (tmp_path / "e.txt").write_text("content of e.txt")
+
+    result = _scan(manifest, tmp_path)
+    assert [p.name for p in result.new] == ["e.txt"]
+    assert [p.name for p in result.changed] == ["a.txt"]
+    assert result.deleted == [tmp_path / "c.txt"]
+    assert result.unchanged == 2
+    # Deleted files are forgotten, touched ones refreshed
+    assert len(manifest) == 3
+    assert _scan(manifest, tmp_path).unchanged == 2
+
+
+def test_failed_files_are_skipped_until_they_change(tmp_path):
+    doc = tmp_path / "scan.txt"
+    doc.write_text("no text")
+    manifest = ScanManifest(tmp_path / SCAN_MANIFEST_NAME, root=tmp_path)
+    manifest.record(doc, status=STATUS_FAILED)
+
+    result = _scan(manifest, tmp_path)
+    assert result.to_index == []
+    assert (result.unchanged, result.failed) == (1, 1)
+    # Failed files are no reference for duplicate uploads
+    assert manifest.find_by_hash(hash_file(doc)) is None
+
+    doc.write_text("some text now")
+    assert _scan(manifest, tmp_path).changed == [doc]
+    manifest.record(doc)
+    assert manifest.find_by_hash(hash_file(doc)) == doc
+
+
+def test_save_and_reload(tmp_path):
+    indexed = tmp_path / "a.txt"
+    indexed.write_text("alpha")
+    failed = tmp_path / "b.txt"
+    failed.write_text("beta")
+    manifest_path = tmp_path / SCAN_MANIFEST_NAME
+    manifest = ScanManifest(manifest_path, root=tmp_path)
+    manifest.record(indexed)
+    manifest.record(failed, status=STATUS_FAILED)
+    manifest.save()
+
+    reloaded = ScanManifest(manifest_path, root=tmp_path)
+    assert len(reloaded) == 2
+    assert reloaded.find_by_hash(hash_file(indexed)) == indexed
+    assert reloaded.find_by_hash(hash_file(failed)) is None
+    result = _scan(reloaded, tmp_path)
+    assert (result.unchanged, result.failed) == (2, 1)
+
+    # Saving without changes does not rewrite the file
+    mtime = manifest_path.stat().st_mtime_ns
+    reloaded.save()
+    assert manifest_path.stat().st_mtime_ns == mtime
+
+
+def test_unreadable_manifest_is_ignored(tmp_path):
+    manifest_path = tmp_path / SCAN_MANIFEST_NAME
+    manifest_path.write_text("{not json")
+    (tmp_path / "a.txt").write_text("alpha")
+
+    manifest = ScanManifest(manifest_path, root=tmp_path)
+    assert len(manifest) == 0
+    assert [p.name for p in _scan(manifest, tmp_path).new] == ["a.txt"]